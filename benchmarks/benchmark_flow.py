@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+Validation Flow Benchmark
+Runs create_validation_flow() on synthetic repositories with a stub LLM and records
+per-node wall time, CPU time and peak RSS, optionally comparing against a stored baseline.
+
+Examples:
+    # Quick run on a 1k-file Java/Spring repository
+    python benchmarks/benchmark_flow.py --profiles java-spring --sizes 1000
+
+    # Full matrix, saving the results as the new baseline
+    python benchmarks/benchmark_flow.py --profiles java-spring,python,ts-monorepo --sizes 1000,10000,100000 \\
+        --save-baseline benchmarks/baseline.json
+
+    # Fail (exit code 1) if any node got more than 25% slower than the baseline
+    python benchmarks/benchmark_flow.py --baseline benchmarks/baseline.json --tolerance 0.25
+
+    # Fail if any node's time per file at 16k files is more than twice its time per file at 1k files
+    python benchmarks/benchmark_flow.py --sizes 1000,4000,16000 --iterations 1 --max-scaling 2.0
+"""
+
+import os
+import sys
+import io
+import json
+import time
+import uuid
+import shutil
+import platform
+import argparse
+import tempfile
+import statistics
+import contextlib
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    # Not available on Windows - peak RSS is reported as 0
+    RESOURCE_AVAILABLE = False
+
+# Add the repository root to the path so we can import the gates package
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic_repo import PROFILES, ensure_repository
+from gates import nodes
+from gates.flow import create_validation_flow
+from gates.utils.hard_gates import HARD_GATES
+
+
+RESULTS_FORMAT_VERSION = 1
+
+# Nodes faster than this are too noisy to flag as regressions
+MIN_REGRESSION_SECONDS = 0.05
+
+
+class StubLLMClient:
+    """LLM client stand-in that answers instantly (or after a fixed latency) with gate patterns"""
+
+    class _Config:
+        class _Provider:
+            value = "stub"
+
+        provider = _Provider()
+        model = "stub-patterns"
+
+    def __init__(self, latency: float = 0.0):
+        self.config = self._Config()
+        self.latency = latency
+
+    def is_available(self) -> bool:
+        return True
+
+    def call_llm(self, prompt: str) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        response = {}
+        for gate in HARD_GATES:
+            patterns = gate.get("patterns", {})
+            response[gate["name"]] = {
+                "patterns": patterns.get("positive", []) + patterns.get("violations", []),
+                "description": f"Stub patterns for {gate['name']}",
+                "significance": "Benchmark stub",
+                "expected_coverage": {"percentage": 25, "reasoning": "Benchmark stub", "confidence": "medium"}
+            }
+        return json.dumps(response)
+
+
+def _peak_rss_mb() -> float:
+    """Process high-water mark RSS in MB"""
+    if not RESOURCE_AVAILABLE:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+@contextlib.contextmanager
+def instrument_nodes(flow, timings: Dict[str, Dict[str, float]]):
+    """Wrap each node class's _run to record wall time, CPU time and peak RSS growth"""
+    node_classes = []
+    node = flow.start_node
+    while node is not None and type(node) not in node_classes:
+        node_classes.append(type(node))
+        node = node.successors.get("default")
+
+    originals = {}
+
+    def make_wrapper(node_class, original_run):
+        def timed_run(self, shared):
+            rss_before = _peak_rss_mb()
+            wall_start = time.perf_counter()
+            cpu_start = time.process_time()
+            try:
+                return original_run(self, shared)
+            finally:
+                timings[node_class.__name__] = {
+                    "wall_seconds": time.perf_counter() - wall_start,
+                    "cpu_seconds": time.process_time() - cpu_start,
+                    "peak_rss_mb": _peak_rss_mb(),
+                    "peak_rss_growth_mb": _peak_rss_mb() - rss_before
+                }
+        return timed_run
+
+    for node_class in node_classes:
+        originals[node_class] = node_class.__dict__.get("_run")
+        node_class._run = make_wrapper(node_class, node_class._run)
+    try:
+        yield
+    finally:
+        for node_class, original in originals.items():
+            if original is None:
+                del node_class._run
+            else:
+                node_class._run = original
+
+
+@contextlib.contextmanager
+def stub_external_services(repo_path: str, llm_latency: float):
+    """Serve the synthetic repository instead of cloning and answer LLM calls with the stub"""
+    originals = (nodes.clone_repository, nodes.cleanup_repository, nodes.create_llm_client_from_env)
+
+    def local_clone(repo_url, branch="main", github_token=None, target_dir=None, checkout=True):
+        return repo_path
+
+    def keep_repository(path):
+        # The synthetic repository is reused across iterations
+        pass
+
+    nodes.clone_repository = local_clone
+    nodes.cleanup_repository = keep_repository
+    nodes.create_llm_client_from_env = lambda: StubLLMClient(llm_latency)
+    try:
+        yield
+    finally:
+        nodes.clone_repository, nodes.cleanup_repository, nodes.create_llm_client_from_env = originals
+
+
+def build_shared(repo_path: str, temp_dir: str) -> Dict[str, Any]:
+    """Build the shared store for one flow run, writing reports and logs under temp_dir"""
+    output_dir = os.path.join(temp_dir, "reports")
+    return {
+        "request": {
+            "repository_url": f"https://github.com/benchmark/{Path(repo_path).name}",
+            "branch": "main",
+            "github_token": None,
+            "threshold": 70,
+            "report_format": "both",
+            "output_dir": output_dir,
+            "verbose": False,
+            "scan_id": str(uuid.uuid4())
+        },
+        "llm_config": {},
+        "repository": {"local_path": None, "metadata": None},
+        "config": {"build_files": {}, "config_files": {}, "dependencies": []},
+        "llm": {"prompt": None, "response": None, "patterns": {}},
+        "validation": {"gate_results": [], "overall_score": 0.0},
+        "reports": {"html_path": None, "json_path": None},
+        "hard_gates": HARD_GATES,
+        "temp_dir": temp_dir,
+        "errors": [],
+        "directories": {"logs": os.path.join(temp_dir, "logs")}
+    }
+
+
+def run_flow_once(repo_path: str, llm_latency: float = 0.0, verbose: bool = False) -> Dict[str, Any]:
+    """Run the full validation flow once and return per-node metrics"""
+    temp_dir = tempfile.mkdtemp(prefix="codegates_bench_")
+    shared = build_shared(repo_path, temp_dir)
+
+    flow = create_validation_flow()
+    timings: Dict[str, Dict[str, float]] = {}
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        with stub_external_services(repo_path, llm_latency), instrument_nodes(flow, timings), output:
+            flow.run(shared)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return {
+        "nodes": timings,
+        "total": {
+            "wall_seconds": time.perf_counter() - wall_start,
+            "cpu_seconds": time.process_time() - cpu_start,
+            "peak_rss_mb": _peak_rss_mb()
+        },
+        "overall_score": shared["validation"].get("overall_score", 0.0),
+        "files_scanned": (shared["repository"].get("metadata") or {}).get("total_files", 0),
+        "errors": list(shared["errors"]),
+        "scan_stats": shared.get("scan_stats", {})
+    }
+
+
+def summarize_runs(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Reduce repeated runs to medians (wall/CPU) and maxima (RSS)"""
+    def reduce(samples: List[Dict[str, float]]) -> Dict[str, float]:
+        return {
+            "wall_seconds": round(statistics.median(s["wall_seconds"] for s in samples), 4),
+            "cpu_seconds": round(statistics.median(s["cpu_seconds"] for s in samples), 4),
+            "peak_rss_mb": round(max(s["peak_rss_mb"] for s in samples), 1)
+        }
+
+    node_names = list(dict.fromkeys(name for run in runs for name in run["nodes"]))
+    return {
+        "nodes": {name: reduce([run["nodes"][name] for run in runs if name in run["nodes"]]) for name in node_names},
+        "total": reduce([run["total"] for run in runs]),
+        "overall_score": runs[-1]["overall_score"],
+        "files_scanned": runs[-1]["files_scanned"],
+        "errors": runs[-1]["errors"],
+        "scan_stats": runs[-1]["scan_stats"]
+    }
+
+
+def compare_to_baseline(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[Dict[str, Any]]:
+    """
+    Compare benchmark results to a baseline
+
+    Args:
+        results: Current results (as produced by run_benchmarks)
+        baseline: Baseline results in the same format
+        tolerance: Allowed relative slowdown (0.25 = 25%)
+
+    Returns:
+        List of regressions (scenario, node, baseline and current wall time)
+    """
+    regressions = []
+    baseline_scenarios = {s["scenario"]: s for s in baseline.get("scenarios", [])}
+
+    for scenario in results.get("scenarios", []):
+        reference = baseline_scenarios.get(scenario["scenario"])
+        if reference is None:
+            continue
+
+        measurements = [("TOTAL", scenario["total"], reference["total"])]
+        measurements += [
+            (name, metrics, reference["nodes"][name])
+            for name, metrics in scenario["nodes"].items()
+            if name in reference["nodes"]
+        ]
+        for name, current, previous in measurements:
+            limit = max(previous["wall_seconds"] * (1 + tolerance), previous["wall_seconds"] + MIN_REGRESSION_SECONDS)
+            if current["wall_seconds"] > limit:
+                regressions.append({
+                    "scenario": scenario["scenario"],
+                    "node": name,
+                    "baseline_seconds": previous["wall_seconds"],
+                    "current_seconds": current["wall_seconds"],
+                    "slowdown": round(current["wall_seconds"] / previous["wall_seconds"], 2) if previous["wall_seconds"] else None
+                })
+
+    return regressions
+
+
+def check_scaling(results: Dict[str, Any], max_ratio: float) -> List[Dict[str, Any]]:
+    """
+    Find nodes whose cost grows faster than the repository
+
+    For each profile run at several sizes, a node's wall time per scanned file at
+    the largest size is compared to that at the smallest size.
+
+    Args:
+        results: Results (as produced by run_benchmarks)
+        max_ratio: Allowed growth of the time per file (2.0 = twice as slow per file)
+
+    Returns:
+        List of superlinear nodes (profile, node, sizes and time per file at both ends)
+    """
+    superlinear = []
+    by_profile: Dict[str, List[Dict[str, Any]]] = {}
+    for scenario in results.get("scenarios", []):
+        by_profile.setdefault(scenario["profile"], []).append(scenario)
+
+    for profile, scenarios in by_profile.items():
+        if len(scenarios) < 2:
+            continue
+        smallest = min(scenarios, key=lambda s: s["size"])
+        largest = max(scenarios, key=lambda s: s["size"])
+        if not smallest["files_scanned"] or not largest["files_scanned"]:
+            continue
+
+        measurements = [("TOTAL", smallest["total"], largest["total"])]
+        measurements += [
+            (name, smallest["nodes"][name], metrics)
+            for name, metrics in largest["nodes"].items()
+            if name in smallest["nodes"]
+        ]
+        for name, small, large in measurements:
+            if large["wall_seconds"] < MIN_REGRESSION_SECONDS:
+                continue
+            small_per_file = max(small["wall_seconds"], MIN_REGRESSION_SECONDS) / smallest["files_scanned"]
+            large_per_file = large["wall_seconds"] / largest["files_scanned"]
+            if large_per_file > small_per_file * max_ratio:
+                superlinear.append({
+                    "profile": profile,
+                    "node": name,
+                    "sizes": [smallest["size"], largest["size"]],
+                    "ms_per_file": [round(small_per_file * 1000, 4), round(large_per_file * 1000, 4)],
+                    "ratio": round(large_per_file / small_per_file, 2)
+                })
+
+    return superlinear
+
+
+def run_benchmarks(profiles: List[str], sizes: List[int], iterations: int = 3, work_dir: Optional[str] = None,
+                   llm_latency: float = 0.0, seed: int = 42, verbose: bool = False) -> Dict[str, Any]:
+    """
+    Run the benchmark matrix
+
+    Returns:
+        Machine-readable results with one entry per (profile, size) scenario
+    """
+    work_dir = work_dir or os.path.join(tempfile.gettempdir(), "codegates_benchmark_repos")
+    scenarios = []
+
+    for profile in profiles:
+        for size in sizes:
+            name = f"{profile}-{size}"
+            print(f"🏗️ Preparing synthetic repository {name}...")
+            generate_start = time.perf_counter()
+            repo_path = ensure_repository(work_dir, profile, size, seed)
+            print(f"   Ready in {time.perf_counter() - generate_start:.1f}s: {repo_path}")
+
+            runs = []
+            for iteration in range(iterations):
+                run = run_flow_once(repo_path, llm_latency, verbose)
+                runs.append(run)
+                print(f"   ⏱️ Run {iteration + 1}/{iterations}: {run['total']['wall_seconds']:.2f}s wall, "
+                      f"{run['total']['cpu_seconds']:.2f}s CPU, {run['total']['peak_rss_mb']:.0f}MB peak RSS")
+
+            scenarios.append({"scenario": name, "profile": profile, "size": size, "iterations": iterations, **summarize_runs(runs)})
+
+    return {
+        "format_version": RESULTS_FORMAT_VERSION,
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        },
+        "settings": {"iterations": iterations, "llm_latency": llm_latency, "seed": seed},
+        "scenarios": scenarios
+    }
+
+
+def print_summary(results: Dict[str, Any]) -> None:
+    """Print a per-node table for each scenario"""
+    for scenario in results["scenarios"]:
+        print(f"\n📊 {scenario['scenario']} ({scenario['files_scanned']} files scanned, score {scenario['overall_score']:.1f}%)")
+        print(f"   {'Node':<24}{'Wall (s)':>10}{'CPU (s)':>10}{'Peak RSS (MB)':>15}")
+        for name, metrics in list(scenario["nodes"].items()) + [("TOTAL", scenario["total"])]:
+            print(f"   {name:<24}{metrics['wall_seconds']:>10.3f}{metrics['cpu_seconds']:>10.3f}{metrics['peak_rss_mb']:>15.1f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the CodeGates validation flow on synthetic repositories.")
+    parser.add_argument("--profiles", default="java-spring", help=f"Comma-separated profiles ({', '.join(PROFILES)})")
+    parser.add_argument("--sizes", default="1000", help="Comma-separated file counts, e.g. 1000,10000,100000")
+    parser.add_argument("--iterations", type=int, default=3, help="Runs per scenario (median is reported)")
+    parser.add_argument("--work-dir", default=None, help="Where generated repositories are kept for reuse")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Simulated LLM latency in seconds")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for synthetic file contents")
+    parser.add_argument("--output", "-o", default=None, help="Write results JSON to this file")
+    parser.add_argument("--baseline", default=None, help="Baseline results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown vs baseline")
+    parser.add_argument("--save-baseline", default=None, help="Also write the results to this baseline file")
+    parser.add_argument("--max-scaling", type=float, default=None,
+                        help="Fail if a node's time per file grows more than this factor from the smallest to the largest size")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Show flow output")
+    args = parser.parse_args(argv)
+
+    profiles = [p.strip() for p in args.profiles.split(",") if p.strip()]
+    unknown = [p for p in profiles if p not in PROFILES]
+    if unknown:
+        parser.error(f"Unknown profiles: {', '.join(unknown)}")
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    results = run_benchmarks(profiles, sizes, args.iterations, args.work_dir, args.llm_latency, args.seed, args.verbose)
+    print_summary(results)
+
+    for path in [args.output, args.save_baseline]:
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            Path(path).write_text(json.dumps(results, indent=2))
+            print(f"\n💾 Results written to {path}")
+
+    status = 0
+    if args.max_scaling:
+        superlinear = check_scaling(results, args.max_scaling)
+        if superlinear:
+            print(f"\n❌ {len(superlinear)} node(s) scale worse than {args.max_scaling:g}x time per file:")
+            for s in superlinear:
+                print(f"   {s['profile']} {s['node']}: {s['ms_per_file'][0]:.3f}ms/file at {s['sizes'][0]} files → "
+                      f"{s['ms_per_file'][1]:.3f}ms/file at {s['sizes'][1]} files ({s['ratio']}x)")
+            status = 1
+        else:
+            print(f"\n✅ Every node within {args.max_scaling:g}x time per file across sizes")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.tolerance * 100:.0f}% tolerance:")
+            for r in regressions:
+                print(f"   {r['scenario']} {r['node']}: {r['baseline_seconds']:.3f}s → {r['current_seconds']:.3f}s")
+            return 1
+        print(f"\n✅ No regressions beyond {args.tolerance * 100:.0f}% tolerance")
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
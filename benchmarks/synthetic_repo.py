@@ -0,0 +1,232 @@
+"""
+Synthetic Repository Generator
+Deterministic repositories of configurable size and language mix for benchmarking
+"""
+
+import json
+import random
+from pathlib import Path
+from typing import Dict, Any, List, Callable
+
+
+# Language mix per profile: (generator name, share of files)
+PROFILES = {
+    "java-spring": [("java", 0.80), ("java_test", 0.15), ("yaml", 0.03), ("xml", 0.02)],
+    "python": [("python", 0.75), ("python_test", 0.20), ("yaml", 0.03), ("config", 0.02)],
+    "ts-monorepo": [("typescript", 0.60), ("tsx", 0.15), ("ts_test", 0.20), ("json", 0.05)],
+    "mixed": [("java", 0.30), ("python", 0.25), ("typescript", 0.20), ("java_test", 0.10), ("python_test", 0.10), ("yaml", 0.05)]
+}
+
+# Files are spread over module directories, then over numbered parts of each module
+MODULE_COUNT = 50
+FILES_PER_DIRECTORY = 40
+
+JAVA_BLOCKS = [
+    '    private static final Logger logger = LoggerFactory.getLogger({cls}.class);\n',
+    '    public ResponseEntity<String> handle{n}(String id) {{\n        logger.info("Handling request {{}}", id);\n'
+    '        return ResponseEntity.ok(service.find(id));\n    }}\n',
+    '    @CircuitBreaker(name = "backend{n}", fallbackMethod = "fallback{n}")\n'
+    '    public String call{n}() {{\n        return restTemplate.getForObject(url, String.class);\n    }}\n',
+    '    @Retryable(maxAttempts = 3, backoff = @Backoff(delay = 500))\n    public void retry{n}() {{ client.send(); }}\n',
+    '    public int compute{n}(int a, int b) {{\n        int total = 0;\n        for (int i = 0; i < a; i++) {{ total += b * i; }}\n'
+    '        return total;\n    }}\n',
+    '    public void audit{n}(User user) {{\n        auditLogger.info("user={{}} action=update", user.getId());\n    }}\n',
+    '    public void fail{n}() {{\n        try {{ process(); }} catch (IOException e) {{ logger.error("Processing failed", e); }}\n    }}\n',
+    '    @RateLimiter(name = "api{n}")\n    @GetMapping("/api/v1/items/{n}")\n    public List<Item> list{n}() {{ return repository.findAll(); }}\n'
+]
+
+JAVA_TEST_BLOCKS = [
+    '    @Test\n    void shouldHandle{n}() {{\n        assertEquals(200, controller.handle{n}("id").getStatusCodeValue());\n    }}\n',
+    '    @Test\n    void shouldCompute{n}() {{\n        assertThat(service.compute{n}(2, 3)).isEqualTo(3);\n    }}\n',
+    '    @Mock\n    private Repository repository{n};\n'
+]
+
+PYTHON_BLOCKS = [
+    'logger = logging.getLogger(__name__)\n\n',
+    'def handle_{n}(request):\n    logger.info("handling request", extra={{"request_id": request.id}})\n    return service.find(request.id)\n\n',
+    '@retry(stop=stop_after_attempt(3), wait=wait_exponential())\ndef fetch_{n}(url):\n    return requests.get(url, timeout=10)\n\n',
+    'def compute_{n}(a, b):\n    total = 0\n    for i in range(a):\n        total += b * i\n    return total\n\n',
+    'def fail_{n}():\n    try:\n        process()\n    except ValueError as exc:\n        logger.error("processing failed: %s", exc)\n        raise\n\n',
+    'class Model{n}:\n    def __init__(self, name):\n        self.name = name\n\n    def __repr__(self):\n        return f"Model{n}({{self.name}})"\n\n'
+]
+
+PYTHON_TEST_BLOCKS = [
+    'def test_compute_{n}():\n    assert compute_{n}(2, 3) == 3\n\n',
+    '@pytest.mark.parametrize("value", [1, 2, 3])\ndef test_model_{n}(value):\n    assert Model{n}(str(value)).name == str(value)\n\n',
+    'def test_fetch_{n}(mocker):\n    mocker.patch("requests.get")\n    fetch_{n}("http://example")\n\n'
+]
+
+TS_BLOCKS = [
+    'export async function fetch{n}(url: string): Promise<Response> {{\n'
+    '  const controller = new AbortController();\n  setTimeout(() => controller.abort(), 5000);\n'
+    '  return fetch(url, {{ signal: controller.signal }});\n}}\n\n',
+    'export function compute{n}(a: number, b: number): number {{\n  let total = 0;\n'
+    '  for (let i = 0; i < a; i++) {{ total += b * i; }}\n  return total;\n}}\n\n',
+    'export class Service{n} {{\n  private readonly logger = new Logger("Service{n}");\n\n'
+    '  handle(id: string): void {{\n    this.logger.log(`handling ${{id}}`);\n  }}\n}}\n\n',
+    'export function fail{n}(): void {{\n  try {{\n    process();\n  }} catch (error) {{\n'
+    '    console.error("processing failed", error);\n    Sentry.captureException(error);\n  }}\n}}\n\n'
+]
+
+TSX_BLOCKS = [
+    'export const Panel{n} = ({{ title }}: {{ title: string }}) => (\n  <ErrorBoundary fallback={{<ErrorPage />}}>\n'
+    '    <div className="panel">{{title}}</div>\n  </ErrorBoundary>\n);\n\n',
+    'export function List{n}({{ items }}: {{ items: string[] }}) {{\n'
+    '  return <ul>{{items.map((item) => <li key={{item}}>{{item}}</li>)}}</ul>;\n}}\n\n'
+]
+
+TS_TEST_BLOCKS = [
+    'describe("compute{n}", () => {{\n  it("adds", () => {{\n    expect(compute{n}(2, 3)).toBe(3);\n  }});\n}});\n\n',
+    'test("fetch{n} aborts", async () => {{\n  await expect(fetch{n}("http://example")).rejects.toThrow();\n}});\n\n'
+]
+
+
+def _java(rng: random.Random, index: int) -> tuple:
+    cls = f"Service{index}"
+    body = "".join(rng.choice(JAVA_BLOCKS).format(cls=cls, n=rng.randint(0, 999)) for _ in range(rng.randint(3, 12)))
+    content = (f"package com.example.module{index % MODULE_COUNT};\n\nimport org.slf4j.Logger;\nimport org.slf4j.LoggerFactory;\n\n"
+               f"@Service\npublic class {cls} {{\n{body}}}\n")
+    return f"src/main/java/com/example/module{index % MODULE_COUNT}", f"{cls}.java", content
+
+
+def _java_test(rng: random.Random, index: int) -> tuple:
+    cls = f"Service{index}Test"
+    body = "".join(rng.choice(JAVA_TEST_BLOCKS).format(n=rng.randint(0, 999)) for _ in range(rng.randint(2, 6)))
+    content = f"package com.example;\n\nimport org.junit.jupiter.api.Test;\n\nclass {cls} {{\n{body}}}\n"
+    return f"src/test/java/com/example/module{index % MODULE_COUNT}", f"{cls}.java", content
+
+
+def _python(rng: random.Random, index: int) -> tuple:
+    body = "".join(rng.choice(PYTHON_BLOCKS).format(n=rng.randint(0, 999)) for _ in range(rng.randint(3, 12)))
+    content = f"import logging\nimport requests\nfrom tenacity import retry, stop_after_attempt, wait_exponential\n\n{body}"
+    return f"app/package{index % MODULE_COUNT}", f"module_{index}.py", content
+
+
+def _python_test(rng: random.Random, index: int) -> tuple:
+    body = "".join(rng.choice(PYTHON_TEST_BLOCKS).format(n=rng.randint(0, 999)) for _ in range(rng.randint(2, 6)))
+    return f"tests/package{index % MODULE_COUNT}", f"test_module_{index}.py", f"import pytest\n\n{body}"
+
+
+def _typescript(rng: random.Random, index: int) -> tuple:
+    body = "".join(rng.choice(TS_BLOCKS).format(n=rng.randint(0, 999)) for _ in range(rng.randint(3, 10)))
+    return f"packages/pkg{index % 25}/src", f"service{index}.ts", f"import {{ Logger }} from '@nestjs/common';\n\n{body}"
+
+
+def _tsx(rng: random.Random, index: int) -> tuple:
+    body = "".join(rng.choice(TSX_BLOCKS).format(n=rng.randint(0, 999)) for _ in range(rng.randint(2, 6)))
+    return f"packages/pkg{index % 25}/src/components", f"Component{index}.tsx", f"import React from 'react';\n\n{body}"
+
+
+def _ts_test(rng: random.Random, index: int) -> tuple:
+    body = "".join(rng.choice(TS_TEST_BLOCKS).format(n=rng.randint(0, 999)) for _ in range(rng.randint(2, 5)))
+    return f"packages/pkg{index % 25}/src/__tests__", f"service{index}.test.ts", body
+
+
+def _yaml(rng: random.Random, index: int) -> tuple:
+    content = (f"server:\n  port: {8000 + index % 100}\nlogging:\n  level:\n    root: INFO\n"
+               f"resilience4j:\n  circuitbreaker:\n    instances:\n      backend{index}:\n        failureRateThreshold: 50\n")
+    return f"config/env{index % 10}", f"application-{index}.yml", content
+
+
+def _xml(rng: random.Random, index: int) -> tuple:
+    content = ('<configuration>\n  <appender name="JSON" class="ch.qos.logback.core.ConsoleAppender">\n'
+               '    <encoder class="net.logstash.logback.encoder.LogstashEncoder"/>\n  </appender>\n</configuration>\n')
+    return f"src/main/resources/env{index % 10}", f"logback-{index}.xml", content
+
+
+def _config(rng: random.Random, index: int) -> tuple:
+    return f"config/env{index % 10}", f"settings_{index}.ini", f"[server]\nport = {8000 + index % 100}\ntimeout = 30\n"
+
+
+def _json(rng: random.Random, index: int) -> tuple:
+    content = json.dumps({"name": f"@example/pkg{index}", "version": "1.0.0", "dependencies": {"axios": "^1.6.0"}}, indent=2)
+    return f"packages/pkg{index % 25}/config", f"settings{index}.json", content + "\n"
+
+
+GENERATORS: Dict[str, Callable[[random.Random, int], tuple]] = {
+    "java": _java,
+    "java_test": _java_test,
+    "python": _python,
+    "python_test": _python_test,
+    "typescript": _typescript,
+    "tsx": _tsx,
+    "ts_test": _ts_test,
+    "yaml": _yaml,
+    "xml": _xml,
+    "config": _config,
+    "json": _json
+}
+
+BUILD_FILES = {
+    "java-spring": {"pom.xml": "<project>\n  <dependencies>\n    <dependency><artifactId>spring-boot-starter-web</artifactId></dependency>\n"
+                               "    <dependency><artifactId>resilience4j-spring-boot2</artifactId></dependency>\n  </dependencies>\n</project>\n"},
+    "python": {"requirements.txt": "requests==2.31.0\ntenacity==8.2.3\nstructlog==23.2.0\npytest==7.4.0\n"},
+    "ts-monorepo": {"package.json": json.dumps({"name": "monorepo", "private": True, "workspaces": ["packages/*"],
+                                                "devDependencies": {"jest": "^29.0.0", "typescript": "^5.0.0"}}, indent=2) + "\n"},
+    "mixed": {"pom.xml": "<project><dependencies><dependency><artifactId>slf4j-api</artifactId></dependency></dependencies></project>\n",
+              "requirements.txt": "requests==2.31.0\n"}
+}
+
+
+def generate_repository(target_dir: str, profile: str = "java-spring", file_count: int = 1000, seed: int = 42) -> Dict[str, Any]:
+    """
+    Generate a deterministic synthetic repository
+
+    The same profile, file_count and seed always produce identical files, so a
+    generated repository can be reused across benchmark runs.
+
+    Args:
+        target_dir: Directory to write the repository into
+        profile: Language mix (one of PROFILES)
+        file_count: Number of source, test and config files to generate
+        seed: Random seed for file contents
+
+    Returns:
+        Summary with file counts per generator and total bytes
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown profile '{profile}'. Available: {', '.join(sorted(PROFILES))}")
+
+    rng = random.Random(f"{profile}-{file_count}-{seed}")
+    root = Path(target_dir)
+    root.mkdir(parents=True, exist_ok=True)
+
+    kinds: List[str] = []
+    for kind, share in PROFILES[profile]:
+        kinds.extend([kind] * int(round(file_count * share)))
+    kinds = (kinds + [PROFILES[profile][0][0]] * file_count)[:file_count]
+    rng.shuffle(kinds)
+
+    counts: Dict[str, int] = {}
+    total_bytes = 0
+    for index, kind in enumerate(kinds):
+        directory, name, content = GENERATORS[kind](rng, index)
+        # Split modules into parts so directories stay around FILES_PER_DIRECTORY entries
+        path = root / directory / f"part{index // (MODULE_COUNT * FILES_PER_DIRECTORY)}" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+        counts[kind] = counts.get(kind, 0) + 1
+        total_bytes += len(content)
+
+    for name, content in BUILD_FILES[profile].items():
+        (root / name).write_text(content)
+        total_bytes += len(content)
+
+    summary = {
+        "profile": profile,
+        "file_count": file_count,
+        "seed": seed,
+        "files_by_kind": counts,
+        "total_bytes": total_bytes
+    }
+    (root / ".synthetic_repo.json").write_text(json.dumps(summary, indent=2))
+    return summary
+
+
+def ensure_repository(work_dir: str, profile: str, file_count: int, seed: int = 42) -> str:
+    """Get the path of a generated repository, generating it only if it does not exist yet"""
+    repo_dir = Path(work_dir) / f"{profile}-{file_count}-{seed}"
+    marker = repo_dir / ".synthetic_repo.json"
+    if not marker.exists():
+        generate_repository(str(repo_dir), profile, file_count, seed)
+    return str(repo_dir)
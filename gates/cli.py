@@ -5,8 +5,6 @@ CodeGates CLI - Command Line Interface
 
 import sys
 import os
-import uuid
-import tempfile
 import click
 from pathlib import Path
 from typing import Optional
@@ -14,9 +12,9 @@ from typing import Optional
 # Add current directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from flow import create_validation_flow
+# Commands import the flow, LLM clients and report code they need when they run,
+# so short commands (gates, view, --help) start without loading the scan machinery
 from utils.hard_gates import HARD_GATES
-from utils.llm_client import LLMProvider
 
 
 @click.group()
@@ -47,14 +45,39 @@ def main():
 @click.option('--llm-temperature', type=float, default=0.1, help='LLM temperature (default: 0.1)')
 @click.option('--llm-max-tokens', type=int, default=4000, help='LLM max tokens (default: 4000)')
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose output')
+@click.option('--quiet', is_flag=True, envvar='CODEGATES_QUIET', help='Only log warnings and errors (production mode)')
+@click.option('--log-format', type=click.Choice(['text', 'json']), envvar='CODEGATES_LOG_FORMAT', default='text',
+              help='Scan log output: emoji text or JSON lines (default: text)')
+@click.option('--profile', is_flag=True, help='Profile the scan and write pstats/flame graph files next to the reports')
+@click.option('--profile-mode', type=click.Choice(['cprofile', 'sampling']), default=None,
+              help='cprofile: pstats + sampled stacks; sampling: sampled stacks only, lower overhead (default: CODEGATES_PROFILE_MODE or cprofile)')
+@click.option('--report-detail', type=click.Choice(['summary', 'file', 'match']), default=None,
+              help='Matches in the JSON report: summary (none), file (per-file counts) or match (every match) (default: CODEGATES_REPORT_DETAIL or summary)')
+@click.option('--json-format', type=click.Choice(['compact', 'pretty', 'ndjson']), default=None,
+              help='JSON report layout (default: CODEGATES_REPORT_JSON_FORMAT or compact)')
+@click.option('--gzip', 'gzip_report', is_flag=True, help='Gzip the JSON report (also enabled by CODEGATES_REPORT_GZIP=true)')
+@click.option('--html-mode', type=click.Choice(['inline', 'lazy']), default=None,
+              help='inline: all gate details in the HTML; lazy: small page, details loaded from a sidecar on expand (default: CODEGATES_HTML_MODE or inline)')
+@click.option('--fast-verdict', is_flag=True, help='Stop scanning each gate once its score or status can no longer change (also enabled by CODEGATES_FAST_VERDICT=true)')
+@click.option('--file-selection', type=click.Choice(['top', 'sample']), default=None,
+              help='Gates with more files than max_files: scan the largest files (top) or a stratified random sample with confidence intervals (sample) (default: CODEGATES_FILE_SELECTION or top)')
+@click.option('--repository-source', type=click.Choice(['worktree', 'objects', 'local']), default=None,
+              help='Read files from a checked-out working tree (worktree), straight from the git objects of a clone without checkout (objects) or from a local directory in place (local; the default when REPOSITORY_URL is an existing path) (default: CODEGATES_REPOSITORY_SOURCE or worktree)')
+@click.option('--changed-file', 'changed_files', multiple=True,
+              help='Local scans: only scan this file (repeatable, e.g. the files staged for a commit)')
+@click.option('--tracked-only', is_flag=True,
+              help='Local scans: only scan files in the git index, ignoring untracked build output (also enabled by CODEGATES_LOCAL_TRACKED_ONLY=true)')
 def scan(repository_url: str, branch: str, token: Optional[str], threshold: int, 
          output: str, format: str, llm_provider: str, llm_model: Optional[str], 
          llm_url: Optional[str], llm_api_key: Optional[str], llm_temperature: float, 
-         llm_max_tokens: int, verbose: bool):
+         llm_max_tokens: int, verbose: bool, quiet: bool, log_format: str,
+         profile: bool, profile_mode: str, report_detail: Optional[str], json_format: Optional[str],
+         gzip_report: bool, html_mode: Optional[str], fast_verdict: bool, file_selection: Optional[str],
+         repository_source: Optional[str], changed_files: tuple, tracked_only: bool):
     """
     Scan a repository for hard gate compliance.
     
-    REPOSITORY_URL: Git repository URL (GitHub, GitLab, etc.)
+    REPOSITORY_URL: Git repository URL (GitHub, GitLab, etc.), or a local directory or file to scan in place
     
     Examples:
     
@@ -78,7 +101,36 @@ def scan(repository_url: str, branch: str, token: Optional[str], threshold: int,
         
         # Generate only HTML report
         codegates scan https://github.com/owner/repo --format html
+        
+        # Profile a slow scan (profile_<scan_id>.pstats / .collapsed.txt in the output directory)
+        codegates scan https://github.com/owner/repo --profile
+        
+        # Every match in a gzipped NDJSON report
+        codegates scan https://github.com/owner/repo --format json --report-detail match --json-format ndjson --gzip
+        
+        # HTML report that loads gate details on demand (large repositories)
+        codegates scan https://github.com/owner/repo --format html --html-mode lazy
+        
+        # CI gating: only the gate statuses are needed
+        codegates scan https://github.com/owner/repo --format json --fast-verdict
+        
+        # Monorepo: estimate gate scores from stratified file samples
+        codegates scan https://github.com/owner/monorepo --file-selection sample
+        
+        # Read the repository from git objects, without writing a working tree
+        codegates scan https://github.com/owner/repo --repository-source objects
+        
+        # Pre-commit: scan changed files of the current checkout in place
+        codegates scan . --changed-file src/main/App.java --changed-file pom.xml
     """
+    import uuid
+    import tempfile
+    from flow import create_validation_flow
+    from utils.profiler import profile_scan
+    
+    # A path on disk is scanned where it is instead of being cloned
+    if repository_source is None and os.path.exists(repository_url):
+        repository_source = "local"
     
     if verbose:
         click.echo("🚀 CodeGates - Hard Gate Validation System")
@@ -105,7 +157,21 @@ def scan(repository_url: str, branch: str, token: Optional[str], threshold: int,
             "scan_id": str(uuid.uuid4()),
             "output_dir": output,
             "report_format": format,
-            "verbose": verbose
+            "verbose": verbose,
+            "quiet": quiet,
+            "log_format": log_format,
+            "log_level": "debug" if verbose else None,
+            "profile": profile,
+            "profile_mode": profile_mode,
+            "report_detail": report_detail,
+            "report_json_format": json_format,
+            "report_gzip": gzip_report or None,
+            "html_mode": html_mode,
+            "fast_verdict": fast_verdict or None,
+            "file_selection": file_selection,
+            "repository_source": repository_source,
+            "changed_files": list(changed_files) or None,
+            "tracked_only": tracked_only or None
         },
         "llm_config": {
             "provider": llm_provider,
@@ -149,7 +215,8 @@ def scan(repository_url: str, branch: str, token: Optional[str], threshold: int,
         with click.progressbar(length=100, label='Validating repository') as bar:
             # Mock progress updates - in real implementation, nodes would update this
             validation_flow = create_validation_flow()
-            validation_flow.run(shared)
+            with profile_scan(shared):
+                validation_flow.run(shared)
             bar.update(100)
         
         # Display results
@@ -184,9 +251,15 @@ def scan(repository_url: str, branch: str, token: Optional[str], threshold: int,
                 click.echo(f"⚠️  Warning Gates: {warnings}/{total}")
             click.echo(f"❌ Failed Gates: {failed}/{total}")
             
-            # Threshold check
-            if overall_score >= threshold:
+            # Threshold check; gates stopped by fast verdict leave a range, only a certain pass succeeds
+            score_low, score_high = shared["validation"].get("overall_score_bounds", [overall_score, overall_score])
+            if score_high > score_low:
+                click.echo(f"⏩ Fast verdict: overall score between {score_low:.1f}% and {score_high:.1f}%")
+            if score_low >= threshold:
                 click.echo(f"🎉 SUCCESS: Score {overall_score:.1f}% meets threshold {threshold}%")
+            elif score_high >= threshold:
+                click.echo(f"💥 FAILURE: Fast verdict cannot confirm threshold {threshold}% (score {score_low:.1f}-{score_high:.1f}%), rerun without --fast-verdict")
+                sys.exit(1)
             else:
                 click.echo(f"💥 FAILURE: Score {overall_score:.1f}% below threshold {threshold}%")
                 sys.exit(1)
@@ -196,6 +269,8 @@ def scan(repository_url: str, branch: str, token: Optional[str], threshold: int,
                 click.echo(f"📄 HTML Report: {shared['reports']['html_path']}")
             if shared["reports"]["json_path"]:
                 click.echo(f"📄 JSON Report: {shared['reports']['json_path']}")
+            for kind, path in shared["reports"].get("profile", {}).items():
+                click.echo(f"🔬 Profile ({kind}): {path}")
                 
             # Show top failed gates if verbose
             if verbose and failed > 0:
@@ -223,6 +298,161 @@ def scan(repository_url: str, branch: str, token: Optional[str], threshold: int,
         sys.exit(1)
 
 
+@main.command()
+@click.argument('repositories', nargs=-1)
+@click.option('--file', '-i', 'repository_file', type=click.Path(exists=True, dir_okay=False),
+              help='File with one repository per line ("URL" or "URL BRANCH", # for comments)')
+@click.option('--org', 'org_url', help='GitHub organization or user URL; all its repositories are scanned')
+@click.option('--branch', '-b', default=None,
+              help='Branch for repositories that do not name one (default: main, or each repository\'s default branch with --org)')
+@click.option('--token', '-t', envvar='GITHUB_TOKEN', help='GitHub token (optional, from env GITHUB_TOKEN)')
+@click.option('--threshold', '-q', default=70, type=int, help='Quality threshold (default: 70)')
+@click.option('--output', '-o', default='./reports', help='Output directory for reports (default: ./reports)')
+@click.option('--format', '-f', type=click.Choice(['html', 'json', 'both']), default='both',
+              help='Per-repository report format (default: both)')
+@click.option('--llm-url', envvar='LLM_URL', help='LLM service URL (from env LLM_URL)')
+@click.option('--llm-api-key', envvar='LLM_API_KEY', help='LLM API key (from env LLM_API_KEY)')
+@click.option('--clone-workers', type=int, default=None, help='Repositories cloned at once (default: CODEGATES_BATCH_CLONE_WORKERS or 4)')
+@click.option('--scan-workers', type=int, default=None, help='Repositories scanned at once (default: CODEGATES_BATCH_SCAN_WORKERS or 2)')
+@click.option('--llm-workers', type=int, default=None, help='Concurrent LLM calls (default: CODEGATES_BATCH_LLM_WORKERS or 4)')
+@click.option('--include-forks', is_flag=True, help='Include forks when scanning an organization')
+@click.option('--include-archived', is_flag=True, help='Include archived repositories when scanning an organization')
+@click.option('--limit', type=int, default=None, help='Scan at most this many repositories')
+@click.option('--verbose', '-v', is_flag=True, help='Show the full log output of every scan')
+@click.option('--log-format', type=click.Choice(['text', 'json']), envvar='CODEGATES_LOG_FORMAT', default='text',
+              help='Log output format: text or json lines (default: text)')
+def batch(repositories: tuple, repository_file: Optional[str], org_url: Optional[str], branch: Optional[str],
+          token: Optional[str], threshold: int, output: str, format: str, llm_url: Optional[str],
+          llm_api_key: Optional[str], clone_workers: Optional[int], scan_workers: Optional[int],
+          llm_workers: Optional[int], include_forks: bool, include_archived: bool, limit: Optional[int],
+          verbose: bool, log_format: str):
+    """
+    Scan many repositories and write one aggregate report.
+
+    REPOSITORIES: Git repository URLs (optional with --file or --org)
+
+    Examples:
+
+        # Scan every repository of an organization
+        codegates batch --org https://github.com/my-org
+
+        # Scan a list of repositories, four clones and two scans at a time
+        codegates batch --file repos.txt --clone-workers 4 --scan-workers 2
+    """
+    from flow import create_validation_flow
+    from utils.batch_runner import run_batch, resolve_batch_targets, read_repository_file
+    from utils.scan_logger import ScanLogger
+
+    targets = list(repositories)
+    if repository_file:
+        targets += read_repository_file(repository_file)
+    if not targets and not org_url:
+        click.echo("❌ Give repository URLs, --file or --org")
+        sys.exit(1)
+
+    try:
+        targets = resolve_batch_targets(targets, org_url=org_url, branch=branch, github_token=token,
+                                        include_forks=include_forks, include_archived=include_archived, limit=limit)
+    except Exception as e:
+        click.echo(f"❌ Could not list repositories: {str(e)}")
+        sys.exit(1)
+
+    if not targets:
+        click.echo("❌ No repositories to scan")
+        sys.exit(1)
+
+    # Scans run in parallel; without --verbose only their warnings and errors are shown
+    request_options = {
+        "github_token": token,
+        "threshold": threshold,
+        "report_format": format,
+        "verbose": verbose,
+        "quiet": not verbose,
+        "log_format": log_format,
+        "log_level": "debug" if verbose else None
+    }
+    llm_config = {"url": llm_url, "api_key": llm_api_key}
+    limits = {"clone": clone_workers, "scan": scan_workers, "llm": llm_workers}
+
+    report = run_batch(targets, create_validation_flow, request_options=request_options, llm_config=llm_config,
+                       output_dir=output, limits=limits, logger=ScanLogger(log_format=log_format))
+    summary = report["summary"]
+
+    click.echo("\n" + "=" * 60)
+    click.echo("🎯 BATCH COMPLETE")
+    click.echo("=" * 60)
+    click.echo(f"📦 Repositories: {summary['repositories']} ({report['duration_seconds']:.1f}s)")
+    click.echo(f"📊 Average Score: {summary['average_score']:.1f}%")
+    click.echo(f"✅ Meet threshold {threshold}%: {summary['meets_threshold']}/{summary['repositories']}")
+    click.echo(f"❌ Below threshold: {summary['below_threshold']}")
+    if summary["failed"]:
+        click.echo(f"💥 Failed scans: {summary['failed']}")
+        for row in report["repositories"]:
+            if row["status"] != "completed":
+                click.echo(f"   - {row['repository_url']}@{row['branch']}: {'; '.join(row['errors'][-1:])}")
+
+    click.echo(f"📄 Batch JSON Report: {report['report_paths']['json']}")
+    click.echo(f"📄 Batch CSV Report: {report['report_paths']['csv']}")
+
+    if summary["failed"] or summary["below_threshold"]:
+        sys.exit(1)
+
+
+@main.command()
+@click.option('--socket', 'socket_path', default=None,
+              help='Serve on this unix socket instead of stdin/stdout')
+@click.option('--output', '-o', default='./reports', help='Output directory for reports (default: ./reports)')
+@click.option('--token', '-t', envvar='GITHUB_TOKEN', help='GitHub token for repository URL scans (from env GITHUB_TOKEN)')
+@click.option('--llm-url', envvar='LLM_URL', help='LLM service URL (from env LLM_URL)')
+@click.option('--llm-api-key', envvar='LLM_API_KEY', help='LLM API key (from env LLM_API_KEY)')
+@click.option('--file-cache-mb', type=float, default=None,
+              help='Memory for file contents kept between scans (default: CODEGATES_DAEMON_FILE_CACHE_MB or 256)')
+@click.option('--verbose', '-v', is_flag=True, help='Log every scan in full (to stderr on stdio)')
+def daemon(socket_path: Optional[str], output: str, token: Optional[str], llm_url: Optional[str],
+           llm_api_key: Optional[str], file_cache_mb: Optional[float], verbose: bool):
+    """
+    Serve scans to an editor over JSON-RPC 2.0.
+
+    Reads one JSON request per line and writes one response per line, with
+    "progress" and "log" notifications while a scan runs. The process stays up
+    between scans, so the LLM client, compiled patterns and unchanged files are
+    reused instead of starting a new process per scan.
+
+    Examples:
+
+        # Serve on stdin/stdout (how the VS Code extension runs it)
+        codegates daemon
+
+        # Serve on a unix socket
+        codegates daemon --socket /tmp/codegates.sock
+    """
+    from flow import create_validation_flow
+    from utils.scan_daemon import ScanDaemon, serve_stdio, serve_unix_socket
+
+    request_options = {
+        "github_token": token,
+        "verbose": verbose,
+        "quiet": not verbose,
+        "log_level": "debug" if verbose else None
+    }
+    llm_config = {"url": llm_url, "api_key": llm_api_key}
+    file_cache_bytes = int(file_cache_mb * 1024 * 1024) if file_cache_mb is not None else None
+    scan_daemon = ScanDaemon(create_validation_flow, request_options=request_options, llm_config=llm_config,
+                             output_dir=output, file_cache_bytes=file_cache_bytes)
+
+    try:
+        if socket_path:
+            click.echo(f"🛰️ CodeGates daemon listening on {socket_path}", err=True)
+            serve_unix_socket(scan_daemon, socket_path)
+        else:
+            serve_stdio(scan_daemon)
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        click.echo(f"❌ Daemon failed: {str(e)}", err=True)
+        sys.exit(1)
+
+
 @main.command()
 @click.argument('report_path')
 def view(report_path: str):
@@ -242,12 +472,12 @@ def view(report_path: str):
         import webbrowser
         webbrowser.open(f"file://{report_file.absolute()}")
         click.echo(f"📄 Opened HTML report in browser: {report_path}")
-    elif report_file.suffix.lower() == '.json':
+    elif report_file.name.lower().endswith(('.json', '.json.gz', '.ndjson', '.ndjson.gz')):
         # Display JSON report summary
         import json
+        from utils.report_writer import read_json_report
         try:
-            with open(report_file, 'r') as f:
-                data = json.load(f)
+            data = read_json_report(str(report_file))
             
             click.echo(f"📊 Report Summary: {report_path}")
             click.echo(f"   Overall Score: {data.get('summary', {}).get('overall_score', 'N/A')}")
@@ -283,7 +513,7 @@ def gates():
 def test_llm(llm_provider: Optional[str], verbose: bool):
     """Test LLM integration and availability."""
     
-    from utils.llm_client import create_llm_client_from_env, LLMClient, LLMConfig, _create_config_for_provider
+    from utils.llm_client import create_llm_client_from_env, LLMClient, LLMConfig, LLMProvider, _create_config_for_provider
     
     click.echo("🧪 Testing LLM Integration")
     click.echo("=" * 30)
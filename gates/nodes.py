@@ -6,43 +6,94 @@ All nodes for the hard gate validation workflow
 import os
 import json
 import re
+import time
+import zlib
+from html import escape
 from pathlib import Path
 from typing import Dict, Any, List, Optional
-from pocketflow import Node 
 from datetime import datetime
 
 # Import utilities
 try:
     # Try relative imports first (when run as module)
     from .utils.git_operations import clone_repository, cleanup_repository
+    from .utils.git_object_source import GitObjectSource, get_repository_source_mode
+    from .utils.local_source import LocalFileSource, resolve_local_target, tracked_only_enabled
     from .utils.file_scanner import scan_directory
     from .utils.hard_gates import HARD_GATES
     from .utils.llm_client import create_llm_client_from_env, LLMClient, LLMConfig, LLMProvider
-    from .utils.static_patterns import get_static_patterns_for_gate, get_pattern_statistics
+    from .utils.static_patterns import get_static_patterns_for_gate, get_pattern_statistics, get_static_pattern_registry
+    from .utils.content_cache import FileContentCache, get_scan_content_cache
+    from .utils.dependency_extractor import Dependency, extract_dependencies, manifest_type, get_dependency_cache
+    from .utils.relevance_index import FileRelevanceIndex
+    from .utils.pattern_safety import PatternSafetyGuard
+    from .utils.trigram_index import TrigramIndex, get_scan_trigram_index
+    from .utils.instrumentation import InstrumentedNode, get_scan_metrics
+    from .utils.batch_runner import get_batch_cache
+    from .utils.report_index import report_index_enabled, write_report_index
+    from .utils.match_table import MatchTable, as_match_table, MATCH_RETENTION_POLICIES
+    from .utils.early_termination import GateVerdictTracker
+    from .utils.file_sampling import StratifiedFileSample, stratified_order, FILE_SELECTION_MODES
+    from .utils.report_writer import (
+        StringTables, get_report_options, get_report_filename, encode_gate_matches, write_json_report,
+        write_html_details, FILE_COLUMNS, MATCH_COLUMNS
+    )
 except ImportError:
     # Fall back to absolute imports (when run directly)
     from utils.git_operations import clone_repository, cleanup_repository
+    from utils.git_object_source import GitObjectSource, get_repository_source_mode
+    from utils.local_source import LocalFileSource, resolve_local_target, tracked_only_enabled
     from utils.file_scanner import scan_directory
     from utils.hard_gates import HARD_GATES
     from utils.llm_client import create_llm_client_from_env, LLMClient, LLMConfig, LLMProvider
-    from utils.static_patterns import get_static_patterns_for_gate, get_pattern_statistics
+    from utils.static_patterns import get_static_patterns_for_gate, get_pattern_statistics, get_static_pattern_registry
+    from utils.content_cache import FileContentCache, get_scan_content_cache
+    from utils.dependency_extractor import Dependency, extract_dependencies, manifest_type, get_dependency_cache
+    from utils.relevance_index import FileRelevanceIndex
+    from utils.pattern_safety import PatternSafetyGuard
+    from utils.trigram_index import TrigramIndex, get_scan_trigram_index
+    from utils.instrumentation import InstrumentedNode, get_scan_metrics
+    from utils.batch_runner import get_batch_cache
+    from utils.report_index import report_index_enabled, write_report_index
+    from utils.match_table import MatchTable, as_match_table, MATCH_RETENTION_POLICIES
+    from utils.early_termination import GateVerdictTracker
+    from utils.file_sampling import StratifiedFileSample, stratified_order, FILE_SELECTION_MODES
+    from utils.report_writer import (
+        StringTables, get_report_options, get_report_filename, encode_gate_matches, write_json_report,
+        write_html_details, FILE_COLUMNS, MATCH_COLUMNS
+    )
 
 
-class FetchRepositoryNode(Node):
+class FetchRepositoryNode(InstrumentedNode):
     """Node to fetch/clone repository"""
     
+    stage = "clone"
+    
     def prep(self, shared: Dict[str, Any]) -> Dict[str, Any]:
         """Prepare repository fetch parameters"""
         return {
             "repository_url": shared["request"]["repository_url"],
             "branch": shared["request"]["branch"],
             "github_token": shared["request"].get("github_token"),
-            "temp_dir": shared["temp_dir"]
+            "temp_dir": shared["temp_dir"],
+            "source_mode": get_repository_source_mode(shared["request"]),
+            "changed_files": shared["request"].get("changed_files"),
+            "tracked_only": tracked_only_enabled(shared["request"]),
+            # Set by the scan daemon: file contents kept warm across its scans
+            "file_cache": shared.get("local_file_cache")
         }
     
-    def exec(self, params: Dict[str, Any]) -> str:
-        """Clone the repository"""
-        print(f"🔄 Fetching repository: {params['repository_url']}")
+    def exec(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Clone the repository (or open a local directory in place)"""
+        if params["source_mode"] == "local":
+            # Nothing to clone: read the workspace where it is, CleanupNode leaves it alone
+            repo_path, changed_files = resolve_local_target(params["repository_url"], params["changed_files"])
+            source = LocalFileSource(repo_path, changed_files=changed_files, tracked_only=params["tracked_only"],
+                                     file_cache=params["file_cache"])
+            self.log.info(f"📂 Using local {source.description}: {repo_path} (branch ignored)")
+            return {"repo_path": repo_path, "source": source}
+        
+        self.log.info(f"🔄 Fetching repository: {params['repository_url']}")
         
         # Create a more robust target directory
         temp_dir = params["temp_dir"]
@@ -54,7 +105,7 @@ class FetchRepositoryNode(Node):
         # Ensure the target directory path is valid
         try:
             os.makedirs(target_dir, exist_ok=True)
-            print(f"📁 Target directory created: {target_dir}")
+            self.log.info(f"📁 Target directory created: {target_dir}")
         except Exception as e:
             raise Exception(f"Failed to create target directory {target_dir}: {e}")
         
@@ -62,108 +113,148 @@ class FetchRepositoryNode(Node):
             repo_url=params["repository_url"],
             branch=params["branch"],
             github_token=params["github_token"],
-            target_dir=target_dir
+            target_dir=target_dir,
+            # Object scans read blobs from the clone's object database, no working tree is written
+            checkout=params["source_mode"] == "worktree"
         )
         
-        return repo_path
+        source = GitObjectSource(repo_path) if params["source_mode"] == "objects" else None
+        return {"repo_path": repo_path, "source": source}
     
-    def post(self, shared: Dict[str, Any], prep_res: Dict[str, Any], exec_res: str) -> str:
-        """Store repository path in shared store"""
-        shared["repository"]["local_path"] = exec_res
-        print(f"✅ Repository fetched to: {exec_res}")
+    def post(self, shared: Dict[str, Any], prep_res: Dict[str, Any], exec_res: Dict[str, Any]) -> str:
+        """Store repository path and source in shared store"""
+        repo_path = exec_res["repo_path"]
+        shared["repository"]["local_path"] = repo_path
+        shared["repository"]["source_mode"] = prep_res["source_mode"]
+        if exec_res["source"] is not None:
+            shared["repository"]["source"] = exec_res["source"]
+        if prep_res["source_mode"] == "local":
+            self.log.info(f"✅ Scanning local directory in place: {repo_path}")
+        elif prep_res["source_mode"] == "objects":
+            self.log.info(f"✅ Repository objects fetched to: {repo_path} (no checkout)")
+        else:
+            self.log.info(f"✅ Repository fetched to: {repo_path}")
         return "default"
 
 
-class ProcessCodebaseNode(Node):
+class ProcessCodebaseNode(InstrumentedNode):
     """Node to process codebase and extract metadata"""
     
-    def prep(self, shared: Dict[str, Any]) -> str:
-        """Get repository path"""
+    stage = "scan"
+    
+    def prep(self, shared: Dict[str, Any]) -> Dict[str, Any]:
+        """Get repository path and git object source"""
         repo_path = shared["repository"]["local_path"]
         if not repo_path or not os.path.exists(repo_path):
             raise ValueError("Repository path not found or invalid")
-        return repo_path
+        return {"repo_path": repo_path, "source": shared["repository"].get("source")}
     
-    def exec(self, repo_path: str) -> Dict[str, Any]:
+    def exec(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Scan repository and extract metadata"""
-        print(f"📊 Processing codebase: {repo_path}")
+        repo_path = params["repo_path"]
+        self.log.info(f"📊 Processing codebase: {repo_path}")
         
-        metadata = scan_directory(repo_path, max_files=5000)
+        metadata = scan_directory(repo_path, max_files=5000, logger=self.log, source=params["source"])
+        
+        # The scanner reads every file it lists to count lines
+        self.add_metric("files_touched", metadata.get("total_files", 0))
+        self.add_metric("bytes_read", metadata.get("total_size", 0))
         
         return metadata
     
-    def post(self, shared: Dict[str, Any], prep_res: str, exec_res: Dict[str, Any]) -> str:
+    def post(self, shared: Dict[str, Any], prep_res: Dict[str, Any], exec_res: Dict[str, Any]) -> str:
         """Store metadata in shared store"""
         shared["repository"]["metadata"] = exec_res
-        print(f"✅ Processed {exec_res['total_files']} files, {exec_res['total_lines']} lines")
+        self.log.info(f"✅ Processed {exec_res['total_files']} files, {exec_res['total_lines']} lines")
         return "default"
 
 
-class ExtractConfigNode(Node):
+class ExtractConfigNode(InstrumentedNode):
     """Node to extract configuration and build file contents"""
     
+    stage = "scan"
+    
+    # Characters of each build and config file kept for the prompt
+    CONTENT_HEAD_CHARS = 2000
+    
     def prep(self, shared: Dict[str, Any]) -> Dict[str, Any]:
         """Prepare config extraction parameters"""
+        metadata = shared["repository"]["metadata"]
+        build_files = metadata.get("build_files", [])
         return {
             "repo_path": shared["repository"]["local_path"],
-            "build_files": shared["repository"]["metadata"].get("build_files", []),
-            "config_files": shared["repository"]["metadata"].get("config_files", [])
+            "build_files": build_files,
+            "config_files": metadata.get("config_files", []),
+            # Lockfiles and project files only contribute dependencies, not prompt content
+            "manifest_files": [f["relative_path"] for f in metadata.get("file_list", [])
+                               if manifest_type(f["name"]) and f["relative_path"] not in build_files],
+            "content_cache": get_scan_content_cache(shared)
         }
     
     def exec(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Extract config and build file contents"""
-        print("🔧 Extracting configuration and build files...")
+        self.log.info("🔧 Extracting configuration and build files...")
         
-        repo_path = Path(params["repo_path"])
+        # An empty cache is falsy (it has a length), so test for None
+        content_cache = params.get("content_cache")
+        if content_cache is None:
+            content_cache = FileContentCache(params["repo_path"])
         config_data = {
             "build_files": {},
             "config_files": {},
             "dependencies": []
         }
+        packages = []
         
-        # Extract build file contents
+        # Extract build file contents (only the head is read, whatever the file size)
         for build_file in params["build_files"]:
-            file_path = repo_path / build_file
-            if file_path.exists():
+            if build_file in content_cache or content_cache.exists(build_file):
                 try:
-                    content = file_path.read_text(encoding='utf-8', errors='ignore')
                     config_data["build_files"][build_file] = {
-                        "content": content[:2000],  # Limit content size
-                        "size": len(content),
+                        "content": content_cache.read_head(build_file, self.CONTENT_HEAD_CHARS),
+                        "size": content_cache.file_size(build_file),
                         "type": self._get_build_file_type(build_file)
                     }
                     
                     # Extract dependencies
-                    deps = self._extract_dependencies(build_file, content)
-                    config_data["dependencies"].extend(deps)
+                    packages.extend(self._extract_dependencies(build_file, content_cache))
                     
                 except Exception as e:
-                    print(f"⚠️ Error reading build file {build_file}: {e}")
+                    self.log.warning(f"⚠️ Error reading build file {build_file}: {e}")
+        
+        # Dependencies of lockfiles and project files
+        for manifest_file in params.get("manifest_files", []):
+            try:
+                packages.extend(self._extract_dependencies(manifest_file, content_cache))
+            except Exception as e:
+                self.log.warning(f"⚠️ Error reading manifest {manifest_file}: {e}")
         
         # Extract config file contents
         for config_file in params["config_files"]:
-            file_path = repo_path / config_file
-            if file_path.exists():
+            if config_file in content_cache or content_cache.exists(config_file):
                 try:
-                    content = file_path.read_text(encoding='utf-8', errors='ignore')
                     config_data["config_files"][config_file] = {
-                        "content": content[:2000],  # Limit content size
-                        "size": len(content),
+                        "content": content_cache.read_head(config_file, self.CONTENT_HEAD_CHARS),
+                        "size": content_cache.file_size(config_file),
                         "type": self._get_config_file_type(config_file)
                     }
                 except Exception as e:
-                    print(f"⚠️ Error reading config file {config_file}: {e}")
+                    self.log.warning(f"⚠️ Error reading config file {config_file}: {e}")
         
-        # Remove duplicates from dependencies
-        config_data["dependencies"] = list(set(config_data["dependencies"]))
+        # Remove duplicates in a stable order: declared dependencies first, so the prompt's
+        # first entries are the project's own stack rather than transitive lockfile entries
+        declared = [package.name for package in packages if package.kind != "locked"]
+        locked = [package.name for package in packages if package.kind == "locked"]
+        config_data["dependencies"] = list(dict.fromkeys(declared + locked))
         
         return config_data
     
     def post(self, shared: Dict[str, Any], prep_res: Dict[str, Any], exec_res: Dict[str, Any]) -> str:
         """Store config data in shared store"""
         shared["config"] = exec_res
-        print(f"✅ Extracted {len(exec_res['build_files'])} build files, {len(exec_res['config_files'])} config files")
-        print(f"   Found {len(exec_res['dependencies'])} dependencies")
+        shared.setdefault("scan_stats", {})["dependency_cache"] = get_dependency_cache().get_stats()
+        self.log.info(f"✅ Extracted {len(exec_res['build_files'])} build files, {len(exec_res['config_files'])} config files")
+        self.log.info(f"   Found {len(exec_res['dependencies'])} dependencies")
         return "default"
     
     def _get_build_file_type(self, filename: str) -> str:
@@ -192,43 +283,21 @@ class ExtractConfigNode(Node):
             return "environment"
         return "general"
     
-    def _extract_dependencies(self, filename: str, content: str) -> List[str]:
-        """Extract dependencies from build file content"""
-        dependencies = []
-        
+    def _extract_dependencies(self, relative_path: str, content_cache: FileContentCache) -> List[Dependency]:
+        """Packages a manifest or lockfile depends on (streamed, cached per content hash)"""
         try:
-            if filename == "package.json":
-                data = json.loads(content)
-                deps = data.get("dependencies", {})
-                dev_deps = data.get("devDependencies", {})
-                dependencies.extend(list(deps.keys()))
-                dependencies.extend(list(dev_deps.keys()))
-            
-            elif filename == "requirements.txt":
-                for line in content.split('\n'):
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        # Extract package name (before version specifiers)
-                        package = re.split(r'[>=<~!]', line)[0].strip()
-                        if package:
-                            dependencies.append(package)
-            
-            elif filename == "pom.xml":
-                # Simple regex to extract Maven dependencies
-                import re
-                artifact_pattern = r'<artifactId>([^<]+)</artifactId>'
-                matches = re.findall(artifact_pattern, content)
-                dependencies.extend(matches)
-        
-        except Exception as e:
-            print(f"⚠️ Error extracting dependencies from {filename}: {e}")
-        
-        return dependencies
+            dependencies = extract_dependencies(lambda: content_cache.open_binary(relative_path), relative_path)
+        except OSError as e:
+            self.log.warning(f"⚠️ Error extracting dependencies from {relative_path}: {e}")
+            return []
+        return [dependency for dependency in dependencies if dependency.is_package]
 
 
-class GeneratePromptNode(Node):
+class GeneratePromptNode(InstrumentedNode):
     """Node to generate comprehensive LLM prompt"""
     
+    stage = "scan"
+    
     def prep(self, shared: Dict[str, Any]) -> Dict[str, Any]:
         """Prepare prompt generation data"""
         return {
@@ -240,7 +309,7 @@ class GeneratePromptNode(Node):
     
     def exec(self, data: Dict[str, Any]) -> str:
         """Generate comprehensive LLM prompt"""
-        print("📋 Generating LLM prompt...")
+        self.log.info("📋 Generating LLM prompt...")
         
         # Build comprehensive prompt similar to processor.py
         prompt_parts = []
@@ -556,7 +625,7 @@ class GeneratePromptNode(Node):
         shared["llm"]["prompt"] = exec_res
         
         # Log the final prompt
-        print(f"✅ Generated LLM prompt ({len(exec_res)} characters)")
+        self.log.info(f"✅ Generated LLM prompt ({len(exec_res)} characters)")
         
         # Save prompt to log file for debugging
         try:
@@ -588,28 +657,31 @@ class GeneratePromptNode(Node):
                 f.write("END OF PROMPT\n")
                 f.write("=" * 80 + "\n")
             
-            print(f"📝 Prompt logged to: {prompt_log_file}")
+            self.log.info(f"📝 Prompt logged to: {prompt_log_file}")
             
         except Exception as e:
-            print(f"⚠️ Failed to log prompt: {e}")
+            self.log.warning(f"⚠️ Failed to log prompt: {e}")
         
         return "default"
 
 
-class CallLLMNode(Node):
+class CallLLMNode(InstrumentedNode):
     """Node to call LLM for pattern generation using comprehensive LLM client"""
     
+    stage = "llm"
+    
     def prep(self, shared: Dict[str, Any]) -> Dict[str, Any]:
         """Prepare LLM call parameters"""
         return {
             "prompt": shared["llm"]["prompt"],
             "llm_config": shared.get("llm_config", {}),
-            "request": shared["request"]
+            "request": shared["request"],
+            "batch_cache": get_batch_cache(shared)
         }
     
     def exec(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Call LLM to generate patterns using the comprehensive LLM client"""
-        print("🤖 Calling LLM for pattern generation...")
+        self.log.info("🤖 Calling LLM for pattern generation...")
         
         # Set a timeout for the entire LLM operation
         import signal
@@ -617,10 +689,14 @@ class CallLLMNode(Node):
         
         # Timeout configuration
         LLM_TIMEOUT = int(os.getenv("CODEGATES_LLM_TIMEOUT", "500"))  # 2 minutes default
-        print(f"   ⏱️ LLM timeout set to {LLM_TIMEOUT} seconds")
+        self.log.info(f"   ⏱️ LLM timeout set to {LLM_TIMEOUT} seconds")
         
-        # Try to create LLM client from environment first
-        llm_client = create_llm_client_from_env()
+        # Try to create LLM client from environment first (once per batch in batch scans)
+        batch_cache = params.get("batch_cache")
+        if batch_cache is not None:
+            llm_client = batch_cache.get_llm_client(create_llm_client_from_env)
+        else:
+            llm_client = create_llm_client_from_env()
         
         # If no client from env, try to create from shared config
         if not llm_client:
@@ -650,14 +726,14 @@ class CallLLMNode(Node):
                     llm_client = LLMClient(config)
                     
                 except Exception as e:
-                    print(f"⚠️ Failed to create LLM client from config: {e}")
+                    self.log.warning(f"⚠️ Failed to create LLM client from config: {e}")
                     llm_client = None
         
         # If we have a working LLM client, use it with timeout protection
         if llm_client and llm_client.is_available():
             try:
-                print(f"🔗 Using {llm_client.config.provider.value} LLM provider")
-                print(f"   Model: {llm_client.config.model}")
+                self.log.info(f"🔗 Using {llm_client.config.provider.value} LLM provider")
+                self.log.info(f"   Model: {llm_client.config.model}")
                 
                 # Use threading with timeout to prevent hanging
                 result = {"success": False, "response": "", "error": ""}
@@ -679,7 +755,7 @@ class CallLLMNode(Node):
                 llm_thread.join(timeout=LLM_TIMEOUT)
                 
                 if llm_thread.is_alive():
-                    print(f"⚠️ LLM call timed out after {LLM_TIMEOUT} seconds, using fallback")
+                    self.log.warning(f"⚠️ LLM call timed out after {LLM_TIMEOUT} seconds, using fallback")
                     result["error"] = f"LLM call timed out after {LLM_TIMEOUT} seconds"
                 
                 if result["success"]:
@@ -694,17 +770,17 @@ class CallLLMNode(Node):
                         "response": result["response"][:10000] + "..." if len(result["response"]) > 10000 else result["response"]
                     }
                 else:
-                    print(f"⚠️ LLM call failed: {result['error']}")
+                    self.log.warning(f"⚠️ LLM call failed: {result['error']}")
                     # Fall back to pattern generation
                     pass
                 
             except Exception as e:
-                print(f"⚠️ LLM call failed: {e}")
+                self.log.warning(f"⚠️ LLM call failed: {e}")
                 # Fall back to pattern generation
                 pass
         
         # Fallback to pattern generation
-        print("🔄 LLM not available or failed, using fallback pattern generation")
+        self.log.info("🔄 LLM not available or failed, using fallback pattern generation")
         pattern_data = self._generate_fallback_pattern_data()
         
         return {
@@ -729,8 +805,8 @@ class CallLLMNode(Node):
         shared["llm"]["patterns"] = patterns
         
         pattern_count = sum(len(gate_data.get("patterns", [])) for gate_data in exec_res["pattern_data"].values())
-        print(f"✅ Generated {pattern_count} patterns for {len(exec_res['pattern_data'])} gates")
-        print(f"   Source: {exec_res['source']} ({exec_res['model']})")
+        self.log.info(f"✅ Generated {pattern_count} patterns for {len(exec_res['pattern_data'])} gates")
+        self.log.info(f"   Source: {exec_res['source']} ({exec_res['model']})")
         
         # Log the LLM response using environment-based paths
         try:
@@ -770,10 +846,10 @@ class CallLLMNode(Node):
                 f.write("END OF RESPONSE\n")
                 f.write("=" * 80 + "\n")
             
-            print(f"📝 LLM response logged to: {response_log_file}")
+            self.log.info(f"📝 LLM response logged to: {response_log_file}")
             
         except Exception as e:
-            print(f"⚠️ Failed to log LLM response: {e}")
+            self.log.warning(f"⚠️ Failed to log LLM response: {e}")
         
         return "default"
     
@@ -792,7 +868,7 @@ class CallLLMNode(Node):
             return self._extract_patterns_from_text(response)
             
         except Exception as e:
-            print(f"   ⚠️ Error parsing LLM response: {e}")
+            self.log.warning(f"   ⚠️ Error parsing LLM response: {e}")
             return self._generate_fallback_pattern_data()
     
     def _validate_and_enhance_json_data(self, data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
@@ -924,16 +1000,16 @@ class CallLLMNode(Node):
                 re.compile(pattern)
                 cleaned_patterns.append(pattern)
             except re.error as e:
-                print(f"⚠️ Invalid regex pattern skipped: {pattern} - {e}")
+                self.log.warning(f"⚠️ Invalid regex pattern skipped: {pattern} - {e}")
                 # Try to fix common issues
                 fixed_pattern = self._fix_regex_pattern(pattern)
                 if fixed_pattern:
                     try:
                         re.compile(fixed_pattern)
                         cleaned_patterns.append(fixed_pattern)
-                        print(f"✅ Fixed pattern: {pattern} → {fixed_pattern}")
+                        self.log.info(f"✅ Fixed pattern: {pattern} → {fixed_pattern}")
                     except re.error:
-                        print(f"⚠️ Could not fix pattern: {pattern}")
+                        self.log.warning(f"⚠️ Could not fix pattern: {pattern}")
         
         return cleaned_patterns
     
@@ -1157,8 +1233,8 @@ class CallLLMNode(Node):
             return validated_patterns
             
         except Exception as e:
-            print(f"⚠️ Failed to parse LLM response: {e}")
-            print(f"Response preview: {response[:200]}...")
+            self.log.warning(f"⚠️ Failed to parse LLM response: {e}")
+            self.log.warning(f"Response preview: {response[:200]}...")
             # Return fallback patterns
             return self._generate_fallback_patterns()
     
@@ -1203,9 +1279,17 @@ class CallLLMNode(Node):
         return patterns
 
 
-class ValidateGatesNode(Node):
+class ValidateGatesNode(InstrumentedNode):
     """Node to validate all gates using generated patterns (Map-Reduce)"""
     
+    stage = "scan"
+    
+    # Languages typically used for business logic and application code
+    PRIMARY_LANGUAGES = {
+        "Java", "Python", "JavaScript", "TypeScript", "C#", "C++", "C", 
+        "Go", "Rust", "Kotlin", "Scala", "Swift", "PHP", "Ruby"
+    }
+    
     def prep(self, shared: Dict[str, Any]) -> Dict[str, Any]:
         """Prepare validation parameters"""
         return {
@@ -1215,12 +1299,15 @@ class ValidateGatesNode(Node):
             "pattern_data": shared["llm"].get("pattern_data", {}),
             "hard_gates": shared["hard_gates"],
             "threshold": shared["request"]["threshold"],
-            "shared": shared  # Pass shared context for configuration
+            "shared": shared,  # Pass shared context for configuration
+            "batch_cache": get_batch_cache(shared),
+            # Keep each gate's matches for per-file/per-match JSON detail and the report index
+            "retain_matches": get_report_options(shared["request"])["detail"] != "summary" or report_index_enabled()
         }
     
     def exec(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Validate all gates against the codebase using hybrid pattern validation"""
-        print("🎯 Validating gates against codebase with hybrid pattern validation...")
+        self.log.info("🎯 Validating gates against codebase with hybrid pattern validation...")
         
         repo_path = Path(params["repo_path"])
         llm_patterns = params["patterns"]
@@ -1229,28 +1316,49 @@ class ValidateGatesNode(Node):
         
         # Get pattern matching configuration
         config = self._get_pattern_matching_config(params.get("shared", {}))
-        print(f"   📋 Pattern matching config: max_files={config['max_files']}, max_size={config['max_file_size_mb']}MB, lang_threshold={config['language_threshold_percent']}%")
+        self.log.info(f"   📋 Pattern matching config: max_files={config['max_files']}, max_size={config['max_file_size_mb']}MB, lang_threshold={config['language_threshold_percent']}%")
         
         # Get primary technologies for static pattern selection
         primary_technologies = self._get_primary_technologies(metadata)
         
+        # Share decoded file contents across all gates and pattern sources
+        content_cache = get_scan_content_cache(params.get("shared", {}))
+        
+        # Filter and sort the file list once per scan instead of once per gate and source
+        relevance_index = self._build_relevance_index(metadata)
+        
+        # Trigram index over matchable files so each regex only runs on files containing its literals;
+        # sample mode indexes only the files it scans, so scan time stays bounded by the sample
+        trigram_index = get_scan_trigram_index(params.get("shared", {}), self._get_indexable_files(metadata, config), content_cache,
+                                               lazy=config["file_selection"] == "sample")
+        
+        # Batch scans share pattern screening results across repositories
+        batch_cache = params.get("batch_cache")
+        screen_cache = batch_cache.pattern_screens if batch_cache is not None else None
+        # Static patterns are compiled once per process by the registry
+        static_screen_cache = get_static_pattern_registry().screen_cache
+        
+        # Stratified sample order per relevant file list, shared by gates with the same files
+        sample_orders = {}
+        
         gate_results = []
         
         # Validate each gate (Map phase)
         for gate in params["hard_gates"]:
+            gate_start = time.perf_counter()
             gate_name = gate["name"]
             llm_gate_patterns = llm_patterns.get(gate_name, [])
             gate_pattern_info = pattern_data.get(gate_name, {})
             
-            print(f"   Validating {gate_name} with hybrid patterns...")
+            self.log.debug(f"   Validating {gate_name} with hybrid patterns...")
             
             # Show file analysis summary
             if gate_name == "AUTOMATED_TESTS":
-                relevant_files = self._get_improved_relevant_files(metadata, file_type="Test Code", gate_name=gate_name, config=config)
+                relevant_files = self._get_improved_relevant_files(metadata, file_type="Test Code", gate_name=gate_name, config=config, relevance_index=relevance_index)
             else:
-                relevant_files = self._get_improved_relevant_files(metadata, file_type="Source Code", gate_name=gate_name, config=config)
+                relevant_files = self._get_improved_relevant_files(metadata, file_type="Source Code", gate_name=gate_name, config=config, relevance_index=relevance_index)
             
-            print(f"   📁 Analyzing {len(relevant_files)} relevant files for {gate_name} (from {metadata.get('total_files', 0)} total files in repository)")
+            self.log.debug(f"   📁 Analyzing {len(relevant_files)} relevant files for {gate_name} (from {metadata.get('total_files', 0)} total files in repository)")
             
             # Check if gate is not applicable
             is_not_applicable = (
@@ -1286,25 +1394,12 @@ class ValidateGatesNode(Node):
                         "combined_confidence": "high"
                     }
                 }
-                print(f"   {gate_name} marked as NOT_APPLICABLE")
+                self.log.info(f"   {gate_name} marked as NOT_APPLICABLE", "gate_not_applicable", gate=gate_name)
             else:
                 # Get static patterns for this gate and technology stack
                 static_gate_patterns = get_static_patterns_for_gate(gate_name, primary_technologies)
                 
-                # Hybrid validation: LLM patterns + Static patterns (with improved matching)
-                llm_matches = self._find_pattern_matches_with_config(repo_path, llm_gate_patterns, metadata, gate, config, "LLM")
-                static_matches = self._find_pattern_matches_with_config(repo_path, static_gate_patterns, metadata, gate, config, "Static")
-                
-                # Combine matches and remove duplicates based on file and line
-                all_matches = llm_matches + static_matches
-                unique_matches = self._deduplicate_matches(all_matches)
-                
-                # Calculate relevant file count for this gate type
-                if gate_name == "AUTOMATED_TESTS":
-                    relevant_files = self._get_improved_relevant_files(metadata, file_type="Test Code", gate_name=gate_name, config=config)
-                else:
-                    relevant_files = self._get_improved_relevant_files(metadata, file_type="Source Code", gate_name=gate_name, config=config)
-                
+                # Relevant file count for this gate type (the files selected above)
                 relevant_file_count = len(relevant_files)
                 
                 # Prepare gate with expected coverage for scoring
@@ -1319,14 +1414,77 @@ class ValidateGatesNode(Node):
                     "relevant_files": relevant_file_count
                 }
                 
-                # Calculate score based on gate type and combined matches
-                score = self._calculate_gate_score(gate_with_coverage, unique_matches, metadata)
+                # Sample mode: gates with more relevant files than max_files scan a growing
+                # stratified random sample instead of the largest files
+                file_sample = None
+                if config["file_selection"] == "sample" and relevant_file_count > config["max_files"]:
+                    order = sample_orders.get(id(relevant_files))
+                    if order is None:
+                        order = sample_orders[id(relevant_files)] = stratified_order(relevant_files)
+                    file_sample = StratifiedFileSample(order, config["sample_confidence"])
+                
+                # Fast verdict: both passes stop once more matches cannot change the score or status
+                verdict_tracker = None
+                if config["fast_verdict"] and file_sample is None:
+                    verdict_tracker = GateVerdictTracker(
+                        lambda *counts, scored_gate=gate_with_coverage: self._score_bounds(scored_gate, metadata, *counts),
+                        lambda score, status_gate=gate: self._determine_status(score, status_gate)
+                    )
+                
+                # Hybrid validation: LLM patterns + Static patterns (with improved matching)
+                llm_diagnostics = {}
+                static_diagnostics = {}
+                sample_estimate = None
+                if file_sample is not None:
+                    pattern_sets = [("LLM", llm_gate_patterns, screen_cache, llm_diagnostics), ("Static", static_gate_patterns, static_screen_cache, static_diagnostics)]
+                    scan_options = {"content_cache": content_cache, "relevance_index": relevance_index, "trigram_index": trigram_index}
+                    matches_by_source, seconds_by_source, sample_estimate = self._scan_file_sample(file_sample, repo_path, gate, gate_with_coverage, metadata, config, pattern_sets, scan_options)
+                    llm_matches, static_matches = matches_by_source["LLM"], matches_by_source["Static"]
+                    llm_seconds, static_seconds = seconds_by_source["LLM"], seconds_by_source["Static"]
+                else:
+                    llm_start = time.perf_counter()
+                    llm_matches = self._find_pattern_matches_with_config(repo_path, llm_gate_patterns, metadata, gate, config, "LLM", content_cache=content_cache, relevance_index=relevance_index, diagnostics=llm_diagnostics, trigram_index=trigram_index, screen_cache=screen_cache, verdict_tracker=verdict_tracker)
+                    static_start = time.perf_counter()
+                    if verdict_tracker is not None and verdict_tracker.reason is not None:
+                        # Settled by the LLM pass: static patterns cannot change the outcome
+                        static_matches = MatchTable()
+                    else:
+                        static_matches = self._find_pattern_matches_with_config(repo_path, static_gate_patterns, metadata, gate, config, "Static", content_cache=content_cache, relevance_index=relevance_index, diagnostics=static_diagnostics, trigram_index=trigram_index, screen_cache=static_screen_cache, verdict_tracker=verdict_tracker)
+                    llm_seconds = static_start - llm_start
+                    static_seconds = time.perf_counter() - static_start
+                
+                # Combine matches and remove duplicates based on file and line
+                unique_matches = self._deduplicate_matches(llm_matches, static_matches)
+                
+                # Scan coverage of both pattern passes (partial if either timed out or failed)
+                scan_coverage = self._merge_scan_coverage(llm_diagnostics, static_diagnostics)
+                
+                if scan_coverage["partial"] and sample_estimate is None:
+                    # Score a partial scan against the files actually scanned so the
+                    # score reflects what was seen instead of collapsing on unscanned files
+                    gate_with_coverage = self._scale_gate_for_partial_scan(gate_with_coverage, scan_coverage)
+                    self.log.warning(f"   ⚠️ {gate_name}: partial score based on {scan_coverage['files_scanned']}/{scan_coverage['files_eligible']} files ({scan_coverage['coverage_percentage']:.1f}% coverage)", "gate_partial_score", gate=gate_name)
+                
+                # Calculate score based on gate type and combined matches (extrapolated to all files when sampled)
+                if sample_estimate is not None:
+                    score = sample_estimate["score"]
+                else:
+                    score = self._calculate_gate_score(gate_with_coverage, unique_matches, metadata)
                 
                 # Determine combined confidence
                 combined_confidence = self._calculate_combined_confidence(
                     len(llm_matches), len(static_matches), len(unique_matches)
                 )
                 
+                # Exact counters of the full match set; only a bounded sample of matches is kept
+                match_counts = unique_matches.get_counts()
+                retained_matches = None
+                if params.get("retain_matches"):
+                    retained_matches = unique_matches.retain(
+                        config["match_retention"], config["max_retained_matches"], config["retained_matches_per_file"],
+                        seed=zlib.crc32(gate_name.encode("utf-8"))
+                    )
+                
                 gate_result = {
                     "gate": gate_name,
                     "display_name": gate["display_name"],
@@ -1335,8 +1493,12 @@ class ValidateGatesNode(Node):
                     "priority": gate["priority"],
                     "patterns_used": len(llm_gate_patterns) + len(static_gate_patterns),
                     "matches_found": len(unique_matches),
+                    "match_counts": {**match_counts, "retained": len(retained_matches) if retained_matches is not None else 0},
                     "score": score,
                     "status": self._determine_status(score, gate),
+                    "partial": scan_coverage["partial"],
+                    "early_terminated": scan_coverage["early_terminated"],
+                    "scan_coverage": scan_coverage,
                     "details": self._generate_gate_details(gate_with_coverage, unique_matches),
                     "recommendations": self._generate_gate_recommendations(gate_with_coverage, unique_matches, score),
                     # Add LLM-generated pattern information
@@ -1349,6 +1511,13 @@ class ValidateGatesNode(Node):
                     }),
                     "total_files": metadata.get("total_files", 1),
                     "relevant_files": relevant_file_count,
+                    # Rejected, rewritten and slow patterns from the regex safety guard
+                    "pattern_safety": self._merge_pattern_safety(llm_diagnostics, static_diagnostics),
+                    # Sample match references used for report evidence snippets
+                    "sample_matches": [
+                        {"file": m["file"], "line": m["line"], "match": m["match"][:200]}
+                        for m in unique_matches[:3]
+                    ],
                     # Enhanced validation tracking
                     "validation_sources": {
                         "llm_patterns": {
@@ -1363,15 +1532,65 @@ class ValidateGatesNode(Node):
                         },
                         "combined_confidence": combined_confidence,
                         "unique_matches": len(unique_matches),
+                        "unique_matches_by_source": match_counts["by_source"],
                         "overlap_matches": len(llm_matches) + len(static_matches) - len(unique_matches)
                     }
                 }
                 
+                # Match records only when the JSON report detail or the report index needs them
+                if retained_matches is not None:
+                    gate_result["matches"] = retained_matches
+                    if retained_matches.sampled:
+                        self.log.debug(f"   🎯 {gate_name}: retained {len(retained_matches)} of {len(unique_matches)} matches ({config['match_retention']})")
+                
+                # Fast verdict stops: the score is exact when saturated, otherwise only the status is
+                if verdict_tracker is not None and verdict_tracker.reason is not None:
+                    gate_result["early_termination"] = {
+                        "reason": verdict_tracker.reason,
+                        "source": verdict_tracker.source,
+                        "files_scanned": scan_coverage["files_scanned"],
+                        "files_eligible": scan_coverage["files_eligible"],
+                        "score_bounds": list(verdict_tracker.bounds)
+                    }
+                    self.log.info(f"   ⏩ {gate_name}: {verdict_tracker.reason.replace('_', ' ')} after {scan_coverage['files_scanned']}/{scan_coverage['files_eligible']} files ({verdict_tracker.source} pass), score range {verdict_tracker.bounds[0]:.1f}-{verdict_tracker.bounds[1]:.1f}%", "gate_early_terminated", gate=gate_name, reason=verdict_tracker.reason)
+                
+                # Sampled gates: estimate and confidence interval over all relevant files
+                if sample_estimate is not None:
+                    gate_result["sampling"] = sample_estimate
+                    confidence = round(sample_estimate["confidence"] * 100)
+                    files_low, files_high = sample_estimate["files_with_matches_interval"]
+                    score_low, score_high = sample_estimate["score_interval"]
+                    gate_result["details"].append(
+                        f"Estimated from a stratified sample of {sample_estimate['files_sampled']}/{sample_estimate['population']} files: "
+                        f"~{sample_estimate['files_with_matches']:.0f} files with matches ({confidence}% CI {files_low:.0f}-{files_high:.0f}), "
+                        f"score {score_low:.1f}-{score_high:.1f}%"
+                    )
+                    self.log.info(f"   🎲 {gate_name}: sampled {sample_estimate['files_sampled']}/{sample_estimate['population']} files in {sample_estimate['rounds']} rounds, score {score:.1f}% ({confidence}% CI {score_low:.1f}-{score_high:.1f}%){'' if sample_estimate['settled'] else ', status not settled at max_files'}", "gate_sampled", gate=gate_name, files_sampled=sample_estimate["files_sampled"])
+                
+                gate_result["timing"] = {
+                    "llm_seconds": round(llm_seconds, 6),
+                    "static_seconds": round(static_seconds, 6),
+                    "files_scanned": scan_coverage["files_scanned"]
+                }
+                self.add_metric("matches_emitted", len(unique_matches))
+                
                 # Log validation details
-                print(f"   {gate_name}: LLM({len(llm_gate_patterns)} patterns, {len(llm_matches)} matches) + Static({len(static_gate_patterns)} patterns, {len(static_matches)} matches) = {len(unique_matches)} unique matches")
+                self.log.info(f"   {gate_name}: LLM({len(llm_gate_patterns)} patterns, {len(llm_matches)} matches) + Static({len(static_gate_patterns)} patterns, {len(static_matches)} matches) = {len(unique_matches)} unique matches", "gate_validated", gate=gate_name, matches=len(unique_matches))
             
+            gate_result.setdefault("timing", {"llm_seconds": 0.0, "static_seconds": 0.0, "files_scanned": 0})
+            gate_result["timing"]["seconds"] = round(time.perf_counter() - gate_start, 6)
             gate_results.append(gate_result)
         
+        # Record how often gate file selection was served from the index
+        index_stats = relevance_index.get_stats()
+        params.get("shared", {}).setdefault("scan_stats", {})["relevance_index"] = index_stats
+        self.log.info(f"   🗂️ Relevance index: {index_stats['subsets']} file subsets built, {index_stats['hits']} lookups served from index")
+        
+        # Record how much regex work the trigram pre-screen avoided
+        trigram_stats = trigram_index.get_stats()
+        params.get("shared", {}).setdefault("scan_stats", {})["trigram_index"] = trigram_stats
+        self.log.info(f"   🔎 Trigram pre-screen: skipped {trigram_stats['regex_runs_skipped']}/{trigram_stats['pattern_file_pairs']} pattern-file regex runs ({trigram_stats['skip_ratio'] * 100:.1f}%)")
+        
         return gate_results
     
     def post(self, shared: Dict[str, Any], prep_res: Dict[str, Any], exec_res: List[Dict[str, Any]]) -> str:
@@ -1389,6 +1608,13 @@ class ValidateGatesNode(Node):
         
         shared["validation"]["overall_score"] = overall_score
         
+        # Range of the overall score: fast verdict gates may stop before reaching their full score
+        gate_bounds = [r["early_termination"]["score_bounds"] if r.get("early_termination") else [r["score"], r["score"]] for r in applicable_gates]
+        shared["validation"]["overall_score_bounds"] = [
+            sum(b[0] for b in gate_bounds) / len(gate_bounds) if gate_bounds else 0.0,
+            sum(b[1] for b in gate_bounds) / len(gate_bounds) if gate_bounds else 0.0
+        ]
+        
         # Count status distribution
         passed = len([r for r in exec_res if r["status"] == "PASS"])
         failed = len([r for r in exec_res if r["status"] == "FAIL"])
@@ -1399,13 +1625,110 @@ class ValidateGatesNode(Node):
         hybrid_stats = self._calculate_hybrid_validation_stats(exec_res)
         shared["validation"]["hybrid_stats"] = hybrid_stats
         
-        print(f"✅ Hybrid validation complete: {overall_score:.1f}% overall (based on {len(applicable_gates)} applicable gates)")
-        print(f"   Passed: {passed}, Failed: {failed}, Warnings: {warnings}, Not Applicable: {not_applicable}")
-        print(f"   Pattern Sources: LLM({hybrid_stats['total_llm_patterns']} patterns, {hybrid_stats['total_llm_matches']} matches) + Static({hybrid_stats['total_static_patterns']} patterns, {hybrid_stats['total_static_matches']} matches)")
-        print(f"   Coverage Enhancement: {hybrid_stats['coverage_improvement']:.1f}% improvement from hybrid validation")
+        # Summarize regex safety guard activity across gates
+        safety_totals = {
+            key: sum(len(r.get("pattern_safety", {}).get(key, [])) for r in exec_res)
+            for key in ["rejected", "rewritten", "slow"]
+        }
+        shared.setdefault("scan_stats", {})["pattern_safety"] = safety_totals
+        
+        # Per-gate timings for the scan metrics
+        get_scan_metrics(shared)["gates"] = {
+            r["gate"]: {
+                "seconds": r["timing"]["seconds"],
+                "llm_seconds": r["timing"]["llm_seconds"],
+                "static_seconds": r["timing"]["static_seconds"],
+                "files_scanned": r["timing"]["files_scanned"],
+                "matches": r.get("matches_found", 0)
+            }
+            for r in exec_res if "timing" in r
+        }
+        
+        # Gates scored from a partial scan after a timeout or failure
+        partially_scanned_gates = [r["gate"] for r in exec_res if r.get("partial")]
+        shared["validation"]["partially_scanned_gates"] = partially_scanned_gates
+        
+        # Gates whose scan stopped early in fast verdict mode
+        early_terminated_gates = [r["gate"] for r in exec_res if r.get("early_terminated")]
+        shared["validation"]["early_terminated_gates"] = early_terminated_gates
+        
+        # Gates scored from a stratified file sample
+        sampled_gates = [r["gate"] for r in exec_res if r.get("sampling")]
+        shared["validation"]["sampled_gates"] = sampled_gates
+        
+        self.log.info(f"✅ Hybrid validation complete: {overall_score:.1f}% overall (based on {len(applicable_gates)} applicable gates)")
+        self.log.info(f"   Passed: {passed}, Failed: {failed}, Warnings: {warnings}, Not Applicable: {not_applicable}")
+        self.log.info(f"   Pattern Sources: LLM({hybrid_stats['total_llm_patterns']} patterns, {hybrid_stats['total_llm_matches']} matches) + Static({hybrid_stats['total_static_patterns']} patterns, {hybrid_stats['total_static_matches']} matches)")
+        self.log.info(f"   Coverage Enhancement: {hybrid_stats['coverage_improvement']:.1f}% improvement from hybrid validation")
+        if partially_scanned_gates:
+            self.log.warning(f"   ⚠️ Partial scores (timed out or failed before scanning all files): {', '.join(partially_scanned_gates)}")
+        if early_terminated_gates:
+            self.log.info(f"   ⏩ Fast verdict: {len(early_terminated_gates)} gates stopped scanning early: {', '.join(early_terminated_gates)}")
+        if sampled_gates:
+            unsettled = [r["gate"] for r in exec_res if r.get("sampling") and not r["sampling"]["settled"]]
+            self.log.info(f"   🎲 Sampled: {len(sampled_gates)} gates scored from stratified file samples" + (f" (status not settled: {', '.join(unsettled)})" if unsettled else ""))
+        if any(safety_totals.values()):
+            self.log.info(f"   Pattern Safety: {safety_totals['rejected']} rejected, {safety_totals['rewritten']} rewritten, {safety_totals['slow']} stopped for exceeding time budget")
         
         return "default"
     
+    def _get_indexable_files(self, metadata: Dict[str, Any], config: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Get the text files pattern matching can read (source and test code within the size limit)"""
+        max_file_size = config["max_file_size_mb"] * 1024 * 1024
+        return [
+            f for f in metadata.get("file_list", [])
+            if f["type"] in ("Source Code", "Test Code") and not f["is_binary"] and f.get("size", 0) <= max_file_size
+        ]
+    
+    def _merge_scan_coverage(self, llm_diagnostics: Dict[str, Any], static_diagnostics: Dict[str, Any]) -> Dict[str, Any]:
+        """Combine file coverage from the LLM and static pattern passes"""
+        sources = {
+            "llm": llm_diagnostics.get("coverage", {}),
+            "static": static_diagnostics.get("coverage", {})
+        }
+        files_eligible = max((c.get("files_eligible", 0) for c in sources.values()), default=0)
+        # Matches are the union of both passes, so the better-covered pass bounds the files seen
+        files_scanned = max((c.get("files_accounted", 0) for c in sources.values()), default=0)
+        partial = any(c.get("partial", False) for c in sources.values())
+        # A fast verdict stop leaves files unscanned without making the score partial
+        early_terminated = any(c.get("early_terminated", False) for c in sources.values())
+        incomplete = partial or early_terminated
+        
+        return {
+            "files_eligible": files_eligible,
+            "files_scanned": files_scanned if incomplete else files_eligible,
+            "coverage_percentage": round(files_scanned / files_eligible * 100, 1) if incomplete and files_eligible else 100.0,
+            "partial": partial,
+            "early_terminated": early_terminated,
+            "sources": sources
+        }
+    
+    def _scale_gate_for_partial_scan(self, gate: Dict[str, Any], scan_coverage: Dict[str, Any]) -> Dict[str, Any]:
+        """Scale file-count expectations of a gate to the fraction of files actually scanned"""
+        files_eligible = scan_coverage["files_eligible"]
+        if not files_eligible:
+            return gate
+        
+        scanned_fraction = max(scan_coverage["files_scanned"], 1) / files_eligible
+        expected_coverage = dict(gate.get("expected_coverage", {}))
+        if "max_files_expected" in expected_coverage:
+            expected_coverage["max_files_expected"] = max(1, int(round(expected_coverage["max_files_expected"] * scanned_fraction)))
+        
+        return {
+            **gate,
+            "expected_coverage": expected_coverage,
+            "relevant_files": max(1, int(round(gate.get("relevant_files", files_eligible) * scanned_fraction)))
+        }
+    
+    def _merge_pattern_safety(self, llm_diagnostics: Dict[str, Any], static_diagnostics: Dict[str, Any]) -> Dict[str, Any]:
+        """Combine pattern safety reports from the LLM and static pattern passes"""
+        merged = {"rejected": [], "rewritten": [], "slow": []}
+        for source, diagnostics in [("LLM", llm_diagnostics), ("Static", static_diagnostics)]:
+            report = diagnostics.get("pattern_safety", {})
+            for key in merged:
+                merged[key].extend({**entry, "source": source} for entry in report.get(key, []))
+        return merged
+    
     def _calculate_hybrid_validation_stats(self, gate_results: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Calculate statistics for hybrid validation"""
         stats = {
@@ -1446,38 +1769,50 @@ class ValidateGatesNode(Node):
         
         return stats
     
-    def _find_pattern_matches_with_config(self, repo_path: Path, patterns: List[str], metadata: Dict[str, Any], gate: Dict[str, Any], config: Dict[str, Any], source: str = "LLM") -> List[Dict[str, Any]]:
+    def _find_pattern_matches_with_config(self, repo_path: Path, patterns: List[str], metadata: Dict[str, Any], gate: Dict[str, Any], config: Dict[str, Any], source: str = "LLM", content_cache: Optional[FileContentCache] = None, relevance_index: Optional[FileRelevanceIndex] = None, diagnostics: Optional[Dict[str, Any]] = None, trigram_index: Optional[TrigramIndex] = None, screen_cache: Optional[Dict[tuple, tuple]] = None, verdict_tracker: Optional[GateVerdictTracker] = None, target_files: Optional[List[Dict[str, Any]]] = None) -> MatchTable:
         """Find pattern matches in appropriate files with improved coverage and error handling"""
-        matches = []
+        # Matches are stored column-wise with interned file, pattern and text strings
+        match_table = MatchTable()
+        # File contents come from the scan-scoped cache so each file is read from disk once
+        if content_cache is None:
+            content_cache = FileContentCache(str(repo_path))
         # Add timeout protection for file processing
         import time
         import threading
         # Timeout configuration for file processing
         FILE_PROCESSING_TIMEOUT = int(os.getenv("CODEGATES_FILE_PROCESSING_TIMEOUT", "300"))  # 5 minutes default
-        print(f"   ⏱️ File processing timeout set to {FILE_PROCESSING_TIMEOUT} seconds")
+        FILE_PROCESSING_GRACE = 5  # Seconds to wait for the worker to reach a file boundary after the deadline
+        log = self.log
+        log.debug(f"   ⏱️ File processing timeout set to {FILE_PROCESSING_TIMEOUT} seconds")
         # Filter files based on gate type with improved logic
         gate_name = gate.get("name", "")
-        if gate_name == "AUTOMATED_TESTS":
+        if target_files is not None:
+            # Files chosen by the caller (a round of a sampled scan)
+            log.debug(f"   Looking at {len(target_files)} sampled files for {gate_name}")
+        elif gate_name == "AUTOMATED_TESTS":
             # For automated tests gate, look at test files across all languages
-            target_files = self._get_improved_relevant_files(metadata, file_type="Test Code", gate_name=gate_name, config=config)
-            print(f"   Looking at {len(target_files)} relevant test files for {gate_name}")
+            target_files = self._get_improved_relevant_files(metadata, file_type="Test Code", gate_name=gate_name, config=config, relevance_index=relevance_index)
+            log.debug(f"   Looking at {len(target_files)} relevant test files for {gate_name}")
         else:
             # For all other gates, look at source code files with more inclusive filtering
-            target_files = self._get_improved_relevant_files(metadata, file_type="Source Code", gate_name=gate_name, config=config)
-            print(f"   Looking at {len(target_files)} relevant source code files for {gate_name}")
-        # Pre-compile patterns for efficiency (fix pattern recompilation issue)
-        compiled_patterns = []
-        invalid_patterns = []
-        for pattern in patterns:
-            try:
-                compiled_pattern = re.compile(pattern, re.IGNORECASE | re.MULTILINE)
-                compiled_patterns.append((pattern, compiled_pattern))
-            except re.error as e:
-                invalid_patterns.append((pattern, str(e)))
-                print(f"   ⚠️ Invalid regex pattern skipped: {pattern} - {e}")
+            target_files = self._get_improved_relevant_files(metadata, file_type="Source Code", gate_name=gate_name, config=config, relevance_index=relevance_index)
+            log.debug(f"   Looking at {len(target_files)} relevant source code files for {gate_name}")
+        # Pre-compile patterns for efficiency; LLM patterns are also screened for
+        # catastrophic backtracking and every pattern runs under a time budget
+        pattern_guard = PatternSafetyGuard(time_budget=config.get("pattern_time_budget_seconds"), logger=log, screen_cache=screen_cache)
+        compiled_patterns = pattern_guard.screen(patterns, re.IGNORECASE | re.MULTILINE, analyze=(source == "LLM"))
+        # Candidate files per pattern from its required literals (None = no pre-screen possible)
+        candidate_masks = {}
+        if trigram_index is not None:
+            if trigram_index.lazy:
+                trigram_index.add_files(self._get_indexable_files({"file_list": target_files[:config["max_files"]]}, config), content_cache)
+            candidate_masks = {pattern: trigram_index.candidates(compiled_pattern.pattern) for pattern, compiled_pattern in compiled_patterns}
         # Report pattern compilation results
-        if invalid_patterns:
-            print(f"   ⚠️ Skipped {len(invalid_patterns)} invalid patterns out of {len(patterns)} total")
+        if pattern_guard.rejected:
+            log.warning(f"   ⚠️ Skipped {len(pattern_guard.rejected)} invalid or unsafe patterns out of {len(patterns)} total", "patterns_rejected", gate=gate_name, count=len(pattern_guard.rejected))
+        # Per-file messages are counted and rate limited instead of printed for every file;
+        # without detailed logging they are only visible at debug level
+        item_level = "info" if config.get("enable_detailed_logging", False) else "debug"
         # Process files with improved limits and error handling
         files_processed = 0
         files_skipped = 0
@@ -1486,87 +1821,204 @@ class ValidateGatesNode(Node):
         # Configurable limits (remove hard-coded 100 file limit)
         max_files = min(len(target_files), config["max_files"])
         max_file_size = config["max_file_size_mb"] * 1024 * 1024  # Convert MB to bytes
-        # Use threading with timeout to prevent hanging
+        # Total eligible bytes, used to project each pattern's cost from a sample of files
+        total_bytes = sum(f.get("size", 0) for f in target_files[:max_files])
+        # Use threading with timeout to prevent hanging; the worker checkpoints its
+        # progress into processing_result after every file so a timeout keeps the
+        # matches collected so far instead of discarding them
         processing_result = {
-            "matches": [],
+            "matches": 0,
             "files_processed": 0,
             "files_skipped": 0,
             "files_too_large": 0,
             "files_read_errors": 0,
+            "timed_out": False,
+            "early_terminated": False,
             "error": None
         }
+        if verdict_tracker is not None:
+            verdict_tracker.start_pass(source, max_files)
+        deadline = time.monotonic() + FILE_PROCESSING_TIMEOUT
+        stop_event = threading.Event()
         def process_files_with_timeout():
             try:
-                local_matches = []
-                local_files_processed = 0
-                local_files_skipped = 0
-                local_files_too_large = 0
-                local_files_read_errors = 0
                 for i, file_info in enumerate(target_files[:max_files]):
+                    # Stop at a file boundary once the time budget is spent
+                    if stop_event.is_set() or time.monotonic() > deadline:
+                        processing_result["timed_out"] = True
+                        break
+                    # Fast verdict: the remaining files cannot change the gate's score or status
+                    if verdict_tracker is not None and verdict_tracker.settled(max_files - i):
+                        processing_result["early_terminated"] = True
+                        break
                     # Add progress logging every 10 files
                     if i % 10 == 0 and i > 0:
                         actual_files_to_process = min(len(target_files), max_files)
-                        print(f"   📊 Processing file {i}/{actual_files_to_process} for {gate_name}...")
-                    file_path = repo_path / file_info["relative_path"]
-                    if not file_path.exists():
-                        local_files_skipped += 1
+                        log.item("debug", "file_progress", f"   📊 Processing file {i}/{actual_files_to_process} for {gate_name}...", gate=gate_name, file_index=i)
+                    file_size = content_cache.get_size(file_info["relative_path"])
+                    if file_size is None and not content_cache.exists(file_info["relative_path"]):
+                        processing_result["files_skipped"] += 1
                         continue
                     try:
-                        file_size = file_path.stat().st_size
+                        if file_size is None:
+                            file_size = content_cache.file_size(file_info["relative_path"])
                         if file_size > max_file_size:
-                            local_files_too_large += 1
-                            if config.get("enable_detailed_logging", True):
-                                print(f"   ⚠️ Skipping large file ({file_size/1024/1024:.1f}MB): {file_info['relative_path']}")
+                            processing_result["files_too_large"] += 1
+                            log.item(item_level, "file_too_large", f"   ⚠️ Skipping large file ({file_size/1024/1024:.1f}MB): {file_info['relative_path']}", file=file_info["relative_path"], size=file_size)
+                            continue
+                        # Only run patterns still within their time budget whose literals can occur in this file
+                        file_patterns = [
+                            (pattern, compiled_pattern) for pattern, compiled_pattern in compiled_patterns
+                            if pattern_guard.is_enabled(pattern) and (
+                                trigram_index is None or trigram_index.may_match(candidate_masks[pattern], file_info["relative_path"])
+                            )
+                        ]
+                        if not file_patterns:
+                            processing_result["files_processed"] += 1
                             continue
-                        content = file_path.read_text(encoding='utf-8', errors='ignore')
-                        # Apply all compiled patterns to this file
-                        for pattern, compiled_pattern in compiled_patterns:
+                        content = content_cache.get_text(file_info["relative_path"])
+                        file_matches = []
+                        for pattern, compiled_pattern in file_patterns:
+                            pattern_start = time.perf_counter()
                             try:
                                 for match in compiled_pattern.finditer(content):
-                                    local_matches.append({
-                                        "file": file_info["relative_path"],
-                                        "pattern": pattern,
-                                        "match": match.group(),
-                                        "line": content[:match.start()].count('\n') + 1,
-                                        "language": file_info["language"],
-                                        "source": source
-                                    })
+                                    file_matches.append((pattern, match.group(), content[:match.start()].count('\n') + 1))
                             except Exception as e:
-                                if config.get("enable_detailed_logging", True):
-                                    print(f"   ⚠️ Pattern matching error in {file_info['relative_path']}: {e}")
-                        local_files_processed += 1
+                                log.item("warning", "pattern_match_error", f"   ⚠️ Pattern matching error in {file_info['relative_path']}: {e}", file=file_info["relative_path"], pattern=pattern, error=str(e))
+                            pattern_guard.record(pattern, time.perf_counter() - pattern_start, file_size, total_bytes)
+                        # Checkpoint: a file's matches are published only once the file is complete
+                        match_table.add_file_matches(file_info["relative_path"], file_info["language"], source, file_matches)
+                        processing_result["matches"] = len(match_table)
+                        processing_result["files_processed"] += 1
+                        if verdict_tracker is not None:
+                            verdict_tracker.add_file(file_info["relative_path"], [line for _, _, line in file_matches])
                     except Exception as e:
-                        local_files_read_errors += 1
-                        if config.get("enable_detailed_logging", True):
-                            print(f"   ⚠️ Error reading file {file_info['relative_path']}: {e}")
+                        processing_result["files_read_errors"] += 1
+                        log.item("warning", "file_read_error", f"   ⚠️ Error reading file {file_info['relative_path']}: {e}", file=file_info["relative_path"], error=str(e))
                         continue
-                # Update result
-                processing_result["matches"] = local_matches
-                processing_result["files_processed"] = local_files_processed
-                processing_result["files_skipped"] = local_files_skipped
-                processing_result["files_too_large"] = local_files_too_large
-                processing_result["files_read_errors"] = local_files_read_errors
             except Exception as e:
                 processing_result["error"] = str(e)
         # Start file processing in a separate thread
         processing_thread = threading.Thread(target=process_files_with_timeout)
         processing_thread.daemon = True
         processing_thread.start()
-        # Wait for completion with timeout
-        processing_thread.join(timeout=FILE_PROCESSING_TIMEOUT)
+        # Wait for completion with timeout (plus a short grace period so the worker
+        # can notice the deadline at the next file boundary)
+        processing_thread.join(timeout=FILE_PROCESSING_TIMEOUT + FILE_PROCESSING_GRACE)
         if processing_thread.is_alive():
-            print(f"   ⚠️ File processing timed out after {FILE_PROCESSING_TIMEOUT} seconds for {gate_name}")
-            processing_result["error"] = f"File processing timed out after {FILE_PROCESSING_TIMEOUT} seconds"
+            # Still stuck inside a single file - stop at the next boundary and keep the checkpoint
+            stop_event.set()
+            processing_result["timed_out"] = True
+        # Snapshot the checkpoint (a stuck worker may still be running)
+        matches = match_table.head(processing_result["matches"])
+        files_processed = processing_result["files_processed"]
+        files_eligible = min(len(target_files), max_files)
+        files_accounted = files_processed + processing_result["files_skipped"] + processing_result["files_too_large"] + processing_result["files_read_errors"]
+        partial = processing_result["timed_out"] or processing_result["error"] is not None
+        if processing_result["timed_out"]:
+            log.warning(f"   ⚠️ File processing timed out after {FILE_PROCESSING_TIMEOUT} seconds for {gate_name}: keeping {len(matches)} matches from {files_processed}/{files_eligible} files", "file_processing_timeout", gate=gate_name, source=source)
         if processing_result["error"]:
-            print(f"   ⚠️ File processing failed for {gate_name}: {processing_result['error']}")
-            return []
-        # Report processing statistics
-        if config.get("enable_detailed_logging", True):
-            actual_files_to_process = min(len(target_files), max_files)
-            print(f"   📊 File processing stats for {gate_name}: {processing_result['files_processed']} processed, {processing_result['files_skipped']} skipped, {processing_result['files_too_large']} too large, {processing_result['files_read_errors']} read errors (out of {actual_files_to_process} eligible files)")
+            log.error(f"   ⚠️ File processing failed for {gate_name}: {processing_result['error']} (keeping {len(matches)} matches from {files_processed}/{files_eligible} files)", "file_processing_error", gate=gate_name, source=source, error=processing_result["error"])
+        if diagnostics is not None:
+            diagnostics["pattern_safety"] = pattern_guard.get_report()
+            diagnostics["coverage"] = {
+                "files_eligible": files_eligible,
+                "files_processed": files_processed,
+                "files_accounted": min(files_accounted, files_eligible),
+                "coverage_percentage": round(min(files_accounted, files_eligible) / files_eligible * 100, 1) if files_eligible else 100.0,
+                "timed_out": processing_result["timed_out"],
+                "early_terminated": processing_result["early_terminated"],
+                "error": processing_result["error"],
+                "partial": partial
+            }
+        # Report processing statistics (one line per gate and source)
+        actual_files_to_process = min(len(target_files), max_files)
+        log.log(item_level, f"   📊 File processing stats for {gate_name}: {processing_result['files_processed']} processed, {processing_result['files_skipped']} skipped, {processing_result['files_too_large']} too large, {processing_result['files_read_errors']} read errors (out of {actual_files_to_process} eligible files)",
+                "file_processing_stats", gate=gate_name, source=source, files_processed=processing_result["files_processed"], files_skipped=processing_result["files_skipped"],
+                files_too_large=processing_result["files_too_large"], files_read_errors=processing_result["files_read_errors"], files_eligible=actual_files_to_process)
         if len(target_files) > max_files:
-            print(f"   ⚠️ File limit reached: processed {max_files} out of {len(target_files)} eligible files for {gate_name}")
-        return processing_result["matches"]
+            log.info(f"   ⚠️ File limit reached: processed {max_files} out of {len(target_files)} eligible files for {gate_name}", "file_limit_reached", gate=gate_name, files_eligible=len(target_files), max_files=max_files)
+        return matches
+    
+    def _scan_file_sample(self, file_sample: StratifiedFileSample, repo_path: Path, gate: Dict[str, Any], gate_with_coverage: Dict[str, Any], metadata: Dict[str, Any], config: Dict[str, Any], pattern_sets: List[tuple], scan_options: Dict[str, Any]) -> tuple:
+        """
+        Scan a growing stratified sample of a gate's files with every pattern source
+        
+        The sample starts at sample_initial_files and doubles until the gate status is
+        the same at both ends of the score's confidence interval, the sample reaches
+        max_files or a round is cut short by a timeout.
+        
+        Returns:
+            (matches per source, seconds per source, sample estimate)
+        """
+        sample_cap = min(config["max_files"], file_sample.population)
+        sample_size = min(config["sample_initial_files"], sample_cap)
+        round_matches = {source: [] for source, _, _, _ in pattern_sets}
+        seconds = {source: 0.0 for source, _, _, _ in pattern_sets}
+        rounds = 0
+        while True:
+            batch = file_sample.next_batch(sample_size)
+            rounds += 1
+            scanned = len(batch)
+            for source, patterns, screen_cache, diagnostics in pattern_sets:
+                round_diagnostics = {}
+                start = time.perf_counter()
+                round_matches[source].append(self._find_pattern_matches_with_config(repo_path, patterns, metadata, gate, config, source, diagnostics=round_diagnostics, screen_cache=screen_cache, target_files=batch, **scan_options))
+                seconds[source] += time.perf_counter() - start
+                self._add_round_diagnostics(diagnostics, round_diagnostics)
+                # Only files every source finished count as sampled
+                scanned = min(scanned, round_diagnostics["coverage"]["files_accounted"])
+            file_sample.add_scanned(scanned)
+            
+            matches = {source: MatchTable.merge_unique(*tables) for source, tables in round_matches.items()}
+            estimate = self._estimate_sampled_score(gate_with_coverage, metadata, file_sample, self._deduplicate_matches(*matches.values()))
+            if estimate["settled"] or scanned < len(batch) or sample_size >= sample_cap:
+                break
+            sample_size = min(sample_size * 2, sample_cap)
+        
+        estimate["rounds"] = rounds
+        return matches, seconds, estimate
+    
+    def _add_round_diagnostics(self, diagnostics: Dict[str, Any], round_diagnostics: Dict[str, Any]) -> None:
+        """Add one sample round's coverage and pattern safety to a pattern source's diagnostics"""
+        coverage = diagnostics.setdefault("coverage", {
+            "files_eligible": 0, "files_processed": 0, "files_accounted": 0,
+            "timed_out": False, "early_terminated": False, "error": None, "partial": False
+        })
+        round_coverage = round_diagnostics["coverage"]
+        for key in ("files_eligible", "files_processed", "files_accounted"):
+            coverage[key] += round_coverage[key]
+        for key in ("timed_out", "partial"):
+            coverage[key] = coverage[key] or round_coverage[key]
+        coverage["error"] = coverage["error"] or round_coverage["error"]
+        coverage["coverage_percentage"] = round(coverage["files_accounted"] / coverage["files_eligible"] * 100, 1) if coverage["files_eligible"] else 100.0
+        
+        # Patterns are screened again every round, keep each reported pattern once
+        round_safety = round_diagnostics.get("pattern_safety", {})
+        safety = diagnostics.setdefault("pattern_safety", {**round_safety, "rejected": [], "rewritten": [], "slow": []})
+        for key in ("rejected", "rewritten", "slow"):
+            known = {entry["pattern"] for entry in safety[key]}
+            safety[key].extend(entry for entry in round_safety.get(key, []) if entry["pattern"] not in known)
+    
+    def _estimate_sampled_score(self, gate: Dict[str, Any], metadata: Dict[str, Any], file_sample: StratifiedFileSample, matches: MatchTable) -> Dict[str, Any]:
+        """Score a gate from sampled matches extrapolated to all its relevant files, with a confidence interval"""
+        file_counts = matches.file_counts()
+        files = file_sample.estimate_total({path: 1 for path in file_counts}, proportion=True)
+        total_matches = file_sample.estimate_total(file_counts)
+        score = self._score_from_counts(gate, total_matches[0], files[0], metadata, quiet=True)
+        # Scores only move one way as matches are added, so the interval ends bound the score
+        ends = [self._score_from_counts(gate, total_matches[i], files[i], metadata, quiet=True) for i in (1, 2)]
+        score_low, score_high = min(ends), max(ends)
+        return {
+            **file_sample.get_stats(),
+            "files_with_matches": round(files[0], 1),
+            "files_with_matches_interval": [round(files[1], 1), round(files[2], 1)],
+            "matches": round(total_matches[0], 1),
+            "matches_interval": [round(total_matches[1], 1), round(total_matches[2], 1) if total_matches[2] != float("inf") else None],
+            "score": score,
+            "score_interval": [round(score_low, 2), round(score_high, 2)],
+            "settled": self._determine_status(score_low, gate) == self._determine_status(score_high, gate)
+        }
     
     def _get_technology_relevant_files(self, metadata: Dict[str, Any], file_type: str = "Source Code") -> List[Dict[str, Any]]:
         """Get files that are relevant to the primary technology stack"""
@@ -1578,7 +2030,7 @@ class ValidateGatesNode(Node):
         
         if not primary_technologies:
             # Fallback to all files if no primary technology detected
-            print(f"   No primary technology detected, using all {len(all_files)} {file_type.lower()} files")
+            self.log.info(f"   No primary technology detected, using all {len(all_files)} {file_type.lower()} files")
             return all_files
         
         # Filter files to only include primary technology files
@@ -1586,8 +2038,8 @@ class ValidateGatesNode(Node):
                          if f["language"] in primary_technologies]
         
         primary_tech_str = ", ".join(primary_technologies)
-        print(f"   Primary technologies: {primary_tech_str}")
-        print(f"   Filtered to {len(relevant_files)} relevant files (from {len(all_files)} total {file_type.lower()} files)")
+        self.log.info(f"   Primary technologies: {primary_tech_str}")
+        self.log.info(f"   Filtered to {len(relevant_files)} relevant files (from {len(all_files)} total {file_type.lower()} files)")
         
         return relevant_files
     
@@ -1630,7 +2082,7 @@ class ValidateGatesNode(Node):
             if language in primary_languages:
                 if percentage >= 20.0:
                     primary_technologies.append(language)
-                    print(f"   Primary technology detected: {language} ({percentage:.1f}%, {file_count} files)")
+                    self.log.info(f"   Primary technology detected: {language} ({percentage:.1f}%, {file_count} files)")
         
         # If no primary technology found with 20% threshold, take the most dominant primary language
         if not primary_technologies:
@@ -1648,12 +2100,18 @@ class ValidateGatesNode(Node):
             if dominant_primary and max_percentage >= 10.0:  # At least 10% to be considered
                 primary_technologies.append(dominant_primary)
                 file_count = language_stats[dominant_primary].get("files", 0)
-                print(f"   Dominant primary technology: {dominant_primary} ({max_percentage:.1f}%, {file_count} files)")
+                self.log.info(f"   Dominant primary technology: {dominant_primary} ({max_percentage:.1f}%, {file_count} files)")
         
         return primary_technologies
     
     def _calculate_gate_score(self, gate: Dict[str, Any], matches: List[Dict[str, Any]], metadata: Dict[str, Any]) -> float:
         """Calculate score for a gate based on matches and LLM-provided expected coverage with maximum files analysis"""
+        # Exact counters, also for a table that only retains a sample of its matches
+        match_table = as_match_table(matches)
+        return self._score_from_counts(gate, match_table.total_matches, match_table.files_with_matches(), metadata)
+    
+    def _score_from_counts(self, gate: Dict[str, Any], total_matches: float, files_with_matches: int, metadata: Dict[str, Any], quiet: bool = False) -> float:
+        """Score a gate from its match and matched-file counts (quiet skips the infrastructure log lines)"""
         
         gate_name = gate["name"]
         
@@ -1669,20 +2127,21 @@ class ValidateGatesNode(Node):
         
         # Special handling for infrastructure patterns with 100% expected coverage
         if expected_percentage == 100:
-            print(f"🎯 Infrastructure pattern detected for {gate_name}: {reasoning}")
+            if not quiet:
+                self.log.info(f"🎯 Infrastructure pattern detected for {gate_name}: {reasoning}")
             
             # For infrastructure patterns, we need to verify the framework is actually used
-            files_with_matches = len(set(m["file"] for m in matches)) if matches else 0
-            
             if files_with_matches > 0:
                 # Infrastructure framework detected and being used - score based on usage
                 usage_ratio = min(files_with_matches / max_files_expected, 1.0)
                 score = usage_ratio * 100.0
-                print(f"   Infrastructure framework in use: {files_with_matches}/{max_files_expected} expected files ({score:.1f}%)")
+                if not quiet:
+                    self.log.info(f"   Infrastructure framework in use: {files_with_matches}/{max_files_expected} expected files ({score:.1f}%)")
                 return score
             else:
                 # Infrastructure framework detected but not being used - low score
-                print(f"   Infrastructure framework detected but not implemented: 0/{max_files_expected} expected files")
+                if not quiet:
+                    self.log.info(f"   Infrastructure framework detected but not implemented: 0/{max_files_expected} expected files")
                 return 10.0  # Low score for detected but unused framework
         
         # Convert percentage to decimal
@@ -1697,20 +2156,18 @@ class ValidateGatesNode(Node):
         
         if gate_name == "AVOID_LOGGING_SECRETS":
             # For security gates, fewer matches = better score
-            if len(matches) == 0:
+            if total_matches == 0:
                 return 100.0
             else:
                 # Penalize based on number of violations
-                violation_penalty = min(len(matches) * 10, 100)
+                violation_penalty = min(total_matches * 10, 100)
                 return max(0.0, 100.0 - violation_penalty)
         else:
             # For other gates, more matches = better score
-            if len(matches) == 0:
+            if total_matches == 0:
                 return 0.0
             else:
                 # Score based on coverage vs expected coverage (using max files expected)
-                files_with_matches = len(set(m["file"] for m in matches))
-                
                 # Use maximum files expected for more accurate coverage calculation
                 actual_coverage = files_with_matches / max_files_expected
                 
@@ -1734,6 +2191,16 @@ class ValidateGatesNode(Node):
                 
                 return final_score
     
+    def _score_bounds(self, gate: Dict[str, Any], metadata: Dict[str, Any], total_matches: int, files_with_matches: int, files_unmatched: int, scans_remaining: int) -> tuple:
+        """Lowest and highest score a gate can still reach while scans_remaining file scans are left"""
+        current = self._score_from_counts(gate, total_matches, files_with_matches, metadata, quiet=True)
+        if scans_remaining <= 0:
+            return current, current
+        # Any remaining scan may add any number of matches, and a match to every unmatched file;
+        # scores only move one way as matches are added (up, or down for AVOID_LOGGING_SECRETS)
+        reachable = self._score_from_counts(gate, float("inf"), files_with_matches + files_unmatched, metadata, quiet=True)
+        return min(current, reachable), max(current, reachable)
+    
     def _determine_status(self, score: float, gate: Dict[str, Any]) -> str:
         """Determine gate status based on score"""
         
@@ -1768,7 +2235,7 @@ class ValidateGatesNode(Node):
         # Calculate actual coverage using maximum files expected
         total_files = gate.get("total_files", 1)
         relevant_files = gate.get("relevant_files", total_files)
-        files_with_matches = len(set(m['file'] for m in matches)) if matches else 0
+        files_with_matches = as_match_table(matches).files_with_matches()
         
         # Calculate coverage using maximum files expected for more accurate assessment
         actual_percentage = (files_with_matches / max_files_expected) * 100 if max_files_expected > 0 else 0
@@ -1802,15 +2269,16 @@ class ValidateGatesNode(Node):
         
         details.append(f"Confidence: {confidence}")
         
-        if matches:
-            details.append(f"Found {len(matches)} matches across {files_with_matches} files")
+        total_matches = as_match_table(matches).total_matches
+        if total_matches:
+            details.append(f"Found {total_matches} matches across {files_with_matches} files")
             
             # Show sample matches
             for match in matches[:3]:
                 details.append(f"  {match['file']}:{match['line']} - {match['match'][:50]}")
             
-            if len(matches) > 3:
-                details.append(f"  ... and {len(matches) - 3} more matches")
+            if total_matches > 3:
+                details.append(f"  ... and {total_matches - 3} more matches")
         else:
             details.append(f"No matches found for {gate['display_name']}")
         
@@ -1830,7 +2298,7 @@ class ValidateGatesNode(Node):
         # Calculate actual coverage using maximum files expected
         total_files = gate.get("total_files", 1)
         relevant_files = gate.get("relevant_files", total_files)
-        files_with_matches = len(set(m['file'] for m in matches)) if matches else 0
+        files_with_matches = as_match_table(matches).files_with_matches()
         
         # Calculate coverage using maximum files expected for more accurate assessment
         actual_percentage = (files_with_matches / max_files_expected) * 100 if max_files_expected > 0 else 0
@@ -1883,16 +2351,9 @@ class ValidateGatesNode(Node):
         
         return recommendations
     
-    def _deduplicate_matches(self, matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Remove duplicate matches based on file and line"""
-        seen = set()
-        unique_matches = []
-        for match in matches:
-            key = (match["file"], match["line"])
-            if key not in seen:
-                seen.add(key)
-                unique_matches.append(match)
-        return unique_matches
+    def _deduplicate_matches(self, *match_sets) -> MatchTable:
+        """Combine match sets, removing duplicate matches based on file and line"""
+        return MatchTable.merge_unique(*(as_match_table(matches) for matches in match_sets))
     
     def _calculate_combined_confidence(self, llm_matches: int, static_matches: int, unique_matches: int) -> str:
         """Calculate combined confidence based on LLM, static, and unique matches"""
@@ -1915,27 +2376,51 @@ class ValidateGatesNode(Node):
             "language_threshold_percent": 5.0,
             "config_threshold_percent": 1.0,
             "min_languages": 1,
-            "enable_detailed_logging": True,
+            # Per-file messages at info level (otherwise debug); rate limited either way
+            "enable_detailed_logging": os.getenv("CODEGATES_DETAILED_LOGGING", "false").lower() in ("1", "true", "yes"),
             "skip_binary_files": True,
-            "process_large_files": False
+            "process_large_files": False,
+            "pattern_time_budget_seconds": float(os.getenv("CODEGATES_PATTERN_TIME_BUDGET", "10")),
+            # Match records kept per gate for evidence and reports (counters stay exact)
+            "match_retention": os.getenv("CODEGATES_MATCH_RETENTION", "sample").lower(),
+            "max_retained_matches": int(os.getenv("CODEGATES_MAX_RETAINED_MATCHES", "1000")),
+            "retained_matches_per_file": int(os.getenv("CODEGATES_RETAINED_MATCHES_PER_FILE", "3")),
+            # Stop scanning a gate once its score or PASS/WARNING/FAIL verdict can no longer change
+            "fast_verdict": os.getenv("CODEGATES_FAST_VERDICT", "false").lower() in ("1", "true", "yes"),
+            # Files of gates with more relevant files than max_files: the largest ("top") or a stratified random sample
+            "file_selection": os.getenv("CODEGATES_FILE_SELECTION", "top").lower(),
+            "sample_initial_files": int(os.getenv("CODEGATES_SAMPLE_INITIAL_FILES", "200")),
+            "sample_confidence": float(os.getenv("CODEGATES_SAMPLE_CONFIDENCE", "0.95"))
         }
         
         # Override with request-specific config if available
         request_config = shared.get("request", {}).get("pattern_matching", {})
         config = {**default_config, **request_config}
+        if shared.get("request", {}).get("fast_verdict") is not None:
+            config["fast_verdict"] = shared["request"]["fast_verdict"]
+        if shared.get("request", {}).get("file_selection"):
+            config["file_selection"] = shared["request"]["file_selection"]
         
         # Validate configuration
         config["max_files"] = max(50, min(config["max_files"], 2000))  # Between 50-2000
         config["max_file_size_mb"] = max(1, min(config["max_file_size_mb"], 50))  # Between 1-50 MB
         config["language_threshold_percent"] = max(0.5, min(config["language_threshold_percent"], 50.0))  # Between 0.5-50%
+        config["pattern_time_budget_seconds"] = max(0.1, float(config["pattern_time_budget_seconds"]))  # At least 100ms per pattern
+        if config["match_retention"] not in MATCH_RETENTION_POLICIES:
+            config["match_retention"] = "sample"
+        config["max_retained_matches"] = max(1, int(config["max_retained_matches"]))
+        config["retained_matches_per_file"] = max(1, int(config["retained_matches_per_file"]))
+        if isinstance(config["fast_verdict"], str):
+            config["fast_verdict"] = config["fast_verdict"].lower() in ("1", "true", "yes")
+        if config["file_selection"] not in FILE_SELECTION_MODES:
+            config["file_selection"] = "top"
+        config["sample_initial_files"] = max(10, min(int(config["sample_initial_files"]), config["max_files"]))
+        config["sample_confidence"] = max(0.5, min(float(config["sample_confidence"]), 0.999))
         
         return config
 
-    def _get_improved_relevant_files(self, metadata: Dict[str, Any], file_type: str = "Source Code", gate_name: str = "", config: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+    def _get_improved_relevant_files(self, metadata: Dict[str, Any], file_type: str = "Source Code", gate_name: str = "", config: Dict[str, Any] = None, relevance_index: Optional[FileRelevanceIndex] = None) -> List[Dict[str, Any]]:
         """Get files that are relevant with improved, less aggressive filtering"""
-        all_files = [f for f in metadata.get("file_list", []) 
-                    if f["type"] == file_type and not f["is_binary"]]
-        
         # Use default config if none provided
         if config is None:
             config = {
@@ -1944,19 +2429,35 @@ class ValidateGatesNode(Node):
                 "min_languages": 1
             }
         
+        # Without a scan-wide index, build a throwaway one for this call
+        if relevance_index is None:
+            relevance_index = self._build_relevance_index(metadata)
+        
+        # Subsets depend only on file type, gate language category and thresholds
+        gate_category = self._get_gate_language_category(gate_name)
+        index_key = (
+            file_type,
+            gate_category,
+            config["language_threshold_percent"],
+            config["config_threshold_percent"],
+            config.get("min_languages", 1)
+        )
+        relevant_files = relevance_index.lookup(index_key)
+        if relevant_files is not None:
+            return relevant_files
+        
+        all_files_count = relevance_index.count_files(file_type)
+        
         # Get language statistics for intelligent filtering
         language_stats = metadata.get("language_stats", {})
         total_files = sum(stats.get("files", 0) for stats in language_stats.values())
         
         if not language_stats or total_files == 0:
-            print(f"   No language statistics available, using all {len(all_files)} {file_type.lower()} files")
-            return all_files
+            self.log.debug(f"   No language statistics available, using all {all_files_count} {file_type.lower()} files")
+            return relevance_index.build(index_key, file_type, languages=None, ordered=False)
         
         # Define technology categories for more intelligent filtering
-        primary_languages = {
-            "Java", "Python", "JavaScript", "TypeScript", "C#", "C++", "C", 
-            "Go", "Rust", "Kotlin", "Scala", "Swift", "PHP", "Ruby"
-        }
+        primary_languages = self.PRIMARY_LANGUAGES
         
         config_languages = {
             "XML", "JSON", "YAML", "Properties", "TOML", "INI"
@@ -1985,21 +2486,21 @@ class ValidateGatesNode(Node):
         config_threshold = config["config_threshold_percent"]
         
         # Gate-specific logic for better relevance
-        if gate_name in ["STRUCTURED_LOGS", "AVOID_LOGGING_SECRETS", "AUDIT_TRAIL", "LOG_API_CALLS", "LOG_APPLICATION_MESSAGES", "ERROR_LOGS"]:
+        if gate_category == "logging":
             # Logging-related gates: include primary languages + config files
             for language, percentage in language_percentages.items():
                 if language in primary_languages and percentage >= primary_threshold:
                     relevant_languages.add(language)
                 elif language in config_languages and percentage >= config_threshold:
                     relevant_languages.add(language)
-        elif gate_name in ["UI_ERRORS", "UI_ERROR_TOOLS"]:
+        elif gate_category == "ui":
             # UI-related gates: include web languages + primary languages
             for language, percentage in language_percentages.items():
                 if language in web_languages and percentage >= config_threshold:
                     relevant_languages.add(language)
                 elif language in primary_languages and percentage >= primary_threshold:
                     relevant_languages.add(language)
-        elif gate_name == "AUTOMATED_TESTS":
+        elif gate_category == "tests":
             # Test-related gates: include all primary languages with lower threshold
             test_threshold = max(primary_threshold * 0.6, 1.0)  # 60% of primary threshold, minimum 1%
             for language, percentage in language_percentages.items():
@@ -2029,38 +2530,58 @@ class ValidateGatesNode(Node):
             if dominant_language in primary_languages:
                 relevant_languages.add(dominant_language)
         
-        # Filter files to include relevant languages
-        if relevant_languages:
-            relevant_files = [f for f in all_files 
-                             if f["language"] in relevant_languages]
-        else:
-            # Fallback: use all files if no relevant languages found
-            relevant_files = all_files
+        # Filter the relevance-sorted files to the relevant languages
+        # (fallback: use all files if no relevant languages found)
+        relevant_files = relevance_index.build(
+            index_key, file_type, languages=relevant_languages if relevant_languages else None
+        )
         
-        # Sort files by relevance (prioritize larger files and common patterns)
-        relevant_files.sort(key=lambda f: (
-            f["language"] in primary_languages,  # Primary languages first
-            f["size"],  # Larger files first
-            not f["relative_path"].startswith("test"),  # Non-test files first (except for test gates)
-            f["relative_path"]  # Alphabetical as tiebreaker
-        ), reverse=True)
-        
-        # Report filtering results
+        # Report filtering results (once per gate category)
         relevant_langs_str = ", ".join(sorted(relevant_languages))
-        print(f"   Relevant languages: {relevant_langs_str}")
-        print(f"   Filtered to {len(relevant_files)} relevant files (from {len(all_files)} total {file_type.lower()} files)")
+        self.log.debug(f"   Relevant languages: {relevant_langs_str}")
+        self.log.debug(f"   Filtered to {len(relevant_files)} relevant files (from {all_files_count} total {file_type.lower()} files)")
         
         # Show percentage breakdown
-        if len(all_files) > 0:
-            coverage_percentage = (len(relevant_files) / len(all_files)) * 100
-            print(f"   Coverage: {coverage_percentage:.1f}% of {file_type.lower()} files")
+        if all_files_count > 0:
+            coverage_percentage = (len(relevant_files) / all_files_count) * 100
+            self.log.debug(f"   Coverage: {coverage_percentage:.1f}% of {file_type.lower()} files")
         
         return relevant_files
+    
+    def _build_relevance_index(self, metadata: Dict[str, Any]) -> FileRelevanceIndex:
+        """Build the per-scan relevance index over the scanned file list"""
+        primary_languages = self.PRIMARY_LANGUAGES
+        
+        # Sort files by relevance (prioritize larger files and common patterns)
+        def relevance_sort_key(f: Dict[str, Any]):
+            return (
+                f["language"] in primary_languages,  # Primary languages first
+                f["size"],  # Larger files first
+                not f["relative_path"].startswith("test"),  # Non-test files first (except for test gates)
+                f["relative_path"]  # Alphabetical as tiebreaker
+            )
+        
+        return FileRelevanceIndex(metadata.get("file_list", []), sort_key=relevance_sort_key)
+    
+    def _get_gate_language_category(self, gate_name: str) -> str:
+        """Get the language-selection category for a gate"""
+        if gate_name in ["STRUCTURED_LOGS", "AVOID_LOGGING_SECRETS", "AUDIT_TRAIL", "LOG_API_CALLS", "LOG_APPLICATION_MESSAGES", "ERROR_LOGS"]:
+            return "logging"
+        elif gate_name in ["UI_ERRORS", "UI_ERROR_TOOLS"]:
+            return "ui"
+        elif gate_name == "AUTOMATED_TESTS":
+            return "tests"
+        return "general"
 
 
-class GenerateReportNode(Node):
+class GenerateReportNode(InstrumentedNode):
     """Node to generate HTML and JSON reports using the same template as original report.py"""
     
+    stage = "scan"
+    
+    # Matches listed per gate in the lazy HTML report's details (the report index has all of them)
+    lazy_details_matches = 100
+    
     def prep(self, shared: Dict[str, Any]) -> Dict[str, Any]:
         """Prepare report generation parameters"""
         return {
@@ -2072,12 +2593,15 @@ class GenerateReportNode(Node):
                 "source": shared["llm"].get("source", "unknown"),
                 "model": shared["llm"].get("model", "unknown")
             },
-            "scan_id": shared["request"]["scan_id"]
+            "scan_id": shared["request"]["scan_id"],
+            "content_cache": get_scan_content_cache(shared),
+            "metrics": get_scan_metrics(shared),
+            "server_url": shared.get("server", {}).get("url")
         }
     
     def exec(self, params: Dict[str, Any]) -> Dict[str, str]:
         """Generate reports using the same template as original report.py"""
-        print("📄 Generating reports with original template...")
+        self.log.info("📄 Generating reports with original template...")
         
         scan_id = params["scan_id"]
         output_dir = params["request"].get("output_dir", "./reports")
@@ -2086,72 +2610,149 @@ class GenerateReportNode(Node):
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
         
+        # Build evidence snippets once for both report formats (served from the scan content cache)
+        content_cache = params.get("content_cache")
+        params = {
+            **params,
+            "evidence": self._collect_evidence_snippets(params["validation_results"]["gate_results"], content_cache)
+        }
+        
         report_paths = {}
+        options = get_report_options(params["request"])
         
-        # Generate JSON report
+        # Generate JSON report (streamed one gate at a time)
         if report_format in ["json", "both"]:
-            json_path = os.path.join(output_dir, f"codegates_report_{scan_id}.json")
-            json_data = self._generate_json_report(params)
-            
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(json_data, f, indent=2, ensure_ascii=False)
+            json_path = os.path.join(output_dir, get_report_filename(scan_id, options))
+            tables = StringTables()
+            
+            written = write_json_report(
+                json_path,
+                self._generate_json_report_header(params, options["detail"]),
+                self._iter_json_report_gates(params, options["detail"], tables),
+                tables=tables,
+                json_format=options["json_format"],
+                compress=options["gzip"]
+            )
+            self.log.info(f"   🧾 JSON report: {written['gates']} gates, {options['detail']} detail, {options['json_format']}{' + gzip' if options['gzip'] else ''}, {written['bytes'] / 1024:.1f}KB")
             
             report_paths["json"] = json_path
         
         # Generate HTML report
         if report_format in ["html", "both"]:
             html_path = os.path.join(output_dir, f"codegates_report_{scan_id}.html")
-            html_content = self._generate_html_report(params)
+            
+            if options["html_mode"] == "lazy":
+                # Small shell with gate summaries; details are rendered in the browser from a sidecar on expand
+                details_path = os.path.join(output_dir, f"codegates_report_{scan_id}.details.js")
+                details_bytes = write_html_details(details_path, self._collect_gate_details(params))
+                report_paths["html_details"] = details_path
+                html_content = self._generate_html_report(params, lazy_details=os.path.basename(details_path))
+                self.log.info(f"   🧾 Lazy HTML report: {len(html_content.encode('utf-8')) / 1024:.1f}KB shell + {details_bytes / 1024:.1f}KB gate details")
+            else:
+                html_content = self._generate_html_report(params)
             
             with open(html_path, 'w', encoding='utf-8') as f:
                 f.write(html_content)
             
             report_paths["html"] = html_path
         
+        # Index gate summaries and matches for the paginated report API
+        if report_index_enabled():
+            report_paths["index"] = write_report_index(
+                output_dir, scan_id, params["validation_results"]["gate_results"],
+                params["validation_results"].get("overall_score", 0.0)
+            )
+        
         return report_paths
     
     def post(self, shared: Dict[str, Any], prep_res: Dict[str, Any], exec_res: Dict[str, str]) -> str:
         """Store report paths in shared store"""
         shared["reports"]["json_path"] = exec_res.get("json")
         shared["reports"]["html_path"] = exec_res.get("html")
+        shared["reports"]["index_path"] = exec_res.get("index")
+        shared["reports"]["html_details_path"] = exec_res.get("html_details")
+        
+        # Expose content cache effectiveness in the scan stats
+        content_cache = prep_res.get("content_cache")
+        if content_cache is not None:
+            cache_stats = content_cache.get_stats()
+            shared.setdefault("scan_stats", {})["content_cache"] = cache_stats
+            self.log.info(f"   💾 Content cache: {cache_stats['hit_ratio'] * 100:.1f}% hit ratio, {cache_stats['bytes_served'] / 1024 / 1024:.1f}MB served from {cache_stats['bytes_read'] / 1024 / 1024:.1f}MB read ({cache_stats['disk_reads']} disk reads)")
         
         # Get server info for URL generation
         server_info = shared.get("server", {})
         server_url = server_info.get("url", "http://localhost:8000")
         scan_id = shared["request"]["scan_id"]
         
-        print(f"✅ Reports generated:")
+        self.log.info(f"✅ Reports generated:")
         for format_type, path in exec_res.items():
-            print(f"   {format_type.upper()}: {path}")
+            self.log.info(f"   {format_type.upper()}: {path}")
             
             # Print URL for HTML report
             if format_type == "html" and path:
                 report_url = f"{server_url}/api/v1/scan/{scan_id}/report/html"
-                print(f"   🌐 HTML Report URL: {report_url}")
+                self.log.info(f"   🌐 HTML Report URL: {report_url}")
             elif format_type == "json" and path:
                 report_url = f"{server_url}/api/v1/scan/{scan_id}/report/json"
-                print(f"   🌐 JSON Report URL: {report_url}")
+                self.log.info(f"   🌐 JSON Report URL: {report_url}")
         
         return "default"
     
-    def _generate_json_report(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate JSON report with same structure as original plus hybrid validation info"""
+    def _collect_evidence_snippets(self, gate_results: List[Dict[str, Any]], content_cache: Optional[FileContentCache]) -> Dict[str, List[Dict[str, Any]]]:
+        """Build source snippets for each gate's sample matches"""
+        evidence = {}
         
-        validation = params["validation_results"]
-        metadata = params["metadata"]
-        llm_info = params["llm_info"]
-        
-        # Use the new data structure directly
-        gate_results = validation["gate_results"]
-        hybrid_stats = validation.get("hybrid_stats", {})
+        for gate_result in gate_results:
+            snippets = []
+            for sample in gate_result.get("sample_matches", []):
+                snippet = content_cache.get_snippet(sample["file"], sample["line"]) if content_cache is not None else ""
+                snippets.append({
+                    "file": sample["file"],
+                    "line": sample["line"],
+                    "match": sample["match"],
+                    "snippet": snippet
+                })
+            evidence[gate_result["gate"]] = snippets
+        
+        return evidence
+    
+    def _collect_gate_details(self, params: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Details panel content of every gate for the lazy HTML report, plus each gate's first matches"""
+        evidence = params.get("evidence", {})
+        details = {}
+        
+        for gate in params["validation_results"]["gate_results"]:
+            data = self._gate_details_data(gate, evidence.get(gate.get("gate", ""), []))
+            matches = gate.get("matches", [])
+            data["matches"] = [
+                {"file": m["file"], "line": m["line"], "match": m["match"][:200]}
+                for m in matches[:self.lazy_details_matches]
+            ]
+            data["matches_found"] = gate.get("matches_found", len(matches))
+            details[gate.get("gate", "")] = data
         
+        return details
+    
+    def _generate_json_report(self, params: Dict[str, Any], detail: str = "summary") -> Dict[str, Any]:
+        """Generate JSON report with same structure as original plus hybrid validation info"""
+        tables = StringTables()
+        report = self._generate_json_report_header(params, detail)
+        report["gates"] = list(self._iter_json_report_gates(params, detail, tables))
+        report["string_tables"] = tables.tables
+        return report
+    
+    def _iter_json_report_gates(self, params: Dict[str, Any], detail: str, tables: StringTables):
+        """Yield the JSON report's gate entries one at a time, with matches encoded at the requested detail"""
         # Transform to match expected JSON format while preserving new data
-        gates = []
-        for gate_result in gate_results:
+        for gate_result in params["validation_results"]["gate_results"]:
             expected_coverage = gate_result.get("expected_coverage", {})
             total_files = gate_result.get("total_files", 1)
             relevant_files = gate_result.get("relevant_files", total_files)
-            files_with_matches = len(set(m.get('file', '') for m in gate_result.get("matches", []))) if gate_result.get("matches") else 0
+            match_counts = gate_result.get("match_counts")
+            if match_counts:
+                files_with_matches = match_counts["files_with_matches"]
+            else:
+                files_with_matches = as_match_table(gate_result.get("matches")).files_with_matches()
             actual_coverage_percentage = (files_with_matches / relevant_files) * 100 if relevant_files > 0 else 0
             
             gate = {
@@ -2165,6 +2766,8 @@ class GenerateReportNode(Node):
                 "description": gate_result["description"],
                 "patterns_used": gate_result.get("patterns_used", 0),
                 "matches_found": gate_result.get("matches_found", 0),
+                # Exact per-pattern and per-source counts; "retained" match rows are a bounded sample
+                "match_counts": gate_result.get("match_counts", {}),
                 "recommendations": gate_result.get("recommendations", []),
                 "pattern_description": gate_result.get("pattern_description", ""),
                 "pattern_significance": gate_result.get("pattern_significance", ""),
@@ -2194,11 +2797,30 @@ class GenerateReportNode(Node):
                 "found": gate_result.get("matches_found", 0),
                 "coverage": gate_result["score"],  # Use score as coverage
                 "quality_score": gate_result["score"],
-                "matches": []  # Could be populated with actual matches if needed
+                "evidence": params.get("evidence", {}).get(gate_result["gate"], []),
+                "pattern_safety": gate_result.get("pattern_safety", {"rejected": [], "rewritten": [], "slow": []}),
+                # Partial scores come from a scan that timed out or failed before covering all files
+                "partial": gate_result.get("partial", False),
+                # Fast verdict gates stopped scanning once their score or status was settled
+                "early_terminated": gate_result.get("early_terminated", False),
+                "early_termination": gate_result.get("early_termination"),
+                # Sampled gates: estimates over all relevant files with confidence intervals
+                "sampling": gate_result.get("sampling"),
+                "scan_coverage": gate_result.get("scan_coverage", {}),
+                "matches": []  # Match details are in match_files / match_rows (per-file / per-match detail)
             }
-            gates.append(gate)
+            gate.update(encode_gate_matches(gate_result.get("matches", []), detail, tables))
+            yield gate
+    
+    def _generate_json_report_header(self, params: Dict[str, Any], detail: str = "summary") -> Dict[str, Any]:
+        """Report fields other than the gates (metadata, totals, metrics, hybrid statistics)"""
+        validation = params["validation_results"]
+        metadata = params["metadata"]
+        llm_info = params["llm_info"]
+        gate_results = validation["gate_results"]
+        hybrid_stats = validation.get("hybrid_stats", {})
         
-        return {
+        header = {
             "report_metadata": {
                 "scan_id": params["scan_id"],
                 "repository_url": params["request"]["repository_url"],
@@ -2210,24 +2832,31 @@ class GenerateReportNode(Node):
                 "validation_type": "hybrid"
             },
             "scan_metadata": {
-                "scan_duration": 0,  # Could be tracked
+                # Wall time of the nodes finished before report generation
+                "scan_duration": round(params.get("metrics", {}).get("total_seconds", 0.0), 3),
                 "total_files": metadata.get("total_files", 0),
                 "total_lines": metadata.get("total_lines", 0),
                 "timestamp": self._get_timestamp(),
                 "project_name": self._extract_project_name(params["request"]["repository_url"]),
                 "project_path": params["request"]["repository_url"],
-                "repository_url": params["request"]["repository_url"]
+                "repository_url": params["request"]["repository_url"],
+                "content_cache": params["content_cache"].get_stats() if params.get("content_cache") is not None else {}
             },
             "languages_detected": list(metadata.get("languages", {}).keys()),
-            "gates": gates,
             "score": validation["overall_score"],
             "overall_score": validation["overall_score"],
+            "overall_score_bounds": validation.get("overall_score_bounds", [validation["overall_score"]] * 2),
             "passed_gates": len([g for g in gate_results if g["status"] == "PASS"]),
             "warning_gates": len([g for g in gate_results if g["status"] == "WARNING"]),
             "failed_gates": len([g for g in gate_results if g["status"] == "FAIL"]),
             "not_applicable_gates": len([g for g in gate_results if g["status"] == "NOT_APPLICABLE"]),
+            "partially_scanned_gates": [g["gate"] for g in gate_results if g.get("partial")],
+            "early_terminated_gates": [g["gate"] for g in gate_results if g.get("early_terminated")],
+            "sampled_gates": [g["gate"] for g in gate_results if g.get("sampling")],
             "total_applicable_gates": len([g for g in gate_results if g["status"] != "NOT_APPLICABLE"]),
             "total_all_gates": len(gate_results),
+            # Per-node and per-gate timings and resource counters
+            "metrics": params.get("metrics", {}),
             "critical_issues": [],
             "recommendations": [rec for gate in gate_results for rec in gate.get("recommendations", [])],
             # Enhanced hybrid validation statistics
@@ -2239,11 +2868,23 @@ class GenerateReportNode(Node):
                 "llm_patterns_used": hybrid_stats.get("total_llm_patterns", 0),
                 "coverage_improvement": hybrid_stats.get("coverage_improvement", 0.0),
                 "confidence_distribution": hybrid_stats.get("confidence_distribution", {})
-            }
+            },
+            # Gate match detail: summary, file (match_files rows) or match (match_rows rows)
+            "report_detail": detail
         }
+        if detail == "file":
+            header["file_columns"] = FILE_COLUMNS
+        elif detail == "match":
+            header["match_columns"] = MATCH_COLUMNS
+        return header
     
-    def _generate_html_report(self, params: Dict[str, Any]) -> str:
-        """Generate HTML report using exact same template as original report.py with hybrid validation info"""
+    def _generate_html_report(self, params: Dict[str, Any], lazy_details: Optional[str] = None) -> str:
+        """
+        Generate HTML report using exact same template as original report.py with hybrid validation info
+        
+        With lazy_details (file name of the gate details sidecar) the gate details
+        are left out and rendered in the browser when a gate is expanded.
+        """
         
         validation = params["validation_results"]
         metadata = params["metadata"]
@@ -2284,6 +2925,9 @@ class GenerateReportNode(Node):
         }
         </script>
         """
+        if lazy_details:
+            details_api = f"{params['server_url']}/api/v1/scan/{params['scan_id']}/report/html/details" if params.get("server_url") else None
+            toggle_script = self._get_lazy_details_script(lazy_details, details_api)
         
         # Generate hybrid validation summary
         hybrid_summary = self._generate_hybrid_validation_summary_html(hybrid_stats)
@@ -2345,7 +2989,7 @@ class GenerateReportNode(Node):
         {hybrid_summary}
         
         <h2>Hard Gates Analysis</h2>
-        {self._generate_gates_table_html_from_new_data(gate_results)}
+        {self._generate_gates_table_html_from_new_data(gate_results, params.get("evidence", {}), lazy=bool(lazy_details))}
         
         <footer style="margin-top: 50px; text-align: center; color: #6b7280; border-top: 1px solid #e5e7eb; padding-top: 20px;">
             <p>Hard Gate Assessment {report_type_display} Report generated on {timestamp}</p>
@@ -2393,6 +3037,117 @@ class GenerateReportNode(Node):
         </p>
         """
     
+    def _get_lazy_details_script(self, details_src: str, details_api: Optional[str] = None) -> str:
+        """
+        Script for lazy HTML reports: loads a gate's details when it is first expanded
+        
+        Served by the API (details_api set, page not opened from disk), one gate is
+        fetched per expand; otherwise the sidecar script is loaded once with a
+        script tag, which also works for reports opened from file://.
+        """
+        config = json.dumps({"src": details_src, "api": details_api}).replace("</", "<\\/")
+        return """
+        <script>
+        const CODEGATES_DETAILS = __CONFIG__;
+        let gateDetailsSidecar = null;
+        
+        function loadGateDetails(gate) {
+            if (CODEGATES_DETAILS.api && window.location.protocol !== 'file:') {
+                return fetch(CODEGATES_DETAILS.api + '?gate=' + encodeURIComponent(gate))
+                    .then(response => {
+                        if (!response.ok) throw new Error('HTTP ' + response.status);
+                        return response.json();
+                    })
+                    .then(details => details[gate]);
+            }
+            if (!gateDetailsSidecar) {
+                gateDetailsSidecar = new Promise((resolve, reject) => {
+                    const script = document.createElement('script');
+                    script.src = CODEGATES_DETAILS.src;
+                    script.onload = () => resolve(window.codegatesGateDetails || {});
+                    script.onerror = () => { gateDetailsSidecar = null; reject(new Error('Could not load ' + CODEGATES_DETAILS.src)); };
+                    document.head.appendChild(script);
+                });
+            }
+            return gateDetailsSidecar.then(details => details[gate]);
+        }
+        
+        function escapeHtml(value) {
+            const div = document.createElement('div');
+            div.textContent = value === undefined || value === null ? '' : String(value);
+            return div.innerHTML;
+        }
+        
+        function detailsSection(title, body) {
+            return '<div class="details-section"><div class="details-section-title">' + title + '</div>' + body + '</div>';
+        }
+        
+        function renderGateDetails(data) {
+            let html = '<div class="metrics-grid">' + data.metrics.map(([label, value]) =>
+                '<div class="metric-card"><div class="metric-label">' + escapeHtml(label) + '</div><div class="metric-value">' + escapeHtml(value) + '</div></div>'
+            ).join('') + '</div>';
+            html += detailsSection('Gate Information:',
+                '<p><strong>Category:</strong> ' + escapeHtml(data.category) + '</p>' +
+                '<p><strong>Priority:</strong> ' + escapeHtml(data.priority) + '</p>' +
+                '<p><strong>Description:</strong> ' + escapeHtml(data.description) + '</p>');
+            if (data.pattern_description || data.pattern_significance) {
+                html += detailsSection('Pattern Analysis:',
+                    (data.pattern_description ? '<p><strong>Pattern Description:</strong> ' + escapeHtml(data.pattern_description) + '</p>' : '') +
+                    (data.pattern_significance ? '<p><strong>Significance:</strong> ' + escapeHtml(data.pattern_significance) + '</p>' : ''));
+            }
+            if (data.details.length) {
+                html += detailsSection('Analysis Details:', '<ul>' + data.details.map(d => '<li>' + escapeHtml(d) + '</li>').join('') + '</ul>');
+            }
+            if (data.evidence.length) {
+                html += detailsSection('Evidence:', data.evidence.map(e =>
+                    '<p><strong>' + escapeHtml(e.file) + ':' + e.line + '</strong></p><pre class="evidence-snippet">' + escapeHtml(e.text) + '</pre>'
+                ).join(''));
+            }
+            if (data.matches.length) {
+                html += detailsSection('Matches (' + data.matches.length + ' of ' + data.matches_found + '):', '<ul>' + data.matches.map(m =>
+                    '<li><strong>' + escapeHtml(m.file) + ':' + m.line + '</strong> <code>' + escapeHtml(m.match) + '</code></li>'
+                ).join('') + '</ul>');
+            }
+            if (data.pattern_safety.length) {
+                html += detailsSection('Pattern Safety:', '<ul>' + data.pattern_safety.map(([label, pattern, reason]) =>
+                    '<li><strong>' + escapeHtml(label) + ':</strong> <code>' + escapeHtml(pattern) + '</code> - ' + escapeHtml(reason) + '</li>'
+                ).join('') + '</ul>');
+            }
+            if (data.recommendations.length) {
+                html += detailsSection('Recommendations:', '<ul>' + data.recommendations.map(r => '<li>' + escapeHtml(r) + '</li>').join('') + '</ul>');
+            }
+            return html;
+        }
+        
+        function toggleDetails(button, detailsId) {
+            const details = document.getElementById(detailsId);
+            const isExpanded = button.getAttribute('aria-expanded') === 'true';
+            
+            button.setAttribute('aria-expanded', !isExpanded);
+            details.setAttribute('aria-hidden', isExpanded);
+            
+            // Render the gate's details the first time it is expanded
+            if (!isExpanded && details.dataset.gate && !details.dataset.loaded) {
+                const cell = details.querySelector('.details-content');
+                details.dataset.loaded = 'true';
+                loadGateDetails(details.dataset.gate)
+                    .then(data => { cell.innerHTML = data ? renderGateDetails(data) : '<p>No details available</p>'; })
+                    .catch(error => {
+                        delete details.dataset.loaded;
+                        cell.innerHTML = '<p>Could not load details: ' + escapeHtml(error.message) + '</p>';
+                    });
+            }
+            
+            // Smooth scroll to expanded content
+            if (!isExpanded) {
+                setTimeout(() => {
+                    details.scrollIntoView({ behavior: 'smooth', block: 'nearest' });
+                }, 100);
+            }
+        }
+        </script>
+        """.replace("__CONFIG__", config)
+    
     def _get_extension_css_styles(self) -> str:
         """Get CSS styles that exactly match the original report.py"""
         return """
@@ -2517,6 +3272,16 @@ class GenerateReportNode(Node):
             font-weight: 500;
             margin-bottom: 8px;
         }
+        
+        .evidence-snippet {
+            background: #f3f4f6;
+            border-radius: 4px;
+            padding: 8px 12px;
+            font-family: monospace;
+            font-size: 0.85em;
+            overflow-x: auto;
+            white-space: pre;
+        }
         """
     
     def _transform_gates_for_template(self, gate_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -2884,8 +3649,8 @@ class GenerateReportNode(Node):
         
         return details
     
-    def _generate_gates_table_html_from_new_data(self, gate_results: List[Dict[str, Any]]) -> str:
-        """Generate gates table HTML with categories using new data structure"""
+    def _generate_gates_table_html_from_new_data(self, gate_results: List[Dict[str, Any]], evidence_snippets: Optional[Dict[str, List[Dict[str, Any]]]] = None, lazy: bool = False) -> str:
+        """Generate gates table HTML with categories using new data structure (lazy: empty details rows filled in on expand)"""
         gate_categories = self._get_new_gate_categories()
         
         html = """<div class="gates-analysis">"""
@@ -2920,7 +3685,10 @@ class GenerateReportNode(Node):
                 recommendation = self._get_recommendation_from_new_data(gate)
                 
                 # Generate detailed content
-                details_content = self._generate_gate_details_from_new_data(gate)
+                if lazy:
+                    details_content = '<p class="details-loading">Loading details...</p>'
+                else:
+                    details_content = self._generate_gate_details_from_new_data(gate, (evidence_snippets or {}).get(gate.get("gate", ""), []))
                 
                 html += f"""
                                 <tr>
@@ -2928,14 +3696,14 @@ class GenerateReportNode(Node):
                                         <button class="details-toggle" onclick="toggleDetails(this, 'details-{gate_id}')" aria-expanded="false" aria-label="Show details for {display_name}">+</button>
                                     </td>
                                     <td><strong>{display_name}</strong></td>
-                                    <td><span class="status-{status_info['class']}">{status_info['text']}</span></td>
+                                    <td><span class="status-{status_info['class']}">{status_info['text']}</span>{' <small>(partial scan)</small>' if gate.get("partial") else ''}{' <small>(early verdict)</small>' if gate.get("early_terminated") else ''}{' <small>(sampled)</small>' if gate.get("sampling") else ''}</td>
                                     <td>{evidence}</td>
                                     <td>{recommendation}</td>
                                 </tr>"""
                 
                 # Add details row (hidden by default)
                 html += f"""
-                                <tr id="details-{gate_id}" class="gate-details" aria-hidden="true">
+                                <tr id="details-{gate_id}" class="gate-details" aria-hidden="true"{f' data-gate="{escape(gate.get("gate", ""))}"' if lazy else ''}>
                                     <td colspan="5" class="details-content">
                                         {details_content}
                                     </td>
@@ -2950,10 +3718,8 @@ class GenerateReportNode(Node):
         html += """</div>"""
         return html
 
-    def _generate_gate_details_from_new_data(self, gate: Dict[str, Any]) -> str:
-        """Generate detailed content for a gate using new data structure"""
-        details = []
-        
+    def _gate_details_data(self, gate: Dict[str, Any], evidence: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Content of a gate's details panel, rendered inline or on demand by the lazy report's script"""
         # Metrics section
         metrics = [
             ('Score', f"{gate.get('score', 0):.1f}%"),
@@ -2962,8 +3728,55 @@ class GenerateReportNode(Node):
             ('Matches Found', f"{gate.get('matches_found', 0)}")
         ]
         
+        # Partial scans show how many files were covered before the timeout
+        if gate.get("partial"):
+            scan_coverage = gate.get("scan_coverage", {})
+            metrics.append(('Files Scanned (Partial)', f"{scan_coverage.get('files_scanned', 0)}/{scan_coverage.get('files_eligible', 0)}"))
+        
+        # Fast verdict gates show where scanning stopped and why
+        early_termination = gate.get("early_termination")
+        if early_termination:
+            reason = "Score Saturated" if early_termination["reason"] == "score_saturated" else "Verdict Settled"
+            metrics.append((f'Files Scanned ({reason})', f"{early_termination['files_scanned']}/{early_termination['files_eligible']}"))
+        
+        # Sampled gates show the sample size and the score's confidence interval
+        sampling = gate.get("sampling")
+        if sampling:
+            metrics.append(('Files Sampled', f"{sampling['files_sampled']}/{sampling['population']}"))
+            metrics.append((f"Score ({round(sampling['confidence'] * 100)}% CI)", f"{sampling['score_interval'][0]:.1f}-{sampling['score_interval'][1]:.1f}%"))
+        
+        # Pattern safety - patterns the regex guard rejected, rewrote or stopped
+        pattern_safety = gate.get("pattern_safety", {})
+        safety_items = (
+            [("Rejected", item["pattern"], item["reason"]) for item in pattern_safety.get("rejected", [])] +
+            [("Rewritten", item["pattern"], f'{item["reason"]} → {item["rewritten"]}') for item in pattern_safety.get("rewritten", [])] +
+            [("Slow", item["pattern"], item["reason"]) for item in pattern_safety.get("slow", [])]
+        )
+        
+        return {
+            "metrics": metrics,
+            "category": gate.get("category", "Unknown"),
+            "priority": gate.get("priority", "Unknown"),
+            "description": gate.get("description", "No description available"),
+            "pattern_description": gate.get("pattern_description", ""),
+            "pattern_significance": gate.get("pattern_significance", ""),
+            "details": gate.get('details', [])[:5],  # Show first 5 details
+            # Evidence with source snippets (the matched text when no snippet is available)
+            "evidence": [
+                {"file": item["file"], "line": item["line"], "text": item.get("snippet") or item["match"]}
+                for item in evidence or []
+            ],
+            "pattern_safety": safety_items,
+            "recommendations": gate.get('recommendations', [])[:3]  # Show first 3 recommendations
+        }
+    
+    def _generate_gate_details_from_new_data(self, gate: Dict[str, Any], evidence: Optional[List[Dict[str, Any]]] = None) -> str:
+        """Generate detailed content for a gate using new data structure"""
+        data = self._gate_details_data(gate, evidence)
+        details = []
+        
         metrics_html = '<div class="metrics-grid">'
-        for label, value in metrics:
+        for label, value in data["metrics"]:
             metrics_html += f"""
                 <div class="metric-card">
                     <div class="metric-label">{label}</div>
@@ -2975,15 +3788,15 @@ class GenerateReportNode(Node):
         # Gate information section
         gate_info_html = '<div class="details-section">'
         gate_info_html += '<div class="details-section-title">Gate Information:</div>'
-        gate_info_html += f'<p><strong>Category:</strong> {gate.get("category", "Unknown")}</p>'
-        gate_info_html += f'<p><strong>Priority:</strong> {gate.get("priority", "Unknown")}</p>'
-        gate_info_html += f'<p><strong>Description:</strong> {gate.get("description", "No description available")}</p>'
+        gate_info_html += f'<p><strong>Category:</strong> {data["category"]}</p>'
+        gate_info_html += f'<p><strong>Priority:</strong> {data["priority"]}</p>'
+        gate_info_html += f'<p><strong>Description:</strong> {data["description"]}</p>'
         gate_info_html += '</div>'
         details.append(gate_info_html)
         
         # Pattern Analysis section - NEW
-        pattern_description = gate.get("pattern_description", "")
-        pattern_significance = gate.get("pattern_significance", "")
+        pattern_description = data["pattern_description"]
+        pattern_significance = data["pattern_significance"]
         
         if pattern_description or pattern_significance:
             pattern_html = '<div class="details-section">'
@@ -2999,24 +3812,43 @@ class GenerateReportNode(Node):
             details.append(pattern_html)
         
         # Details section
-        gate_details = gate.get('details', [])
-        if gate_details:
+        if data["details"]:
             details_html = '<div class="details-section">'
             details_html += '<div class="details-section-title">Analysis Details:</div>'
             details_html += '<ul>'
-            for detail in gate_details[:5]:  # Show first 5 details
+            for detail in data["details"]:
                 details_html += f'<li>{detail}</li>'
             details_html += '</ul>'
             details_html += '</div>'
             details.append(details_html)
         
+        # Evidence section with source snippets
+        if data["evidence"]:
+            evidence_html = '<div class="details-section">'
+            evidence_html += '<div class="details-section-title">Evidence:</div>'
+            for item in data["evidence"]:
+                evidence_html += f'<p><strong>{escape(item["file"])}:{item["line"]}</strong></p>'
+                evidence_html += f'<pre class="evidence-snippet">{escape(item["text"])}</pre>'
+            evidence_html += '</div>'
+            details.append(evidence_html)
+        
+        # Pattern safety section
+        if data["pattern_safety"]:
+            safety_html = '<div class="details-section">'
+            safety_html += '<div class="details-section-title">Pattern Safety:</div>'
+            safety_html += '<ul>'
+            for label, pattern, reason in data["pattern_safety"]:
+                safety_html += f'<li><strong>{label}:</strong> <code>{escape(pattern)}</code> - {escape(reason)}</li>'
+            safety_html += '</ul>'
+            safety_html += '</div>'
+            details.append(safety_html)
+        
         # Recommendations section
-        recommendations = gate.get('recommendations', [])
-        if recommendations:
+        if data["recommendations"]:
             rec_html = '<div class="details-section">'
             rec_html += '<div class="details-section-title">Recommendations:</div>'
             rec_html += '<ul>'
-            for rec in recommendations[:3]:  # Show first 3 recommendations
+            for rec in data["recommendations"]:
                 rec_html += f'<li>{rec}</li>'
             rec_html += '</ul>'
             rec_html += '</div>'
@@ -3025,45 +3857,59 @@ class GenerateReportNode(Node):
         return ''.join(details)
 
 
-class CleanupNode(Node):
+class CleanupNode(InstrumentedNode):
     """Node to cleanup temporary files and directories"""
     
     def prep(self, shared: Dict[str, Any]) -> Dict[str, Any]:
         """Prepare cleanup parameters"""
         return {
             "temp_dir": shared["temp_dir"],
-            "repo_path": shared["repository"]["local_path"]
+            "repo_path": shared["repository"]["local_path"],
+            "content_cache": shared.get("content_cache"),
+            "source": shared["repository"].get("source"),
+            # Local directories are the user's workspace, never delete them
+            "keep_repository": shared["repository"].get("source_mode") == "local"
         }
     
     def exec(self, params: Dict[str, Any]) -> bool:
         """Cleanup temporary files"""
-        print("🧹 Cleaning up temporary files...")
+        self.log.info("🧹 Cleaning up temporary files...")
+        
+        # Release cached file contents (statistics stay available)
+        if params.get("content_cache") is not None:
+            params["content_cache"].clear()
+        
+        # Stop the cat-file process before its repository is removed
+        if params.get("source") is not None:
+            params["source"].close()
         
         try:
-            if params["repo_path"] and os.path.exists(params["repo_path"]):
+            if params["repo_path"] and os.path.exists(params["repo_path"]) and not params.get("keep_repository"):
                 cleanup_repository(params["repo_path"])
             
             if params["temp_dir"] and os.path.exists(params["temp_dir"]):
                 import shutil
                 shutil.rmtree(params["temp_dir"])
-                print(f"🧹 Cleaned up temp directory: {params['temp_dir']}")
+                self.log.info(f"🧹 Cleaned up temp directory: {params['temp_dir']}")
             
             return True
         except Exception as e:
-            print(f"⚠️ Cleanup failed: {e}")
+            self.log.warning(f"⚠️ Cleanup failed: {e}")
             return False
     
     def post(self, shared: Dict[str, Any], prep_res: Dict[str, Any], exec_res: bool) -> str:
         """Mark cleanup complete"""
+        if prep_res.get("source") is not None:
+            shared.setdefault("scan_stats", {})["repository_source"] = prep_res["source"].get_stats()
         if exec_res:
-            print("✅ Cleanup completed successfully")
+            self.log.info("✅ Cleanup completed successfully")
         else:
             shared["errors"].append("Cleanup failed")
         
         return "default" 
     def _generate_simplified_prompt(self, data: Dict[str, Any]) -> str:
         """Generate a simplified prompt for local LLMs"""
-        print("📋 Generating simplified LLM prompt for local LLM...")
+        self.log.info("📋 Generating simplified LLM prompt for local LLM...")
         
         prompt_parts = []
         
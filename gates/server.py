@@ -8,11 +8,12 @@ import os
 import uuid
 import tempfile
 import asyncio
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any, List
-from fastapi import FastAPI, HTTPException, BackgroundTasks
-from fastapi.responses import HTMLResponse, JSONResponse
+from typing import Optional, Dict, Any, List, Union
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, FileResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
@@ -21,6 +22,11 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from flow import create_validation_flow
 from utils.hard_gates import HARD_GATES
+from utils.instrumentation import METRICS_REGISTRY
+from utils.profiler import profile_scan
+from utils.batch_runner import run_batch, resolve_batch_targets
+from utils.report_writer import read_json_report, read_html_details
+from utils.report_index import ReportIndex
 
 # Add server configuration at the top of the file
 import socket
@@ -64,6 +70,37 @@ class ScanRequest(BaseModel):
     report_format: str = Field(default="both", description="Report format: html, json, or both")
     llm_url: Optional[str] = Field(default=None, description="Custom LLM service URL")
     llm_api_key: Optional[str] = Field(default=None, description="LLM API key")
+    profile: bool = Field(default=False, description="Profile the scan (download via /api/v1/scan/{scan_id}/profile)")
+    profile_mode: Optional[str] = Field(default=None, description="Profiler: cprofile (pstats + sampled stacks) or sampling (sampled stacks only); defaults to CODEGATES_PROFILE_MODE")
+    report_detail: Optional[str] = Field(default=None, description="JSON report match detail: summary, file or match; defaults to CODEGATES_REPORT_DETAIL")
+    report_json_format: Optional[str] = Field(default=None, description="JSON report layout: compact, pretty or ndjson; defaults to CODEGATES_REPORT_JSON_FORMAT")
+    report_gzip: Optional[bool] = Field(default=None, description="Gzip the JSON report; defaults to CODEGATES_REPORT_GZIP")
+    html_mode: Optional[str] = Field(default=None, description="HTML report: inline (all gate details in the page) or lazy (details loaded on expand); defaults to CODEGATES_HTML_MODE")
+    fast_verdict: Optional[bool] = Field(default=None, description="Stop scanning each gate once its score or status can no longer change; defaults to CODEGATES_FAST_VERDICT")
+    file_selection: Optional[str] = Field(default=None, description="Gates with more files than max_files: top (largest files) or sample (stratified random sample with confidence intervals); defaults to CODEGATES_FILE_SELECTION")
+    repository_source: Optional[str] = Field(default=None, description="Read files from a checked-out working tree (worktree) or from the git objects of a clone without checkout (objects); defaults to CODEGATES_REPOSITORY_SOURCE")
+
+
+class BatchRepository(BaseModel):
+    repository_url: str = Field(..., description="Git repository URL")
+    branch: Optional[str] = Field(default=None, description="Branch to scan (defaults to the batch branch)")
+
+
+class BatchScanRequest(BaseModel):
+    repositories: List[Union[str, BatchRepository]] = Field(default=[], description="Repository URLs or {repository_url, branch} objects")
+    org_url: Optional[str] = Field(default=None, description="GitHub organization or user URL; all its repositories are scanned")
+    branch: Optional[str] = Field(default=None, description="Branch for repositories that do not name one (default: main, or the default branch for org repositories)")
+    github_token: Optional[str] = Field(default=None, description="GitHub token for private repos and org listing")
+    threshold: int = Field(default=70, ge=0, le=100, description="Quality threshold percentage")
+    report_format: str = Field(default="both", description="Per-repository report format: html, json, or both")
+    llm_url: Optional[str] = Field(default=None, description="Custom LLM service URL")
+    llm_api_key: Optional[str] = Field(default=None, description="LLM API key")
+    include_forks: bool = Field(default=False, description="Include forks when scanning an organization")
+    include_archived: bool = Field(default=False, description="Include archived repositories when scanning an organization")
+    limit: Optional[int] = Field(default=None, ge=1, description="Scan at most this many repositories")
+    clone_workers: Optional[int] = Field(default=None, ge=1, description="Repositories cloned at once (default: CODEGATES_BATCH_CLONE_WORKERS)")
+    scan_workers: Optional[int] = Field(default=None, ge=1, description="Repositories scanned at once (default: CODEGATES_BATCH_SCAN_WORKERS)")
+    llm_workers: Optional[int] = Field(default=None, ge=1, description="Concurrent LLM calls (default: CODEGATES_BATCH_LLM_WORKERS)")
 
 
 class ScanResponse(BaseModel):
@@ -118,6 +155,8 @@ app.add_middleware(
 
 # In-memory storage for scan results (in production, use Redis/Database)
 scan_results: Dict[str, Dict[str, Any]] = {}
+batch_results: Dict[str, Dict[str, Any]] = {}
+batch_lock = threading.Lock()
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -176,6 +215,10 @@ async def start_scan(request: ScanRequest, background_tasks: BackgroundTasks):
     """
     Start a new repository scan
     """
+    # Local sources would read the server's own disk, they are for the CLI only
+    if request.repository_source == "local":
+        raise HTTPException(status_code=400, detail="repository_source 'local' is only available from the CLI")
+    
     try:
         # Generate scan ID
         scan_id = str(uuid.uuid4())
@@ -260,16 +303,47 @@ async def get_html_report(scan_id: str):
     if not html_path or not Path(html_path).exists():
         raise HTTPException(status_code=404, detail="HTML report not found")
     
-    with open(html_path, 'r', encoding='utf-8') as f:
-        html_content = f.read()
+    # Streamed from disk instead of read into memory
+    return FileResponse(html_path, media_type="text/html; charset=utf-8")
+
+
+def get_html_details_path(scan_id: str) -> str:
+    """Gate details sidecar of a lazy HTML report, or the matching HTTP error"""
+    if scan_id not in scan_results:
+        raise HTTPException(status_code=404, detail="Scan not found")
+    
+    result = scan_results[scan_id]
     
-    return HTMLResponse(content=html_content)
+    if result["status"] != "completed":
+        raise HTTPException(status_code=400, detail="Scan not completed yet")
+    
+    details_path = result.get("html_details_path")
+    if not details_path or not Path(details_path).exists():
+        raise HTTPException(status_code=404, detail="Gate details not found (HTML report not generated in lazy mode)")
+    
+    return details_path
+
+
+@app.get("/api/v1/scan/{scan_id}/report/html/details")
+async def get_html_report_details(scan_id: str, gate: Optional[str] = None):
+    """
+    Gate details of a lazy HTML report, for one gate (?gate=NAME) or all gates
+    """
+    details = read_html_details(get_html_details_path(scan_id))
+    if gate is None:
+        return JSONResponse(content=details)
+    if gate not in details:
+        raise HTTPException(status_code=404, detail=f"Gate not found: {gate}")
+    return JSONResponse(content={gate: details[gate]})
 
 
 @app.get("/api/v1/scan/{scan_id}/report/json")
-async def get_json_report(scan_id: str):
+async def get_json_report(scan_id: str, http_request: Request):
     """
     Get JSON report for a completed scan
+
+    Gzipped compact reports are sent as stored (Content-Encoding: gzip) to clients
+    that accept gzip; NDJSON reports are reassembled into one JSON document.
     """
     if scan_id not in scan_results:
         raise HTTPException(status_code=404, detail="Scan not found")
@@ -283,13 +357,191 @@ async def get_json_report(scan_id: str):
     if not json_path or not Path(json_path).exists():
         raise HTTPException(status_code=404, detail="JSON report not found")
     
-    import json
-    with open(json_path, 'r', encoding='utf-8') as f:
-        json_data = json.load(f)
+    if json_path.endswith(".json"):
+        return FileResponse(json_path, media_type="application/json")
+    if json_path.endswith(".json.gz") and "gzip" in http_request.headers.get("accept-encoding", ""):
+        return FileResponse(json_path, media_type="application/json", headers={"Content-Encoding": "gzip"})
+    
+    json_data = read_json_report(json_path)
     
     return JSONResponse(content=json_data)
 
 
+# Declared after the html/json report routes so it does not shadow them
+@app.get("/api/v1/scan/{scan_id}/report/{filename}")
+async def get_html_report_sidecar(scan_id: str, filename: str):
+    """
+    Gate details sidecar script, requested relative to the HTML report URL by lazy reports
+    """
+    details_path = get_html_details_path(scan_id)
+    if filename != Path(details_path).name:
+        raise HTTPException(status_code=404, detail="Report file not found")
+    return FileResponse(details_path, media_type="application/javascript")
+
+
+def get_report_index(scan_id: str) -> ReportIndex:
+    """Report index of a completed scan, or the matching HTTP error"""
+    if scan_id not in scan_results:
+        raise HTTPException(status_code=404, detail="Scan not found")
+    
+    result = scan_results[scan_id]
+    
+    if result["status"] != "completed":
+        raise HTTPException(status_code=400, detail="Scan not completed yet")
+    
+    index_path = result.get("report_index_path")
+    if not index_path or not Path(index_path).exists():
+        raise HTTPException(status_code=404, detail="Report index not found (CODEGATES_REPORT_INDEX disabled?)")
+    
+    return ReportIndex.load(index_path)
+
+
+@app.get("/api/v1/scan/{scan_id}/gates")
+async def query_report_gates(scan_id: str, gate: Optional[str] = None, status: Optional[str] = None,
+                             category: Optional[str] = None, offset: int = 0, limit: int = 50,
+                             fields: Optional[str] = None):
+    """
+    Page through a scan's gate results
+
+    gate, status and category take comma-separated values (e.g. status=FAIL,WARNING);
+    fields limits each item to the listed fields (e.g. fields=gate,status,score).
+    """
+    index = get_report_index(scan_id)
+    return JSONResponse(content=index.query_gates(gate=gate, status=status, category=category,
+                                                  offset=offset, limit=limit, fields=fields))
+
+
+@app.get("/api/v1/scan/{scan_id}/matches")
+async def query_report_matches(scan_id: str, gate: Optional[str] = None, status: Optional[str] = None,
+                               file: Optional[str] = None, language: Optional[str] = None,
+                               source: Optional[str] = None, offset: int = 0, limit: int = 50,
+                               fields: Optional[str] = None):
+    """
+    Page through a scan's pattern matches
+
+    Filter by gate, gate status, file (exact path, or a directory ending in "/"),
+    language and source (llm or static); fields limits each item to the listed fields.
+    """
+    index = get_report_index(scan_id)
+    return JSONResponse(content=index.query_matches(gate=gate, status=status, file=file, language=language,
+                                                    source=source, offset=offset, limit=limit, fields=fields))
+
+
+@app.get("/api/v1/scan/{scan_id}/profile")
+async def get_scan_profile(scan_id: str, format: str = "pstats"):
+    """
+    Download the profile of a scan started with "profile": true
+
+    format: pstats (cProfile stats for pstats/snakeviz), collapsed (stacks for
+    flamegraph.pl/speedscope) or summary (text)
+    """
+    if scan_id not in scan_results:
+        raise HTTPException(status_code=404, detail="Scan not found")
+    
+    result = scan_results[scan_id]
+    
+    if result["status"] in ("pending", "running"):
+        raise HTTPException(status_code=400, detail="Scan not completed yet")
+    
+    profile_paths = result.get("profile_paths") or {}
+    if not profile_paths:
+        raise HTTPException(status_code=404, detail="Scan was not profiled")
+    
+    media_types = {
+        "pstats": "application/octet-stream",
+        "collapsed": "text/plain; charset=utf-8",
+        "summary": "text/plain; charset=utf-8"
+    }
+    if format not in media_types:
+        raise HTTPException(status_code=400, detail=f"Unknown profile format: {format} (use {', '.join(media_types)})")
+    
+    profile_path = profile_paths.get(format)
+    if not profile_path or not Path(profile_path).exists():
+        raise HTTPException(status_code=404, detail=f"Profile {format} output not found")
+    
+    return FileResponse(profile_path, media_type=media_types[format], filename=Path(profile_path).name)
+
+
+@app.post("/api/v1/scans/batch")
+async def start_batch_scan(request: BatchScanRequest, background_tasks: BackgroundTasks):
+    """
+    Start scanning a list of repositories and/or every repository of an organization
+    
+    Each repository becomes a regular scan (see /api/v1/scan/{scan_id}); the batch
+    status and aggregate report are served under /api/v1/scans/batch/{batch_id}.
+    """
+    if not request.repositories and not request.org_url:
+        raise HTTPException(status_code=400, detail="Give repositories or org_url")
+    
+    batch_id = str(uuid.uuid4())
+    batch_results[batch_id] = {
+        "batch_id": batch_id,
+        "status": "running",
+        "request": request.dict(exclude={"github_token", "llm_api_key"}),
+        "created_at": datetime.now().isoformat(),
+        "repositories_total": None,
+        "repositories_done": 0,
+        "repositories": [],
+        "summary": None,
+        "report_paths": {},
+        "errors": []
+    }
+    
+    # Runs in the background thread pool; scans inside the batch run in their own threads
+    background_tasks.add_task(perform_batch_scan, batch_id, request)
+    
+    return {
+        "batch_id": batch_id,
+        "status": "running",
+        "message": "Batch scan started successfully",
+        "created_at": batch_results[batch_id]["created_at"],
+        "status_url": f"{get_server_url()}/api/v1/scans/batch/{batch_id}"
+    }
+
+
+@app.get("/api/v1/scans/batch/{batch_id}")
+async def get_batch_scan_status(batch_id: str):
+    """
+    Get batch progress, per-repository results and the aggregate summary
+    """
+    if batch_id not in batch_results:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    
+    with batch_lock:
+        result = dict(batch_results[batch_id])
+        result["repositories"] = list(result["repositories"])
+    
+    if result["report_paths"]:
+        server_url = get_server_url()
+        result["report_urls"] = {fmt: f"{server_url}/api/v1/scans/batch/{batch_id}/report?format={fmt}" for fmt in result["report_paths"]}
+    result.pop("report_paths")
+    
+    return JSONResponse(content=result)
+
+
+@app.get("/api/v1/scans/batch/{batch_id}/report")
+async def get_batch_report(batch_id: str, format: str = "json"):
+    """
+    Download the aggregate batch report (format: json or csv)
+    """
+    if batch_id not in batch_results:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    
+    result = batch_results[batch_id]
+    if result["status"] == "running":
+        raise HTTPException(status_code=400, detail="Batch not completed yet")
+    
+    if format not in ("json", "csv"):
+        raise HTTPException(status_code=400, detail=f"Unknown report format: {format} (use json or csv)")
+    
+    report_path = result["report_paths"].get(format)
+    if not report_path or not Path(report_path).exists():
+        raise HTTPException(status_code=404, detail="Batch report not found")
+    
+    media_type = "application/json" if format == "json" else "text/csv; charset=utf-8"
+    return FileResponse(report_path, media_type=media_type, filename=Path(report_path).name)
+
+
 @app.get("/api/v1/gates", response_model=List[GateInfo])
 async def list_gates():
     """
@@ -318,10 +570,23 @@ async def health_check():
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Prometheus metrics: per-node and per-gate timings and counters aggregated over finished scans
+    """
+    active_scans = len([s for s in scan_results.values() if s["status"] == "running"])
+    return PlainTextResponse(
+        METRICS_REGISTRY.render(active_scans=active_scans),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 async def perform_scan(scan_id: str, request: ScanRequest):
     """
     Perform the actual repository scan in background
     """
+    shared = {}
     try:
         # Update status
         scan_results[scan_id]["status"] = "running"
@@ -351,7 +616,16 @@ async def perform_scan(scan_id: str, request: ScanRequest):
                 "scan_id": scan_id,
                 "output_dir": scan_reports_dir,
                 "report_format": request.report_format,
-                "verbose": False
+                "verbose": False,
+                "profile": request.profile,
+                "profile_mode": request.profile_mode,
+                "report_detail": request.report_detail,
+                "report_json_format": request.report_json_format,
+                "report_gzip": request.report_gzip,
+                "html_mode": request.html_mode,
+                "fast_verdict": request.fast_verdict,
+                "file_selection": request.file_selection,
+                "repository_source": request.repository_source
             },
             "server": {
                 "url": server_url,
@@ -402,8 +676,11 @@ async def perform_scan(scan_id: str, request: ScanRequest):
         # Create progress-aware flow
         validation_flow = create_progress_aware_flow(scan_id)
         
-        # Run the flow with progress tracking
-        validation_flow.run(shared)
+        # Run the flow with progress tracking (profiled if requested)
+        with profile_scan(shared):
+            validation_flow.run(shared)
+        if shared["reports"].get("profile"):
+            scan_results[scan_id]["profile_paths"] = shared["reports"]["profile"]
         
         # Update scan results
         if shared["validation"]["gate_results"]:
@@ -427,6 +704,8 @@ async def perform_scan(scan_id: str, request: ScanRequest):
                 "total_gates": len(gate_results),
                 "html_report_path": shared["reports"]["html_path"],
                 "json_report_path": shared["reports"]["json_path"],
+                "report_index_path": shared["reports"].get("index_path"),
+                "html_details_path": shared["reports"].get("html_details_path"),
                 "html_report_url": html_report_url,
                 "json_report_url": json_report_url,
                 "completed_at": datetime.now().isoformat(),
@@ -436,6 +715,8 @@ async def perform_scan(scan_id: str, request: ScanRequest):
                 "step_details": "Scan completed successfully"
             })
             
+            METRICS_REGISTRY.observe_scan(shared.get("metrics"), "completed")
+            
             # Print report URLs to logs
             print(f"📄 Scan {scan_id} completed successfully!")
             if html_report_url:
@@ -450,8 +731,10 @@ async def perform_scan(scan_id: str, request: ScanRequest):
                 "progress_percentage": 0,
                 "step_details": "Scan failed - no validation results generated"
             })
+            METRICS_REGISTRY.observe_scan(shared.get("metrics"), "failed")
     
     except Exception as e:
+        METRICS_REGISTRY.observe_scan(shared.get("metrics"), "failed")
         scan_results[scan_id].update({
             "status": "failed",
             "errors": [str(e)],
@@ -461,6 +744,100 @@ async def perform_scan(scan_id: str, request: ScanRequest):
         })
 
 
+def perform_batch_scan(batch_id: str, request: BatchScanRequest):
+    """
+    Run a batch scan in background, registering every repository scan as it finishes
+    """
+    server_url = get_server_url()
+    
+    def record_scan(row: Dict[str, Any], shared: Dict[str, Any]):
+        scan_id = row["scan_id"]
+        html_report_url = f"{server_url}/api/v1/scan/{scan_id}/report/html" if row["html_path"] else None
+        json_report_url = f"{server_url}/api/v1/scan/{scan_id}/report/json" if row["json_path"] else None
+        scan_results[scan_id] = {
+            "scan_id": scan_id,
+            "batch_id": batch_id,
+            "status": row["status"],
+            "request": {"repository_url": row["repository_url"], "branch": row["branch"], "threshold": request.threshold},
+            "created_at": batch_results[batch_id]["created_at"],
+            "overall_score": row["overall_score"],
+            "total_files": row["total_files"],
+            "total_lines": row["total_lines"],
+            "passed_gates": row["passed_gates"],
+            "failed_gates": row["failed_gates"],
+            "warning_gates": row["warning_gates"],
+            "total_gates": row["total_gates"],
+            "html_report_path": row["html_path"],
+            "json_report_path": row["json_path"],
+            "report_index_path": shared["reports"].get("index_path"),
+            "html_details_path": shared["reports"].get("html_details_path"),
+            "html_report_url": html_report_url,
+            "json_report_url": json_report_url,
+            "completed_at": datetime.now().isoformat(),
+            "errors": row["errors"],
+            "current_step": "Completed" if row["status"] == "completed" else "Failed",
+            "progress_percentage": 100 if row["status"] == "completed" else 0,
+            "step_details": None
+        }
+        METRICS_REGISTRY.observe_scan(shared.get("metrics"), row["status"])
+        with batch_lock:
+            batch = batch_results[batch_id]
+            batch["repositories_done"] += 1
+            batch["repositories"].append({
+                key: row[key] for key in ("repository_url", "branch", "scan_id", "status", "overall_score", "meets_threshold", "errors")
+            })
+    
+    try:
+        targets = resolve_batch_targets(
+            [repo.dict() if isinstance(repo, BatchRepository) else repo for repo in request.repositories],
+            org_url=request.org_url,
+            branch=request.branch,
+            github_token=request.github_token,
+            include_forks=request.include_forks,
+            include_archived=request.include_archived,
+            limit=request.limit
+        )
+        batch_results[batch_id]["repositories_total"] = len(targets)
+        
+        report = run_batch(
+            targets,
+            create_validation_flow,
+            request_options={
+                "github_token": request.github_token,
+                "threshold": request.threshold,
+                "report_format": request.report_format,
+                "verbose": False,
+                "quiet": True
+            },
+            llm_config={"url": request.llm_url, "api_key": request.llm_api_key},
+            output_dir=REPORTS_DIR,
+            limits={"clone": request.clone_workers, "scan": request.scan_workers, "llm": request.llm_workers},
+            batch_id=batch_id,
+            temp_root=TEMP_DIR,
+            directories={"reports": REPORTS_DIR, "logs": LOGS_DIR, "temp": TEMP_DIR},
+            on_result=record_scan
+        )
+        
+        batch_results[batch_id].update({
+            "status": "completed",
+            "completed_at": report["completed_at"],
+            "duration_seconds": report["duration_seconds"],
+            "summary": report["summary"],
+            "gates": report["gates"],
+            "stages": report["stages"],
+            "report_paths": report["report_paths"]
+        })
+        print(f"📦 Batch {batch_id} completed: {report['summary']['completed']}/{report['summary']['repositories']} repositories scanned")
+        print(f"🌐 Batch Report URL: {server_url}/api/v1/scans/batch/{batch_id}/report")
+    
+    except Exception as e:
+        batch_results[batch_id].update({
+            "status": "failed",
+            "completed_at": datetime.now().isoformat(),
+            "errors": [str(e)]
+        })
+
+
 def create_progress_aware_flow(scan_id: str):
     """
     Create a progress-aware validation flow that reports progress to scan_results
@@ -549,6 +926,8 @@ if __name__ == "__main__":
     print(f"🚪 Port: {SERVER_PORT}")
     print(f"📋 API Documentation: {server_url}/docs")
     print(f"🏥 Health Check: {server_url}/api/v1/health")
+    print(f"📈 Metrics: {server_url}/metrics")
+    print(f"📦 Batch Scans: POST {server_url}/api/v1/scans/batch")
     print(f"🔍 Available Gates: {server_url}/api/v1/gates")
     print("=" * 60)
     print("📄 Report URLs will be printed in the logs when scans complete")
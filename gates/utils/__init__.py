@@ -1,22 +1,77 @@
 """
 CodeGates Utilities Package
 Contains utility functions for the PocketFlow-based CodeGates application
+
+Exports are imported on first use: importing one utility (or this package) does
+not load GitPython, the LLM provider SDKs or the report code of the others.
 """
 
-from .hard_gates import HARD_GATES, get_gate_by_name, get_gates_by_category
-from .git_operations import clone_repository, cleanup_repository
-from .file_scanner import scan_directory
-from .llm_client import create_llm_client_from_env, LLMClient, LLMConfig, LLMProvider
-
-__all__ = [
-    'HARD_GATES',
-    'get_gate_by_name', 
-    'get_gates_by_category',
-    'clone_repository',
-    'cleanup_repository', 
-    'scan_directory',
-    'create_llm_client_from_env',
-    'LLMClient',
-    'LLMConfig',
-    'LLMProvider'
-] 
\ No newline at end of file
+import importlib
+
+
+# Exported name -> submodule defining it
+_EXPORTS = {
+    'HARD_GATES': 'hard_gates',
+    'get_gate_by_name': 'hard_gates',
+    'get_gates_by_category': 'hard_gates',
+    'clone_repository': 'git_operations',
+    'cleanup_repository': 'git_operations',
+    'GitObjectSource': 'git_object_source',
+    'LocalFileSource': 'local_source',
+    'scan_directory': 'file_scanner',
+    'analyze_repository': 'repository_analyzer',
+    'FileExtractor': 'repository_analyzer',
+    'extract_dependencies': 'dependency_extractor',
+    'get_dependency_cache': 'dependency_extractor',
+    'create_llm_client_from_env': 'llm_client',
+    'LLMClient': 'llm_client',
+    'LLMConfig': 'llm_client',
+    'LLMProvider': 'llm_client',
+    'FileContentCache': 'content_cache',
+    'get_scan_content_cache': 'content_cache',
+    'FileRelevanceIndex': 'relevance_index',
+    'PatternSafetyGuard': 'pattern_safety',
+    'analyze_pattern': 'pattern_safety',
+    'rewrite_pattern': 'pattern_safety',
+    'TrigramIndex': 'trigram_index',
+    'get_scan_trigram_index': 'trigram_index',
+    'InstrumentedNode': 'instrumentation',
+    'MetricsRegistry': 'instrumentation',
+    'get_scan_metrics': 'instrumentation',
+    'ScanLogger': 'scan_logger',
+    'get_scan_logger': 'scan_logger',
+    'get_logger': 'scan_logger',
+    'StackSampler': 'profiler',
+    'profile_scan': 'profiler',
+    'StageLimiter': 'batch_runner',
+    'BatchCache': 'batch_runner',
+    'run_batch': 'batch_runner',
+    'resolve_batch_targets': 'batch_runner',
+    'ScanDaemon': 'scan_daemon',
+    'PipelineScheduler': 'stage_scheduler',
+    'StringTables': 'report_writer',
+    'write_json_report': 'report_writer',
+    'read_json_report': 'report_writer',
+    'ReportIndex': 'report_index',
+    'write_report_index': 'report_index',
+    'MatchTable': 'match_table',
+    'StaticPatternRegistry': 'static_patterns',
+    'get_static_pattern_registry': 'static_patterns',
+    'GateVerdictTracker': 'early_termination',
+    'StratifiedFileSample': 'file_sampling'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,458 @@
+"""
+Batch Runner Utility
+Scans many repositories in one run with bounded per-stage parallelism, shared caches and one aggregate report
+"""
+
+import os
+import csv
+import json
+import time
+import uuid
+import shutil
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable
+
+from .hard_gates import HARD_GATES
+from .git_operations import list_repositories
+from .scan_logger import ScanLogger
+from .stage_scheduler import PipelineScheduler
+
+
+# Flow stages with their own concurrency limit; nodes declare their stage
+STAGES = ("clone", "scan", "llm")
+
+# Default slots per stage (override with CODEGATES_BATCH_<STAGE>_WORKERS).
+# Cloning and LLM calls wait on the network; scanning is CPU bound and shares
+# one interpreter, so a couple of scan slots keep it busy while others wait.
+DEFAULT_STAGE_WORKERS = {"clone": 4, "scan": 2, "llm": 4}
+
+
+def get_stage_limits(overrides: Optional[Dict[str, Optional[int]]] = None) -> Dict[str, int]:
+    """Per-stage worker limits from the environment, overridden by non-empty entries of overrides"""
+    limits = {}
+    for stage in STAGES:
+        value = (overrides or {}).get(stage)
+        if value is None:
+            value = os.getenv(f"CODEGATES_BATCH_{stage.upper()}_WORKERS", str(DEFAULT_STAGE_WORKERS[stage]))
+        limits[stage] = max(1, int(value))
+    return limits
+
+
+class StageLimiter:
+    """
+    Bounds how many scans run each flow stage at the same time.
+
+    The pipeline scheduler takes slots without blocking when it dispatches a
+    node; InstrumentedNode acquires one (blocking) when a shared store carries
+    the limiter instead. Either way a batch can clone a few repositories, scan a
+    few others and wait on the LLM for more, each stage capped independently.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None):
+        self.limits = get_stage_limits(limits)
+        self._semaphores = {stage: threading.BoundedSemaphore(limit) for stage, limit in self.limits.items()}
+        self._lock = threading.Lock()
+        self._stats = {stage: {"acquired": 0, "active": 0, "peak": 0, "wait_seconds": 0.0} for stage in self.limits}
+
+    def acquire(self, stage: str) -> float:
+        """Wait for a slot of a stage; returns the seconds spent waiting (unknown stages are not limited)"""
+        semaphore = self._semaphores.get(stage)
+        if semaphore is None:
+            return 0.0
+        start = time.perf_counter()
+        semaphore.acquire()
+        waited = time.perf_counter() - start
+        with self._lock:
+            stats = self._stats[stage]
+            stats["acquired"] += 1
+            stats["active"] += 1
+            stats["peak"] = max(stats["peak"], stats["active"])
+            stats["wait_seconds"] += waited
+        return waited
+
+    def try_acquire(self, stage: str) -> bool:
+        """Take a slot of a stage if one is free, without waiting"""
+        semaphore = self._semaphores.get(stage)
+        if semaphore is None:
+            return True
+        if not semaphore.acquire(blocking=False):
+            return False
+        with self._lock:
+            stats = self._stats[stage]
+            stats["acquired"] += 1
+            stats["active"] += 1
+            stats["peak"] = max(stats["peak"], stats["active"])
+        return True
+
+    def record_wait(self, stage: str, seconds: float) -> None:
+        """Account time a stage's work waited in a scheduler queue"""
+        with self._lock:
+            if stage in self._stats:
+                self._stats[stage]["wait_seconds"] += seconds
+
+    def release(self, stage: str) -> None:
+        semaphore = self._semaphores.get(stage)
+        if semaphore is None:
+            return
+        with self._lock:
+            self._stats[stage]["active"] -= 1
+        semaphore.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                stage: {"limit": self.limits[stage], **{k: round(v, 3) if isinstance(v, float) else v for k, v in stats.items()}}
+                for stage, stats in self._stats.items()
+            }
+
+
+class BatchCache:
+    """
+    Caches shared by all scans of a batch.
+
+    - The LLM client is created (and its availability checked, tokens fetched)
+      once instead of once per repository.
+    - Pattern screening results (ReDoS analysis and adversarial probing) are
+      reused across repositories, which mostly get the same LLM patterns.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._llm_client = None
+        self._llm_client_created = False
+        self.pattern_screens: Dict[tuple, tuple] = {}
+        self.llm_client_reuses = 0
+
+    def get_llm_client(self, factory: Callable[[], Any]) -> Any:
+        """Get the batch LLM client, creating it with factory on first use (None if unavailable)"""
+        with self._lock:
+            if not self._llm_client_created:
+                self._llm_client = factory()
+                self._llm_client_created = True
+            else:
+                self.llm_client_reuses += 1
+            return self._llm_client
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "llm_client_reuses": self.llm_client_reuses,
+            "pattern_screens_cached": len(self.pattern_screens)
+        }
+
+
+def get_batch_cache(shared: Dict[str, Any]) -> Optional[BatchCache]:
+    """Batch cache of the scan, None outside batch scans"""
+    return shared.get("batch_cache")
+
+
+def read_repository_file(path: str) -> List[Dict[str, Optional[str]]]:
+    """
+    Read batch targets from a file
+
+    One repository per line as "URL" or "URL BRANCH"; blank lines and lines
+    starting with # are ignored.
+    """
+    targets = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            parts = line.split()
+            targets.append({"repository_url": parts[0], "branch": parts[1] if len(parts) > 1 else None})
+    return targets
+
+
+def resolve_batch_targets(repositories: Optional[List[Any]] = None, org_url: Optional[str] = None,
+                          branch: Optional[str] = None, github_token: Optional[str] = None,
+                          include_forks: bool = False, include_archived: bool = False,
+                          limit: Optional[int] = None) -> List[Dict[str, str]]:
+    """
+    Build the list of repositories to scan
+
+    Args:
+        repositories: Repository URLs or {"repository_url", "branch"} dicts
+        org_url: GitHub organization or user URL whose repositories are added
+        branch: Branch for repositories that do not name one; if None, listed
+                repositories use "main" and organization repositories their default branch
+        github_token: GitHub token for listing private organization repositories
+        include_forks: Include forks when listing an organization
+        include_archived: Include archived repositories when listing an organization
+        limit: Scan at most this many repositories
+
+    Returns:
+        De-duplicated list of {"repository_url", "branch"} dicts in input order
+    """
+    candidates = []
+    for repository in repositories or []:
+        if isinstance(repository, str):
+            repository = {"repository_url": repository}
+        candidates.append({
+            "repository_url": repository["repository_url"],
+            "branch": repository.get("branch") or branch or "main"
+        })
+
+    if org_url:
+        for repository in list_repositories(org_url, github_token, include_forks=include_forks, include_archived=include_archived):
+            candidates.append({
+                "repository_url": repository["repository_url"],
+                "branch": branch or repository["branch"]
+            })
+
+    targets = []
+    seen = set()
+    for target in candidates:
+        url = target["repository_url"].rstrip("/").lower()
+        key = (url[:-4] if url.endswith(".git") else url, target["branch"])
+        if key not in seen:
+            seen.add(key)
+            targets.append(target)
+
+    return targets[:limit] if limit else targets
+
+
+def build_scan_shared(request: Dict[str, Any], llm_config: Optional[Dict[str, Any]], temp_dir: str) -> Dict[str, Any]:
+    """Build the shared store for one scan"""
+    return {
+        "request": request,
+        "llm_config": dict(llm_config or {}),
+        "repository": {
+            "local_path": None,
+            "metadata": {}
+        },
+        "config": {
+            "build_files": {},
+            "config_files": {},
+            "dependencies": []
+        },
+        "llm": {
+            "prompt": None,
+            "response": None,
+            "patterns": {},
+            "source": "unknown",
+            "model": "unknown"
+        },
+        "validation": {
+            "gate_results": [],
+            "overall_score": 0.0
+        },
+        "reports": {
+            "html_path": None,
+            "json_path": None
+        },
+        "hard_gates": HARD_GATES,
+        "temp_dir": temp_dir,
+        "errors": []
+    }
+
+
+def run_batch(targets: List[Dict[str, str]], flow_factory: Callable[[], Any], request_options: Optional[Dict[str, Any]] = None,
+              llm_config: Optional[Dict[str, Any]] = None, output_dir: str = "./reports", limits: Optional[Dict[str, int]] = None,
+              batch_id: Optional[str] = None, temp_root: Optional[str] = None, directories: Optional[Dict[str, Any]] = None,
+              on_result: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None,
+              logger: Optional[ScanLogger] = None, max_in_flight: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Scan many repositories and write one aggregate report
+
+    The scans are pipelined through the stage scheduler: clones and LLM calls
+    run on a network pool (clone + llm workers), file processing, pattern
+    matching and reports on a CPU pool (scan workers), and each stage keeps its
+    own limit, so a slow clone or LLM call never holds up repositories that are
+    ready to scan.
+
+    Args:
+        targets: {"repository_url", "branch"} dicts (see resolve_batch_targets)
+        flow_factory: Creates a validation flow for one repository
+        request_options: Request keys shared by all scans (threshold, report_format, github_token, ...)
+        llm_config: LLM configuration shared by all scans
+        output_dir: Directory for the aggregate report; repository reports go to output_dir/batch_<batch_id>
+        limits: Per-stage worker limits (see get_stage_limits)
+        batch_id: Batch identifier (generated if None)
+        temp_root: Parent directory for per-scan temp directories (system temp if None)
+        directories: Optional "directories" section for each scan's shared store (logs, ...)
+        on_result: Called with (result row, shared store) after each repository
+        logger: Logger for batch progress lines
+        max_in_flight: Scans started but not finished at most (CODEGATES_BATCH_MAX_IN_FLIGHT,
+                       default twice the number of workers); bounds checkouts on disk
+
+    Returns:
+        The aggregate report, including "report_paths"
+    """
+    batch_id = batch_id or str(uuid.uuid4())
+    request_options = dict(request_options or {})
+    log = logger or ScanLogger(scan_id=batch_id)
+    limiter = StageLimiter(limits)
+    cache = BatchCache()
+    scans_dir = Path(output_dir) / f"batch_{batch_id}"
+    scans_dir.mkdir(parents=True, exist_ok=True)
+
+    if max_in_flight is None and os.getenv("CODEGATES_BATCH_MAX_IN_FLIGHT"):
+        max_in_flight = int(os.getenv("CODEGATES_BATCH_MAX_IN_FLIGHT"))
+    scheduler = PipelineScheduler(
+        network_workers=limiter.limits["clone"] + limiter.limits["llm"],
+        cpu_workers=limiter.limits["scan"],
+        max_in_flight=max_in_flight,
+        limiter=limiter
+    )
+
+    rows: List[Optional[Dict[str, Any]]] = [None] * len(targets)
+    scans: Dict[int, Dict[str, Any]] = {}
+    progress = {"done": 0}
+    progress_lock = threading.Lock()
+    created_at = datetime.now().isoformat()
+    start = time.perf_counter()
+
+    log.info(f"📦 Batch {batch_id}: {len(targets)} repositories "
+             f"(clone {limiter.limits['clone']}, scan {limiter.limits['scan']}, llm {limiter.limits['llm']} workers)",
+             "batch_started", repositories=len(targets), limits=limiter.limits)
+
+    def start_scan(index: int):
+        target = targets[index]
+        scan_id = str(uuid.uuid4())
+        temp_dir = tempfile.mkdtemp(prefix=f"codegates_{scan_id}_", dir=temp_root)
+        request = {
+            "threshold": 70,
+            "report_format": "both",
+            "verbose": False,
+            **request_options,
+            "repository_url": target["repository_url"],
+            "branch": target["branch"],
+            "scan_id": scan_id,
+            "output_dir": str(scans_dir)
+        }
+        shared = build_scan_shared(request, llm_config, temp_dir)
+        if directories:
+            shared["directories"] = dict(directories)
+        shared["batch_cache"] = cache
+        scans[index] = {"scan_id": scan_id, "temp_dir": temp_dir, "started_at": time.perf_counter()}
+        return flow_factory(), shared
+
+    def finish_scan(index: int, shared: Optional[Dict[str, Any]], error: Optional[BaseException]):
+        target = targets[index]
+        scan = scans.get(index) or {"scan_id": str(uuid.uuid4()), "temp_dir": None, "started_at": time.perf_counter()}
+        if scan["temp_dir"]:
+            shutil.rmtree(scan["temp_dir"], ignore_errors=True)
+        if shared is None:
+            shared = build_scan_shared({**request_options, **target}, llm_config, "")
+        if error is not None:
+            shared["errors"].append(str(error))
+
+        row = summarize_scan(target, scan["scan_id"], shared, time.perf_counter() - scan["started_at"])
+        rows[index] = row
+        with progress_lock:
+            progress["done"] += 1
+            done = progress["done"]
+        if row["status"] == "completed":
+            log.info(f"{'✅' if row['meets_threshold'] else '❌'} [{done}/{len(targets)}] {row['repository_url']}@{row['branch']}: "
+                     f"{row['overall_score']:.1f}% ({row['passed_gates']}/{row['total_gates']} gates) in {row['duration_seconds']:.1f}s",
+                     "repository_scanned", repository=row["repository_url"], score=row["overall_score"])
+        else:
+            log.warning(f"💥 [{done}/{len(targets)}] {row['repository_url']}@{row['branch']} failed: {'; '.join(row['errors'][-1:])}",
+                        "repository_failed", repository=row["repository_url"])
+        if on_result is not None:
+            on_result(row, shared)
+
+    scheduler.run(range(len(targets)), start_scan, finish_scan)
+
+    duration = time.perf_counter() - start
+    report = build_batch_report(batch_id, rows, request_options.get("threshold", 70), created_at,
+                                duration, limiter.get_stats(), cache.get_stats())
+    report["pipeline"] = scheduler.get_stats()
+    report["report_paths"] = write_batch_report(report, output_dir)
+    summary = report["summary"]
+    log.info(f"📦 Batch {batch_id} finished in {report['duration_seconds']:.1f}s ({summary['scans_per_hour']:.0f} scans/hour): "
+             f"{summary['completed']} completed, {summary['failed']} failed, {summary['meets_threshold']} meet the {summary['threshold']}% threshold",
+             "batch_finished", **summary)
+    return report
+
+
+def summarize_scan(target: Dict[str, str], scan_id: str, shared: Dict[str, Any], duration: float) -> Dict[str, Any]:
+    """One aggregate report row from a finished scan's shared store"""
+    gate_results = shared["validation"]["gate_results"]
+    threshold = shared["request"].get("threshold", 70)
+    score = shared["validation"]["overall_score"] if gate_results else 0.0
+    nodes = shared.get("metrics", {}).get("nodes", {})
+    metadata = shared["repository"]["metadata"] or {}
+    errors = list(shared["errors"])
+    if not gate_results and not errors:
+        errors.append("No validation results generated")
+    return {
+        "repository_url": target["repository_url"],
+        "branch": target["branch"],
+        "scan_id": scan_id,
+        "status": "completed" if gate_results else "failed",
+        "overall_score": score,
+        "meets_threshold": bool(gate_results) and score >= threshold,
+        "passed_gates": len([g for g in gate_results if g.get("status") == "PASS"]),
+        "failed_gates": len([g for g in gate_results if g.get("status") == "FAIL"]),
+        "warning_gates": len([g for g in gate_results if g.get("status") == "WARNING"]),
+        "total_gates": len(gate_results),
+        "total_files": metadata.get("total_files", 0),
+        "total_lines": metadata.get("total_lines", 0),
+        "duration_seconds": round(duration, 3),
+        "queue_seconds": round(sum(n.get("queue_seconds", 0.0) for n in nodes.values()), 3),
+        "gates": {g.get("gate", "UNKNOWN"): g.get("status") for g in gate_results},
+        "html_path": shared["reports"].get("html_path"),
+        "json_path": shared["reports"].get("json_path"),
+        "errors": errors
+    }
+
+
+def build_batch_report(batch_id: str, rows: List[Dict[str, Any]], threshold: int, created_at: str, duration: float,
+                       stage_stats: Dict[str, Any], cache_stats: Dict[str, Any]) -> Dict[str, Any]:
+    """Aggregate report over all scanned repositories"""
+    completed = [row for row in rows if row["status"] == "completed"]
+
+    gates: Dict[str, Dict[str, Any]] = {}
+    for row in completed:
+        for gate_name, status in row["gates"].items():
+            counts = gates.setdefault(gate_name, {"PASS": 0, "FAIL": 0, "WARNING": 0, "NOT_APPLICABLE": 0})
+            counts[status] = counts.get(status, 0) + 1
+    for counts in gates.values():
+        applicable = sum(counts.values()) - counts.get("NOT_APPLICABLE", 0)
+        counts["pass_rate"] = round(counts["PASS"] / applicable * 100, 1) if applicable else None
+
+    return {
+        "batch_id": batch_id,
+        "created_at": created_at,
+        "completed_at": datetime.now().isoformat(),
+        "duration_seconds": round(duration, 3),
+        "summary": {
+            "repositories": len(rows),
+            "completed": len(completed),
+            "failed": len(rows) - len(completed),
+            "meets_threshold": len([row for row in completed if row["meets_threshold"]]),
+            "below_threshold": len([row for row in completed if not row["meets_threshold"]]),
+            "threshold": threshold,
+            "average_score": round(sum(row["overall_score"] for row in completed) / len(completed), 1) if completed else 0.0,
+            "scans_per_hour": round(len(rows) / duration * 3600, 1) if duration > 0 else 0.0
+        },
+        "gates": gates,
+        "stages": stage_stats,
+        "caches": cache_stats,
+        "repositories": rows
+    }
+
+
+def write_batch_report(report: Dict[str, Any], output_dir: str) -> Dict[str, str]:
+    """Write the aggregate report as JSON and a one-row-per-repository CSV; returns their paths"""
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    json_path = output_path / f"codegates_batch_{report['batch_id']}.json"
+    csv_path = output_path / f"codegates_batch_{report['batch_id']}.csv"
+
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, default=str)
+
+    columns = ["repository_url", "branch", "status", "overall_score", "meets_threshold", "passed_gates", "failed_gates",
+               "warning_gates", "total_gates", "total_files", "total_lines", "duration_seconds", "scan_id", "json_path", "html_path"]
+    with open(csv_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns + ["errors"], extrasaction="ignore")
+        writer.writeheader()
+        for row in report["repositories"]:
+            writer.writerow({**row, "errors": "; ".join(row["errors"])})
+
+    return {"json": str(json_path), "csv": str(csv_path)}
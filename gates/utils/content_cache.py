@@ -0,0 +1,235 @@
+"""
+Content Cache Utility
+Scan-scoped LRU cache of decoded file contents shared by all nodes and gates
+"""
+
+import io
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, BinaryIO
+
+
+# Default byte budget for a single scan (override with CODEGATES_CONTENT_CACHE_MB)
+DEFAULT_CONTENT_CACHE_MB = 256
+
+
+class FileContentCache:
+    """
+    LRU cache of decoded file contents keyed by relative_path.
+
+    Files are read from disk at most once while they stay within the byte budget,
+    so the 15 gates x 2 pattern sources share a single read of each file.
+    With a source (GitObjectSource, LocalFileSource), misses and existence
+    checks go through it instead of the working tree.
+    Thread-safe because pattern matching runs in a worker thread per gate.
+    """
+
+    def __init__(self, repo_path: str, max_bytes: Optional[int] = None, source=None):
+        self.repo_path = Path(repo_path) if repo_path else Path(".")
+        self.source = source
+        if max_bytes is None:
+            max_bytes = int(os.getenv("CODEGATES_CONTENT_CACHE_MB", str(DEFAULT_CONTENT_CACHE_MB))) * 1024 * 1024
+        self.max_bytes = max(0, int(max_bytes))
+
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_reads = 0
+        self.bytes_read = 0
+        self.bytes_served = 0
+
+    def __contains__(self, relative_path: str) -> bool:
+        with self._lock:
+            return relative_path in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get_size(self, relative_path: str) -> Optional[int]:
+        """Get the on-disk size of a cached file, or None if it is not cached"""
+        with self._lock:
+            return self._sizes.get(relative_path)
+
+    def exists(self, relative_path: str) -> bool:
+        """Whether a file exists in the repository (cached or not)"""
+        if self.source is not None:
+            return self.source.exists(relative_path)
+        return (self.repo_path / relative_path).exists()
+
+    def file_size(self, relative_path: str) -> int:
+        """
+        Get a file's size without reading it
+
+        Raises:
+            OSError: If the file does not exist
+        """
+        if self.source is not None:
+            return self.source.get_size(relative_path)
+        return (self.repo_path / relative_path).stat().st_size
+
+    def get_text(self, relative_path: str) -> str:
+        """
+        Get decoded file content, reading from disk only on a cache miss
+
+        Args:
+            relative_path: File path relative to the repository root
+
+        Returns:
+            File content decoded as UTF-8 (undecodable bytes ignored)
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        with self._lock:
+            content = self._entries.get(relative_path)
+            if content is not None:
+                self._entries.move_to_end(relative_path)
+                self.hits += 1
+                self.bytes_served += self._sizes[relative_path]
+                return content
+
+        # Read outside the lock so a slow disk does not serialize other readers
+        if self.source is not None:
+            raw = self.source.read_bytes(relative_path)
+        else:
+            raw = (self.repo_path / relative_path).read_bytes()
+        content = raw.decode('utf-8', errors='ignore')
+        size = len(raw)
+
+        with self._lock:
+            self.misses += 1
+            self.disk_reads += 1
+            self.bytes_read += size
+            self.bytes_served += size
+            self._store(relative_path, content, size)
+
+        return content
+
+    def open_binary(self, relative_path: str) -> BinaryIO:
+        """
+        Open a file's raw bytes as a binary stream without caching it
+
+        The file is streamed from disk (or read through the source) even if its
+        text is cached: the cached text is decoded leniently and may differ
+        from the bytes. Large lockfiles never enter the cache.
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        if self.source is not None:
+            return io.BytesIO(self.source.read_bytes(relative_path))
+        return open(self.repo_path / relative_path, 'rb')
+
+    def read_head(self, relative_path: str, max_chars: int) -> str:
+        """
+        Get the first characters of a file without reading or caching the rest
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        with self._lock:
+            content = self._entries.get(relative_path)
+        if content is not None:
+            return content[:max_chars]
+        with self.open_binary(relative_path) as stream:
+            # UTF-8 uses at most 4 bytes per character
+            return stream.read(max_chars * 4).decode('utf-8', errors='ignore')[:max_chars]
+
+    def get_snippet(self, relative_path: str, line: int, context: int = 1, max_line_length: int = 200) -> str:
+        """
+        Get a few lines of source around a 1-based line number
+
+        Returns an empty string if the file cannot be read.
+        """
+        try:
+            lines = self.get_text(relative_path).splitlines()
+        except OSError:
+            return ""
+
+        start = max(line - 1 - context, 0)
+        end = min(line + context, len(lines))
+        snippet_lines = []
+        for number in range(start, end):
+            text = lines[number]
+            if len(text) > max_line_length:
+                text = text[:max_line_length] + "..."
+            snippet_lines.append(f"{number + 1:>5} | {text}")
+
+        return "\n".join(snippet_lines)
+
+    def clear(self) -> None:
+        """Drop all cached contents (statistics are preserved)"""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.current_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics for the scan stats"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "max_bytes": self.max_bytes,
+                "current_bytes": self.current_bytes,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "disk_reads": self.disk_reads,
+                "bytes_read": self.bytes_read,
+                "bytes_served": self.bytes_served
+            }
+
+    def _store(self, relative_path: str, content: str, size: int) -> None:
+        """Insert an entry and evict least recently used ones to stay within budget (lock held)"""
+        if size > self.max_bytes:
+            # Larger than the whole budget - serve it but never cache it
+            return
+
+        if relative_path in self._entries:
+            self.current_bytes -= self._sizes[relative_path]
+
+        self._entries[relative_path] = content
+        self._entries.move_to_end(relative_path)
+        self._sizes[relative_path] = size
+        self.current_bytes += size
+
+        while self.current_bytes > self.max_bytes and self._entries:
+            evicted_path, _ = self._entries.popitem(last=False)
+            self.current_bytes -= self._sizes.pop(evicted_path)
+            self.evictions += 1
+
+
+def get_scan_content_cache(shared: Dict[str, Any]) -> FileContentCache:
+    """
+    Get the content cache for the current scan, creating it on first use
+
+    The cache lives in the shared store so every node of a scan uses the same
+    instance. A new cache is created if the repository path or source changes.
+
+    Args:
+        shared: PocketFlow shared store
+
+    Returns:
+        Scan-scoped FileContentCache
+    """
+    repo_path = shared.get("repository", {}).get("local_path")
+    source = shared.get("repository", {}).get("source")
+    cache = shared.get("content_cache")
+
+    if cache is None or str(cache.repo_path) != str(Path(repo_path) if repo_path else Path(".")) or cache.source is not source:
+        budget_mb = shared.get("request", {}).get("content_cache_mb")
+        max_bytes = int(budget_mb) * 1024 * 1024 if budget_mb is not None else None
+        cache = FileContentCache(repo_path, max_bytes=max_bytes, source=source)
+        shared["content_cache"] = cache
+
+    return cache
@@ -0,0 +1,499 @@
+"""
+Dependency Extractor Utility
+Streaming dependency parsers for build manifests and lockfiles (Maven, Gradle, npm,
+yarn, Python requirements, Go modules, Ruby gems, .csproj), cached per file content hash
+"""
+
+import io
+import os
+import re
+import json
+import codecs
+import hashlib
+import threading
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Callable, Iterator, NamedTuple, BinaryIO, Tuple
+
+from .scan_logger import get_logger
+
+
+# Parsed manifests kept per process (override with CODEGATES_DEPENDENCY_CACHE_ENTRIES)
+DEFAULT_DEPENDENCY_CACHE_ENTRIES = 1024
+
+# Bytes read at a time from a manifest
+CHUNK_SIZE = 64 * 1024
+
+
+class Dependency(NamedTuple):
+    """
+    One entry of a manifest.
+
+    kind is "dependency" for declared packages (or "dev", "peer", "optional"
+    for npm sections), "locked" for lockfile entries, "parent", "plugin",
+    "project" and "reference" for build-system references, and "module",
+    "toolchain" and "engine" for the project itself and its runtime.
+    """
+
+    name: str
+    version: Optional[str] = None
+    ecosystem: str = ""
+    kind: str = "dependency"
+
+    @property
+    def is_package(self) -> bool:
+        """Whether this is something the project depends on (not its own module or runtime)"""
+        return self.kind not in ("module", "toolchain", "engine")
+
+
+# --- XML manifests (iterparse, elements are released as soon as they are read) ---
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _child_text(element, name: str) -> Optional[str]:
+    for child in element:
+        if _local_name(child.tag) == name:
+            return (child.text or "").strip() or None
+    return None
+
+
+def parse_maven(stream: BinaryIO) -> Iterator[Dependency]:
+    """Dependencies (including managed and plugin dependencies) and the parent of a pom.xml"""
+    path = []
+    for event, element in ET.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            path.append(_local_name(element.tag))
+            continue
+
+        name = path.pop()
+        if name == "dependency" and path and path[-1] == "dependencies":
+            group_id, artifact_id = _child_text(element, "groupId"), _child_text(element, "artifactId")
+            if artifact_id:
+                yield Dependency(f"{group_id}:{artifact_id}" if group_id else artifact_id,
+                                 _child_text(element, "version"), "maven", "dependency")
+            element.clear()
+        elif name == "parent" and len(path) == 1:
+            group_id, artifact_id = _child_text(element, "groupId"), _child_text(element, "artifactId")
+            if group_id and artifact_id:
+                yield Dependency(f"{group_id}:{artifact_id}", _child_text(element, "version"), "maven", "parent")
+            element.clear()
+        elif len(path) <= 1:
+            element.clear()
+
+
+def parse_csproj(stream: BinaryIO) -> Iterator[Dependency]:
+    """PackageReference, ProjectReference and Reference items of a .csproj"""
+    for _, element in ET.iterparse(stream, events=("end",)):
+        name = _local_name(element.tag)
+        include = element.get("Include") or element.get("Update")
+        if name == "PackageReference" and include:
+            yield Dependency(include, element.get("Version") or _child_text(element, "Version"), "nuget", "dependency")
+        elif name == "ProjectReference" and include:
+            yield Dependency(os.path.splitext(os.path.basename(include.replace("\\", "/")))[0], None, "nuget", "project")
+        elif name == "Reference" and include:
+            yield Dependency(include, None, "nuget", "reference")
+        if name in ("PackageReference", "ProjectReference", "Reference", "ItemGroup", "PropertyGroup"):
+            element.clear()
+
+
+# --- Line-oriented manifests ---
+
+def _iter_lines(stream: BinaryIO) -> Iterator[str]:
+    """Decoded lines of a binary stream (UTF-8, undecodable bytes dropped), one at a time"""
+    text = io.TextIOWrapper(stream, encoding="utf-8", errors="ignore", newline=None)
+    try:
+        yield from text
+    finally:
+        # Leave closing the stream to its opener
+        text.detach()
+
+
+GRADLE_CONFIGURATIONS = (r"(?:implementation|api|compile|compileOnly|runtimeOnly|testImplementation|testCompileOnly|"
+                         r"testRuntimeOnly|androidTestImplementation|annotationProcessor|kapt|ksp|classpath)")
+GRADLE_DEPENDENCY = re.compile(GRADLE_CONFIGURATIONS + r"\s*\(?\s*['\"]([\w.\-]+):([\w.\-]+)(?::([\w.\-${}]+))?['\"]")
+GRADLE_PROJECT = re.compile(GRADLE_CONFIGURATIONS + r"\s*\(?\s*project\s*\(\s*(?:path\s*:\s*)?['\"]([^'\"]+)['\"]")
+GRADLE_PLUGIN = re.compile(r"\bid\s*\(?\s*['\"]([\w.\-]+)['\"]\s*\)?(?:\s*version\s*\(?\s*['\"]([\w.\-]+)['\"])?")
+
+
+def parse_gradle(stream: BinaryIO) -> Iterator[Dependency]:
+    """Dependencies, project dependencies and plugins of a build.gradle or build.gradle.kts"""
+    for line in _iter_lines(stream):
+        for group_id, artifact_id, version in GRADLE_DEPENDENCY.findall(line):
+            yield Dependency(f"{group_id}:{artifact_id}", version or None, "maven", "dependency")
+        for project in GRADLE_PROJECT.findall(line):
+            yield Dependency(project, None, "gradle", "project")
+        for plugin_id, version in GRADLE_PLUGIN.findall(line):
+            yield Dependency(plugin_id, version or None, "gradle", "plugin")
+
+
+REQUIREMENT = re.compile(r"([A-Za-z0-9][A-Za-z0-9._\-]*)(\[[^\]]*\])?\s*([^;#\s][^;#]*)?")
+
+
+def parse_requirements(stream: BinaryIO) -> Iterator[Dependency]:
+    """Requirements of a requirements.txt (options, includes and comments are skipped)"""
+    for line in _iter_lines(stream):
+        line = line.strip()
+        if not line or line.startswith(("#", "-")) or "://" in line:
+            continue
+        match = REQUIREMENT.match(line)
+        if match:
+            version = (match.group(3) or "").strip()
+            yield Dependency(match.group(1), version.replace(" ", "") or None, "pypi", "dependency")
+
+
+def parse_go_mod(stream: BinaryIO) -> Iterator[Dependency]:
+    """Module, Go version and requirements (single-line and blocks) of a go.mod"""
+    block = None
+    for line in _iter_lines(stream):
+        line = line.split("//", 1)[0].strip()
+        if not line:
+            continue
+        if block is not None:
+            if line == ")":
+                block = None
+            elif block == "require":
+                parts = line.split()
+                if len(parts) >= 2:
+                    yield Dependency(parts[0], parts[1], "go", "dependency")
+            continue
+
+        parts = line.split()
+        if parts[0] in ("require", "replace", "exclude", "retract") and parts[-1] == "(":
+            block = parts[0]
+        elif parts[0] == "require" and len(parts) >= 3:
+            yield Dependency(parts[1], parts[2], "go", "dependency")
+        elif parts[0] == "module" and len(parts) >= 2:
+            yield Dependency(parts[1].strip('"'), None, "go", "module")
+        elif parts[0] == "go" and len(parts) >= 2:
+            yield Dependency("go", parts[1], "go", "toolchain")
+
+
+GEM = re.compile(r"""^\s*gem\s*\(?\s*['"]([^'"]+)['"](?:\s*,\s*['"]([^'"]+)['"])?""")
+
+
+def parse_gemfile(stream: BinaryIO) -> Iterator[Dependency]:
+    """Gems of a Gemfile"""
+    for line in _iter_lines(stream):
+        match = GEM.match(line)
+        if match:
+            yield Dependency(match.group(1), match.group(2), "rubygems", "dependency")
+
+
+YARN_VERSION = re.compile(r'\s+version:?\s+"?([^"\s]+)')
+
+
+def parse_yarn_lock(stream: BinaryIO) -> Iterator[Dependency]:
+    """Resolved packages of a yarn.lock (classic and berry formats)"""
+    name = None
+    for line in _iter_lines(stream):
+        if not line.strip() or line.startswith("#"):
+            continue
+        if not line[0].isspace():
+            # "@scope/pkg@^1.0.0", "@scope/pkg@^1.1.0": or pkg@npm:^1.0.0:
+            spec = line.rstrip().rstrip(":").split(",")[0].strip().strip('"')
+            name = spec[:spec.index("@", 1)] if "@" in spec[1:] else spec
+            if name == "__metadata":
+                name = None
+            continue
+        match = YARN_VERSION.match(line)
+        if name and match:
+            yield Dependency(name, match.group(1), "npm", "locked")
+            name = None
+
+
+# --- JSON manifests ---
+
+JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+NUMBER_CONTINUATION = ("", *"0123456789.eE+-")
+
+
+class _JsonReader:
+    """Decoded text of a JSON stream, read a chunk at a time as the parser moves through it"""
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.text_decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        self.json_decoder = json.JSONDecoder(strict=False)
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def _fill(self) -> None:
+        chunk = self.stream.read(CHUNK_SIZE)
+        self.eof = not chunk
+        self.buffer = self.buffer[self.position:] + self.text_decoder.decode(chunk, final=self.eof)
+        self.position = 0
+
+    def peek(self) -> str:
+        """Next character after whitespace, or "" at the end of the document"""
+        while True:
+            self.position = JSON_WHITESPACE.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if self.eof:
+                return ""
+            self._fill()
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} in JSON near: {self.buffer[self.position:self.position + 40]!r}")
+        self.position += 1
+
+    def decode(self) -> Any:
+        """Decode the value at the current position whole, reading more until it is complete"""
+        while True:
+            try:
+                value, end = self.json_decoder.raw_decode(self.buffer, self.position)
+                # A number ending at a chunk boundary may continue in the next chunk
+                if self.eof or self.buffer[end:end + 1] not in NUMBER_CONTINUATION:
+                    self.position = end
+                    return value
+            except ValueError:
+                if self.eof:
+                    raise ValueError(f"Invalid JSON near: {self.buffer[self.position:self.position + 40]!r}")
+            self._fill()
+
+
+def iter_json_members(stream: BinaryIO, depth: int) -> Iterator[Tuple[Tuple[str, ...], Any]]:
+    """
+    Parse a JSON document incrementally
+
+    Objects are walked key by key down to depth; the values found there (and
+    arrays or scalars above it) are decoded whole by the C decoder, so memory
+    is bounded by the largest such value rather than by the document.
+
+    Yields:
+        (keys, value) for each value decoded, keys being its path from the root
+    """
+    reader = _JsonReader(stream)
+    path: List[str] = []
+    expecting_value = True
+    while True:
+        char = reader.peek()
+        if expecting_value:
+            expecting_value = False
+            if char == "{" and len(path) < depth:
+                reader.position += 1
+                if reader.peek() == "}":
+                    reader.position += 1
+                    continue
+                path.append(reader.decode())
+                reader.expect(":")
+                expecting_value = True
+            else:
+                yield tuple(path), reader.decode()
+        elif not path:
+            if char:
+                raise ValueError(f"Unexpected data after JSON document: {char!r}")
+            return
+        elif char == ",":
+            reader.position += 1
+            if reader.peek() != '"':
+                raise ValueError("Expected a key in JSON object")
+            path[-1] = reader.decode()
+            reader.expect(":")
+            expecting_value = True
+        elif char == "}":
+            reader.position += 1
+            path.pop()
+        else:
+            raise ValueError(f"Expected ',' or '}}' in JSON, found {char!r}")
+
+
+NPM_SECTIONS = {
+    "dependencies": "dependency",
+    "devDependencies": "dev",
+    "peerDependencies": "peer",
+    "optionalDependencies": "optional"
+}
+
+
+def parse_package_json(stream: BinaryIO) -> Iterator[Dependency]:
+    """Dependency sections and engines of a package.json"""
+    for keys, value in iter_json_members(stream, depth=2):
+        if len(keys) != 2 or not isinstance(value, str):
+            continue
+        if keys[0] in NPM_SECTIONS:
+            yield Dependency(keys[1], value, "npm", NPM_SECTIONS[keys[0]])
+        elif keys[0] == "engines":
+            yield Dependency(keys[1], value, "npm", "engine")
+
+
+def _locked_v1(name: str, entry: Any) -> Iterator[Dependency]:
+    """A version 1 lockfile entry and its nested dependencies"""
+    if not isinstance(entry, dict):
+        return
+    if isinstance(entry.get("version"), str):
+        yield Dependency(name, entry["version"], "npm", "locked")
+    for nested_name, nested in (entry.get("dependencies") or {}).items():
+        yield from _locked_v1(nested_name, nested)
+
+
+def parse_package_lock(stream: BinaryIO) -> Iterator[Dependency]:
+    """Locked packages of a package-lock.json or npm-shrinkwrap.json (lockfile versions 1 to 3)"""
+    packages_seen = False
+    for keys, value in iter_json_members(stream, depth=2):
+        if len(keys) != 2 or not isinstance(value, dict):
+            continue
+        if keys[0] == "packages":
+            # "node_modules/a/node_modules/@scope/b": {"version": ...}; "" is the project itself
+            packages_seen = True
+            if keys[1] and isinstance(value.get("version"), str):
+                yield Dependency(keys[1].rsplit("node_modules/", 1)[-1], value["version"], "npm", "locked")
+        elif keys[0] == "dependencies" and not packages_seen:
+            # Version 1 (version 2 repeats "packages" here for older npm)
+            yield from _locked_v1(keys[1], value)
+
+
+# Manifest file name (or extension) -> (format, parser)
+MANIFEST_PARSERS: Dict[str, Tuple[str, Callable[[BinaryIO], Iterator[Dependency]]]] = {
+    "pom.xml": ("maven", parse_maven),
+    "build.gradle": ("gradle", parse_gradle),
+    "build.gradle.kts": ("gradle", parse_gradle),
+    "package.json": ("npm", parse_package_json),
+    "package-lock.json": ("npm-lock", parse_package_lock),
+    "npm-shrinkwrap.json": ("npm-lock", parse_package_lock),
+    "yarn.lock": ("yarn-lock", parse_yarn_lock),
+    "requirements.txt": ("pip", parse_requirements),
+    "go.mod": ("go", parse_go_mod),
+    "Gemfile": ("bundler", parse_gemfile),
+    ".csproj": ("nuget", parse_csproj)
+}
+
+
+def manifest_type(filename: str) -> Optional[str]:
+    """Format of a manifest by file name (e.g. "maven"), or None if it is not one"""
+    entry = MANIFEST_PARSERS.get(filename) or MANIFEST_PARSERS.get(os.path.splitext(filename)[1].lower())
+    return entry[0] if entry else None
+
+
+class DependencyCache:
+    """
+    Parsed manifests keyed by format and SHA-256 of the file content.
+
+    Shared by every scan of the process (batches, the daemon), so a manifest
+    or lockfile is parsed once per content whatever its path or repository.
+    LRU by entry count; thread-safe.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_DEPENDENCY_CACHE_ENTRIES):
+        self.max_entries = max(0, int(max_entries))
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Dependency, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_parsed = 0
+
+    def get(self, key: Tuple[str, str]) -> Optional[Tuple[Dependency, ...]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Tuple[str, str], dependencies: Tuple[Dependency, ...], size: int) -> None:
+        with self._lock:
+            self.bytes_parsed += size
+            if self.max_entries == 0:
+                return
+            self._entries[key] = dependencies
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_entries": self.max_entries,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "bytes_parsed": self.bytes_parsed
+            }
+
+
+_cache: Optional[DependencyCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_dependency_cache() -> DependencyCache:
+    """The process-wide dependency cache, created on first use"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = DependencyCache(int(os.getenv("CODEGATES_DEPENDENCY_CACHE_ENTRIES",
+                                                       str(DEFAULT_DEPENDENCY_CACHE_ENTRIES))))
+    return _cache
+
+
+def extract_dependencies(open_stream: Callable[[], BinaryIO], filename: str,
+                         cache: Optional[DependencyCache] = None) -> List[Dependency]:
+    """
+    Extract the dependencies of a manifest or lockfile
+
+    The file is opened once and hashed in chunks; only if its content was not
+    parsed before is it rewound and parsed, streaming. A malformed file yields
+    what was read before the error.
+
+    Args:
+        open_stream: Opens the file's raw bytes as a binary stream (called again
+                     only if the stream cannot seek)
+        filename: File name (or path) selecting the parser
+        cache: Dependency cache (defaults to the process-wide one)
+
+    Returns:
+        Unique dependencies in file order (empty for files that are not manifests)
+    """
+    name = os.path.basename(filename.replace("\\", "/"))
+    entry = MANIFEST_PARSERS.get(name) or MANIFEST_PARSERS.get(os.path.splitext(name)[1].lower())
+    if entry is None:
+        return []
+    manifest, parser = entry
+    cache = get_dependency_cache() if cache is None else cache
+
+    stream = open_stream()
+    try:
+        digest = hashlib.sha256()
+        size = 0
+        for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+            size += len(chunk)
+        key = (manifest, digest.hexdigest())
+
+        cached = cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+        if stream.seekable():
+            stream.seek(0)
+        else:
+            stream.close()
+            stream = open_stream()
+
+        dependencies: "OrderedDict[Dependency, None]" = OrderedDict()
+        try:
+            for dependency in parser(stream):
+                dependencies[dependency] = None
+        except (ET.ParseError, ValueError) as e:
+            get_logger().item("warning", "dependency_parse_error", f"⚠️ Error parsing {filename}: {e}",
+                              file=filename, error=str(e))
+    finally:
+        stream.close()
+
+    result = tuple(dependencies)
+    cache.put(key, result, size)
+    return list(result)
+
+
+def extract_file_dependencies(path: str, cache: Optional[DependencyCache] = None) -> List[Dependency]:
+    """Extract the dependencies of a manifest on disk (see extract_dependencies)"""
+    return extract_dependencies(lambda: open(path, "rb"), path, cache)
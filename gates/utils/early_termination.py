@@ -0,0 +1,69 @@
+"""
+Early Termination Utility
+Tracks a gate's matches across its pattern passes so fast verdict scans can stop once
+the gate's score or verdict can no longer change
+"""
+
+from typing import Callable, Optional, Set, Tuple
+
+
+# Why a gate stopped scanning: its score is final, or the score can still
+# move but not across a status threshold
+EARLY_TERMINATION_REASONS = ("score_saturated", "verdict_settled")
+
+# (matches, files_with_matches, files_unmatched, scans_remaining) -> (lowest, highest) reachable score
+ScoreBounds = Callable[[int, int, int, int], Tuple[float, float]]
+
+
+class GateVerdictTracker:
+    """
+    Unique matches of one gate across its pattern passes (LLM, then static).
+
+    Every pass scans the same eligible files. Before each file the scan asks
+    settled(): the score_bounds callback gives the lowest and highest score
+    still reachable with the files left to scan. Equal bounds mean more
+    matches cannot change the score; bounds with the same status mean they
+    cannot change the verdict. Either way the remaining scanning is skipped.
+    """
+
+    def __init__(self, score_bounds: ScoreBounds, status_for_score: Callable[[float], str], passes: int = 2):
+        self.score_bounds = score_bounds
+        self.status_for_score = status_for_score
+        self.passes_left = passes
+        self.files_eligible = 0
+        self.source: Optional[str] = None
+        self.matched_files: Set[str] = set()
+        self.matched_lines: Set[Tuple[str, int]] = set()
+        self.reason: Optional[str] = None
+        self.bounds: Optional[Tuple[float, float]] = None
+
+    def start_pass(self, source: str, files_eligible: int) -> None:
+        """Begin a pattern pass over files_eligible files"""
+        self.source = source
+        self.passes_left = max(self.passes_left - 1, 0)
+        self.files_eligible = max(self.files_eligible, files_eligible)
+
+    def add_file(self, file: str, lines: list) -> None:
+        """Record the matched lines of a completed file"""
+        if lines:
+            self.matched_files.add(file)
+            self.matched_lines.update((file, line) for line in lines)
+
+    def settled(self, files_left: int) -> bool:
+        """Whether the gate's score or verdict is final with files_left files left in the current pass"""
+        if self.reason is not None:
+            return True
+
+        # Later passes rescan every eligible file; only files without a match can add matched files
+        scans_remaining = files_left + self.passes_left * self.files_eligible
+        files_unmatched = max(min(self.files_eligible - len(self.matched_files), scans_remaining), 0)
+        low, high = self.score_bounds(len(self.matched_lines), len(self.matched_files), files_unmatched, scans_remaining)
+
+        if high - low < 1e-9:
+            self.reason = "score_saturated"
+        elif self.status_for_score(low) == self.status_for_score(high):
+            self.reason = "verdict_settled"
+        else:
+            return False
+        self.bounds = (round(low, 2), round(high, 2))
+        return True
@@ -0,0 +1,178 @@
+"""
+File Sampling Utility
+Stratified random file samples for very large repositories, with extrapolated totals and
+confidence intervals
+"""
+
+import math
+import random
+import posixpath
+from collections import Counter
+from statistics import NormalDist
+from typing import Dict, Any, List, Tuple
+
+
+# How gate files are chosen when there are more relevant files than max_files:
+# the most relevant (largest) files, or a stratified random sample
+FILE_SELECTION_MODES = ("top", "sample")
+
+
+def _directories(files: List[Dict[str, Any]]) -> List[str]:
+    """Directory of each file below the files' common directory (first level only)"""
+    paths = [f["relative_path"].replace("\\", "/") for f in files]
+    parents = [posixpath.dirname(path) for path in paths]
+    common = posixpath.commonpath(parents) if parents and all(parents) else ""
+    directories = []
+    for parent in parents:
+        rest = parent[len(common):].lstrip("/") if common else parent
+        directories.append(rest.split("/", 1)[0] or ".")
+    return directories
+
+
+def stratified_order(files: List[Dict[str, Any]], seed: int = 0) -> List[Tuple[Tuple[str, str], Dict[str, Any]]]:
+    """
+    Order files so that every prefix is a proportional stratified random sample
+
+    Files are grouped by language and directory (the first directory level
+    below the directory all files share, so modules of a monorepo and of a
+    single project both split). Each stratum is shuffled and its files are
+    spread evenly over the order, starting at a random offset.
+
+    Returns:
+        (stratum, file) pairs in sample order
+    """
+    rng = random.Random(seed)
+    strata: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for file_info, directory in zip(files, _directories(files)):
+        strata.setdefault((file_info.get("language", "Unknown"), directory), []).append(file_info)
+
+    keyed = []
+    for stratum in sorted(strata):
+        members = strata[stratum]
+        rng.shuffle(members)
+        offset = rng.random()
+        keyed.extend(((rank + offset) / len(members), stratum, file_info) for rank, file_info in enumerate(members))
+    keyed.sort(key=lambda item: item[0])
+    return [(stratum, file_info) for _, stratum, file_info in keyed]
+
+
+class StratifiedFileSample:
+    """
+    A stratified random sample of a gate's files, grown in rounds.
+
+    next_batch() hands out the next files of a stratified order (see
+    stratified_order) and add_scanned() records the files actually scanned.
+    estimate_total() extrapolates a per-file value (1 for a file with matches,
+    or its match count) from the scanned files to all files with the
+    stratified estimator, with a confidence interval that shrinks to the
+    exact total once every file has been scanned.
+    """
+
+    def __init__(self, order: List[Tuple[Tuple[str, str], Dict[str, Any]]], confidence: float = 0.95):
+        self.order = order
+        self.population = len(order)
+        self.strata_sizes = Counter(stratum for stratum, _ in order)
+        self.confidence = confidence
+        self.z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        self.handed_out = 0
+        self.scanned: List[Tuple[Tuple[str, str], Dict[str, Any]]] = []
+
+    @classmethod
+    def from_files(cls, files: List[Dict[str, Any]], seed: int = 0, confidence: float = 0.95) -> "StratifiedFileSample":
+        return cls(stratified_order(files, seed), confidence)
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether every file has been handed out"""
+        return self.handed_out >= self.population
+
+    def next_batch(self, sample_size: int) -> List[Dict[str, Any]]:
+        """Files to scan to grow the sample to sample_size files"""
+        end = min(max(sample_size, self.handed_out), self.population)
+        batch = [file_info for _, file_info in self.order[self.handed_out:end]]
+        self.handed_out = end
+        return batch
+
+    def add_scanned(self, count: int) -> None:
+        """Record that the first count files of the last batch were scanned"""
+        start = len(self.scanned)
+        self.scanned.extend(self.order[start:start + count])
+
+    def estimate_total(self, values: Dict[str, float], proportion: bool = False) -> Tuple[float, float, float]:
+        """
+        Estimate the total of a per-file value over all files
+
+        Args:
+            values: Value per scanned file path (missing files count as 0)
+            proportion: Values are 0/1 indicators (Wilson interval on the share of files)
+
+        Returns:
+            (estimate, low, high) of the total at the sample's confidence level
+        """
+        n = len(self.scanned)
+        population = self.population
+        if n == 0:
+            return 0.0, 0.0, float(population) if proportion else math.inf
+
+        groups: Dict[Tuple[str, str], List[float]] = {}
+        for stratum, file_info in self.scanned:
+            groups.setdefault(stratum, []).append(values.get(file_info["relative_path"], 0))
+        observed = sum(sum(ys) for ys in groups.values())
+        if n >= population:
+            return float(observed), float(observed), float(observed)
+
+        pooled_mean = observed / n
+        pooled_var = sum((y - pooled_mean) ** 2 for ys in groups.values() for y in ys) / max(n - 1, 1)
+        total = 0.0
+        variance = 0.0
+        for stratum, ys in groups.items():
+            size = self.strata_sizes[stratum]
+            mean = sum(ys) / len(ys)
+            total += size * mean
+            if 1 < len(ys) < size:
+                s2 = sum((y - mean) ** 2 for y in ys) / (len(ys) - 1)
+                variance += size * size * (1 - len(ys) / size) * s2 / len(ys)
+        # Strata not reached yet are estimated from the whole sample
+        unsampled = population - sum(self.strata_sizes[stratum] for stratum in groups)
+        if unsampled:
+            total += unsampled * pooled_mean
+            variance += unsampled * unsampled * pooled_var / n
+
+        if proportion:
+            low, high = self._wilson(total / population, variance / population ** 2, n)
+            low, high = low * population, high * population
+            # Scanned files are known: matched ones count, unmatched ones cannot
+            known_zero = n - sum(1 for ys in groups.values() for y in ys if y)
+            return total, max(low, float(observed)), min(high, float(population - known_zero))
+
+        spread = self.z * math.sqrt(variance)
+        low, high = total - spread, total + spread
+        if variance == 0:
+            # No spread seen (e.g. no matches yet): bound the files that may still
+            # have matches and give each of them at least one
+            _, _, files_high = self.estimate_total({path: 1 for path, y in values.items() if y}, proportion=True)
+            high = max(high, files_high * max(pooled_mean, 1.0))
+        return total, max(low, float(observed)), high
+
+    def _wilson(self, p: float, variance: float, n: int) -> Tuple[float, float]:
+        """Wilson score interval for a share p, using the effective sample size of the design"""
+        fraction = n / self.population
+        if 0 < p < 1 and variance > 0:
+            effective_n = p * (1 - p) / variance
+        else:
+            # No variance to go by: a simple random sample with finite population correction
+            effective_n = n / (1 - fraction)
+        z2 = self.z * self.z
+        denominator = 1 + z2 / effective_n
+        center = (p + z2 / (2 * effective_n)) / denominator
+        half = self.z * math.sqrt(p * (1 - p) / effective_n + z2 / (4 * effective_n * effective_n)) / denominator
+        return max(center - half, 0.0), min(center + half, 1.0)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "population": self.population,
+            "files_sampled": len(self.scanned),
+            "strata": len(self.strata_sizes),
+            "strata_sampled": len({stratum for stratum, _ in self.scanned}),
+            "confidence": self.confidence
+        }
@@ -3,11 +3,18 @@ File Scanner Utility
 Scans repository files and extracts metadata
 """
 
+import io
 import os
 import mimetypes
+import fnmatch
 from pathlib import Path
-from typing import Dict, List, Any, Set
-import re
+from typing import Dict, List, Any, Set, Optional, Callable
+
+try:
+    from .scan_logger import ScanLogger, get_logger
+except ImportError:
+    # Fall back to absolute imports (when run directly)
+    from scan_logger import ScanLogger, get_logger
 
 
 # Language detection mappings
@@ -60,24 +67,42 @@ BINARY_EXTENSIONS = {
 }
 
 
-def scan_directory(repo_path: str, max_files: int = 10000) -> Dict[str, Any]:
+def scan_directory(repo_path: str, max_files: int = 10000, logger: Optional[ScanLogger] = None, source=None,
+                   extractors: Optional[List[Any]] = None) -> Dict[str, Any]:
     """
     Scan directory and extract file metadata
     
+    Every other view of the repository is built in the same walk by extractors
+    (see repository_analyzer), so the tree is listed and each file read once.
+    
     Args:
         repo_path: Path to repository directory
         max_files: Maximum number of files to process
+        logger: Scan logger (defaults to the active logger)
+        source: GitObjectSource or LocalFileSource to list and read files from
+            instead of walking the directory (sizes come from the listing)
+        extractors: Objects whose add(file_info, read_text) is called for each
+            processed file; read_text() returns the file's text, read at most once
         
     Returns:
         Dictionary with file metadata and statistics
     """
     
-    print(f"📁 Scanning directory: {repo_path}")
+    log = logger or get_logger()
+    if source is not None:
+        log.info(f"📁 Scanning {source.description}: {repo_path}")
+    else:
+        log.info(f"📁 Scanning directory: {repo_path}")
     
     repo_path = Path(repo_path)
     if not repo_path.exists():
         raise ValueError(f"Directory does not exist: {repo_path}")
     
+    if source is not None:
+        files = _walk_source(repo_path, source)
+    else:
+        files = [(file_path, None) for file_path in _walk_directory(repo_path)]
+    
     metadata = {
         "total_files": 0,
         "total_lines": 0,
@@ -93,13 +118,14 @@ def scan_directory(repo_path: str, max_files: int = 10000) -> Dict[str, Any]:
     
     files_processed = 0
     
-    for file_path in _walk_directory(repo_path):
+    for file_path, size in files:
         if files_processed >= max_files:
-            print(f"⚠️ Reached maximum file limit ({max_files})")
+            log.warning(f"⚠️ Reached maximum file limit ({max_files})", "file_limit_reached", max_files=max_files)
             break
             
         try:
-            file_info = _analyze_file(file_path, repo_path)
+            read_text = _text_reader(file_path, repo_path, source)
+            file_info = _analyze_file(file_path, repo_path, size=size, source=source, read_text=read_text)
             if file_info:
                 metadata["file_list"].append(file_info)
                 
@@ -130,8 +156,11 @@ def scan_directory(repo_path: str, max_files: int = 10000) -> Dict[str, Any]:
                 
                 files_processed += 1
                 
+                for extractor in extractors or ():
+                    extractor.add(file_info, read_text)
+                
         except Exception as e:
-            print(f"⚠️ Error processing file {file_path}: {e}")
+            log.item("warning", "file_scan_error", f"⚠️ Error processing file {file_path}: {e}", file=str(file_path), error=str(e))
             continue
     
     # Calculate language statistics
@@ -147,8 +176,8 @@ def scan_directory(repo_path: str, max_files: int = 10000) -> Dict[str, Any]:
     # Build directory structure
     metadata["directory_structure"] = _build_directory_structure(metadata["file_list"])
     
-    print(f"✅ Scanned {metadata['total_files']} files, {metadata['total_lines']} lines")
-    print(f"   Languages detected: {', '.join(metadata['languages'].keys())}")
+    log.info(f"✅ Scanned {metadata['total_files']} files, {metadata['total_lines']} lines", "directory_scanned", files=metadata["total_files"], lines=metadata["total_lines"])
+    log.info(f"   Languages detected: {', '.join(metadata['languages'].keys())}")
     
     return metadata
 
@@ -165,17 +194,53 @@ def _walk_directory(repo_path: Path) -> List[Path]:
         for filename in filenames:
             file_path = Path(root) / filename
             
-            if not _should_ignore_file(file_path):
+            if not _should_ignore_file(file_path, relative_path=file_path.relative_to(repo_path)):
                 files.append(file_path)
     
     return sorted(files)
 
 
-def _analyze_file(file_path: Path, repo_root: Path) -> Dict[str, Any]:
+def _walk_source(repo_path: Path, source) -> List[tuple]:
+    """List files to process from a git object source as (path, size) pairs"""
+    
+    files = []
+    
+    for relative_path, size in source.list_files():
+        # Same directory and file filters as the working tree walk, applied to the
+        # path inside the tree (a bare clone's own directory is often named *.git)
+        if any(_should_ignore_directory(part) for part in relative_path.split('/')[:-1]):
+            continue
+        if not _should_ignore_file(Path(relative_path), size=size, relative_path=Path(relative_path)):
+            files.append((repo_path.joinpath(*relative_path.split('/')), size))
+    
+    return files
+
+
+def _text_reader(file_path: Path, repo_root: Path, source=None) -> Callable[[], str]:
+    """Reader of a file's text (UTF-8, undecodable bytes dropped) that reads it on first call only"""
+    
+    text = []
+    
+    def read_text() -> str:
+        if not text:
+            if source is not None:
+                data = source.read_bytes(file_path.relative_to(repo_root).as_posix())
+            else:
+                with open(file_path, 'rb') as f:
+                    data = f.read()
+            text.append(data.decode('utf-8', errors='ignore'))
+        return text[0]
+    
+    return read_text
+
+
+def _analyze_file(file_path: Path, repo_root: Path, size: Optional[int] = None, source=None,
+                  read_text: Optional[Callable[[], str]] = None) -> Dict[str, Any]:
     """Analyze individual file and extract metadata"""
     
     try:
-        stat = file_path.stat()
+        if size is None:
+            size = file_path.stat().st_size
         relative_path = file_path.relative_to(repo_root)
         
         # Get basic info
@@ -183,7 +248,7 @@ def _analyze_file(file_path: Path, repo_root: Path) -> Dict[str, Any]:
             "path": str(file_path),
             "relative_path": str(relative_path),
             "name": file_path.name,
-            "size": stat.st_size,
+            "size": size,
             "extension": file_path.suffix.lower(),
             "language": _detect_language(file_path),
             "type": _get_file_type(file_path),
@@ -192,17 +257,18 @@ def _analyze_file(file_path: Path, repo_root: Path) -> Dict[str, Any]:
         }
         
         # Count lines for text files
-        if not file_info["is_binary"] and stat.st_size < 1024 * 1024:  # Skip files > 1MB
+        if not file_info["is_binary"] and size < 1024 * 1024:  # Skip files > 1MB
             try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    file_info["lines"] = sum(1 for line in f if line.strip())
+                # Same universal-newline line splitting as reading the file in text mode
+                text = (read_text or _text_reader(file_path, repo_root, source))()
+                file_info["lines"] = sum(1 for line in io.StringIO(text, newline=None) if line.strip())
             except Exception:
                 file_info["lines"] = 0
         
         return file_info
         
     except Exception as e:
-        print(f"⚠️ Error analyzing file {file_path}: {e}")
+        get_logger().item("warning", "file_analyze_error", f"⚠️ Error analyzing file {file_path}: {e}", file=str(file_path), error=str(e))
         return None
 
 
@@ -271,25 +337,31 @@ def _is_binary_file(file_path: Path) -> bool:
     return False
 
 
-def _should_ignore_file(file_path: Path) -> bool:
-    """Check if file should be ignored"""
+def _should_ignore_file(file_path: Path, size: Optional[int] = None, relative_path: Optional[Path] = None) -> bool:
+    """
+    Check if file should be ignored (size is stat'ed unless given)
+    
+    Names are matched against whole components of the path below the repository
+    root (just the file name without relative_path), so Layout.java, checkout/
+    or a repository cloned under output/ are not mistaken for build output.
+    """
     
     filename = file_path.name
+    parts = (relative_path or Path(filename)).parts
     
     # Check ignore patterns
     for pattern in IGNORE_PATTERNS:
         if '*' in pattern:
-            # Simple glob matching
-            pattern_regex = pattern.replace('*', '.*')
-            if re.match(pattern_regex, filename):
-                return True
-        else:
-            if pattern in str(file_path):
+            if fnmatch.fnmatchcase(filename, pattern):
                 return True
+        elif pattern in parts:
+            return True
     
     # Skip very large files
     try:
-        if file_path.stat().st_size > 10 * 1024 * 1024:  # 10MB
+        if size is None:
+            size = file_path.stat().st_size
+        if size > 10 * 1024 * 1024:  # 10MB
             return True
     except OSError:
         return True
@@ -0,0 +1,203 @@
+"""
+Git Object Source Utility
+Lists and reads repository files straight from the git object database, so scans
+need no working-tree checkout
+"""
+
+import os
+import subprocess
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+
+# Where scans read repository files from: a checked-out working tree, the git
+# object database of a clone without checkout, or a local directory scanned in
+# place (see local_source)
+REPOSITORY_SOURCES = ("worktree", "objects", "local")
+
+# ls-tree modes that are not regular file contents (symlink targets, submodules)
+_SKIPPED_MODES = ("120000", "160000")
+
+
+def get_repository_source_mode(request: Dict[str, Any]) -> str:
+    """
+    Get the repository source mode of a scan
+
+    Args:
+        request: Scan request (repository_source overrides CODEGATES_REPOSITORY_SOURCE)
+
+    Returns:
+        One of REPOSITORY_SOURCES
+
+    Raises:
+        ValueError: If the mode is not a known source
+    """
+    mode = request.get("repository_source") or os.getenv("CODEGATES_REPOSITORY_SOURCE", "worktree")
+    mode = str(mode).strip().lower()
+    if mode not in REPOSITORY_SOURCES:
+        raise ValueError(f"Invalid repository source '{mode}', expected one of: {', '.join(REPOSITORY_SOURCES)}")
+    return mode
+
+
+class GitObjectSource:
+    """
+    Read-only view of one commit's tree in a git repository.
+
+    The tree is listed once with `git ls-tree -r -l`, which includes blob
+    sizes, so no file is ever stat'ed. Blob contents are streamed through a
+    single persistent `git cat-file --batch` process that is started on the
+    first read. Works with bare clones and with regular repositories (the
+    working tree is never touched). Thread-safe: reads from the gate worker
+    threads are serialized on the batch process.
+    """
+
+    def __init__(self, git_dir: str, treeish: str = "HEAD"):
+        self.git_dir = str(git_dir)
+        self.treeish = treeish
+        self._entries: Optional[Dict[str, Tuple[str, int]]] = None
+        self._commit: Optional[str] = None
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+        self.blob_reads = 0
+        self.bytes_read = 0
+
+    def __enter__(self) -> "GitObjectSource":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def description(self) -> str:
+        return f"git objects ({self.treeish})"
+
+    @property
+    def commit(self) -> Optional[str]:
+        """SHA of the commit being read, or None if it cannot be resolved"""
+        if self._commit is None:
+            try:
+                self._commit = self._git("rev-parse", "--verify", f"{self.treeish}^{{commit}}").decode().strip() or None
+            except (OSError, subprocess.CalledProcessError):
+                return None
+        return self._commit
+
+    def list_files(self) -> List[Tuple[str, int]]:
+        """
+        List the regular files of the tree
+
+        Returns:
+            (relative_path, size) pairs sorted by path
+        """
+        return [(path, size) for path, (_, size) in sorted(self._load_entries().items())]
+
+    def exists(self, relative_path: str) -> bool:
+        return _normalize(relative_path) in self._load_entries()
+
+    def get_size(self, relative_path: str) -> int:
+        """
+        Get a file's size from the tree listing
+
+        Raises:
+            FileNotFoundError: If the file is not in the tree
+        """
+        return self._lookup(relative_path)[1]
+
+    def read_bytes(self, relative_path: str) -> bytes:
+        """
+        Read a file's contents from its blob
+
+        Raises:
+            FileNotFoundError: If the file is not in the tree
+            OSError: If the blob cannot be read
+        """
+        sha, _ = self._lookup(relative_path)
+        with self._lock:
+            process = self._batch_process()
+            try:
+                process.stdin.write(sha.encode() + b"\n")
+                process.stdin.flush()
+                header = process.stdout.readline().split()
+                if len(header) != 3 or header[1] != b"blob":
+                    raise OSError(f"Unexpected cat-file response for {relative_path}: {b' '.join(header).decode(errors='replace')}")
+                size = int(header[2])
+                content = process.stdout.read(size)
+                process.stdout.read(1)  # Trailing newline after the contents
+            except (OSError, ValueError) as e:
+                # The stream position is unknown now, start a fresh process on the next read
+                self._stop_process()
+                raise OSError(f"Failed to read {relative_path} from git objects: {e}") from e
+            if len(content) != size:
+                self._stop_process()
+                raise OSError(f"Truncated blob for {relative_path}: {len(content)} of {size} bytes")
+            self.blob_reads += 1
+            self.bytes_read += size
+        return content
+
+    def close(self) -> None:
+        """Stop the cat-file process (the listing stays available)"""
+        with self._lock:
+            self._stop_process()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "commit": self._commit,
+            "files": len(self._entries) if self._entries is not None else 0,
+            "blob_reads": self.blob_reads,
+            "bytes_read": self.bytes_read
+        }
+
+    def _load_entries(self) -> Dict[str, Tuple[str, int]]:
+        """Parse `git ls-tree -r -l -z` once: path -> (blob sha, size)"""
+        if self._entries is None:
+            try:
+                output = self._git("ls-tree", "-r", "-l", "-z", self.treeish)
+            except subprocess.CalledProcessError as e:
+                raise ValueError(f"Cannot list {self.treeish} in {self.git_dir}: {e.stderr.decode(errors='replace').strip()}")
+            entries = {}
+            for record in output.split(b"\0"):
+                if not record:
+                    continue
+                info, _, path = record.partition(b"\t")
+                mode, object_type, sha, size = info.split()
+                if object_type != b"blob" or mode.decode() in _SKIPPED_MODES:
+                    continue
+                entries[os.fsdecode(path)] = (sha.decode(), int(size))
+            self._entries = entries
+        return self._entries
+
+    def _lookup(self, relative_path: str) -> Tuple[str, int]:
+        entry = self._load_entries().get(_normalize(relative_path))
+        if entry is None:
+            raise FileNotFoundError(f"Not in {self.treeish}: {relative_path}")
+        return entry
+
+    def _batch_process(self) -> subprocess.Popen:
+        """Start the persistent cat-file process on first use (lock held)"""
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(
+                ["git", "-C", self.git_dir, "cat-file", "--batch"],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+            )
+        return self._process
+
+    def _stop_process(self) -> None:
+        """Close the cat-file process (lock held)"""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+            process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+        finally:
+            process.stdout.close()
+
+    def _git(self, *args: str) -> bytes:
+        return subprocess.run(["git", "-C", self.git_dir, *args], check=True, capture_output=True).stdout
+
+
+def _normalize(relative_path: str) -> str:
+    """Tree paths always use forward slashes"""
+    return str(relative_path).replace("\\", "/")
@@ -7,18 +7,18 @@ import os
 import shutil
 import tempfile
 from pathlib import Path
-from typing import Optional, Tuple
-import git
-import requests
-import zipfile
+from typing import Optional, Tuple, List, Dict
 from urllib.parse import urlparse
 import time
-import urllib3
+
+# GitPython, requests and urllib3 are imported by the functions that use them,
+# so importing this module (every CLI command does) stays cheap
 
 
 def clone_repository(repo_url: str, branch: str = "main", 
                     github_token: Optional[str] = None,
-                    target_dir: Optional[str] = None) -> str:
+                    target_dir: Optional[str] = None,
+                    checkout: bool = True) -> str:
     """
     Clone a repository using Git or GitHub API with enterprise-aware preferences
     
@@ -27,6 +27,8 @@ def clone_repository(repo_url: str, branch: str = "main",
         branch: Branch to checkout
         github_token: GitHub token for private repos
         target_dir: Target directory (if None, creates temp dir)
+        checkout: False clones bare (git objects only, no working tree files
+            are written); read it with GitObjectSource
     
     Returns:
         Path to cloned repository
@@ -50,6 +52,17 @@ def clone_repository(repo_url: str, branch: str = "main",
     if not os.access(target_dir, os.W_OK):
         raise Exception(f"Target directory is not writable: {target_dir}")
     
+    if not checkout:
+        # The GitHub API only serves archives to extract, git objects need a Git clone
+        print("📦 Cloning without checkout (git objects only)")
+        try:
+            return _clone_with_git(repo_url, branch, github_token, target_dir, bare=True)
+        except Exception:
+            # Clean up temp directory on failure
+            if target_dir and target_dir.startswith(tempfile.gettempdir()):
+                cleanup_repository(target_dir)
+            raise
+    
     # Determine if this is GitHub Enterprise
     parsed_url = urlparse(repo_url)
     hostname = parsed_url.netloc.lower()
@@ -99,8 +112,9 @@ def clone_repository(repo_url: str, branch: str = "main",
                 raise git_error
 
 
-def _clone_with_git(repo_url: str, branch: str, github_token: Optional[str], target_dir: str) -> str:
-    """Clone repository using Git with enterprise support"""
+def _clone_with_git(repo_url: str, branch: str, github_token: Optional[str], target_dir: str, bare: bool = False) -> str:
+    """Clone repository using Git with enterprise support (bare clones skip the checkout)"""
+    import git
     
     # Parse repository URL to determine if it's enterprise
     parsed_url = urlparse(repo_url)
@@ -149,6 +163,7 @@ def _clone_with_git(repo_url: str, branch: str, github_token: Optional[str], tar
             target_dir, 
             branch=branch, 
             depth=1,
+            bare=bare,
             env=env
         )
         
@@ -175,6 +190,7 @@ def _clone_with_git(repo_url: str, branch: str, github_token: Optional[str], tar
                         target_dir, 
                         branch=branch, 
                         depth=1,
+                        bare=bare,
                         env=env
                     )
                     print(f"✅ Repository cloned successfully to: {target_dir} (SSL verification disabled)")
@@ -200,6 +216,9 @@ def _clone_with_git(repo_url: str, branch: str, github_token: Optional[str], tar
 
 def _download_with_github_api(repo_url: str, branch: str, github_token: Optional[str], target_dir: str) -> str:
     """Download repository using GitHub API with enterprise support"""
+    import zipfile
+    import requests
+    import urllib3
     
     # Parse repository URL to determine if it's enterprise
     parsed_url = urlparse(repo_url)
@@ -424,6 +443,90 @@ def cleanup_repository(repo_path: str) -> None:
             print(f"⚠️ Failed to cleanup repository {repo_path}: {e}")
 
 
+def list_repositories(owner_url: str, github_token: Optional[str] = None,
+                      include_forks: bool = False, include_archived: bool = False) -> List[Dict[str, str]]:
+    """
+    List the repositories of a GitHub organization or user
+
+    Args:
+        owner_url: Organization or user URL (e.g. https://github.com/my-org)
+        github_token: GitHub token (required for private repositories)
+        include_forks: Include forked repositories
+        include_archived: Include archived repositories
+
+    Returns:
+        List of {"repository_url", "branch", "name"} dicts, branch being the default branch
+    """
+    import requests
+    import urllib3
+
+    parsed_url = urlparse(owner_url.rstrip('/'))
+    hostname = parsed_url.netloc.lower()
+    path_parts = parsed_url.path.strip('/').split('/')
+    if not hostname or not path_parts[0]:
+        raise ValueError(f"Invalid GitHub organization URL format: {owner_url}")
+    owner = path_parts[0]
+
+    is_github_enterprise = 'github' in hostname and hostname != 'github.com'
+    api_base = f"https://{hostname}/api/v3" if is_github_enterprise else "https://api.github.com"
+
+    headers = {
+        "Accept": "application/vnd.github.v3+json",
+        "User-Agent": "CodeGates/1.0"
+    }
+    if github_token:
+        headers["Authorization"] = f"token {github_token}"
+
+    request_kwargs = {"timeout": (30, 120)}
+    if is_github_enterprise:
+        disable_ssl = os.getenv('GITHUB_ENTERPRISE_DISABLE_SSL', 'true').lower() == 'true'
+        ca_bundle = os.getenv('GITHUB_ENTERPRISE_CA_BUNDLE')
+        if disable_ssl:
+            request_kwargs["verify"] = False
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        elif ca_bundle and os.path.exists(ca_bundle):
+            request_kwargs["verify"] = ca_bundle
+
+    session = requests.Session()
+    session.headers.update(headers)
+
+    try:
+        # Organizations first, then users; 100 repositories per page
+        for kind in ("orgs", "users"):
+            repos = []
+            page = 1
+            while True:
+                api_url = f"{api_base}/{kind}/{owner}/repos?per_page=100&page={page}"
+                response = session.get(api_url, **request_kwargs)
+                if response.status_code == 404 and page == 1:
+                    break
+                response.raise_for_status()
+                data = response.json()
+                if not isinstance(data, list) or not data:
+                    break
+                repos.extend(data)
+                if len(data) < 100:
+                    break
+                page += 1
+
+            if page > 1 or repos:
+                print(f"📚 Found {len(repos)} repositories for {owner} ({kind[:-1]})")
+                return [
+                    {
+                        "repository_url": repo["clone_url"],
+                        "branch": repo.get("default_branch") or "main",
+                        "name": repo.get("full_name", repo.get("name", ""))
+                    }
+                    for repo in repos
+                    if (include_forks or not repo.get("fork")) and (include_archived or not repo.get("archived"))
+                ]
+
+        raise Exception(f"No organization or user named {owner} found at {api_base}")
+
+    finally:
+        session.close()
+
+
 def get_repository_info(repo_path: str) -> dict:
     """
     Get basic information about the repository
@@ -446,6 +549,7 @@ def get_repository_info(repo_path: str) -> dict:
     
     try:
         if os.path.exists(os.path.join(repo_path, ".git")):
+            import git
             repo = git.Repo(repo_path)
             info.update({
                 "is_git_repo": True,
@@ -0,0 +1,225 @@
+"""
+Instrumentation Utility
+Per-node timing and resource counters for the validation flow, plus a Prometheus registry
+"""
+
+import time
+import threading
+from typing import Dict, Any, List, Optional
+from pocketflow import Node
+
+from .scan_logger import ScanLogger, get_scan_logger, get_logger, set_active_logger
+
+
+# Counters every node reports (0 when a node does not touch them)
+NODE_COUNTERS = ("retries", "bytes_read", "files_touched", "matches_emitted")
+
+
+def get_scan_metrics(shared: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Get the metrics section of the shared store, creating it on first use
+
+    Layout:
+        {"started_at": epoch seconds, "total_seconds": float,
+         "nodes": {NodeName: {prep/exec/post/total/cpu/queue seconds, status, counters, log_events}},
+         "gates": {GATE_NAME: {seconds, llm_seconds, static_seconds, files_scanned, matches}}}
+    """
+    metrics = shared.get("metrics")
+    if metrics is None:
+        metrics = {"started_at": time.time(), "total_seconds": 0.0, "nodes": {}, "gates": {}}
+        shared["metrics"] = metrics
+    return metrics
+
+
+class InstrumentedNode(Node):
+    """
+    PocketFlow node that records its own prep/exec/post timings into shared["metrics"].
+
+    Retries are taken from PocketFlow's retry counter, files touched and bytes
+    read from the scan content cache; nodes that read files another way or emit
+    matches add to their counters with add_metric() during prep/exec/post.
+    Log events counted by the scan logger while the node runs are recorded too.
+
+    Nodes declare the batch stage they belong to ("clone", "scan" or "llm");
+    when the shared store carries a stage limiter the node waits for a slot of
+    its stage first, and the wait is recorded as queue_seconds (the pipeline
+    scheduler used by batch scans queues nodes itself and sets queued_seconds).
+    """
+
+    stage: Optional[str] = None
+
+    @property
+    def log(self) -> ScanLogger:
+        """Scan logger while the node runs, otherwise the process default logger"""
+        return getattr(self, "_log", None) or get_logger()
+
+    def add_metric(self, name: str, value: float = 1) -> None:
+        """Add to one of this node's counters for the current run"""
+        counters = getattr(self, "_run_counters", None)
+        if counters is not None:
+            counters[name] = counters.get(name, 0) + value
+
+    def _run(self, shared: Dict[str, Any]) -> Any:
+        metrics = get_scan_metrics(shared)
+        node_name = type(self).__name__
+        # Flow runs shallow copies of the node, so counters are reset per run
+        self._run_counters = {}
+        self._log = get_scan_logger(shared)
+        self._log.start_node(node_name)
+        previous_logger = set_active_logger(self._log)
+        reads_before = self._content_reads(shared)
+        timings = {}
+        status = "error"
+        limiter = shared.get("stage_limiter") if self.stage else None
+        # The pipeline scheduler queues nodes itself and sets queued_seconds
+        queue_seconds = limiter.acquire(self.stage) if limiter is not None else getattr(self, "queued_seconds", 0.0)
+        cpu_start = time.process_time()
+        run_start = time.perf_counter()
+
+        try:
+            start = time.perf_counter()
+            prep_res = self.prep(shared)
+            timings["prep_seconds"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            exec_res = self._exec(prep_res)
+            timings["exec_seconds"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            action = self.post(shared, prep_res, exec_res)
+            timings["post_seconds"] = time.perf_counter() - start
+
+            status = "ok"
+            return action
+        finally:
+            node_metrics = {
+                "prep_seconds": 0.0,
+                "exec_seconds": 0.0,
+                "post_seconds": 0.0,
+                **{phase: round(seconds, 6) for phase, seconds in timings.items()},
+                "total_seconds": round(time.perf_counter() - run_start, 6),
+                "cpu_seconds": round(time.process_time() - cpu_start, 6),
+                "queue_seconds": round(queue_seconds, 6),
+                "status": status
+            }
+            counters = {name: 0 for name in NODE_COUNTERS}
+            counters.update(self._run_counters)
+            counters["retries"] = getattr(self, "cur_retry", 0) or 0
+            reads_after = self._content_reads(shared)
+            counters["files_touched"] += max(0, reads_after[0] - reads_before[0])
+            counters["bytes_read"] += max(0, reads_after[1] - reads_before[1])
+            node_metrics.update(counters)
+            log_counters = self._log.end_node(node_name)
+            node_metrics["log_events"] = log_counters["events"]
+            node_metrics["log_suppressed"] = sum(log_counters["suppressed"].values())
+            set_active_logger(previous_logger)
+            if limiter is not None:
+                limiter.release(self.stage)
+
+            metrics["nodes"][node_name] = node_metrics
+            metrics["total_seconds"] = round(sum(n["total_seconds"] for n in metrics["nodes"].values()), 6)
+
+    @staticmethod
+    def _content_reads(shared: Dict[str, Any]) -> tuple:
+        """Disk reads and bytes read so far by the scan content cache"""
+        cache = shared.get("content_cache")
+        if cache is None:
+            return (0, 0)
+        return (getattr(cache, "disk_reads", 0), getattr(cache, "bytes_read", 0))
+
+
+class MetricsRegistry:
+    """
+    Process-wide aggregation of scan metrics rendered in Prometheus text format.
+
+    Node and gate timings are exposed as summaries (_sum/_count), counters as
+    _total series labelled by node.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._scans: Dict[str, int] = {}
+        self._node_phase_seconds: Dict[tuple, List[float]] = {}
+        self._node_cpu_seconds: Dict[str, float] = {}
+        self._node_counters: Dict[tuple, float] = {}
+        self._gate_seconds: Dict[str, List[float]] = {}
+        self._gate_matches: Dict[str, float] = {}
+        self._log_events: Dict[tuple, int] = {}
+
+    def observe_scan(self, metrics: Optional[Dict[str, Any]], status: str) -> None:
+        """Add one finished scan's metrics (shared["metrics"]) to the registry"""
+        metrics = metrics or {}
+        with self._lock:
+            self._scans[status] = self._scans.get(status, 0) + 1
+
+            for node, node_metrics in metrics.get("nodes", {}).items():
+                for phase in ("prep", "exec", "post", "total"):
+                    observed = self._node_phase_seconds.setdefault((node, phase), [0.0, 0])
+                    observed[0] += node_metrics.get(f"{phase}_seconds", 0.0)
+                    observed[1] += 1
+                self._node_cpu_seconds[node] = self._node_cpu_seconds.get(node, 0.0) + node_metrics.get("cpu_seconds", 0.0)
+                for counter in NODE_COUNTERS:
+                    key = (node, counter)
+                    self._node_counters[key] = self._node_counters.get(key, 0) + node_metrics.get(counter, 0)
+                for event, count in node_metrics.get("log_events", {}).items():
+                    key = (node, event)
+                    self._log_events[key] = self._log_events.get(key, 0) + count
+
+            for gate, gate_metrics in metrics.get("gates", {}).items():
+                observed = self._gate_seconds.setdefault(gate, [0.0, 0])
+                observed[0] += gate_metrics.get("seconds", 0.0)
+                observed[1] += 1
+                self._gate_matches[gate] = self._gate_matches.get(gate, 0) + gate_metrics.get("matches", 0)
+
+    def render(self, active_scans: Optional[int] = None) -> str:
+        """Render all series in Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            lines += ["# HELP codegates_scans_total Finished scans by status", "# TYPE codegates_scans_total counter"]
+            for status, count in sorted(self._scans.items()):
+                lines.append(f'codegates_scans_total{{status="{_escape_label(status)}"}} {count}')
+
+            if active_scans is not None:
+                lines += ["# HELP codegates_active_scans Scans currently running", "# TYPE codegates_active_scans gauge",
+                          f"codegates_active_scans {active_scans}"]
+
+            lines += ["# HELP codegates_node_duration_seconds Node wall time by phase", "# TYPE codegates_node_duration_seconds summary"]
+            for (node, phase), (total, count) in sorted(self._node_phase_seconds.items()):
+                labels = f'node="{_escape_label(node)}",phase="{phase}"'
+                lines.append(f"codegates_node_duration_seconds_sum{{{labels}}} {total:.6f}")
+                lines.append(f"codegates_node_duration_seconds_count{{{labels}}} {count}")
+
+            lines += ["# HELP codegates_node_cpu_seconds_total Process CPU time spent in each node", "# TYPE codegates_node_cpu_seconds_total counter"]
+            for node, total in sorted(self._node_cpu_seconds.items()):
+                lines.append(f'codegates_node_cpu_seconds_total{{node="{_escape_label(node)}"}} {total:.6f}')
+
+            for counter in NODE_COUNTERS:
+                name = f"codegates_node_{counter}_total"
+                lines += [f"# HELP {name} Node {counter.replace('_', ' ')}", f"# TYPE {name} counter"]
+                for (node, key), total in sorted(self._node_counters.items()):
+                    if key == counter:
+                        lines.append(f'{name}{{node="{_escape_label(node)}"}} {total:g}')
+
+            lines += ["# HELP codegates_log_events_total Log events counted per node (printed or not)", "# TYPE codegates_log_events_total counter"]
+            for (node, event), total in sorted(self._log_events.items()):
+                lines.append(f'codegates_log_events_total{{node="{_escape_label(node)}",event="{_escape_label(event)}"}} {total}')
+
+            lines += ["# HELP codegates_gate_duration_seconds Gate validation wall time", "# TYPE codegates_gate_duration_seconds summary"]
+            for gate, (total, count) in sorted(self._gate_seconds.items()):
+                lines.append(f'codegates_gate_duration_seconds_sum{{gate="{_escape_label(gate)}"}} {total:.6f}')
+                lines.append(f'codegates_gate_duration_seconds_count{{gate="{_escape_label(gate)}"}} {count}')
+
+            lines += ["# HELP codegates_gate_matches_total Unique pattern matches per gate", "# TYPE codegates_gate_matches_total counter"]
+            for gate, total in sorted(self._gate_matches.items()):
+                lines.append(f'codegates_gate_matches_total{{gate="{_escape_label(gate)}"}} {total:g}')
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    """Escape a Prometheus label value"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Registry shared by the API server process
+METRICS_REGISTRY = MetricsRegistry()
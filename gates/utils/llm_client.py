@@ -9,42 +9,25 @@ import time
 import uuid
 import base64
 import logging
+import importlib
 import threading
-import requests
 from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 from enum import Enum
 
-try:
-    import openai
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
 
-try:
-    import anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+def _provider_sdk(name: str):
+    """
+    Import a provider SDK (or httpx) on first use, None if it is not installed
 
-try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
-
-try:
-    import ollama
-    OLLAMA_AVAILABLE = True
-except ImportError:
-    OLLAMA_AVAILABLE = False
-
-try:
-    import httpx
-    HTTPX_AVAILABLE = True
-except ImportError:
-    HTTPX_AVAILABLE = False
+    The SDKs are large and only one provider is used per process, so none of
+    them is imported when this module is.
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
 
 
 class LLMProvider(Enum):
@@ -114,6 +97,7 @@ class ApigeeTokenManager:
         
         self.logger.info("Attempting to generate new Apigee token...")
         
+        import requests
         try:
             response = requests.post(
                 self.apigee_login_url, 
@@ -205,6 +189,7 @@ class EnterpriseTokenManager:
         if not self.refresh_token and not (self.client_id and self.client_secret):
             raise ValueError("No refresh credentials configured")
         
+        import requests
         try:
             headers = {"Content-Type": "application/json"}
             
@@ -284,7 +269,8 @@ class LLMClient:
     
     def _call_openai(self, prompt: str) -> str:
         """Call OpenAI API"""
-        if not OPENAI_AVAILABLE:
+        openai = _provider_sdk("openai")
+        if openai is None:
             raise ImportError("OpenAI library not available")
         
         try:
@@ -310,7 +296,8 @@ class LLMClient:
     
     def _call_anthropic(self, prompt: str) -> str:
         """Call Anthropic API"""
-        if not ANTHROPIC_AVAILABLE:
+        anthropic = _provider_sdk("anthropic")
+        if anthropic is None:
             raise ImportError("Anthropic library not available. Install with: pip install anthropic")
         
         client = anthropic.Anthropic(
@@ -330,7 +317,8 @@ class LLMClient:
     
     def _call_gemini(self, prompt: str) -> str:
         """Call Google Gemini API"""
-        if not GEMINI_AVAILABLE:
+        genai = _provider_sdk("google.generativeai")
+        if genai is None:
             raise ImportError("Google Generative AI library not available. Install with: pip install google-generativeai")
         
         genai.configure(api_key=self.config.api_key)
@@ -344,7 +332,8 @@ class LLMClient:
     
     def _call_ollama(self, prompt: str) -> str:
         """Call Ollama API"""
-        if not OLLAMA_AVAILABLE:
+        ollama = _provider_sdk("ollama")
+        if ollama is None:
             raise ImportError("Ollama library not available. Install with: pip install ollama")
         
         if self.config.base_url:
@@ -360,12 +349,11 @@ class LLMClient:
     
     def _call_local(self, prompt: str) -> str:
         """Call local LLM API"""
-        if not HTTPX_AVAILABLE:
+        httpx = _provider_sdk("httpx")
+        if httpx is None:
             raise ImportError("HTTPX library not available")
         
         try:
-            import httpx
-            
             headers = {
                 "Content-Type": "application/json",
                 "Authorization": f"Bearer {self.config.api_key}" if self.config.api_key else ""
@@ -419,6 +407,7 @@ class LLMClient:
             "max_tokens": self.config.max_tokens
         }
         
+        import requests
         response = requests.post(
             self.config.base_url,
             headers=headers,
@@ -436,8 +425,12 @@ class LLMClient:
         if not self.apigee_token_manager:
             raise ValueError("Apigee token manager not initialized")
         
-        if not HTTPX_AVAILABLE:
+        openai = _provider_sdk("openai")
+        httpx = _provider_sdk("httpx")
+        if httpx is None:
             raise ImportError("httpx library not available. Install with: pip install httpx")
+        if openai is None:
+            raise ImportError("OpenAI library not available")
         
         # Get Apigee token
         apigee_token = self.apigee_token_manager.get_apigee_token()
@@ -0,0 +1,276 @@
+"""
+Local Source Utility
+Scans a directory that is already on disk (a workspace checkout) in place, optionally
+limited to the files tracked by git or to a list of changed files
+"""
+
+import os
+import subprocess
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from .file_scanner import _should_ignore_directory
+from .scan_logger import get_logger
+
+
+def tracked_only_enabled(request: Dict[str, Any]) -> bool:
+    """Whether local scans list only files in the git index (request tracked_only, else CODEGATES_LOCAL_TRACKED_ONLY)"""
+    value = request.get("tracked_only")
+    if value is None:
+        return os.getenv("CODEGATES_LOCAL_TRACKED_ONLY", "false").lower() in ("1", "true", "yes")
+    return bool(value)
+
+
+def resolve_local_target(path: str, changed_files: Optional[List[str]] = None) -> Tuple[str, Optional[List[str]]]:
+    """
+    Resolve the directory to scan and the changed files within it
+
+    A file path scans that file only, from the root of its git work tree (or
+    its directory outside git) so relative paths and build files stay intact.
+
+    Args:
+        path: Local directory or file
+        changed_files: Files to limit the scan to (absolute, or relative to the directory)
+
+    Returns:
+        (root directory, changed files relative to it or None for all files)
+
+    Raises:
+        ValueError: If the path does not exist
+    """
+    target = Path(path).expanduser().resolve()
+    if not target.exists():
+        raise ValueError(f"Local path does not exist: {path}")
+
+    if target.is_file():
+        root = _git_toplevel(target.parent) or target.parent
+        changed_files = [str(target)] + list(changed_files or [])
+    else:
+        root = target
+
+    if changed_files is None:
+        return str(root), None
+
+    relative_files = []
+    for changed_file in changed_files:
+        file_path = Path(changed_file).expanduser()
+        file_path = file_path.resolve() if file_path.is_absolute() else (root / file_path).resolve()
+        try:
+            relative = file_path.relative_to(root).as_posix()
+        except ValueError:
+            raise ValueError(f"Changed file is outside {root}: {changed_file}")
+        if relative not in relative_files:
+            relative_files.append(relative)
+    return str(root), relative_files
+
+
+class LocalFileCache:
+    """
+    File contents kept across the scans of a long-lived process (the daemon).
+
+    Entries are keyed by absolute path and only served while the file's size
+    and modification time are unchanged, so edits between scans are always
+    read again. LRU within a byte budget; thread-safe.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max(0, int(max_bytes))
+        self._entries: "OrderedDict[str, Tuple[int, int, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, path: str, size: int, mtime_ns: int) -> Optional[bytes]:
+        """Cached contents of a file, or None if missing or stale"""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != size or entry[1] != mtime_ns:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(path)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, path: str, size: int, mtime_ns: int, content: bytes) -> None:
+        with self._lock:
+            previous = self._entries.pop(path, None)
+            if previous is not None:
+                self.current_bytes -= len(previous[2])
+            if len(content) > self.max_bytes:
+                return
+            self._entries[path] = (size, mtime_ns, content)
+            self.current_bytes += len(content)
+            while self.current_bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= len(evicted[2])
+                self.evictions += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_bytes": self.max_bytes,
+                "current_bytes": self.current_bytes,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+
+class LocalFileSource:
+    """
+    Files of a local directory, read in place.
+
+    Serves the same interface as GitObjectSource so the scanner, the content
+    cache and the pattern matcher read a workspace without cloning it. The
+    listing is every file (like a working tree walk), the files in the git
+    index (tracked_only, so untracked build output is ignored) or just the
+    changed files of a pre-commit scan. commit is always None: the tree may
+    have uncommitted changes, so nothing is persisted per commit for it.
+    A LocalFileCache serves files unchanged since an earlier scan from memory.
+    """
+
+    commit = None
+
+    def __init__(self, root: str, changed_files: Optional[List[str]] = None, tracked_only: bool = False,
+                 file_cache: Optional[LocalFileCache] = None):
+        self.root = Path(root)
+        self.changed_files = changed_files
+        self.tracked_only = tracked_only
+        self.file_cache = file_cache
+        self._stats: Optional[Dict[str, Tuple[int, int]]] = None
+
+        self.file_reads = 0
+        self.bytes_read = 0
+        self.cache_hits = 0
+
+    @property
+    def description(self) -> str:
+        if self.changed_files is not None:
+            return f"{len(self.changed_files)} changed files"
+        return "tracked files" if self.tracked_only else "local directory"
+
+    def list_files(self) -> List[Tuple[str, int]]:
+        """
+        List the files to scan
+
+        Returns:
+            (relative_path, size) pairs sorted by path
+        """
+        return sorted((path, size) for path, (size, _) in self._load_stats().items())
+
+    def exists(self, relative_path: str) -> bool:
+        return _normalize(relative_path) in self._load_stats()
+
+    def get_size(self, relative_path: str) -> int:
+        """
+        Get a listed file's size
+
+        Raises:
+            FileNotFoundError: If the file is not listed
+        """
+        return self._lookup(relative_path)[0]
+
+    def read_bytes(self, relative_path: str) -> bytes:
+        """
+        Read a listed file from disk
+
+        Raises:
+            OSError: If the file is not listed or cannot be read
+        """
+        size, mtime_ns = self._lookup(relative_path)
+        file_path = str(self.root / _normalize(relative_path))
+        if self.file_cache is not None:
+            content = self.file_cache.get(file_path, size, mtime_ns)
+            if content is not None:
+                self.cache_hits += 1
+                return content
+        with open(file_path, "rb") as f:
+            content = f.read()
+        self.file_reads += 1
+        self.bytes_read += len(content)
+        # Only cache what matches the listing, a file written since then is read again next time
+        if self.file_cache is not None and len(content) == size:
+            self.file_cache.put(file_path, size, mtime_ns, content)
+        return content
+
+    def close(self) -> None:
+        """Nothing to release, the files stay where they are"""
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "commit": None,
+            "files": len(self._stats) if self._stats is not None else 0,
+            "file_reads": self.file_reads,
+            "bytes_read": self.bytes_read,
+            "cache_hits": self.cache_hits,
+            "tracked_only": self.tracked_only,
+            "changed_files": len(self.changed_files) if self.changed_files is not None else None
+        }
+
+    def _load_stats(self) -> Dict[str, Tuple[int, int]]:
+        """List the files once: relative path -> (size, mtime_ns) (deleted files are skipped)"""
+        if self._stats is None:
+            if self.changed_files is not None:
+                paths = self.changed_files
+            elif self.tracked_only:
+                paths = self._tracked_files()
+            else:
+                paths = None
+
+            if paths is None:
+                paths = []
+                for root, dirs, filenames in os.walk(self.root):
+                    # Prune what the scanner ignores anyway (.git, node_modules, build output) instead of stat-ing it
+                    dirs[:] = [d for d in dirs if not _should_ignore_directory(d)]
+                    paths.extend((Path(root) / filename).relative_to(self.root).as_posix() for filename in filenames)
+
+            stats = {}
+            for relative_path in paths:
+                try:
+                    stat = (self.root / relative_path).stat()
+                except OSError:
+                    continue
+                if os.path.isfile(self.root / relative_path):
+                    stats[relative_path] = (stat.st_size, stat.st_mtime_ns)
+            self._stats = stats
+        return self._stats
+
+    def _lookup(self, relative_path: str) -> Tuple[int, int]:
+        entry = self._load_stats().get(_normalize(relative_path))
+        if entry is None:
+            raise FileNotFoundError(f"Not in the scan: {relative_path}")
+        return entry
+
+    def _tracked_files(self) -> Optional[List[str]]:
+        """Files in the git index below root, or None (all files) outside a git work tree"""
+        try:
+            output = subprocess.run(
+                ["git", "-C", str(self.root), "ls-files", "-z", "--cached"],
+                check=True, capture_output=True
+            ).stdout
+        except (OSError, subprocess.CalledProcessError):
+            get_logger().warning(f"⚠️ {self.root} is not a git work tree, scanning all files")
+            return None
+        return [os.fsdecode(path) for path in output.split(b"\0") if path]
+
+
+def _git_toplevel(directory: Path) -> Optional[Path]:
+    """Root of the git work tree containing directory, if any"""
+    try:
+        output = subprocess.run(
+            ["git", "-C", str(directory), "rev-parse", "--show-toplevel"],
+            check=True, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return Path(output).resolve() if output else None
+
+
+def _normalize(relative_path: str) -> str:
+    """Listed paths always use forward slashes"""
+    return str(relative_path).replace("\\", "/")
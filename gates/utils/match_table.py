@@ -0,0 +1,342 @@
+"""
+Match Table Utility
+Columnar store of pattern matches with interned strings, used for deduplication, scoring and reporting
+"""
+
+import random
+from array import array
+from typing import Dict, Any, List, Optional, Iterable, Iterator, Tuple, Union
+
+from .report_writer import StringTables, STRING_TABLES, MAX_MATCH_TEXT
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# How matches are kept once a gate is scored: a uniform sample, the first
+# matches of each file (sampled down to the limit if needed) or everything
+MATCH_RETENTION_POLICIES = ("sample", "per_file", "all")
+
+# String tables of a match table: the report's tables plus the matched text
+MATCH_STRING_TABLES = STRING_TABLES + ("texts",)
+
+# Integer column of each interned string column
+_ID_COLUMNS = (("files", "file_ids"), ("patterns", "pattern_ids"), ("languages", "language_ids"),
+               ("sources", "source_ids"), ("texts", "text_ids"))
+_COLUMNS = ("file_ids", "lines", "pattern_ids", "language_ids", "source_ids", "text_ids")
+
+
+def _ints(values: Iterable[int] = ()) -> array:
+    return array("i", values)
+
+
+class MatchTable:
+    """
+    Pattern matches stored as parallel integer columns.
+
+    Files, patterns, languages, sources and matched texts (truncated to
+    MAX_MATCH_TEXT, like every report) are interned once in the table's string
+    tables, so a match costs six array slots instead of a six-key dict.
+    Deduplication, per-file and per-source counts run on the integer columns,
+    vectorized with NumPy when it is installed. Indexing, slicing and
+    iteration still produce match dicts for callers that need them.
+
+    A table returned by retain() holds a bounded subset of the matches and
+    carries the exact counters of the full set: total_matches,
+    files_with_matches() and get_counts() report the full set while len(),
+    indexing and iteration cover the retained rows.
+    """
+
+    def __init__(self, strings: Optional[StringTables] = None):
+        self.strings = strings if strings is not None else StringTables(MATCH_STRING_TABLES)
+        self.file_ids = _ints()
+        self.lines = _ints()
+        self.pattern_ids = _ints()
+        self.language_ids = _ints()
+        self.source_ids = _ints()
+        self.text_ids = _ints()
+        # Counters of the full match set when this table only retains part of it
+        self.exact: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_matches(cls, matches: Iterable[Dict[str, Any]]) -> "MatchTable":
+        """Build a table from match dicts"""
+        table = cls()
+        for match in matches:
+            table.append(match.get("file"), match.get("line", 0), match.get("pattern"), match.get("match", ""),
+                         match.get("language"), match.get("source"))
+        return table
+
+    def append(self, file: str, line: int, pattern: str, text: str, language: str, source: str) -> None:
+        intern = self.strings.intern
+        self.file_ids.append(intern("files", file))
+        self.lines.append(line)
+        self.pattern_ids.append(intern("patterns", pattern))
+        self.language_ids.append(intern("languages", language))
+        self.source_ids.append(intern("sources", source))
+        self.text_ids.append(intern("texts", str(text)[:MAX_MATCH_TEXT]))
+
+    def add_file_matches(self, file: str, language: str, source: str, rows: List[Tuple[str, str, int]]) -> None:
+        """Append one file's (pattern, text, line) matches, interning the shared strings once"""
+        if not rows:
+            return
+        intern = self.strings.intern
+        count = len(rows)
+        self.file_ids.extend([intern("files", file)] * count)
+        self.language_ids.extend([intern("languages", language)] * count)
+        self.source_ids.extend([intern("sources", source)] * count)
+        self.pattern_ids.extend([intern("patterns", pattern) for pattern, _, _ in rows])
+        self.text_ids.extend([intern("texts", str(text)[:MAX_MATCH_TEXT]) for _, text, _ in rows])
+        self.lines.extend([line for _, _, line in rows])
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    @property
+    def total_matches(self) -> int:
+        """Number of matches, including those not retained"""
+        return self.exact["matches"] if self.exact is not None else len(self)
+
+    @property
+    def sampled(self) -> bool:
+        """Whether matches were dropped by retain()"""
+        return self.exact is not None and self.exact["matches"] > len(self)
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """Match i as a dict"""
+        tables = self.strings.tables
+        return {
+            "file": tables["files"][self.file_ids[i]],
+            "pattern": tables["patterns"][self.pattern_ids[i]],
+            "match": tables["texts"][self.text_ids[i]],
+            "line": self.lines[i],
+            "language": tables["languages"][self.language_ids[i]],
+            "source": tables["sources"][self.source_ids[i]]
+        }
+
+    def __getitem__(self, key: Union[int, slice]):
+        if isinstance(key, slice):
+            return [self.row(i) for i in range(*key.indices(len(self)))]
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("match index out of range")
+        return self.row(key)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def head(self, count: int) -> "MatchTable":
+        """The first count matches, sharing this table's strings"""
+        if count >= len(self):
+            return self
+        table = MatchTable(self.strings)
+        for column in _COLUMNS:
+            setattr(table, column, getattr(self, column)[:count])
+        return table
+
+    def take(self, indices: List[int]) -> "MatchTable":
+        """The matches at the given row indices, sharing this table's strings"""
+        table = MatchTable(self.strings)
+        for column in _COLUMNS:
+            values = getattr(self, column)
+            getattr(table, column).extend([values[i] for i in indices])
+        return table
+
+    def get_counts(self) -> Dict[str, Any]:
+        """Exact counters of the full match set: matches, files and per-pattern / per-source counts"""
+        if self.exact is not None:
+            return self.exact
+        return {
+            "matches": len(self),
+            "files_with_matches": self.files_with_matches(),
+            "by_pattern": self.pattern_counts(),
+            "by_source": self.source_counts()
+        }
+
+    def retain(self, policy: str = "sample", limit: int = 1000, per_file: int = 3, seed: int = 0) -> "MatchTable":
+        """
+        Keep at most limit matches for evidence and reporting
+
+        "sample" keeps a uniform random sample, "per_file" the first per_file
+        matches of every file (sampled down to limit if there are still too
+        many) and "all" every match. Retained rows keep their original order
+        and the sample is reproducible for a given seed. The result carries
+        this table's exact counters.
+        """
+        if policy == "all" or (policy == "sample" and len(self) <= limit):
+            return self
+        counts = self.get_counts()
+
+        indices = range(len(self))
+        if policy == "per_file":
+            kept_per_file: Dict[int, int] = {}
+            indices = []
+            for i, file_id in enumerate(self.file_ids):
+                kept = kept_per_file.get(file_id, 0)
+                if kept < per_file:
+                    kept_per_file[file_id] = kept + 1
+                    indices.append(i)
+        if len(indices) > limit:
+            indices = sorted(random.Random(seed).sample(indices, max(0, limit)))
+
+        table = self.take(list(indices))
+        table.exact = counts
+        return table
+
+    def intern_rows(self, tables: StringTables) -> Iterator[list]:
+        """
+        Yield [file, line, pattern, language, source, match] report rows with
+        strings interned in the report's string tables
+
+        Each distinct string is looked up in the report tables once, in the
+        order rows first use it, so the tables match interning the dicts.
+        """
+        source_tables = self.strings.tables
+        maps = {name: [-1] * len(source_tables[name]) for name in STRING_TABLES}
+        columns = {name: getattr(self, column) for name, column in _ID_COLUMNS}
+
+        def remap(name: str, i: int) -> int:
+            string_id = columns[name][i]
+            index = maps[name][string_id]
+            if index < 0:
+                index = maps[name][string_id] = tables.intern(name, source_tables[name][string_id])
+            return index
+
+        texts = source_tables["texts"]
+        for i in range(len(self)):
+            yield [remap("files", i), self.lines[i], remap("patterns", i), remap("languages", i),
+                   remap("sources", i), texts[self.text_ids[i]]]
+
+    def intern_file_lines(self, tables: StringTables) -> Iterator[tuple]:
+        """Yield (file, line) with files interned in the report's string tables"""
+        files = self.strings.tables["files"]
+        file_map = [-1] * len(files)
+        for file_id, line in zip(self.file_ids, self.lines):
+            index = file_map[file_id]
+            if index < 0:
+                index = file_map[file_id] = tables.intern("files", files[file_id])
+            yield index, line
+
+    def files_with_matches(self) -> int:
+        """Number of distinct files with at least one match"""
+        if self.exact is not None:
+            return self.exact["files_with_matches"]
+        if not len(self):
+            return 0
+        if NUMPY_AVAILABLE:
+            return int(np.count_nonzero(np.bincount(self._view("file_ids"))))
+        return len(set(self.file_ids))
+
+    def file_counts(self) -> Dict[str, int]:
+        """Matches per file (retained rows only)"""
+        return self._counts("files", "file_ids")
+
+    def pattern_counts(self) -> Dict[str, int]:
+        """Matches per pattern"""
+        if self.exact is not None:
+            return self.exact["by_pattern"]
+        return self._counts("patterns", "pattern_ids")
+
+    def source_counts(self) -> Dict[str, int]:
+        """Matches per pattern source (LLM / Static)"""
+        if self.exact is not None:
+            return self.exact["by_source"]
+        return self._counts("sources", "source_ids")
+
+    def nbytes(self) -> int:
+        """Bytes held by the integer columns (string tables excluded)"""
+        return sum(len(column) * column.itemsize for column in (getattr(self, name) for name in _COLUMNS))
+
+    @classmethod
+    def merge_unique(cls, *tables: "MatchTable") -> "MatchTable":
+        """
+        Concatenate tables keeping the first match per (file, line)
+
+        The result has its own string tables; inputs are not modified.
+        """
+        merged = cls()
+        remapped = []
+        for table in tables:
+            maps = {
+                column: [merged.strings.intern(name, value) for value in table.strings.tables[name]]
+                for name, column in _ID_COLUMNS
+            }
+            remapped.append((table, maps))
+
+        if NUMPY_AVAILABLE:
+            merged._merge_numpy(remapped)
+        else:
+            merged._merge_python(remapped)
+        return merged
+
+    def _merge_python(self, remapped: list) -> None:
+        seen = set()
+        for table, maps in remapped:
+            file_map = maps["file_ids"]
+            # Duplicates are sparse: find them, then copy the runs of rows between them
+            dropped = []
+            for i, key in enumerate(zip([file_map[file_id] for file_id in table.file_ids], table.lines)):
+                if key in seen:
+                    dropped.append(i)
+                else:
+                    seen.add(key)
+            runs = []
+            start = 0
+            for i in dropped + [len(table)]:
+                if i > start:
+                    runs.append((start, i))
+                start = i + 1
+            for column in _COLUMNS:
+                values = getattr(table, column)
+                column_map = maps.get(column)
+                # Ids of the first table are unchanged by the merge
+                if column_map is not None and any(i != value for i, value in enumerate(column_map)):
+                    values = array("i", [column_map[value] for value in values])
+                target = getattr(self, column)
+                for start, end in runs:
+                    target.extend(values[start:end])
+
+    def _merge_numpy(self, remapped: list) -> None:
+        parts = [(table, maps) for table, maps in remapped if len(table)]
+        if not parts:
+            return
+        columns = {}
+        for column in _COLUMNS:
+            columns[column] = np.concatenate([
+                table._view(column) if column == "lines"
+                else np.asarray(maps[column], dtype=np.intc)[table._view(column)]
+                for table, maps in parts
+            ])
+        keys = (columns["file_ids"].astype(np.int64) << 32) | (columns["lines"].astype(np.int64) & 0xFFFFFFFF)
+        _, first = np.unique(keys, return_index=True)
+        first.sort()
+        for column in _COLUMNS:
+            getattr(self, column).frombytes(columns[column][first].astype(np.intc).tobytes())
+
+    def _view(self, column: str):
+        return np.frombuffer(getattr(self, column), dtype=np.intc)
+
+    def _counts(self, name: str, column: str) -> Dict[str, int]:
+        values = self.strings.tables[name]
+        if not len(self):
+            return {}
+        if NUMPY_AVAILABLE:
+            counts = np.bincount(self._view(column), minlength=len(values))
+            return {values[i]: int(counts[i]) for i in np.flatnonzero(counts)}
+        counts: Dict[str, int] = {}
+        for i in getattr(self, column):
+            counts[values[i]] = counts.get(values[i], 0) + 1
+        return counts
+
+
+def as_match_table(matches: Union[MatchTable, Iterable[Dict[str, Any]], None]) -> MatchTable:
+    """Return matches as a MatchTable, converting a list of match dicts"""
+    if isinstance(matches, MatchTable):
+        return matches
+    return MatchTable.from_matches(matches or [])
+
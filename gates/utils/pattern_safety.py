@@ -0,0 +1,462 @@
+"""
+Pattern Safety Utility
+ReDoS analysis, rewriting and time budgeting for LLM-generated regex patterns
+"""
+
+import os
+import re
+import time
+from typing import Dict, Any, List, Optional, Tuple, Pattern
+
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:
+    # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+from .scan_logger import get_logger
+
+
+# Default time budget per pattern per gate and source (override with CODEGATES_PATTERN_TIME_BUDGET)
+DEFAULT_PATTERN_TIME_BUDGET = 10.0
+
+# Number of files matched before projecting a pattern's cost over all eligible files
+DEFAULT_COST_SAMPLE_FILES = 10
+
+# Adversarial probe lengths and the time a single probe may take
+PROBE_LENGTHS = (8, 12, 16, 20)
+PROBE_TIME_LIMIT = 0.05
+
+_REPEAT_OPS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT)
+_ANY_FIRST = "any"
+
+# Character sets are approximated over ASCII, with every other character folded into one member
+_NON_ASCII = -1
+_ALL_CHARS = frozenset(range(128)) | {_NON_ASCII}
+_CATEGORY_ESCAPES = {
+    getattr(sre_constants, name): escape
+    for name, escape in (("CATEGORY_DIGIT", r"\d"), ("CATEGORY_NOT_DIGIT", r"\D"), ("CATEGORY_SPACE", r"\s"),
+                         ("CATEGORY_NOT_SPACE", r"\S"), ("CATEGORY_WORD", r"\w"), ("CATEGORY_NOT_WORD", r"\W"))
+    if hasattr(sre_constants, name)
+}
+_CATEGORY_CHARS = {
+    category: frozenset(i for i in range(128) if re.fullmatch(escape, chr(i))) | {_NON_ASCII}
+    for category, escape in _CATEGORY_ESCAPES.items()
+}
+
+# (X+)+, (X*)*, (?:X+)* ... where X is a single atom - same language as (X)+ / (X)*
+_NESTED_SINGLE_ATOM = re.compile(
+    r'\((\?:)?((?:\\.|\[(?:\\.|[^\]\\])*\]|[^()\[\]\\|*+?{}]))([+*])\)([+*])'
+)
+
+
+def analyze_pattern(pattern: str) -> Dict[str, Any]:
+    """
+    Statically analyze a regex for constructs prone to catastrophic backtracking
+
+    Detects unbounded quantifiers nested inside unbounded quantifiers whose body
+    has no mandatory separator the inner quantifier cannot match ((a+)+, but not
+    (\w+\.)+), quantified alternations whose branches can start with the same
+    character, and directly adjacent unbounded quantifiers over overlapping characters.
+
+    Args:
+        pattern: Regex pattern string
+
+    Returns:
+        Dictionary with "safe" (no exponential constructs), "issues" and "warnings"
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except (re.error, RecursionError) as e:
+        return {"safe": False, "issues": [f"invalid regex: {e}"], "warnings": []}
+
+    issues: List[str] = []
+    warnings: List[str] = []
+    _walk(list(parsed), [], issues, warnings)
+
+    return {
+        "safe": not issues,
+        "issues": sorted(set(issues)),
+        "warnings": sorted(set(warnings))
+    }
+
+
+def rewrite_pattern(pattern: str) -> str:
+    """
+    Rewrite nested single-atom quantifiers to an equivalent linear form
+
+    (X+)+ and (X*)* match exactly the same strings as (X)+ and (X)*, so the
+    rewrite never changes which text a pattern matches.
+    """
+    previous = None
+    while previous != pattern:
+        previous = pattern
+        pattern = _NESTED_SINGLE_ATOM.sub(_rewrite_nested_atom, pattern)
+    return pattern
+
+
+def probe_pattern_cost(compiled: Pattern, pattern: str, time_limit: float = PROBE_TIME_LIMIT) -> Optional[float]:
+    """
+    Run a pattern against short adversarial inputs built from its own characters
+
+    Each probe repeats one character (word, digit, space or one of the pattern's
+    own literal characters) and ends with characters that force the match to fail,
+    which is the worst case for backtracking.
+
+    Returns:
+        Slowest probe time in seconds, or None if a probe exceeded time_limit
+    """
+    literal_chars = sorted(set(ch for ch in pattern if ch.isalnum() or ch in "_-.:/"))[:8]
+    alphabet = ["a", "1", " ", "_"] + [ch for ch in literal_chars if ch not in "a1_"]
+    slowest = 0.0
+
+    for ch in alphabet:
+        for length in PROBE_LENGTHS:
+            probe = ch * length + "\x00!"
+            start = time.perf_counter()
+            compiled.search(probe)
+            elapsed = time.perf_counter() - start
+            slowest = max(slowest, elapsed)
+            if elapsed > time_limit:
+                return None
+
+    return slowest
+
+
+class PatternSafetyGuard:
+    """
+    Screens patterns before matching and enforces a time budget while matching.
+
+    LLM patterns are analyzed, rewritten when a linear equivalent exists, rejected
+    otherwise, and probed with adversarial inputs. During matching every pattern's
+    time is accounted; after a sample of files its cost over all eligible bytes is
+    projected, and patterns that exceed (or are projected to exceed) the budget are
+    dropped for the remaining files instead of stalling the gate.
+
+    Screening outcomes only depend on the pattern and flags, so callers that
+    screen the same patterns repeatedly (batch scans) can pass a screen_cache
+    dict shared between guards to skip repeated analysis and probing.
+    """
+
+    def __init__(self, time_budget: Optional[float] = None, sample_files: int = DEFAULT_COST_SAMPLE_FILES, logger=None,
+                 screen_cache: Optional[Dict[tuple, tuple]] = None):
+        if time_budget is None:
+            time_budget = float(os.getenv("CODEGATES_PATTERN_TIME_BUDGET", str(DEFAULT_PATTERN_TIME_BUDGET)))
+        self.time_budget = max(0.1, float(time_budget))
+        self.sample_files = max(1, int(sample_files))
+        # Messages come from matching worker threads, so the caller passes the scan logger
+        self.logger = logger or get_logger()
+        self.screen_cache = screen_cache
+
+        self.rejected: List[Dict[str, Any]] = []
+        self.rewritten: List[Dict[str, Any]] = []
+        self.slow: List[Dict[str, Any]] = []
+
+        self._elapsed: Dict[str, float] = {}
+        self._bytes: Dict[str, int] = {}
+        self._files: Dict[str, int] = {}
+        self._disabled: set = set()
+
+    def screen(self, patterns: List[str], flags: int, analyze: bool = True) -> List[Tuple[str, Pattern]]:
+        """
+        Compile patterns, rewriting or rejecting unsafe ones
+
+        Args:
+            patterns: Pattern strings
+            flags: re flags used for matching
+            analyze: Whether to run ReDoS analysis and probing (LLM patterns)
+
+        Returns:
+            List of (original pattern, compiled pattern) tuples that are safe to run
+        """
+        compiled_patterns = []
+
+        for pattern in patterns:
+            if self.screen_cache is not None:
+                cache_key = (pattern, flags, analyze)
+                outcome = self.screen_cache.get(cache_key)
+                if outcome is None:
+                    outcome = self.screen_cache[cache_key] = self._screen_one(pattern, flags, analyze)
+            else:
+                outcome = self._screen_one(pattern, flags, analyze)
+
+            compiled, rewritten, rejected_reason = outcome
+            if rewritten is not None:
+                self.rewritten.append(dict(rewritten))
+            if rejected_reason is not None:
+                self._reject(pattern, rejected_reason)
+                continue
+            compiled_patterns.append((pattern, compiled))
+
+        return compiled_patterns
+
+    def _screen_one(self, pattern: str, flags: int, analyze: bool) -> tuple:
+        """Screen one pattern; returns (compiled or None, rewrite record or None, rejection reason or None)"""
+        rewritten = None
+        candidate = pattern
+        if analyze:
+            analysis = analyze_pattern(candidate)
+            if not analysis["safe"]:
+                rewrite = rewrite_pattern(candidate)
+                if rewrite != candidate and analyze_pattern(rewrite)["safe"]:
+                    rewritten = {
+                        "pattern": pattern,
+                        "rewritten": rewrite,
+                        "reason": "; ".join(analysis["issues"])
+                    }
+                    candidate = rewrite
+                else:
+                    return None, None, "; ".join(analysis["issues"])
+
+        try:
+            compiled = re.compile(candidate, flags)
+        except re.error as e:
+            return None, rewritten, f"invalid regex: {e}"
+
+        if analyze and probe_pattern_cost(compiled, candidate) is None:
+            return None, rewritten, f"adversarial probe exceeded {PROBE_TIME_LIMIT * 1000:.0f}ms"
+
+        return compiled, rewritten, None
+
+    def is_enabled(self, pattern: str) -> bool:
+        """Check whether a pattern is still within its budget"""
+        return pattern not in self._disabled
+
+    def record(self, pattern: str, elapsed: float, file_bytes: int, total_bytes: int) -> bool:
+        """
+        Account matching time for one file and check the pattern's budget
+
+        Args:
+            pattern: Original pattern string
+            elapsed: Seconds spent matching this file
+            file_bytes: Size of the file just matched
+            total_bytes: Total size of all files eligible for this pattern
+
+        Returns:
+            True if the pattern may keep running, False if it was disabled
+        """
+        spent = self._elapsed[pattern] = self._elapsed.get(pattern, 0.0) + elapsed
+        scanned = self._bytes[pattern] = self._bytes.get(pattern, 0) + file_bytes
+        files = self._files[pattern] = self._files.get(pattern, 0) + 1
+
+        if spent > self.time_budget:
+            self._disable(pattern, spent, None, f"exceeded {self.time_budget:.1f}s budget after {files} files")
+            return False
+
+        if files == self.sample_files and scanned > 0:
+            projected = spent / scanned * total_bytes
+            if projected > self.time_budget:
+                self._disable(pattern, spent, projected, f"projected {projected:.1f}s over all eligible files (budget {self.time_budget:.1f}s)")
+                return False
+
+        return True
+
+    def get_report(self) -> Dict[str, Any]:
+        """Get rejected, rewritten and slow patterns for the gate report"""
+        return {
+            "time_budget_seconds": self.time_budget,
+            "rejected": list(self.rejected),
+            "rewritten": list(self.rewritten),
+            "slow": list(self.slow)
+        }
+
+    def _reject(self, pattern: str, reason: str) -> None:
+        self.rejected.append({"pattern": pattern, "reason": reason})
+        self.logger.item("warning", "pattern_rejected", f"   🛡️ Unsafe regex pattern rejected: {pattern} - {reason}", pattern=pattern, reason=reason)
+
+    def _disable(self, pattern: str, spent: float, projected: Optional[float], reason: str) -> None:
+        self._disabled.add(pattern)
+        self.slow.append({
+            "pattern": pattern,
+            "elapsed_seconds": round(spent, 3),
+            "projected_seconds": round(projected, 3) if projected is not None else None,
+            "files_matched": self._files.get(pattern, 0),
+            "reason": reason
+        })
+        self.logger.item("warning", "pattern_stopped", f"   🐢 Slow regex pattern stopped: {pattern} - {reason}", pattern=pattern, reason=reason)
+
+
+def _rewrite_nested_atom(match) -> str:
+    """Replacement for _NESTED_SINGLE_ATOM"""
+    non_capturing, atom, inner, outer = match.groups()
+    # (X+)+ -> (X)+ ; any combination involving * can match empty -> (X)*
+    quantifier = "+" if inner == "+" and outer == "+" else "*"
+    return f"({non_capturing or ''}{atom}){quantifier}"
+
+
+def _walk(items: list, enclosing: List[list], issues: List[str], warnings: List[str]) -> None:
+    """
+    Walk a parsed pattern collecting backtracking hazards
+
+    enclosing holds, for each unbounded quantifier the items are nested in, the
+    character sets its body must consume on every iteration (its separators).
+    """
+    previous_repeat_first = None
+
+    for op, av in items:
+        repeat_first = None
+
+        if op in _REPEAT_OPS:
+            low, high, sub = av
+            unbounded = high == sre_constants.MAXREPEAT
+            sub_items = list(sub)
+            inner_enclosing = enclosing
+
+            if unbounded:
+                # Iterations of the outer body can only be split one way if a separator delimits them
+                chars = _match_chars(sub_items)
+                if any(not any(chars.isdisjoint(separator) for separator in separators) for separators in enclosing):
+                    issues.append("nested unbounded quantifier")
+                if _has_overlapping_branches(sub_items):
+                    issues.append("quantified alternation with overlapping branches")
+                repeat_first = _first_chars(sub_items)
+                if previous_repeat_first is not None and _overlaps(previous_repeat_first, repeat_first):
+                    warnings.append("adjacent unbounded quantifiers over overlapping characters")
+                inner_enclosing = enclosing + [_mandatory_chars(sub_items)]
+
+            _walk(sub_items, inner_enclosing, issues, warnings)
+
+        elif op == sre_constants.SUBPATTERN:
+            _walk(list(av[-1]), enclosing, issues, warnings)
+
+        elif op == sre_constants.BRANCH:
+            for alternative in av[1]:
+                _walk(list(alternative), enclosing, issues, warnings)
+
+        elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            _walk(list(av[1]), [], issues, warnings)
+
+        elif op in (getattr(sre_constants, "ATOMIC_GROUP", None), getattr(sre_constants, "POSSESSIVE_REPEAT", None)):
+            # Atomic constructs never backtrack into their contents
+            pass
+
+        previous_repeat_first = repeat_first
+
+
+def _atom_chars(op, av) -> Optional[frozenset]:
+    """Characters a single-character atom can match (ignoring case), or None if op is not one"""
+    if op == sre_constants.LITERAL:
+        return _fold_case({av})
+    if op == sre_constants.NOT_LITERAL:
+        return (_ALL_CHARS - _fold_case({av})) | {_NON_ASCII}
+    if op == sre_constants.ANY:
+        return _ALL_CHARS
+    if op != sre_constants.IN:
+        return None
+
+    chars = set()
+    negate = False
+    for kind, value in av:
+        if kind == sre_constants.NEGATE:
+            negate = True
+        elif kind == sre_constants.LITERAL:
+            chars.add(value)
+        elif kind == sre_constants.RANGE:
+            low, high = value
+            chars.update(range(low, min(high, 127) + 1))
+            if high > 127:
+                chars.add(_NON_ASCII)
+        elif kind == sre_constants.CATEGORY and value in _CATEGORY_CHARS:
+            chars |= _CATEGORY_CHARS[value]
+        else:
+            return _ALL_CHARS
+    chars = _fold_case(chars)
+    return (_ALL_CHARS - chars) | {_NON_ASCII} if negate else chars
+
+
+def _fold_case(chars) -> frozenset:
+    """Map characters to ASCII set members, adding the other case of letters (patterns run with IGNORECASE)"""
+    folded = set()
+    for char in chars:
+        if char == _NON_ASCII or char > 127:
+            folded.add(_NON_ASCII)
+        else:
+            folded.update((char, ord(chr(char).swapcase())))
+    return frozenset(folded)
+
+
+def _match_chars(items: list) -> frozenset:
+    """Every character a parsed sequence can consume"""
+    chars = set()
+    for op, av in items:
+        atom = _atom_chars(op, av)
+        if atom is not None:
+            chars |= atom
+        elif op == sre_constants.SUBPATTERN:
+            chars |= _match_chars(list(av[-1]))
+        elif op == sre_constants.BRANCH:
+            for alternative in av[1]:
+                chars |= _match_chars(list(alternative))
+        elif op in _REPEAT_OPS or op == getattr(sre_constants, "POSSESSIVE_REPEAT", None):
+            chars |= _match_chars(list(av[2]))
+        elif op == getattr(sre_constants, "ATOMIC_GROUP", None):
+            chars |= _match_chars(list(av))
+        elif op not in (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            # Backreferences, conditionals: anything
+            return _ALL_CHARS
+    return frozenset(chars)
+
+
+def _mandatory_chars(items: list) -> List[frozenset]:
+    """Character sets of the single-character atoms every match of a parsed sequence consumes"""
+    mandatory = []
+    for op, av in items:
+        atom = _atom_chars(op, av)
+        if atom is not None:
+            mandatory.append(atom)
+        elif op == sre_constants.SUBPATTERN:
+            mandatory.extend(_mandatory_chars(list(av[-1])))
+        elif op in _REPEAT_OPS and av[0] >= 1:
+            mandatory.extend(_mandatory_chars(list(av[2])))
+    return mandatory
+
+
+def _first_chars(items: list):
+    """Approximate the set of characters a parsed sequence can start with"""
+    for op, av in items:
+        if op == sre_constants.LITERAL:
+            return {av}
+        if op == sre_constants.AT:
+            continue
+        if op == sre_constants.SUBPATTERN:
+            return _first_chars(list(av[-1]))
+        if op == sre_constants.BRANCH:
+            chars = set()
+            for alternative in av[1]:
+                first = _first_chars(list(alternative))
+                if first == _ANY_FIRST:
+                    return _ANY_FIRST
+                chars |= first
+            return chars
+        if op in _REPEAT_OPS:
+            if av[0] == 0:
+                return _ANY_FIRST
+            return _first_chars(list(av[2]))
+        if op == sre_constants.IN and all(kind == sre_constants.LITERAL for kind, _ in av):
+            return {value for _, value in av}
+        # Classes, categories, '.', backreferences: treat as matching anything
+        return _ANY_FIRST
+    return _ANY_FIRST
+
+
+def _overlaps(first_a, first_b) -> bool:
+    if first_a == _ANY_FIRST or first_b == _ANY_FIRST:
+        return True
+    return bool(first_a & first_b)
+
+
+def _has_overlapping_branches(items: list) -> bool:
+    """Check for an alternation whose branches can start with the same character"""
+    for op, av in items:
+        if op == sre_constants.SUBPATTERN:
+            return _has_overlapping_branches(list(av[-1]))
+        if op == sre_constants.BRANCH:
+            seen = []
+            for alternative in av[1]:
+                first = _first_chars(list(alternative))
+                if any(_overlaps(first, other) for other in seen):
+                    return True
+                seen.append(first)
+    return False
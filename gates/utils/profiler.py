@@ -0,0 +1,152 @@
+"""
+Profiler Utility
+Optional cProfile and sampling profiler for whole scans, written next to the scan's reports
+"""
+
+import io
+import os
+import sys
+import time
+import pstats
+import cProfile
+import threading
+import contextlib
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from .scan_logger import get_scan_logger
+
+
+PROFILE_MODES = ("cprofile", "sampling")
+
+# Sampling interval (override with CODEGATES_PROFILE_INTERVAL_MS)
+DEFAULT_SAMPLE_INTERVAL_MS = 5.0
+
+# Functions listed in the text summary
+SUMMARY_LIMIT = 40
+
+
+class StackSampler:
+    """
+    Low-overhead sampling profiler producing collapsed stacks.
+
+    A daemon thread snapshots sys._current_frames() every interval and counts
+    each distinct stack. The thread that starts the sampler and every thread
+    started afterwards are sampled (pattern matching runs in worker threads);
+    threads that already existed, such as other server requests, are not.
+    """
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL_MS / 1000):
+        self.interval = max(0.001, float(interval))
+        self.samples = 0
+        self.stacks: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._excluded: set = set()
+        self._labels: Dict[Any, str] = {}
+
+    def start(self) -> None:
+        current = threading.get_ident()
+        self._excluded = {t.ident for t in threading.enumerate() if t.ident != current}
+        self._thread = threading.Thread(target=self._run, name="codegates-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def write_collapsed(self, path: Path) -> None:
+        """Write stacks as 'root;caller;callee count' lines (flamegraph.pl / speedscope format)"""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or thread_id in self._excluded:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                key = ";".join(reversed(stack))
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+            self.samples += 1
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+
+@contextlib.contextmanager
+def profile_scan(shared: Dict[str, Any]):
+    """
+    Profile the enclosed flow run when the request asks for it
+
+    With request "profile" set, the run is sampled for a collapsed-stack flame
+    graph and, in "cprofile" mode (default), also traced by cProfile for a pstats
+    file and a text summary. Files are written to the request's output directory
+    and their paths stored in shared["reports"]["profile"]. Without "profile"
+    this is a no-op.
+    """
+    request = shared.get("request", {})
+    if not request.get("profile"):
+        yield None
+        return
+
+    mode = (request.get("profile_mode") or os.getenv("CODEGATES_PROFILE_MODE", "cprofile")).lower()
+    if mode not in PROFILE_MODES:
+        mode = "cprofile"
+    interval_ms = float(os.getenv("CODEGATES_PROFILE_INTERVAL_MS", str(DEFAULT_SAMPLE_INTERVAL_MS)))
+    output_dir = Path(request.get("output_dir") or "./reports")
+    scan_id = request.get("scan_id", "scan")
+
+    sampler = StackSampler(interval=interval_ms / 1000)
+    profiler = cProfile.Profile() if mode == "cprofile" else None
+
+    log = get_scan_logger(shared)
+    log.info(f"🔬 Profiling scan ({mode}, sampling every {interval_ms:g}ms)")
+    start = time.perf_counter()
+    sampler.start()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield sampler
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        sampler.stop()
+        duration = time.perf_counter() - start
+
+        paths = {}
+        try:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            collapsed_path = output_dir / f"profile_{scan_id}.collapsed.txt"
+            sampler.write_collapsed(collapsed_path)
+            paths["collapsed"] = str(collapsed_path)
+
+            if profiler is not None:
+                pstats_path = output_dir / f"profile_{scan_id}.pstats"
+                profiler.dump_stats(str(pstats_path))
+                paths["pstats"] = str(pstats_path)
+
+                summary = io.StringIO()
+                summary.write(f"CodeGates scan profile {scan_id}: {duration:.2f}s wall, {sampler.samples} samples\n")
+                summary.write("cProfile covers the flow thread; the collapsed stacks also cover pattern matching worker threads.\n\n")
+                pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(SUMMARY_LIMIT)
+                summary_path = output_dir / f"profile_{scan_id}.txt"
+                summary_path.write_text(summary.getvalue(), encoding="utf-8")
+                paths["summary"] = str(summary_path)
+        except OSError as e:
+            log.warning(f"⚠️ Could not write scan profile: {e}")
+
+        shared.setdefault("reports", {})["profile"] = paths
+        shared["profile"] = {"mode": mode, "duration_seconds": round(duration, 3), "samples": sampler.samples, "paths": paths}
+        if paths:
+            log.info(f"🔬 Profile written: {', '.join(paths.values())}", "profile_written", **paths)
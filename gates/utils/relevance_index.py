@@ -0,0 +1,100 @@
+"""
+Relevance Index Utility
+Precomputed per-scan file subsets so gate file selection is filtered and sorted once
+"""
+
+from array import array
+from typing import Dict, Any, List, Optional, Callable, Hashable, Iterable
+
+
+class FileRelevanceIndex:
+    """
+    Index over a scan's file_list for repeated gate file selection.
+
+    Each file_type is sorted once by relevance and kept as an array of positions
+    into file_list. Subsets for a (file_type, gate language category) key are
+    derived from that order once and then looked up in O(1) for every gate and
+    pattern source. Returned lists are shared and must not be mutated.
+    """
+
+    def __init__(self, file_list: List[Dict[str, Any]], sort_key: Callable[[Dict[str, Any]], Any]):
+        self._file_list = file_list
+        self._sort_key = sort_key
+        self._sorted_by_type: Dict[str, array] = {}
+        self._unsorted_by_type: Dict[str, array] = {}
+        self._index_arrays: Dict[Hashable, array] = {}
+        self._subsets: Dict[Hashable, List[Dict[str, Any]]] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key: Hashable) -> Optional[List[Dict[str, Any]]]:
+        """Get a previously built subset, or None if it has not been built yet"""
+        subset = self._subsets.get(key)
+        if subset is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return subset
+
+    def count_files(self, file_type: str) -> int:
+        """Count non-binary files of a type"""
+        return len(self._get_type_indices(file_type, ordered=False))
+
+    def build(self, key: Hashable, file_type: str, languages: Optional[Iterable[str]] = None, ordered: bool = True) -> List[Dict[str, Any]]:
+        """
+        Build and store the subset for a key
+
+        Args:
+            key: Lookup key, normally (file_type, gate category, thresholds...)
+            file_type: File type to select ("Source Code", "Test Code", ...)
+            languages: Languages to keep, or None to keep every language
+            ordered: Whether to return files in relevance order
+
+        Returns:
+            Files of the subset, in relevance order if requested
+        """
+        type_indices = self._get_type_indices(file_type, ordered=ordered)
+
+        if languages is None:
+            indices = type_indices
+        else:
+            language_set = set(languages)
+            indices = array('l', (i for i in type_indices if self._file_list[i]["language"] in language_set))
+
+        subset = [self._file_list[i] for i in indices]
+        self._index_arrays[key] = indices
+        self._subsets[key] = subset
+        return subset
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index statistics"""
+        return {
+            "files": len(self._file_list),
+            "file_types_indexed": len(self._sorted_by_type),
+            "subsets": len(self._subsets),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def _get_type_indices(self, file_type: str, ordered: bool) -> array:
+        """Get positions of non-binary files of a type, optionally in relevance order"""
+        unsorted = self._unsorted_by_type.get(file_type)
+        if unsorted is None:
+            unsorted = array('l', (
+                i for i, f in enumerate(self._file_list)
+                if f["type"] == file_type and not f["is_binary"]
+            ))
+            self._unsorted_by_type[file_type] = unsorted
+
+        if not ordered:
+            return unsorted
+
+        ordered_indices = self._sorted_by_type.get(file_type)
+        if ordered_indices is None:
+            ordered_indices = array('l', sorted(
+                unsorted, key=lambda i: self._sort_key(self._file_list[i]), reverse=True
+            ))
+            self._sorted_by_type[file_type] = ordered_indices
+
+        return ordered_indices
@@ -0,0 +1,235 @@
+"""
+Report Index Utility
+Gate summaries and a seekable match file written with the reports, for paginated report queries
+"""
+
+import os
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from .report_writer import StringTables, MATCH_COLUMNS, intern_match_rows
+
+
+INDEX_VERSION = 1
+
+# Gate result fields kept in the index (everything but matches, evidence and timings)
+GATE_FIELDS = [
+    "gate", "display_name", "status", "score", "category", "priority", "description",
+    "patterns_used", "matches_found", "match_counts", "partial", "early_terminated", "sampling", "details", "recommendations", "expected_coverage"
+]
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+
+# Loaded indexes, keyed by path and modification time
+_INDEX_CACHE_SIZE = 32
+_index_cache: Dict[Tuple[str, float], "ReportIndex"] = {}
+_index_cache_lock = threading.Lock()
+
+
+def report_index_enabled() -> bool:
+    """Whether scans write a report index (CODEGATES_REPORT_INDEX, default true)"""
+    return os.getenv("CODEGATES_REPORT_INDEX", "true").lower() == "true"
+
+
+def get_index_paths(output_dir: str, scan_id: str) -> Dict[str, str]:
+    """Paths of a scan's index and match files"""
+    return {
+        "index": os.path.join(output_dir, f"codegates_report_{scan_id}.index.json"),
+        "matches": os.path.join(output_dir, f"codegates_report_{scan_id}.matches.ndjson")
+    }
+
+
+def write_report_index(output_dir: str, scan_id: str, gate_results: List[Dict[str, Any]],
+                       overall_score: float = 0.0) -> str:
+    """
+    Write the report index for a scan
+
+    Matches are written gate by gate to an NDJSON file of interned rows
+    ([file, line, pattern, language, source, match] indexes into the string
+    tables). The index holds the gate summaries, the string tables and, per
+    gate, the byte offset and count of its rows plus the files and languages
+    it matched, so queries seek straight to a gate and skip gates that cannot
+    match a file or language filter.
+
+    Returns:
+        Path of the index file
+    """
+    paths = get_index_paths(output_dir, scan_id)
+    tables = StringTables()
+    gates = []
+
+    with open(paths["matches"], "wb") as f:
+        for gate_result in gate_results:
+            entry = {field: gate_result.get(field) for field in GATE_FIELDS}
+            matches = gate_result.get("matches", [])
+            file_ids, language_ids = set(), set()
+            entry["match_offset"] = f.tell()
+            entry["match_count"] = len(matches)
+            for row in intern_match_rows(matches, tables):
+                file_ids.add(row[0])
+                language_ids.add(row[3])
+                f.write(json.dumps(row, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n")
+            entry["file_ids"] = sorted(file_ids)
+            entry["language_ids"] = sorted(language_ids)
+            gates.append(entry)
+
+    index = {
+        "version": INDEX_VERSION,
+        "scan_id": scan_id,
+        "overall_score": overall_score,
+        "matches_file": os.path.basename(paths["matches"]),
+        "match_columns": MATCH_COLUMNS,
+        "gates": gates,
+        "string_tables": tables.tables
+    }
+    with open(paths["index"], "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+    return paths["index"]
+
+
+def _split(value: Optional[str]) -> Optional[set]:
+    """Comma-separated filter values, None when not filtering"""
+    if not value:
+        return None
+    return {part.strip() for part in value.split(",") if part.strip()}
+
+
+def _select(item: Dict[str, Any], fields: Optional[set]) -> Dict[str, Any]:
+    return {k: v for k, v in item.items() if k in fields} if fields else item
+
+
+def _page(offset: int, limit: Optional[int]) -> Tuple[int, int]:
+    return max(0, int(offset or 0)), max(1, min(int(limit or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+
+
+class ReportIndex:
+    """
+    Read side of a report index: filtered, paginated gate and match queries.
+
+    Gate queries run on the in-memory gate summaries. Match queries seek to the
+    selected gates' rows in the match file and only decode the rows they need:
+    without a file or language filter, whole gates before the requested page
+    are skipped using their row counts.
+    """
+
+    def __init__(self, index_path: str, data: Dict[str, Any]):
+        self.index_path = Path(index_path)
+        self.data = data
+        self.gates = data["gates"]
+        self.tables = data["string_tables"]
+        self.matches_path = self.index_path.parent / data["matches_file"]
+
+    @classmethod
+    def load(cls, index_path: str) -> "ReportIndex":
+        """Load an index, reusing the cached copy while the file is unchanged"""
+        key = (str(index_path), os.path.getmtime(index_path))
+        with _index_cache_lock:
+            cached = _index_cache.get(key)
+        if cached is not None:
+            return cached
+
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = cls(index_path, json.load(f))
+        with _index_cache_lock:
+            if len(_index_cache) >= _INDEX_CACHE_SIZE:
+                _index_cache.pop(next(iter(_index_cache)))
+            _index_cache[key] = index
+        return index
+
+    def query_gates(self, gate: Optional[str] = None, status: Optional[str] = None, category: Optional[str] = None,
+                    offset: int = 0, limit: Optional[int] = None, fields: Optional[str] = None) -> Dict[str, Any]:
+        """Gate summaries filtered by name, status and category (comma-separated values)"""
+        names, statuses, categories = _split(gate), _split(status), _split(category)
+        selected = [
+            g for g in self.gates
+            if (names is None or g["gate"] in names)
+            and (statuses is None or g["status"] in statuses)
+            and (categories is None or g["category"] in categories)
+        ]
+        offset, limit = _page(offset, limit)
+        wanted = _split(fields)
+        items = [
+            _select({field: g.get(field) for field in GATE_FIELDS}, wanted)
+            for g in selected[offset:offset + limit]
+        ]
+        return {"total": len(selected), "offset": offset, "limit": limit, "items": items}
+
+    def query_matches(self, gate: Optional[str] = None, status: Optional[str] = None, file: Optional[str] = None,
+                      language: Optional[str] = None, source: Optional[str] = None, offset: int = 0,
+                      limit: Optional[int] = None, fields: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Matches filtered by gate, gate status, file, language and source
+
+        A file filter matches the exact path or, ending in "/", every file below
+        that directory. Sources are matched ignoring case (llm, static).
+        """
+        names, statuses = _split(gate), _split(status)
+        file_ids = self._string_ids("files", _split(file), prefix=True)
+        language_ids = self._string_ids("languages", _split(language))
+        source_ids = self._string_ids("sources", _split(source), ignore_case=True)
+        offset, limit = _page(offset, limit)
+        wanted = _split(fields)
+
+        selected = [
+            g for g in self.gates
+            if g["match_count"]
+            and (names is None or g["gate"] in names)
+            and (statuses is None or g["status"] in statuses)
+            and (file_ids is None or not file_ids.isdisjoint(g["file_ids"]))
+            and (language_ids is None or not language_ids.isdisjoint(g["language_ids"]))
+        ]
+        row_filtered = file_ids is not None or language_ids is not None or source_ids is not None
+
+        total = 0
+        items = []
+        with open(self.matches_path, "rb") as f:
+            for g in selected:
+                if not row_filtered:
+                    # Every row counts: skip whole gates before the page without reading them
+                    if total + g["match_count"] <= offset or len(items) >= limit:
+                        total += g["match_count"]
+                        continue
+                f.seek(g["match_offset"])
+                for _ in range(g["match_count"]):
+                    line = f.readline()
+                    if row_filtered:
+                        row = json.loads(line)
+                        if (file_ids is not None and row[0] not in file_ids) \
+                                or (language_ids is not None and row[3] not in language_ids) \
+                                or (source_ids is not None and row[4] not in source_ids):
+                            continue
+                    elif total < offset or len(items) >= limit:
+                        total += 1
+                        continue
+                    else:
+                        row = json.loads(line)
+                    if total >= offset and len(items) < limit:
+                        items.append(_select(self._expand(g["gate"], row), wanted))
+                    total += 1
+
+        return {"total": total, "offset": offset, "limit": limit, "items": items}
+
+    def _string_ids(self, table: str, values: Optional[set], prefix: bool = False, ignore_case: bool = False) -> Optional[set]:
+        if values is None:
+            return None
+        fold = str.lower if ignore_case else (lambda value: value)
+        values = {fold(v) for v in values}
+        directories = tuple(v for v in values if prefix and v.endswith("/"))
+        return {
+            i for i, value in enumerate(self.tables.get(table, []))
+            if fold(value) in values or (directories and fold(value).startswith(directories))
+        }
+
+    def _expand(self, gate: str, row: List[Any]) -> Dict[str, Any]:
+        return {
+            "gate": gate,
+            "file": self.tables["files"][row[0]],
+            "line": row[1],
+            "pattern": self.tables["patterns"][row[2]],
+            "language": self.tables["languages"][row[3]],
+            "source": self.tables["sources"][row[4]],
+            "match": row[5]
+        }
@@ -0,0 +1,277 @@
+"""
+Report Writer Utility
+Streams JSON reports gate by gate in compact, pretty or NDJSON form with optional gzip
+"""
+
+import os
+import gzip
+import json
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterable, Iterator
+
+
+REPORT_DETAILS = ("summary", "file", "match")
+REPORT_JSON_FORMATS = ("compact", "pretty", "ndjson")
+REPORT_HTML_MODES = ("inline", "lazy")
+
+# Lazy HTML reports: gate details sidecar, a script assigning one JSON object
+HTML_DETAILS_PREFIX = "window.codegatesGateDetails = "
+HTML_DETAILS_SUFFIX = ";\n"
+
+# Column layout of the interned rows written per gate at "file" and "match" detail
+FILE_COLUMNS = ["file", "matches", "first_line"]
+MATCH_COLUMNS = ["file", "line", "pattern", "language", "source", "match"]
+STRING_TABLES = ("files", "patterns", "languages", "sources")
+
+# Matched text kept per match row, same as the report's sample matches
+MAX_MATCH_TEXT = 200
+
+
+def get_report_options(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Resolve report options from the scan request, falling back to the environment
+
+    Request keys report_detail / report_json_format / report_gzip / html_mode
+    override CODEGATES_REPORT_DETAIL (summary), CODEGATES_REPORT_JSON_FORMAT
+    (compact), CODEGATES_REPORT_GZIP (false) and CODEGATES_HTML_MODE (inline).
+    Unknown values fall back to the defaults.
+    """
+    detail = (request.get("report_detail") or os.getenv("CODEGATES_REPORT_DETAIL", "summary")).lower()
+    html_mode = (request.get("html_mode") or os.getenv("CODEGATES_HTML_MODE", "inline")).lower()
+    json_format = (request.get("report_json_format") or os.getenv("CODEGATES_REPORT_JSON_FORMAT", "compact")).lower()
+    compress = request.get("report_gzip")
+    if compress is None:
+        compress = os.getenv("CODEGATES_REPORT_GZIP", "false").lower() == "true"
+
+    return {
+        "detail": detail if detail in REPORT_DETAILS else "summary",
+        "json_format": json_format if json_format in REPORT_JSON_FORMATS else "compact",
+        "gzip": bool(compress),
+        "html_mode": html_mode if html_mode in REPORT_HTML_MODES else "inline"
+    }
+
+
+def get_report_filename(scan_id: str, options: Dict[str, Any]) -> str:
+    """File name of a scan's JSON report: .json or .ndjson, plus .gz when compressed"""
+    extension = ".ndjson" if options["json_format"] == "ndjson" else ".json"
+    return f"codegates_report_{scan_id}{extension}{'.gz' if options['gzip'] else ''}"
+
+
+class StringTables:
+    """
+    Lookup tables for strings repeated across match rows.
+
+    Each distinct file, pattern, language and source is stored once and rows
+    refer to it by index. Entries added since the last take_new() can be
+    emitted as a delta, which NDJSON reports write before the gate using them.
+    """
+
+    def __init__(self, names: Iterable[str] = STRING_TABLES):
+        self.tables: Dict[str, List[str]] = {name: [] for name in names}
+        self._index: Dict[str, Dict[str, int]] = {name: {} for name in names}
+        self._flushed: Dict[str, int] = {name: 0 for name in names}
+
+    def intern(self, table: str, value: Any) -> int:
+        value = "" if value is None else str(value)
+        index = self._index[table].get(value)
+        if index is None:
+            index = len(self.tables[table])
+            self._index[table][value] = index
+            self.tables[table].append(value)
+        return index
+
+    def take_new(self) -> Dict[str, List[str]]:
+        """Entries added since the previous call (only tables that grew)"""
+        new = {}
+        for name, values in self.tables.items():
+            if len(values) > self._flushed[name]:
+                new[name] = values[self._flushed[name]:]
+                self._flushed[name] = len(values)
+        return new
+
+
+def intern_match_rows(matches: Iterable[Any], tables: StringTables) -> Iterator[list]:
+    """
+    [file, line, pattern, language, source, match] rows of a gate's matches,
+    strings replaced by their index in the report's string tables
+
+    Accepts match dicts or a MatchTable, which remaps its own interned strings.
+    """
+    if hasattr(matches, "intern_rows"):
+        return matches.intern_rows(tables)
+    return (
+        [
+            tables.intern("files", match.get("file")),
+            match.get("line", 0),
+            tables.intern("patterns", match.get("pattern")),
+            tables.intern("languages", match.get("language")),
+            tables.intern("sources", match.get("source")),
+            str(match.get("match", ""))[:MAX_MATCH_TEXT]
+        ]
+        for match in matches
+    )
+
+
+def intern_match_files(matches: Iterable[Any], tables: StringTables) -> Iterator[tuple]:
+    """(file, line) of a gate's matches, file replaced by its index in the report's string tables"""
+    if hasattr(matches, "intern_file_lines"):
+        return matches.intern_file_lines(tables)
+    return ((tables.intern("files", match.get("file")), match.get("line", 0)) for match in matches)
+
+
+def encode_gate_matches(matches: Iterable[Any], detail: str, tables: StringTables) -> Dict[str, Any]:
+    """
+    Encode a gate's matches at the requested detail level
+
+    "file" gives one [file, matches, first_line] row per file, "match" one
+    [file, line, pattern, language, source, match] row per match; strings are
+    replaced by their index in the report's string tables. "summary" adds nothing.
+    """
+    if detail == "file":
+        per_file: Dict[int, List[int]] = {}
+        for file_index, line in intern_match_files(matches, tables):
+            row = per_file.get(file_index)
+            if row is None:
+                per_file[file_index] = [file_index, 1, line]
+            else:
+                row[1] += 1
+                row[2] = min(row[2], line)
+        return {"match_files": list(per_file.values())}
+
+    if detail == "match":
+        return {"match_rows": list(intern_match_rows(matches, tables))}
+
+    return {}
+
+
+def _open_report(path: Path, compress: bool):
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", compresslevel=6)
+    return open(path, "w", encoding="utf-8")
+
+
+def write_json_report(path: str, header: Dict[str, Any], gates: Iterable[Dict[str, Any]],
+                      tables: Optional[StringTables] = None, json_format: str = "compact",
+                      compress: bool = False) -> Dict[str, Any]:
+    """
+    Write a JSON report, serializing one gate at a time
+
+    The header (everything but the gates) is written first and each gate is
+    dumped as the iterable produces it, so only one gate's encoded matches
+    exist at a time. "compact" and "pretty" write one JSON document with the
+    gates and string tables last; "ndjson" writes a "report" record, then for
+    each gate the new string table entries ("strings" record) and the "gate"
+    record. read_json_report() loads any of them back into the same dict.
+
+    Returns:
+        Gates written and bytes on disk
+    """
+    path = Path(path)
+    tables = tables if tables is not None else StringTables()
+    gate_count = 0
+
+    with _open_report(path, compress) as f:
+        if json_format == "ndjson":
+            f.write(json.dumps({"type": "report", **header}, ensure_ascii=False, separators=(",", ":")) + "\n")
+            for gate in gates:
+                new_strings = tables.take_new()
+                if new_strings:
+                    f.write(json.dumps({"type": "strings", **new_strings}, ensure_ascii=False, separators=(",", ":")) + "\n")
+                f.write(json.dumps({"type": "gate", **gate}, ensure_ascii=False, separators=(",", ":")) + "\n")
+                gate_count += 1
+        else:
+            pretty = json_format == "pretty"
+            dump = (lambda value: json.dumps(value, ensure_ascii=False, indent=2)) if pretty else \
+                (lambda value: json.dumps(value, ensure_ascii=False, separators=(",", ":")))
+            indent, newline = ("  ", "\n") if pretty else ("", "")
+            separator = ": " if pretty else ":"
+
+            def member(key: str, value: Any) -> str:
+                return f"{indent}{json.dumps(key)}{separator}" + dump(value).replace("\n", "\n" + indent)
+
+            f.write("{" + newline)
+            for key, value in header.items():
+                f.write(member(key, value) + "," + newline)
+            f.write(f"{indent}\"gates\"{separator}[")
+            for gate in gates:
+                if gate_count:
+                    f.write(",")
+                f.write(newline + indent * 2 + dump(gate).replace("\n", "\n" + indent * 2))
+                gate_count += 1
+            f.write(newline + indent + "]," + newline if gate_count else "]," + newline)
+            f.write(member("string_tables", tables.tables) + newline + "}" + newline)
+
+    return {"gates": gate_count, "bytes": path.stat().st_size}
+
+
+def read_json_report(path: str) -> Dict[str, Any]:
+    """Load a report written by write_json_report (any format, gzip or not) as one dict"""
+    path = Path(path)
+    name = path.name[:-3] if path.name.endswith(".gz") else path.name
+    with open(path, "rb") as raw:
+        compressed = raw.read(2) == b"\x1f\x8b"
+    opener = (lambda: gzip.open(path, "rt", encoding="utf-8")) if compressed else (lambda: open(path, "r", encoding="utf-8"))
+
+    with opener() as f:
+        if not name.endswith(".ndjson"):
+            return json.load(f)
+
+        report: Dict[str, Any] = {}
+        gates = []
+        tables: Dict[str, List[str]] = {table: [] for table in STRING_TABLES}
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            record_type = record.pop("type", None)
+            if record_type == "report":
+                report.update(record)
+            elif record_type == "strings":
+                for table, values in record.items():
+                    tables.setdefault(table, []).extend(values)
+            elif record_type == "gate":
+                gates.append(record)
+        report["gates"] = gates
+        report["string_tables"] = tables
+        return report
+
+
+def write_html_details(path: str, details: Dict[str, Any]) -> int:
+    """
+    Write the gate details sidecar of a lazy HTML report
+
+    The file is a script (loadable from file:// pages, where fetch() of local
+    JSON is blocked) that assigns one JSON object keyed by gate name.
+
+    Returns:
+        Bytes written
+    """
+    payload = json.dumps(details, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(HTML_DETAILS_PREFIX + payload + HTML_DETAILS_SUFFIX)
+    return Path(path).stat().st_size
+
+
+def read_html_details(path: str) -> Dict[str, Any]:
+    """Load the gate details written by write_html_details"""
+    with open(path, "r", encoding="utf-8") as f:
+        content = f.read()
+    return json.loads(content[len(HTML_DETAILS_PREFIX):len(content) - len(HTML_DETAILS_SUFFIX)])
+
+
+def expand_gate_matches(gate: Dict[str, Any], string_tables: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+    """Turn a gate's interned match rows (or per-file rows) back into dicts"""
+    files = string_tables.get("files", [])
+    if "match_rows" in gate:
+        patterns = string_tables.get("patterns", [])
+        languages = string_tables.get("languages", [])
+        sources = string_tables.get("sources", [])
+        return [
+            {"file": files[row[0]], "line": row[1], "pattern": patterns[row[2]],
+             "language": languages[row[3]], "source": sources[row[4]], "match": row[5]}
+            for row in gate["match_rows"]
+        ]
+    return [
+        {"file": files[row[0]], "matches": row[1], "first_line": row[2]}
+        for row in gate.get("match_files", [])
+    ]
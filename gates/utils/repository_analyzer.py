@@ -0,0 +1,149 @@
+"""
+Repository Analyzer Utility
+Builds every view of a repository (file index, language stats, hierarchical
+structure, dependencies, source/test line totals) from a single walk
+"""
+
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Callable, Iterable
+
+from .file_scanner import scan_directory
+from .scan_logger import ScanLogger
+
+
+# parser(path, read_text) -> dependencies declared by a manifest
+DependencyParser = Callable[[str, Callable[[], str]], List[str]]
+
+
+class FileExtractor:
+    """
+    Plugin of the repository analyzer.
+
+    add() sees every file of the walk with its scanner metadata (path,
+    relative_path, name, extension, language, type, lines, ...); read_text()
+    returns the file's text, read once and shared by all extractors. The
+    view is returned by result() under the extractor's name.
+    """
+
+    name = "extractor"
+
+    def add(self, file_info: Dict[str, Any], read_text: Callable[[], str]) -> None:
+        raise NotImplementedError
+
+    def result(self) -> Any:
+        raise NotImplementedError
+
+
+class StructureExtractor(FileExtractor):
+    """Hierarchical structure: nested directories, each with its sorted file names under "_files" """
+
+    name = "structure"
+
+    def __init__(self):
+        self._tree: Dict[str, Any] = {}
+
+    def add(self, file_info: Dict[str, Any], read_text: Callable[[], str]) -> None:
+        node = self._tree
+        *directories, filename = Path(file_info["relative_path"]).parts
+        for directory in directories:
+            node = node.setdefault(directory, {})
+        node.setdefault("_files", []).append(filename)
+
+    def result(self) -> "OrderedDict[str, Any]":
+        return _sorted_tree(self._tree)
+
+
+class LineTotalsExtractor(FileExtractor):
+    """Source and test file counts and non-blank line totals, by scanner file type"""
+
+    name = "line_totals"
+
+    def __init__(self):
+        self.totals = {"source_files": 0, "source_lines": 0, "test_files": 0, "test_lines": 0}
+
+    def add(self, file_info: Dict[str, Any], read_text: Callable[[], str]) -> None:
+        kind = {"Source Code": "source", "Test Code": "test"}.get(file_info["type"])
+        if kind:
+            self.totals[f"{kind}_files"] += 1
+            self.totals[f"{kind}_lines"] += file_info["lines"]
+
+    def result(self) -> Dict[str, int]:
+        return dict(self.totals)
+
+
+class DependencyExtractor(FileExtractor):
+    """
+    Dependencies declared by build manifests.
+
+    parsers maps a file name (pom.xml) or an extension (.csproj) to the
+    function parsing that manifest; other files are not read.
+    """
+
+    name = "dependencies"
+
+    def __init__(self, parsers: Dict[str, DependencyParser]):
+        self.parsers = parsers
+        self.manifests: List[Dict[str, Any]] = []
+        self.counts: Dict[str, int] = defaultdict(int)
+
+    def add(self, file_info: Dict[str, Any], read_text: Callable[[], str]) -> Optional[List[str]]:
+        """Parse the file if it is a manifest; returns its dependencies, or None for other files"""
+        key = file_info["name"] if file_info["name"] in self.parsers else file_info["extension"]
+        parser = self.parsers.get(key)
+        if parser is None:
+            return None
+
+        dependencies = parser(file_info["path"], read_text) or []
+        self.manifests.append({
+            "relative_path": file_info["relative_path"],
+            "manifest": key,
+            "dependencies": sorted(set(dependencies))
+        })
+        for dependency in dependencies:
+            self.counts[dependency] += 1
+        return dependencies
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "manifests": self.manifests,
+            "dependency_counts": dict(sorted(self.counts.items()))
+        }
+
+
+def analyze_repository(repo_path: str, extractors: Iterable[FileExtractor] = (), max_files: int = 10000,
+                       logger: Optional[ScanLogger] = None, source=None) -> Dict[str, Any]:
+    """
+    Walk a repository once and build the scanner metadata and every extractor's view
+
+    Args:
+        repo_path: Path to repository directory
+        extractors: Plugins run on each file of the same walk (names must be unique)
+        max_files: Maximum number of files to process
+        logger: Scan logger (defaults to the active logger)
+        source: GitObjectSource or LocalFileSource to read files from (see scan_directory)
+
+    Returns:
+        {"metadata": scan_directory metadata (file index, language stats, ...), <extractor name>: view}
+    """
+    extractors = list(extractors)
+    names = [extractor.name for extractor in extractors]
+    if "metadata" in names or len(set(names)) != len(names):
+        raise ValueError(f"Extractor names must be unique and not 'metadata': {names}")
+
+    metadata = scan_directory(repo_path, max_files=max_files, logger=logger, source=source, extractors=extractors)
+
+    analysis = {"metadata": metadata}
+    for extractor in extractors:
+        analysis[extractor.name] = extractor.result()
+    return analysis
+
+
+def _sorted_tree(node: Dict[str, Any]) -> "OrderedDict[str, Any]":
+    """Files first, then subdirectories, each sorted by name"""
+    tree = OrderedDict()
+    if "_files" in node:
+        tree["_files"] = sorted(node["_files"])
+    for key in sorted(k for k in node if k != "_files"):
+        tree[key] = _sorted_tree(node[key])
+    return tree
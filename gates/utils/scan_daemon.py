@@ -0,0 +1,388 @@
+"""
+Scan Daemon Utility
+Long-lived scan process for editors: JSON-RPC 2.0 over stdio or a unix socket, with the
+LLM client, compiled patterns and file contents kept warm between scans
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import socket
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, Callable, TextIO
+
+from .batch_runner import BatchCache, build_scan_shared, summarize_scan
+from .local_source import LocalFileCache, resolve_local_target
+from .scan_logger import ScanLogger
+from .static_patterns import get_static_pattern_registry
+
+
+PROTOCOL_VERSION = "1.0"
+
+# JSON-RPC 2.0 error codes (-32000 is the first server-defined code)
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+SCAN_FAILED = -32000
+
+# Default budget of the warm file cache (override with CODEGATES_DAEMON_FILE_CACHE_MB)
+DEFAULT_FILE_CACHE_MB = 256
+
+# Progress reported when each node finishes, as in the API server's scan status
+NODE_PROGRESS = (
+    ("FetchRepositoryNode", "Fetching repository...", 10),
+    ("ProcessCodebaseNode", "Processing codebase...", 25),
+    ("ExtractConfigNode", "Extracting configuration...", 35),
+    ("GeneratePromptNode", "Generating LLM prompt...", 45),
+    ("CallLLMNode", "Calling LLM for patterns...", 65),
+    ("ValidateGatesNode", "Validating gates...", 85),
+    ("GenerateReportNode", "Generating reports...", 95),
+    ("CleanupNode", "Cleaning up...", 100)
+)
+
+
+class DaemonError(Exception):
+    """A request error answered with a JSON-RPC error response"""
+
+    def __init__(self, code: int, message: str, data: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+
+class ProgressLogger(ScanLogger):
+    """
+    Scan logger that also streams the scan to the daemon's client.
+
+    Each node start and end becomes a "progress" notification with the step
+    and percentage, and warnings and errors are forwarded as "log"
+    notifications. Everything is still logged as usual (to stderr on stdio).
+    """
+
+    def __init__(self, notify: Callable[[str, Dict[str, Any]], None], **kwargs):
+        super().__init__(**kwargs)
+        self._notify = notify
+
+    def start_node(self, node: str) -> None:
+        super().start_node(node)
+        step, percentage = _node_progress(node, finished=False)
+        self._notify("progress", {"scan_id": self.scan_id, "node": node, "state": "started",
+                                  "step": step, "percentage": percentage})
+
+    def end_node(self, node: str) -> Dict[str, Any]:
+        counters = super().end_node(node)
+        step, percentage = _node_progress(node, finished=True)
+        self._notify("progress", {"scan_id": self.scan_id, "node": node, "state": "finished",
+                                  "step": step, "percentage": percentage})
+        return counters
+
+    def _emit(self, level: str, message: str, event: Optional[str], fields: Dict[str, Any], node: Optional[str] = None) -> None:
+        super()._emit(level, message, event, fields, node)
+        if level in ("warning", "error"):
+            self._notify("log", {"scan_id": self.scan_id, "level": level, "node": node or self.node,
+                                 "event": event, "message": message.strip()})
+
+
+def get_file_cache_bytes() -> int:
+    """Warm file cache budget in bytes (CODEGATES_DAEMON_FILE_CACHE_MB, 0 disables it)"""
+    return int(float(os.getenv("CODEGATES_DAEMON_FILE_CACHE_MB", str(DEFAULT_FILE_CACHE_MB))) * 1024 * 1024)
+
+
+class ScanDaemon:
+    """
+    Serves scans to one client at a time over newline-delimited JSON-RPC 2.0.
+
+    One process answers every scan of an editor session, so the interpreter,
+    the modules and the static pattern registry are loaded once, the LLM
+    client and pattern screens live in one BatchCache for the daemon's
+    lifetime, and a LocalFileCache serves unchanged workspace files from
+    memory. Requests are handled in order; a scan streams "progress" and "log"
+    notifications before its response.
+
+    Methods:
+        initialize: Warm up; returns the version, pid and capabilities
+        scan: Scan a local path (or a repository URL); returns the result summary
+        stats: Scans served and cache counters
+        shutdown: Answer, then stop serving
+    """
+
+    def __init__(self, flow_factory: Callable[[], Any], request_options: Optional[Dict[str, Any]] = None,
+                 llm_config: Optional[Dict[str, Any]] = None, output_dir: str = "./reports",
+                 file_cache_bytes: Optional[int] = None, temp_root: Optional[str] = None,
+                 logs_dir: Optional[str] = None):
+        self.flow_factory = flow_factory
+        self.request_options = dict(request_options or {})
+        self.llm_config = dict(llm_config or {})
+        self.output_dir = output_dir
+        self.temp_root = temp_root
+        # Prompt and LLM response logs, kept out of the editor's working directory
+        self.logs_dir = logs_dir or str(Path(output_dir) / "logs")
+        self.cache = BatchCache()
+        self.file_cache = LocalFileCache(get_file_cache_bytes() if file_cache_bytes is None else file_cache_bytes)
+        self.started_at = time.perf_counter()
+        self.scans = 0
+        self.running = True
+        self._methods = {
+            "initialize": self._initialize,
+            "scan": self._scan,
+            "stats": self._stats,
+            "shutdown": self._shutdown
+        }
+
+    def serve(self, reader: TextIO, writer: TextIO) -> None:
+        """Answer requests read line by line until shutdown or end of input"""
+        write_lock = threading.Lock()
+
+        def send(message: Dict[str, Any]) -> None:
+            line = json.dumps(message, default=str, ensure_ascii=False)
+            with write_lock:
+                writer.write(line + "\n")
+                writer.flush()
+
+        def notify(method: str, params: Dict[str, Any]) -> None:
+            send({"jsonrpc": "2.0", "method": method, "params": params})
+
+        for line in reader:
+            if not line.strip():
+                continue
+            response = self.handle(line, notify)
+            if response is not None:
+                send(response)
+            if not self.running:
+                break
+
+    def handle(self, line: str, notify: Callable[[str, Dict[str, Any]], None]) -> Optional[Dict[str, Any]]:
+        """
+        Handle one request line
+
+        Returns:
+            The response, or None for notifications (requests without an id)
+        """
+        try:
+            message = json.loads(line)
+        except ValueError as e:
+            return _error_response(None, PARSE_ERROR, f"Parse error: {e}")
+        if not isinstance(message, dict) or not isinstance(message.get("method"), str):
+            return _error_response(None, INVALID_REQUEST, "Invalid request: expected an object with a method")
+
+        request_id = message.get("id")
+        params = message.get("params") or {}
+        try:
+            method = self._methods.get(message["method"])
+            if method is None:
+                raise DaemonError(METHOD_NOT_FOUND, f"Method not found: {message['method']}")
+            if not isinstance(params, dict):
+                raise DaemonError(INVALID_PARAMS, "Invalid params: expected an object")
+            result = method(params, notify)
+        except DaemonError as e:
+            response = _error_response(request_id, e.code, str(e), e.data)
+        except Exception as e:
+            response = _error_response(request_id, INTERNAL_ERROR, f"Internal error: {e}")
+        else:
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        return response if "id" in message else None
+
+    def scan(self, params: Dict[str, Any], notify: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Run one scan with the daemon's warm caches
+
+        Args:
+            params: "path" (local directory or file, scanned in place) or "repository_url" and "branch",
+                    optional "changed_files", "tracked_only", "threshold", "report_format", "output_dir"
+                    and "options" (further request keys, e.g. fast_verdict)
+            notify: Receives (method, params) progress and log notifications
+
+        Returns:
+            The batch summary row of the scan plus the editor result fields (gate_scores, ...)
+
+        Raises:
+            DaemonError: If the params are invalid
+        """
+        notify = notify or (lambda method, params: None)
+        scan_id = str(uuid.uuid4())
+        options = params.get("options") or {}
+        if not isinstance(options, dict):
+            raise DaemonError(INVALID_PARAMS, "Invalid params: options must be an object")
+
+        request = {
+            "threshold": 70,
+            "report_format": "json",
+            "verbose": False,
+            **self.request_options,
+            **options,
+            "scan_id": scan_id,
+            "output_dir": params.get("output_dir") or self.output_dir
+        }
+        for key in ("threshold", "report_format", "tracked_only"):
+            if params.get(key) is not None:
+                request[key] = params[key]
+
+        if params.get("path"):
+            # Editor scans read the workspace in place, so unchanged files come from the warm cache
+            try:
+                resolve_local_target(params["path"], params.get("changed_files"))
+            except ValueError as e:
+                raise DaemonError(INVALID_PARAMS, f"Invalid params: {e}")
+            request.update({"repository_url": params["path"], "branch": None, "repository_source": "local",
+                            "changed_files": params.get("changed_files")})
+        elif params.get("repository_url"):
+            request.update({"repository_url": params["repository_url"], "branch": params.get("branch") or "main"})
+        else:
+            raise DaemonError(INVALID_PARAMS, "Invalid params: give a path or a repository_url")
+
+        temp_dir = tempfile.mkdtemp(prefix=f"codegates_{scan_id}_", dir=self.temp_root)
+        shared = build_scan_shared(request, self.llm_config, temp_dir)
+        shared["directories"] = {"reports": request["output_dir"], "logs": self.logs_dir}
+        shared["batch_cache"] = self.cache
+        shared["local_file_cache"] = self.file_cache
+        shared["logger"] = ProgressLogger(notify, level=request.get("log_level"), log_format=request.get("log_format"),
+                                          quiet=request.get("quiet"), scan_id=scan_id)
+
+        start = time.perf_counter()
+        try:
+            self.flow_factory().run(shared)
+        except Exception as e:
+            shared["errors"].append(str(e))
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        self.scans += 1
+
+        target = {"repository_url": request["repository_url"], "branch": request["branch"]}
+        return build_scan_result(summarize_scan(target, scan_id, shared, time.perf_counter() - start), shared)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "scans": self.scans,
+            "uptime_seconds": round(time.perf_counter() - self.started_at, 3),
+            "batch_cache": self.cache.get_stats(),
+            "file_cache": self.file_cache.get_stats()
+        }
+
+    def _initialize(self, params: Dict[str, Any], notify: Callable) -> Dict[str, Any]:
+        registry = get_static_pattern_registry()
+        return {
+            "name": "codegates",
+            "protocol_version": PROTOCOL_VERSION,
+            "pid": os.getpid(),
+            "capabilities": {
+                "methods": sorted(self._methods),
+                "notifications": ["progress", "log"],
+                "static_patterns": len(registry.compiled)
+            }
+        }
+
+    def _scan(self, params: Dict[str, Any], notify: Callable) -> Dict[str, Any]:
+        result = self.scan(params, notify)
+        if result["status"] != "completed":
+            raise DaemonError(SCAN_FAILED, f"Scan failed: {'; '.join(result['errors'][-1:])}", result)
+        return result
+
+    def _stats(self, params: Dict[str, Any], notify: Callable) -> Dict[str, Any]:
+        return self.get_stats()
+
+    def _shutdown(self, params: Dict[str, Any], notify: Callable) -> None:
+        self.running = False
+        return None
+
+
+def build_scan_result(row: Dict[str, Any], shared: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the fields the editor extension reads (gate_scores, languages, ...) to a summary row"""
+    gate_results = shared["validation"]["gate_results"]
+    metadata = shared["repository"]["metadata"] or {}
+    gate_scores = []
+    for gate in gate_results:
+        counts = gate.get("match_counts") or {}
+        relevant_files = gate.get("relevant_files") or 0
+        gate_scores.append({
+            "gate": gate.get("gate", "UNKNOWN"),
+            "display_name": gate.get("display_name"),
+            "status": gate.get("status"),
+            "score": gate.get("score", 0),
+            "expected": (gate.get("expected_coverage") or {}).get("percentage", 0),
+            "found": gate.get("matches_found", 0),
+            "coverage": round(counts.get("files_with_matches", 0) / relevant_files * 100, 1) if relevant_files else 0,
+            "details": gate.get("details", []),
+            "recommendations": gate.get("recommendations", []),
+            "issues": [
+                {"file": sample["file"], "line": sample.get("line"), "message": sample.get("match", "")}
+                for sample in gate.get("sample_matches", [])
+            ]
+        })
+    repository = row["repository_url"]
+    return {
+        **row,
+        "project_name": Path(str(repository).rstrip("/")).name or repository,
+        "scan_duration": row["duration_seconds"],
+        "languages": list(metadata.get("languages", {})),
+        "recommendations": [rec for gate in gate_results for rec in gate.get("recommendations", [])],
+        "gate_scores": gate_scores
+    }
+
+
+def serve_stdio(daemon: ScanDaemon) -> None:
+    """
+    Serve the daemon on stdin/stdout
+
+    stdout carries only protocol messages; everything the scan prints goes to
+    stderr instead.
+    """
+    protocol_out = sys.stdout
+    sys.stdout = sys.stderr
+    try:
+        daemon.serve(sys.stdin, protocol_out)
+    finally:
+        sys.stdout = protocol_out
+
+
+def serve_unix_socket(daemon: ScanDaemon, path: str) -> None:
+    """
+    Serve the daemon on a unix socket, one connection at a time, until shutdown
+
+    Raises:
+        OSError: If unix sockets are not supported or the path is in use
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("Unix sockets are not supported on this platform, use stdio")
+    if os.path.exists(path):
+        os.remove(path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        server.bind(path)
+        os.chmod(path, 0o600)
+        server.listen(1)
+        while daemon.running:
+            connection, _ = server.accept()
+            with connection, connection.makefile("r", encoding="utf-8") as reader, \
+                    connection.makefile("w", encoding="utf-8") as writer:
+                try:
+                    daemon.serve(reader, writer)
+                except (BrokenPipeError, ConnectionResetError):
+                    continue
+    finally:
+        server.close()
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _node_progress(node: str, finished: bool) -> tuple:
+    """(step label, percentage) of a node; a started node reports the previous node's percentage"""
+    previous = 0
+    for name, step, percentage in NODE_PROGRESS:
+        if name == node:
+            return step, percentage if finished else previous
+        previous = percentage
+    return f"Running {node}...", None
+
+
+def _error_response(request_id: Any, code: int, message: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    error = {"code": code, "message": message}
+    if data is not None:
+        error["data"] = data
+    return {"jsonrpc": "2.0", "id": request_id, "error": error}
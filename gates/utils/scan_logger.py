@@ -0,0 +1,185 @@
+"""
+Scan Logger Utility
+Leveled, rate-limited logging for the validation flow with text or JSON-lines output
+"""
+
+import os
+import json
+import time
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+
+# Per-item messages (one per file, pattern, ...) allowed in a burst and refilled per second
+DEFAULT_BURST = 10
+DEFAULT_RATE = 1.0
+
+_active = threading.local()
+_default_logger = None
+
+
+class ScanLogger:
+    """
+    Logger for one scan.
+
+    Messages have a level and an optional event name. Every event is counted per
+    node whether or not it is printed, so per-item messages in hot loops can be
+    rate limited (token bucket per node and event) and summarized instead of
+    writing one line per file. Output is the usual emoji text or JSON lines
+    (CODEGATES_LOG_FORMAT=json); quiet mode (CODEGATES_QUIET) only prints
+    warnings and errors and keeps per-item messages as counters.
+    """
+
+    def __init__(self, level: Optional[str] = None, log_format: Optional[str] = None, quiet: Optional[bool] = None,
+                 burst: Optional[int] = None, rate: Optional[float] = None, scan_id: Optional[str] = None):
+        if quiet is None:
+            quiet = os.getenv("CODEGATES_QUIET", "false").lower() in ("1", "true", "yes")
+        level = (level or os.getenv("CODEGATES_LOG_LEVEL", "info")).lower()
+        self.quiet = bool(quiet)
+        self.level = LEVELS.get(level, LEVELS["info"])
+        if self.quiet:
+            self.level = max(self.level, LEVELS["warning"])
+        self.format = (log_format or os.getenv("CODEGATES_LOG_FORMAT", "text")).lower()
+        self.burst = 0 if self.quiet else int(burst if burst is not None else os.getenv("CODEGATES_LOG_BURST", DEFAULT_BURST))
+        self.rate = float(rate if rate is not None else os.getenv("CODEGATES_LOG_RATE", DEFAULT_RATE))
+        self.scan_id = scan_id
+        self.node: Optional[str] = None
+
+        self._lock = threading.Lock()
+        self._events: Dict[Optional[str], Dict[str, int]] = {}
+        self._suppressed: Dict[Optional[str], Dict[str, int]] = {}
+        self._buckets: Dict[tuple, list] = {}
+
+    def is_enabled_for(self, level: str) -> bool:
+        return LEVELS[level] >= self.level
+
+    def debug(self, message: str, event: Optional[str] = None, **fields) -> None:
+        self.log("debug", message, event, **fields)
+
+    def info(self, message: str, event: Optional[str] = None, **fields) -> None:
+        self.log("info", message, event, **fields)
+
+    def warning(self, message: str, event: Optional[str] = None, **fields) -> None:
+        self.log("warning", message, event, **fields)
+
+    def error(self, message: str, event: Optional[str] = None, **fields) -> None:
+        self.log("error", message, event, **fields)
+
+    def item(self, level: str, event: str, message: str, **fields) -> None:
+        """Log a per-item message (counted always, printed subject to the rate limit)"""
+        self.log(level, message, event, rate_limited=True, **fields)
+
+    def count(self, event: str, n: int = 1) -> None:
+        """Count an event without printing anything"""
+        with self._lock:
+            events = self._events.setdefault(self.node, {})
+            events[event] = events.get(event, 0) + n
+
+    def log(self, level: str, message: str, event: Optional[str] = None, rate_limited: bool = False, **fields) -> None:
+        if event is not None:
+            self.count(event)
+        if not self.is_enabled_for(level):
+            return
+        if rate_limited and event is not None and not self._take_token(event):
+            with self._lock:
+                suppressed = self._suppressed.setdefault(self.node, {})
+                suppressed[event] = suppressed.get(event, 0) + 1
+            return
+        self._emit(level, message, event, fields)
+
+    def start_node(self, node: str) -> None:
+        """Attribute following events to a node and reset its rate limits"""
+        with self._lock:
+            self.node = node
+            self._events[node] = {}
+            self._suppressed[node] = {}
+            self._buckets = {key: bucket for key, bucket in self._buckets.items() if key[0] != node}
+
+    def end_node(self, node: str) -> Dict[str, Any]:
+        """
+        Finish a node: print one summary line per rate-limited event and return its counters
+
+        Returns:
+            {"events": {event: count}, "suppressed": {event: count}}
+        """
+        with self._lock:
+            events = dict(self._events.get(node, {}))
+            suppressed = dict(self._suppressed.get(node, {}))
+            if self.node == node:
+                self.node = None
+        for event, n in sorted(suppressed.items()):
+            if not self.is_enabled_for("info"):
+                break
+            self._emit("info", f"   🔇 {n} more '{event}' messages suppressed ({events.get(event, n)} total)", "log_suppressed",
+                       {"suppressed_event": event, "suppressed": n, "total": events.get(event, n)}, node=node)
+        return {"events": events, "suppressed": suppressed}
+
+    def _take_token(self, event: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get((self.node, event))
+            if bucket is None:
+                bucket = self._buckets[(self.node, event)] = [float(self.burst), now]
+            bucket[0] = min(float(self.burst), bucket[0] + (now - bucket[1]) * self.rate) if self.burst else 0.0
+            bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return True
+            return False
+
+    def _emit(self, level: str, message: str, event: Optional[str], fields: Dict[str, Any], node: Optional[str] = None) -> None:
+        if self.format == "json":
+            record = {
+                "ts": datetime.now().isoformat(timespec="milliseconds"),
+                "level": level,
+                "scan_id": self.scan_id,
+                "node": node or self.node,
+                "event": event,
+                "message": message.strip()
+            }
+            record.update(fields)
+            line = json.dumps(record, default=str, ensure_ascii=False)
+        else:
+            line = message
+        with self._lock:
+            print(line)
+
+
+def get_scan_logger(shared: Dict[str, Any]) -> ScanLogger:
+    """
+    Get the logger for the current scan, creating it on first use
+
+    Request options "log_level", "log_format" and "quiet" override the environment.
+    """
+    logger = shared.get("logger")
+    if logger is None:
+        request = shared.get("request", {})
+        logger = ScanLogger(
+            level=request.get("log_level"),
+            log_format=request.get("log_format"),
+            quiet=request.get("quiet"),
+            scan_id=request.get("scan_id")
+        )
+        shared["logger"] = logger
+    return logger
+
+
+def get_logger() -> ScanLogger:
+    """Get the logger of the node running on this thread, or the process default logger"""
+    logger = getattr(_active, "logger", None)
+    if logger is not None:
+        return logger
+    global _default_logger
+    if _default_logger is None:
+        _default_logger = ScanLogger()
+    return _default_logger
+
+
+def set_active_logger(logger: Optional[ScanLogger]) -> Optional[ScanLogger]:
+    """Make a logger the one get_logger() returns on this thread; returns the previous one"""
+    previous = getattr(_active, "logger", None)
+    _active.logger = logger
+    return previous
@@ -0,0 +1,206 @@
+"""
+Stage Scheduler Utility
+Pipelines many validation flows through separate network and CPU worker pools
+"""
+
+import copy
+import time
+import threading
+from typing import Dict, Any, List, Optional, Callable, Iterable, Tuple
+
+from .scan_logger import get_logger
+
+
+# Worker pool of each node stage; nodes without a stage (cleanup) only do file I/O
+# and run on the network pool so they never take a CPU worker
+STAGE_POOLS = {"clone": "network", "llm": "network", "scan": "cpu", None: "network"}
+POOLS = ("network", "cpu")
+
+
+class _FlowRun:
+    """One flow moving through the pipeline"""
+
+    __slots__ = ("item", "flow", "shared", "params", "node", "step", "seq", "queued_at", "started_at")
+
+    def __init__(self, item: Any, flow: Any, shared: Dict[str, Any], seq: int):
+        self.item = item
+        self.flow = flow
+        self.shared = shared
+        self.params = {**flow.params}
+        self.node = None
+        self.step = 0
+        self.seq = seq
+        self.queued_at = 0.0
+        self.started_at = time.perf_counter()
+
+
+class PipelineScheduler:
+    """
+    Runs many PocketFlow flows node by node on two bounded worker pools.
+
+    Flow.run() executes one scan's nodes back to back on one thread, so during a
+    batch that thread holds its place while it waits on a clone or the LLM. Here
+    every node is a task: network-bound nodes (fetch, LLM call) run on the
+    network pool, CPU-bound nodes on the CPU pool, and a scan's next node is
+    queued as soon as the previous one finishes. While one scan waits on the LLM
+    the CPU pool matches patterns for another, and clones for the next scans run
+    alongside both.
+
+    Ready nodes of scans that are further along run first, so scans finish (and
+    free their checkout) instead of all piling up mid-flow. At most max_in_flight
+    scans are started at once, and an optional stage limiter (acquired without
+    blocking) caps each stage inside its pool, e.g. clones vs LLM calls.
+    """
+
+    def __init__(self, network_workers: int, cpu_workers: int, max_in_flight: Optional[int] = None, limiter: Any = None):
+        self.workers = {"network": max(1, int(network_workers)), "cpu": max(1, int(cpu_workers))}
+        self.max_in_flight = max(1, int(max_in_flight or 2 * sum(self.workers.values())))
+        self.limiter = limiter
+
+        self._cond = threading.Condition()
+        self._ready: Dict[str, List[_FlowRun]] = {pool: [] for pool in POOLS}
+        self._in_flight = 0
+        self._seq = 0
+        self._stats = {pool: {"workers": self.workers[pool], "tasks": 0, "busy_seconds": 0.0, "queue_seconds": 0.0} for pool in POOLS}
+        self._peak_in_flight = 0
+        self._wall_seconds = 0.0
+
+    def run(self, items: Iterable[Any], start: Callable[[Any], Tuple[Any, Dict[str, Any]]],
+            finish: Callable[[Any, Optional[Dict[str, Any]], Optional[BaseException]], None]) -> None:
+        """
+        Run a flow for every item and wait for all of them
+
+        Args:
+            items: Work items (e.g. batch targets), started in order
+            start: Called when an item is admitted; returns (flow, shared store)
+            finish: Called with (item, shared, error) when its flow ends; error is None on success.
+                Exceptions it raises are logged so the worker keeps running
+        """
+        run_start = time.perf_counter()
+        threads = [
+            threading.Thread(target=self._worker, args=(pool,), name=f"codegates-{pool}-{i}", daemon=True)
+            for pool in POOLS for i in range(self.workers[pool])
+        ]
+        self._finish = finish
+        self._closed = False
+        for thread in threads:
+            thread.start()
+
+        try:
+            for item in items:
+                with self._cond:
+                    while self._in_flight >= self.max_in_flight:
+                        self._cond.wait()
+                    self._in_flight += 1
+                    self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+                    self._seq += 1
+                    seq = self._seq
+
+                try:
+                    flow, shared = start(item)
+                    flow_run = _FlowRun(item, flow, shared, seq)
+                    flow.prep(shared)
+                    flow_run.node = copy.copy(flow.start_node)
+                except Exception as e:
+                    self._complete(item, None, e)
+                    continue
+
+                with self._cond:
+                    self._enqueue(flow_run)
+                    self._cond.notify_all()
+
+            with self._cond:
+                while self._in_flight:
+                    self._cond.wait()
+        finally:
+            with self._cond:
+                self._closed = True
+                self._cond.notify_all()
+            for thread in threads:
+                thread.join()
+            self._wall_seconds = time.perf_counter() - run_start
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Tasks, busy and queue time per pool; utilization is busy time over workers x wall time"""
+        stats = {}
+        for pool, pool_stats in self._stats.items():
+            capacity = pool_stats["workers"] * self._wall_seconds
+            stats[pool] = {
+                **{k: round(v, 3) if isinstance(v, float) else v for k, v in pool_stats.items()},
+                "utilization": round(pool_stats["busy_seconds"] / capacity, 3) if capacity else 0.0
+            }
+        stats["peak_in_flight"] = self._peak_in_flight
+        stats["max_in_flight"] = self.max_in_flight
+        return stats
+
+    def _enqueue(self, flow_run: _FlowRun) -> None:
+        flow_run.queued_at = time.perf_counter()
+        self._ready[STAGE_POOLS.get(getattr(flow_run.node, "stage", None), "network")].append(flow_run)
+
+    def _take(self, pool: str) -> Optional[_FlowRun]:
+        """Highest priority ready node of a pool whose stage has a free slot (caller holds the lock)"""
+        ready = self._ready[pool]
+        for flow_run in sorted(ready, key=lambda r: (-r.step, r.seq)):
+            stage = getattr(flow_run.node, "stage", None)
+            if stage is not None and self.limiter is not None and not self.limiter.try_acquire(stage):
+                continue
+            ready.remove(flow_run)
+            return flow_run
+        return None
+
+    def _worker(self, pool: str) -> None:
+        while True:
+            with self._cond:
+                flow_run = self._take(pool)
+                while flow_run is None:
+                    if self._closed:
+                        return
+                    self._cond.wait()
+                    flow_run = self._take(pool)
+
+            node = flow_run.node
+            stage = getattr(node, "stage", None)
+            queued = time.perf_counter() - flow_run.queued_at
+            if stage is not None and self.limiter is not None:
+                self.limiter.record_wait(stage, queued)
+            # InstrumentedNode reports this as the node's queue_seconds
+            node.queued_seconds = queued
+
+            task_start = time.perf_counter()
+            error = None
+            next_node = None
+            try:
+                node.set_params(flow_run.params)
+                action = node._run(flow_run.shared)
+                next_node = flow_run.flow.get_next_node(node, action)
+                if next_node is None:
+                    flow_run.flow.post(flow_run.shared, None, action)
+            except Exception as e:
+                error = e
+            busy = time.perf_counter() - task_start
+
+            if stage is not None and self.limiter is not None:
+                self.limiter.release(stage)
+            with self._cond:
+                self._stats[pool]["tasks"] += 1
+                self._stats[pool]["busy_seconds"] += busy
+                self._stats[pool]["queue_seconds"] += queued
+                if error is None and next_node is not None:
+                    flow_run.node = copy.copy(next_node)
+                    flow_run.step += 1
+                    self._enqueue(flow_run)
+                self._cond.notify_all()
+
+            if error is not None or next_node is None:
+                self._complete(flow_run.item, flow_run.shared, error)
+
+    def _complete(self, item: Any, shared: Optional[Dict[str, Any]], error: Optional[BaseException]) -> None:
+        try:
+            self._finish(item, shared, error)
+        except Exception as e:
+            # A dead worker would leave its pool short and run() waiting forever
+            get_logger().error(f"❌ Finishing {item} failed: {e}", "scheduler_finish_error", error=str(e))
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
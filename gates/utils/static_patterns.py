@@ -3,6 +3,13 @@ Static Pattern Library for Hard Gate Validation
 Comprehensive technology-specific patterns as secondary validation
 """
 
+import re
+import time
+import threading
+from typing import Dict, Any, List, Optional, Tuple, Pattern
+
+from .scan_logger import get_logger
+
 STATIC_PATTERN_LIBRARY = {
     "STRUCTURED_LOGS": {
         "java": [
@@ -812,177 +819,255 @@ STATIC_PATTERN_LIBRARY = {
     }
 }
 
+# Technology names in the library and the stack names (substrings) that select them
+TECHNOLOGY_ALIASES = {
+    'java': ['java', 'spring', 'kotlin', 'scala'],
+    'python': ['python', 'django', 'flask', 'fastapi'],
+    'javascript': ['javascript', 'js', 'node', 'nodejs', 'react', 'angular', 'vue'],
+    'typescript': ['typescript', 'ts', 'angular', 'nest', 'nestjs'],
+    'csharp': ['csharp', 'c#', 'dotnet', '.net', 'aspnet'],
+    'go': ['go', 'golang'],
+    'rust': ['rust'],
+    'php': ['php', 'laravel', 'symfony'],
+    'ruby': ['ruby', 'rails'],
+    'swift': ['swift', 'ios'],
+    'kotlin': ['kotlin', 'android']
+}
+
+# Library categories included for every technology stack
+SHARED_CATEGORIES = ['standard_logging', 'structured_logging', 'framework_logging', 'multi_language']
+
+# Additional gate-specific patterns included for every technology stack
+GATE_EXTRA_PATTERNS = {
+    # Configuration file patterns
+    "STRUCTURED_LOGS": [
+        r'logback\.xml',
+        r'logback-spring\.xml',
+        r'log4j2\.xml',
+        r'log4j\.properties',
+        r'application\.properties',
+        r'application\.yml',
+        r'appsettings\.json',
+        r'web\.config',
+        r'logging\.conf',
+        r'logger\.config'
+    ],
+    # Test-specific patterns
+    "AUTOMATED_TESTS": [
+        r'@Test',
+        r'@TestCase',
+        r'@Mock',
+        r'@MockBean',
+        r'@SpringBootTest',
+        r'@WebMvcTest',
+        r'@DataJpaTest',
+        r'import.*junit',
+        r'import.*testng',
+        r'import.*mockito',
+        r'import.*pytest',
+        r'import.*unittest',
+        r'describe\(',
+        r'it\(',
+        r'test\(',
+        r'expect\(',
+        r'assert',
+        r'should',
+        r'def test_',
+        r'class.*Test',
+        r'Test.*class'
+    ],
+    # API-specific patterns
+    "LOG_API_CALLS": [
+        r'@RestController',
+        r'@Controller',
+        r'@RequestMapping',
+        r'@GetMapping',
+        r'@PostMapping',
+        r'@PutMapping',
+        r'@DeleteMapping',
+        r'@PatchMapping',
+        r'@PathVariable',
+        r'@RequestParam',
+        r'@RequestBody',
+        r'@api\.route',
+        r'@app\.route',
+        r'app\.(get|post|put|delete|patch)',
+        r'router\.(get|post|put|delete|patch)',
+        r'@Controller',
+        r'@Get',
+        r'@Post',
+        r'@Put',
+        r'@Delete',
+        r'HttpGet',
+        r'HttpPost',
+        r'HttpPut',
+        r'HttpDelete',
+        r'Route\('
+    ],
+    # Error handling patterns
+    "ERROR_LOGS": [
+        r'try\s*\{',
+        r'catch\s*\(',
+        r'finally\s*\{',
+        r'throw\s+new',
+        r'Exception',
+        r'Error',
+        r'try:',
+        r'except\s+\w+:',
+        r'except:',
+        r'raise\s+\w+',
+        r'try\s*\{',
+        r'catch\s*\(\w+\)',
+        r'throw\s+new\s+Error',
+        r'\.error\(',
+        r'\.exception\(',
+        r'\.fatal\(',
+        r'ERROR',
+        r'FATAL',
+        r'EXCEPTION'
+    ]
+}
+
+# Flags static patterns are matched with (same as ValidateGatesNode)
+STATIC_PATTERN_FLAGS = re.IGNORECASE | re.MULTILINE
+
+
+class StaticPatternRegistry:
+    """
+    Compiled static patterns grouped by gate and technology.
+
+    Every distinct pattern in the library is compiled once when the registry is
+    built. Pattern lists are resolved once per gate and set of matched
+    technologies and kept as tuples, so repeated lookups (every gate of every
+    scan in a server or batch process) return the same compiled objects.
+    screen_cache holds the compiled patterns in the form PatternSafetyGuard
+    expects, so the guard never recompiles a static pattern.
+    """
+
+    def __init__(self, library: Dict[str, Dict[str, List[str]]] = None, flags: int = STATIC_PATTERN_FLAGS):
+        self.library = STATIC_PATTERN_LIBRARY if library is None else library
+        self.flags = flags
+        self.compiled: Dict[str, Optional[Pattern]] = {}
+        self.invalid: Dict[str, str] = {}
+        self.screen_cache: Dict[tuple, tuple] = {}
+        self._technologies: Dict[tuple, tuple] = {}
+        self._gate_patterns: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+
+        start = time.perf_counter()
+        pattern_lists = [patterns for gate_patterns in self.library.values() for patterns in gate_patterns.values()]
+        pattern_lists.extend(GATE_EXTRA_PATTERNS.values())
+        for patterns in pattern_lists:
+            for pattern in patterns:
+                if pattern not in self.compiled:
+                    self._compile(pattern)
+        self.build_seconds = time.perf_counter() - start
+
+    def _compile(self, pattern: str) -> None:
+        try:
+            compiled = re.compile(pattern, self.flags)
+            outcome = (compiled, None, None)
+        except re.error as e:
+            compiled = None
+            self.invalid[pattern] = str(e)
+            outcome = (None, None, f"invalid regex: {e}")
+        self.compiled[pattern] = compiled
+        # Static patterns are screened without ReDoS analysis (analyze=False)
+        self.screen_cache[(pattern, self.flags, False)] = outcome
+
+    def resolve_technologies(self, primary_technologies: List[str]) -> tuple:
+        """Library technologies selected by a stack's technology names"""
+        key = tuple(primary_technologies)
+        matched = self._technologies.get(key)
+        if matched is None:
+            normalized = [tech.lower() for tech in primary_technologies]
+            matched = tuple(
+                pattern_tech for pattern_tech, variations in TECHNOLOGY_ALIASES.items()
+                if any(tech in variations or any(var in tech for var in variations) for tech in normalized)
+            )
+            self._technologies[key] = matched
+        return matched
+
+    def get_patterns(self, gate_name: str, primary_technologies: List[str]) -> tuple:
+        """Unique pattern strings for a gate and technology stack, in library order"""
+        if gate_name not in self.library:
+            return ()
+        key = (gate_name, self.resolve_technologies(primary_technologies))
+        patterns = self._gate_patterns.get(key)
+        if patterns is None:
+            with self._lock:
+                patterns = self._gate_patterns.get(key)
+                if patterns is None:
+                    patterns = self._gate_patterns[key] = self._resolve(gate_name, key[1])
+        return patterns
+
+    def get_compiled(self, gate_name: str, primary_technologies: List[str]) -> List[Tuple[str, Pattern]]:
+        """(pattern, compiled pattern) pairs for a gate and technology stack, skipping invalid patterns"""
+        compiled = self.compiled
+        return [(pattern, compiled[pattern]) for pattern in self.get_patterns(gate_name, primary_technologies)
+                if compiled.get(pattern) is not None]
+
+    def _resolve(self, gate_name: str, technologies: tuple) -> tuple:
+        gate_patterns = self.library[gate_name]
+        all_patterns = []
+        logger = get_logger()
+
+        for category in list(technologies) + SHARED_CATEGORIES:
+            if category in gate_patterns:
+                patterns = gate_patterns[category]
+                all_patterns.extend(patterns)
+                logger.debug(f"   📋 Added {len(patterns)} {category} patterns for {gate_name}")
+
+        extra_patterns = GATE_EXTRA_PATTERNS.get(gate_name, [])
+        if extra_patterns:
+            all_patterns.extend(extra_patterns)
+            logger.debug(f"   📋 Added {len(extra_patterns)} gate-specific patterns for {gate_name}")
+
+        # Remove duplicates while preserving order
+        unique_patterns = tuple(dict.fromkeys(all_patterns))
+        logger.debug(f"   ✅ Total unique patterns for {gate_name}: {len(unique_patterns)}")
+        return unique_patterns
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "patterns_compiled": sum(1 for compiled in self.compiled.values() if compiled is not None),
+            "patterns_invalid": len(self.invalid),
+            "gate_lookups_cached": len(self._gate_patterns),
+            "build_seconds": round(self.build_seconds, 4)
+        }
+
+
+_registry: Optional[StaticPatternRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_static_pattern_registry() -> StaticPatternRegistry:
+    """The process-wide static pattern registry, built on first use"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = StaticPatternRegistry()
+                get_logger().debug(f"   📚 Compiled {len(_registry.compiled)} static patterns in {_registry.build_seconds:.3f}s")
+    return _registry
+
+
 def get_static_patterns_for_gate(gate_name: str, primary_technologies: list) -> list:
     """
     Get static patterns for a specific gate and technology stack.
     Enhanced with better technology detection and coverage.
     """
-    if gate_name not in STATIC_PATTERN_LIBRARY:
-        return []
-    
-    gate_patterns = STATIC_PATTERN_LIBRARY[gate_name]
-    all_patterns = []
-    
-    # Normalize technology names for better matching
-    normalized_technologies = [tech.lower() for tech in primary_technologies]
-    
-    # Technology mapping for better coverage
-    tech_mapping = {
-        'java': ['java', 'spring', 'kotlin', 'scala'],
-        'python': ['python', 'django', 'flask', 'fastapi'],
-        'javascript': ['javascript', 'js', 'node', 'nodejs', 'react', 'angular', 'vue'],
-        'typescript': ['typescript', 'ts', 'angular', 'nest', 'nestjs'],
-        'csharp': ['csharp', 'c#', 'dotnet', '.net', 'aspnet'],
-        'go': ['go', 'golang'],
-        'rust': ['rust'],
-        'php': ['php', 'laravel', 'symfony'],
-        'ruby': ['ruby', 'rails'],
-        'swift': ['swift', 'ios'],
-        'kotlin': ['kotlin', 'android']
-    }
-    
-    # Find matching technologies with expanded coverage
-    matched_technologies = set()
-    for tech in normalized_technologies:
-        for pattern_tech, variations in tech_mapping.items():
-            if tech in variations or any(var in tech for var in variations):
-                matched_technologies.add(pattern_tech)
-    
-    # Include patterns for matched technologies
-    for tech in matched_technologies:
-        if tech in gate_patterns:
-            patterns = gate_patterns[tech]
-            all_patterns.extend(patterns)
-            print(f"   📋 Added {len(patterns)} {tech} patterns for {gate_name}")
-    
-    # Always include standard patterns for broader coverage
-    standard_categories = ['standard_logging', 'structured_logging', 'framework_logging']
-    for category in standard_categories:
-        if category in gate_patterns:
-            patterns = gate_patterns[category]
-            all_patterns.extend(patterns)
-            print(f"   📋 Added {len(patterns)} {category} patterns for {gate_name}")
-    
-    # Include multi-language patterns if available
-    if 'multi_language' in gate_patterns:
-        patterns = gate_patterns['multi_language']
-        all_patterns.extend(patterns)
-        print(f"   📋 Added {len(patterns)} multi-language patterns for {gate_name}")
-    
-    # For specific gates, include additional relevant patterns
-    if gate_name == "STRUCTURED_LOGS":
-        # Include configuration file patterns
-        config_patterns = [
-            r'logback\.xml',
-            r'logback-spring\.xml',
-            r'log4j2\.xml',
-            r'log4j\.properties',
-            r'application\.properties',
-            r'application\.yml',
-            r'appsettings\.json',
-            r'web\.config',
-            r'logging\.conf',
-            r'logger\.config'
-        ]
-        all_patterns.extend(config_patterns)
-        print(f"   📋 Added {len(config_patterns)} configuration patterns for {gate_name}")
-    
-    elif gate_name == "AUTOMATED_TESTS":
-        # Include test-specific patterns
-        test_patterns = [
-            r'@Test',
-            r'@TestCase',
-            r'@Mock',
-            r'@MockBean',
-            r'@SpringBootTest',
-            r'@WebMvcTest',
-            r'@DataJpaTest',
-            r'import.*junit',
-            r'import.*testng',
-            r'import.*mockito',
-            r'import.*pytest',
-            r'import.*unittest',
-            r'describe\(',
-            r'it\(',
-            r'test\(',
-            r'expect\(',
-            r'assert',
-            r'should',
-            r'def test_',
-            r'class.*Test',
-            r'Test.*class'
-        ]
-        all_patterns.extend(test_patterns)
-        print(f"   📋 Added {len(test_patterns)} test-specific patterns for {gate_name}")
-    
-    elif gate_name == "LOG_API_CALLS":
-        # Include API-specific patterns
-        api_patterns = [
-            r'@RestController',
-            r'@Controller',
-            r'@RequestMapping',
-            r'@GetMapping',
-            r'@PostMapping',
-            r'@PutMapping',
-            r'@DeleteMapping',
-            r'@PatchMapping',
-            r'@PathVariable',
-            r'@RequestParam',
-            r'@RequestBody',
-            r'@api\.route',
-            r'@app\.route',
-            r'app\.(get|post|put|delete|patch)',
-            r'router\.(get|post|put|delete|patch)',
-            r'@Controller',
-            r'@Get',
-            r'@Post',
-            r'@Put',
-            r'@Delete',
-            r'HttpGet',
-            r'HttpPost',
-            r'HttpPut',
-            r'HttpDelete',
-            r'Route\('
-        ]
-        all_patterns.extend(api_patterns)
-        print(f"   📋 Added {len(api_patterns)} API-specific patterns for {gate_name}")
-    
-    elif gate_name == "ERROR_LOGS":
-        # Include error handling patterns
-        error_patterns = [
-            r'try\s*\{',
-            r'catch\s*\(',
-            r'finally\s*\{',
-            r'throw\s+new',
-            r'Exception',
-            r'Error',
-            r'try:',
-            r'except\s+\w+:',
-            r'except:',
-            r'raise\s+\w+',
-            r'try\s*\{',
-            r'catch\s*\(\w+\)',
-            r'throw\s+new\s+Error',
-            r'\.error\(',
-            r'\.exception\(',
-            r'\.fatal\(',
-            r'ERROR',
-            r'FATAL',
-            r'EXCEPTION'
-        ]
-        all_patterns.extend(error_patterns)
-        print(f"   📋 Added {len(error_patterns)} error handling patterns for {gate_name}")
-    
-    # Remove duplicates while preserving order
-    unique_patterns = []
-    seen = set()
-    for pattern in all_patterns:
-        if pattern not in seen:
-            unique_patterns.append(pattern)
-            seen.add(pattern)
-    
-    print(f"   ✅ Total unique patterns for {gate_name}: {len(unique_patterns)}")
-    return unique_patterns
+    return list(get_static_pattern_registry().get_patterns(gate_name, primary_technologies))
+
+
+def get_compiled_static_patterns(gate_name: str, primary_technologies: list) -> List[Tuple[str, Pattern]]:
+    """
+    Get compiled static patterns for a specific gate and technology stack
+
+    Returns:
+        List of (pattern, compiled pattern) tuples, compiled once per process
+    """
+    return get_static_pattern_registry().get_compiled(gate_name, primary_technologies)
 
 def get_all_static_patterns_for_gate(gate_name: str) -> dict:
     """
@@ -0,0 +1,415 @@
+"""
+Trigram Index Utility
+Per-scan trigram presence index used to pre-screen files before running regex patterns
+"""
+
+import os
+import re
+import gzip
+import json
+from array import array
+from functools import partial
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterable, Union
+
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:
+    # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+from .scan_logger import get_logger
+
+
+# Bump when the index layout or trigram extraction changes (invalidates persisted indexes)
+INDEX_FORMAT_VERSION = 1
+
+# Default directory for indexes persisted per commit (override with CODEGATES_INDEX_CACHE_DIR, "" disables)
+DEFAULT_INDEX_CACHE_DIR = "./index_cache"
+
+_WORD_RE = re.compile(r'\w+')
+_REPEAT_OPS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT)
+
+# Query tree: None matches every file, a str is a required literal,
+# ("and", [...]) / ("or", [...]) combine sub-queries
+Query = Union[None, str, tuple]
+
+
+def extract_literal_query(pattern: str) -> Query:
+    """
+    Extract the literals a regex requires from its parse tree
+
+    Literals are case-folded because patterns are matched with re.IGNORECASE.
+    Alternations become "or" queries; optional parts are dropped.
+
+    Args:
+        pattern: Regex pattern string
+
+    Returns:
+        Query tree, or None if the pattern has no usable required literal
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except (re.error, RecursionError):
+        return None
+    return _sequence_query(list(parsed))
+
+
+def literal_trigrams(literal: str) -> List[str]:
+    """
+    Get the trigrams a literal guarantees in the index
+
+    Only trigrams inside word runs are indexed, because the index is built from
+    each file's word tokens; any text containing the literal contains a token
+    that contains each of its word runs.
+    """
+    trigrams = []
+    for run in _WORD_RE.findall(_fold(literal)):
+        trigrams.extend(run[i:i + 3] for i in range(len(run) - 2))
+    return trigrams
+
+
+class TrigramIndex:
+    """
+    Trigram presence index over a scan's text files.
+
+    Each file's content is tokenized into unique word tokens and the trigrams of
+    those tokens are recorded as one bitmask per trigram (bit i = file i). A
+    pattern's required literals turn into a bitmask of candidate files, so the
+    regex only runs where every required trigram is present. Files that are not
+    in the index are always treated as candidates.
+
+    While files are added, each trigram collects a list of file ids; a
+    trigram's bitmask is built from its list once, when a query first needs it,
+    because OR-ing a bit into a growing int copies it and makes the build quadratic.
+
+    A lazy index starts empty and is filled by add_files with the files a scan
+    is about to match, so sampled scans never read the whole repository.
+    """
+
+    def __init__(self, commit: Optional[str] = None, lazy: bool = False):
+        self.commit = commit
+        self.lazy = lazy
+        self._file_ids: Dict[str, int] = {}
+        self._postings: Dict[str, int] = {}
+        self._pending: Dict[str, array] = defaultdict(partial(array, "i"))
+        self._token_trigrams: Dict[str, frozenset] = {}
+        self._query_cache: Dict[str, Optional[int]] = {}
+        self.loaded_from_disk = False
+
+        self.patterns_screened = 0
+        self.pairs_checked = 0
+        self.pairs_skipped = 0
+
+    def __len__(self) -> int:
+        return len(self._file_ids)
+
+    def __contains__(self, relative_path: str) -> bool:
+        return relative_path in self._file_ids
+
+    def add_file(self, relative_path: str, content: str) -> None:
+        """Index one file's content"""
+        if relative_path in self._file_ids:
+            return
+
+        file_id = len(self._file_ids)
+        self._file_ids[relative_path] = file_id
+        # Candidate masks computed so far do not include the new file
+        self._query_cache.clear()
+
+        token_trigrams = self._token_trigrams
+        tokens = set(_WORD_RE.findall(_fold(content)))
+        for token in tokens.difference(token_trigrams):
+            token_trigrams[token] = frozenset(token[i:i + 3] for i in range(len(token) - 2))
+        trigrams = set().union(*map(token_trigrams.__getitem__, tokens))
+
+        pending = self._pending
+        for trigram in trigrams:
+            pending[trigram].append(file_id)
+
+    def add_files(self, files: Iterable[Dict[str, Any]], content_cache) -> int:
+        """
+        Index the files that are not indexed yet, reading them through the content cache
+
+        Returns:
+            Number of files added (unreadable files are skipped)
+        """
+        added = 0
+        for file_info in files:
+            relative_path = file_info["relative_path"]
+            if relative_path in self._file_ids:
+                continue
+            try:
+                self.add_file(relative_path, content_cache.get_text(relative_path))
+            except OSError:
+                continue
+            added += 1
+        return added
+
+    def candidates(self, pattern: str) -> Optional[int]:
+        """
+        Get the bitmask of files that may match a pattern
+
+        Returns:
+            Bitmask of candidate file ids, or None if the pattern cannot be pre-screened
+        """
+        if pattern not in self._query_cache:
+            query = extract_literal_query(pattern)
+            self._query_cache[pattern] = None if query is None else self._evaluate(query)
+            self.patterns_screened += 1
+        return self._query_cache[pattern]
+
+    def file_id(self, relative_path: str) -> Optional[int]:
+        """Get a file's bit position, or None if it is not indexed"""
+        return self._file_ids.get(relative_path)
+
+    def may_match(self, candidate_mask: Optional[int], relative_path: str) -> bool:
+        """Check whether a file needs to run a pattern with the given candidate mask"""
+        self.pairs_checked += 1
+        if candidate_mask is None:
+            return True
+        file_id = self._file_ids.get(relative_path)
+        if file_id is None or (candidate_mask >> file_id) & 1:
+            return True
+        self.pairs_skipped += 1
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index and pre-screening statistics"""
+        return {
+            "commit": self.commit,
+            "files": len(self._file_ids),
+            "trigrams": len(self._postings.keys() | self._pending.keys()),
+            "lazy": self.lazy,
+            "loaded_from_disk": self.loaded_from_disk,
+            "patterns_screened": self.patterns_screened,
+            "pattern_file_pairs": self.pairs_checked,
+            "regex_runs_skipped": self.pairs_skipped,
+            "skip_ratio": round(self.pairs_skipped / self.pairs_checked, 4) if self.pairs_checked else 0.0
+        }
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Persist the index as gzip-compressed JSON"""
+        self._build_postings()
+        files = sorted(self._file_ids, key=self._file_ids.get)
+        data = {
+            "version": INDEX_FORMAT_VERSION,
+            "commit": self.commit,
+            "files": files,
+            "postings": {trigram: format(mask, "x") for trigram, mask in self._postings.items()}
+        }
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> Optional["TrigramIndex"]:
+        """Load a persisted index, or return None if it is missing, stale or corrupt"""
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_FORMAT_VERSION:
+                return None
+            index = cls(commit=data.get("commit"))
+            index._file_ids = {relative_path: i for i, relative_path in enumerate(data["files"])}
+            index._postings = {trigram: int(mask, 16) for trigram, mask in data["postings"].items()}
+            index.loaded_from_disk = True
+            return index
+        except (OSError, ValueError, KeyError, TypeError, EOFError):
+            return None
+
+    def _build_postings(self) -> None:
+        """Build the bitmask of every trigram"""
+        for trigram in list(self._pending):
+            self._mask(trigram)
+
+    def _mask(self, trigram: str) -> int:
+        """Get a trigram's bitmask, building it from the file ids collected by add_file"""
+        file_ids = self._pending.pop(trigram, None)
+        if file_ids is not None:
+            # Ids are ascending, so the last one sizes the mask
+            mask = bytearray(file_ids[-1] // 8 + 1)
+            for file_id in file_ids:
+                mask[file_id >> 3] |= 1 << (file_id & 7)
+            self._postings[trigram] = self._postings.get(trigram, 0) | int.from_bytes(mask, "little")
+        return self._postings.get(trigram, 0)
+
+    def _evaluate(self, query: Query) -> Optional[int]:
+        """Evaluate a query tree to a candidate bitmask (None = every file)"""
+        if query is None:
+            return None
+        if isinstance(query, str):
+            trigrams = literal_trigrams(query)
+            if not trigrams:
+                return None
+            mask = -1
+            for trigram in trigrams:
+                mask &= self._mask(trigram)
+                if not mask:
+                    break
+            return mask
+
+        op, children = query
+        masks = [self._evaluate(child) for child in children]
+        if op == "or":
+            if any(mask is None for mask in masks):
+                return None
+            result = 0
+            for mask in masks:
+                result |= mask
+            return result
+
+        constrained = [mask for mask in masks if mask is not None]
+        if not constrained:
+            return None
+        result = -1
+        for mask in constrained:
+            result &= mask
+        return result
+
+
+def resolve_commit_sha(repo_path: str) -> Optional[str]:
+    """Read the checked-out commit SHA from a repository's .git directory"""
+    git_dir = Path(repo_path) / ".git"
+    try:
+        head = (git_dir / "HEAD").read_text().strip()
+        if not head.startswith("ref:"):
+            return head or None
+
+        ref = head[4:].strip()
+        ref_file = git_dir / ref
+        if ref_file.exists():
+            return ref_file.read_text().strip() or None
+
+        packed_refs = git_dir / "packed-refs"
+        if packed_refs.exists():
+            for line in packed_refs.read_text().splitlines():
+                parts = line.split()
+                if len(parts) == 2 and parts[1] == ref:
+                    return parts[0]
+    except OSError:
+        pass
+    return None
+
+
+def get_scan_trigram_index(shared: Dict[str, Any], files: Iterable[Dict[str, Any]], content_cache,
+                           lazy: bool = False) -> TrigramIndex:
+    """
+    Get the trigram index for the current scan, building or loading it on first use
+
+    The index lives in the shared store so it is built once per scan. When the
+    repository is a git checkout it is persisted per commit SHA and reused by
+    later scans of the same commit.
+
+    Args:
+        shared: PocketFlow shared store
+        files: File info dicts to index (text files eligible for pattern matching)
+        content_cache: Scan content cache used to read file contents
+        lazy: Without a persisted index, start empty and index files as they are
+              scanned (see TrigramIndex.add_files) instead of reading every file;
+              a partial index is not persisted
+
+    Returns:
+        Scan-scoped TrigramIndex
+    """
+    index = shared.get("trigram_index")
+    if index is not None:
+        return index
+
+    repo_path = shared.get("repository", {}).get("local_path") or "."
+    source = shared.get("repository", {}).get("source")
+    commit = source.commit if source is not None else resolve_commit_sha(repo_path)
+    cache_dir = os.getenv("CODEGATES_INDEX_CACHE_DIR", DEFAULT_INDEX_CACHE_DIR)
+    cache_path = Path(cache_dir) / f"{commit}.v{INDEX_FORMAT_VERSION}.json.gz" if commit and cache_dir else None
+
+    if cache_path is not None and cache_path.exists():
+        index = TrigramIndex.load(cache_path)
+        if index is not None:
+            get_logger().info(f"   🔎 Loaded trigram index for commit {commit[:8]} ({len(index)} files)")
+
+    if index is None and lazy:
+        index = TrigramIndex(commit=commit, lazy=True)
+        get_logger().info("   🔎 Trigram index built from the files scanned")
+
+    if index is None:
+        index = TrigramIndex(commit=commit)
+        index.add_files(files, content_cache)
+        get_logger().info(f"   🔎 Built trigram index: {len(index)} files, {index.get_stats()['trigrams']} trigrams")
+
+        if cache_path is not None:
+            try:
+                index.save(cache_path)
+            except OSError as e:
+                get_logger().warning(f"   ⚠️ Could not persist trigram index: {e}")
+
+    shared["trigram_index"] = index
+    return index
+
+
+def _fold(text: str) -> str:
+    """Case-fold text so every re.IGNORECASE equivalent maps to the same characters"""
+    # casefold() keeps dotless i, which re.IGNORECASE treats as equal to "i"
+    return text.casefold().replace("\u0131", "i")
+
+
+def _sequence_query(items: list) -> Query:
+    """Build an "and" query from a parsed sequence"""
+    required = []
+    literal_run = []
+
+    def flush():
+        if literal_run:
+            required.append("".join(literal_run))
+            literal_run.clear()
+
+    for op, av in items:
+        if op == sre_constants.LITERAL:
+            literal_run.append(chr(av))
+            continue
+        if op == sre_constants.AT:
+            # Anchors and word boundaries consume no text
+            continue
+
+        flush()
+        sub_query = _item_query(op, av)
+        if sub_query is not None:
+            required.append(sub_query)
+
+    flush()
+
+    if not required:
+        return None
+    if len(required) == 1:
+        return required[0]
+    return ("and", required)
+
+
+def _item_query(op, av) -> Query:
+    """Build a query for a single non-literal parse item"""
+    if op == sre_constants.SUBPATTERN:
+        return _sequence_query(list(av[-1]))
+
+    if op == sre_constants.BRANCH:
+        alternatives = [_sequence_query(list(alternative)) for alternative in av[1]]
+        if any(alternative is None for alternative in alternatives):
+            return None
+        return ("or", alternatives)
+
+    if op in _REPEAT_OPS or op == getattr(sre_constants, "POSSESSIVE_REPEAT", None):
+        low, high, sub = av
+        return _sequence_query(list(sub)) if low >= 1 else None
+
+    if op == getattr(sre_constants, "ATOMIC_GROUP", None):
+        return _sequence_query(list(av))
+
+    if op == sre_constants.ASSERT and av[0] == 1:
+        # Positive lookahead text must be present too
+        return _sequence_query(list(av[1]))
+
+    return None
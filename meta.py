@@ -1,9 +1,12 @@
-import os
+import sys
 import json
-import pathlib
+import fnmatch
 import re
 from collections import defaultdict, Counter
 
+from gates.utils import repository_analyzer
+from gates.utils.repository_analyzer import FileExtractor, LineTotalsExtractor
+
 # === Configuration === #
 CONFIG_FILES = {
     "java": ["pom.xml", "build.gradle"],
@@ -37,26 +40,23 @@ EXT_TO_LANG = {
     ".gradle": "gradle"
 }
 
-# File classification
-def classify_file(file_path):
-    ext = pathlib.Path(file_path).suffix.lower()
-    if "test" in file_path.lower():
-        return "test"
-    if ext in EXT_TO_LANG:
-        if ext in [".html", ".css", ".scss"]:
-            return "web"
-        elif ext in [".json", ".xml", ".yml", ".yaml", ".properties", ".env", ".toml", ".jmx", ".sql"]:
-            return "config"
-        return "source"
-    return "other"
-
-# Safe read
-def read_file_safe(filepath, max_bytes=20000):
-    try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            return f.read(max_bytes)
-    except Exception:
-        return ""
+# Scanner file type -> summary category
+FILE_CATEGORIES = {
+    "Source Code": "source",
+    "Test Code": "test",
+    "Web": "web",
+    "Configuration": "config"
+}
+
+# Config file name -> tools, plus the glob patterns, matched once per file
+CONFIG_FILE_TOOLS = defaultdict(list)
+CONFIG_FILE_GLOBS = []
+for _tool, _patterns in CONFIG_FILES.items():
+    for _pattern in _patterns:
+        if "*" in _pattern:
+            CONFIG_FILE_GLOBS.append((_pattern, _tool))
+        else:
+            CONFIG_FILE_TOOLS[_pattern].append(_tool)
 
 # Grouping logic
 def group_languages(lang_counter):
@@ -86,66 +86,63 @@ def group_languages(lang_counter):
     return dict(grouped)
 
 # === Main Analyzer === #
+class SummaryExtractor(FileExtractor):
+    """Language counts, files by category and libraries from config files, on the shared repository walk"""
+
+    name = "summary"
+
+    def __init__(self):
+        self.lang_counter = Counter()
+        self.libraries_detected = defaultdict(set)
+        self.file_structure = defaultdict(list)
+
+    def add(self, file_info, read_text):
+        filename = file_info["name"]
+        ext = file_info["extension"]
+        self.lang_counter[EXT_TO_LANG.get(ext, ext.strip('.'))] += 1
+        self.file_structure[FILE_CATEGORIES.get(file_info["type"], "other")].append(file_info["relative_path"])
+
+        tools = list(CONFIG_FILE_TOOLS.get(filename, ()))
+        tools += [tool for pattern, tool in CONFIG_FILE_GLOBS if fnmatch.fnmatch(filename, pattern)]
+        if not tools:
+            return
+
+        try:
+            content = read_text()[:20000]
+        except Exception:
+            return
+        for tool in tools:
+            if tool == "java":
+                matches = re.findall(r"<groupId>(.*?)</groupId>.*?<artifactId>(.*?)</artifactId>", content, re.DOTALL)
+                for g, a in matches:
+                    self.libraries_detected["java"].add(f"{g}:{a}")
+            elif tool == "python":
+                matches = re.findall(r"^\s*([a-zA-Z0-9_\-]+)==?[\d\.]+", content, re.MULTILINE)
+                self.libraries_detected["python"].update(matches)
+            elif tool in ["nodejs", "react", "angular", "typescript"]:
+                matches = re.findall(r'"([a-zA-Z0-9_\-]+)"\s*:\s*"[\d\^~\.]+"', content)
+                self.libraries_detected[tool].update(matches)
+
+    def result(self):
+        return {
+            "languages_detected": group_languages(self.lang_counter),
+            "libraries_detected": {k: sorted(list(v)) for k, v in self.libraries_detected.items()},
+            "file_structure": dict(self.file_structure)
+        }
+
 def analyze_repository(repo_path):
-    summary = {
-        "total_source_files": 0,
-        "total_source_lines": 0,
-        "total_test_files": 0,
-        "total_test_lines": 0,
-        "languages_detected": {},
-        "libraries_detected": defaultdict(set),
-        "file_structure": defaultdict(list),
+    analysis = repository_analyzer.analyze_repository(
+        repo_path, [LineTotalsExtractor(), SummaryExtractor()], max_files=sys.maxsize
+    )
+    totals = analysis["line_totals"]
+    return {
+        "total_source_files": totals["source_files"],
+        "total_source_lines": totals["source_lines"],
+        "total_test_files": totals["test_files"],
+        "total_test_lines": totals["test_lines"],
+        **analysis["summary"]
     }
 
-    lang_counter = Counter()
-
-    for root, dirs, files in os.walk(repo_path):
-        for file in files:
-            full_path = os.path.join(root, file)
-            rel_path = os.path.relpath(full_path, repo_path)
-            ext = pathlib.Path(file).suffix.lower()
-            lang = EXT_TO_LANG.get(ext, ext.strip('.'))
-            file_type = classify_file(full_path)
-
-            try:
-                size = os.path.getsize(full_path)
-                with open(full_path, "r", encoding="utf-8", errors="ignore") as f:
-                    lines = sum(1 for _ in f)
-            except Exception:
-                lines = 0
-                size = 0
-
-            if file_type == "source":
-                summary["total_source_files"] += 1
-                summary["total_source_lines"] += lines
-            elif file_type == "test":
-                summary["total_test_files"] += 1
-                summary["total_test_lines"] += lines
-
-            lang_counter[lang] += 1
-            summary["file_structure"][file_type].append(rel_path)
-
-            # Detect libraries from config
-            for tool, patterns in CONFIG_FILES.items():
-                for pattern in patterns:
-                    if pathlib.Path(file).match(pattern):
-                        content = read_file_safe(full_path)
-                        if tool == "java":
-                            matches = re.findall(r"<groupId>(.*?)</groupId>.*?<artifactId>(.*?)</artifactId>", content, re.DOTALL)
-                            for g, a in matches:
-                                summary["libraries_detected"]["java"].add(f"{g}:{a}")
-                        elif tool == "python":
-                            matches = re.findall(r"^\s*([a-zA-Z0-9_\-]+)==?[\d\.]+", content, re.MULTILINE)
-                            summary["libraries_detected"]["python"].update(matches)
-                        elif tool in ["nodejs", "react", "angular", "typescript"]:
-                            matches = re.findall(r'"([a-zA-Z0-9_\-]+)"\s*:\s*"[\d\^~\.]+"', content)
-                            summary["libraries_detected"][tool].update(matches)
-
-    summary["languages_detected"] = group_languages(lang_counter)
-    summary["libraries_detected"] = {k: sorted(list(v)) for k, v in summary["libraries_detected"].items()}
-    summary["file_structure"] = dict(summary["file_structure"])
-    return summary
-
 # === CLI Entry Point === #
 if __name__ == "__main__":
     import argparse
@@ -1,11 +1,13 @@
 import os
 import json
 import datetime # Although not used in modified code, kept for consistency
-import re
-import xml.etree.ElementTree as ET
 import collections # For defaultdict and OrderedDict
 import argparse
 import logging # For proper logging
+import sys
+
+from gates.utils.dependency_extractor import extract_file_dependencies
+from gates.utils.repository_analyzer import FileExtractor, StructureExtractor, DependencyExtractor, analyze_repository
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
@@ -388,182 +390,65 @@ def load_config(config_filepath):
     return config
 
 # --- Utility Functions for Dependency Extraction ---
-# (These functions were already robust, changed print statements to logging)
+# (Parsing is the streaming, cached dependency extractor; these format its entries)
+
+def _format_dependency(dependency):
+    """Formats an extracted dependency the way the scan summary lists it."""
+    name, version = dependency.name, dependency.version
+    if dependency.kind == 'parent':
+        return f"PARENT_MODULE:{name}"
+    if dependency.kind == 'plugin':
+        return f"plugin:{name}{':' + version if version else ''}"
+    if dependency.kind == 'engine':
+        return f"engine:{name}@{version}"
+    if dependency.kind == 'module':
+        return f"go_module:{name}"
+    if dependency.kind == 'toolchain':
+        return f"go_version:{version}"
+    if dependency.ecosystem == 'nuget':
+        if dependency.kind == 'project':
+            return f"Internal_Project:{name}"
+        if dependency.kind == 'reference':
+            return f"Assembly_Reference:{name}"
+        return f"NuGet_Package:{name}@{version}" if version else f"NuGet_Package:{name}"
+    if dependency.kind == 'project':
+        return f"project:{name}"
+    if dependency.ecosystem == 'maven':
+        return name
+    if dependency.ecosystem == 'pypi':
+        return f"{name}{version or ''}"
+    return f"{name}@{version}" if version else name
+
+def _extract_formatted(filepath):
+    return [_format_dependency(dependency) for dependency in extract_file_dependencies(filepath)]
 
 def extract_maven_dependencies(filepath):
-    """Extracts artifact IDs from a pom.xml file."""
-    dependencies = []
-    try:
-        tree = ET.parse(filepath)
-        root = tree.getroot()
-        
-        namespace = {'maven': 'http://maven.apache.org/POM/4.0.0'}
-        if root.tag.startswith('{http://maven.apache.org/POM/4.0.0}'):
-            dep_elements = root.findall('.//maven:dependency', namespace)
-            parent_elem = root.find('maven:parent', namespace)
-        else:
-            dep_elements = root.findall('.//dependency')
-            parent_elem = root.find('.//parent')
-
-        for dep in dep_elements:
-            group_id_elem = dep.find('maven:groupId', namespace) if root.tag.startswith('{http://maven.apache.org/POM/4.0.0}') else dep.find('groupId')
-            artifact_id_elem = dep.find('maven:artifactId', namespace) if root.tag.startswith('{http://maven.apache.org/POM/4.0.0}') else dep.find('artifactId')
-            
-            if group_id_elem is not None and artifact_id_elem is not None:
-                dependencies.append(f"{group_id_elem.text}:{artifact_id_elem.text}")
-            elif artifact_id_elem is not None:
-                dependencies.append(artifact_id_elem.text)
-
-        if parent_elem is not None:
-            group_id_elem = parent_elem.find('maven:groupId', namespace) if root.tag.startswith('{http://maven.apache.org/POM/4.0.0}') else parent_elem.find('groupId')
-            artifact_id_elem = parent_elem.find('maven:artifactId', namespace) if root.tag.startswith('{http://maven.apache.org/POM/4.0.0}') else parent_elem.find('artifactId')
-            if group_id_elem is not None and artifact_id_elem is not None:
-                dependencies.append(f"PARENT_MODULE:{group_id_elem.text}:{artifact_id_elem.text}")
-
-    except ET.ParseError as e:
-        logging.error(f"Error parsing XML file {filepath}: {e}")
-    except Exception as e:
-        logging.error(f"An unexpected error occurred parsing Maven file {filepath}: {e}")
-    return dependencies
+    """Extracts groupId:artifactId of the dependencies and parent of a pom.xml file."""
+    return _extract_formatted(filepath)
 
 def extract_gradle_dependencies(filepath):
-    """
-    Extracts dependencies and plugins from a build.gradle file using regex.
-    Note: This is a simplistic regex and may not cover all Gradle DSL complexities (e.g., closures, variables).
-    """
-    dependencies = []
-    try:
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-            dep_patterns = re.findall(
-                r'(?:implementation|api|compile|runtimeOnly|testImplementation|androidTestImplementation|annotationProcessor|kapt|classpath|ksp)\s*[\'"]([a-zA-Z0-9\._-]+:[a-zA-Z0-9\._-]+(?:[:\$][a-zA-Z0-9\._-]+)?|project\([\'"]:[a-zA-Z0-9\._-]+[\'"]\))[\'"]',
-                content
-            )
-            for dep_string in dep_patterns:
-                dependencies.append(dep_string.strip())
-            
-            plugin_patterns = re.findall(
-                r'id\s*[\'"]([a-zA-Z0-9\._-]+)[\'"](?:\s*version\s*[\'"]([a-zA-Z0-9\._-]+)[\'"])?',
-                content
-            )
-            for plugin_id, plugin_version in plugin_patterns:
-                if plugin_id not in dependencies:
-                    dependencies.append(f"plugin:{plugin_id}{':'+plugin_version if plugin_version else ''}")
-
-    except Exception as e:
-        logging.error(f"Error reading or parsing Gradle file {filepath}: {e}")
-    return dependencies
+    """Extracts dependencies, project dependencies and plugins from a build.gradle file."""
+    return _extract_formatted(filepath)
 
 def extract_npm_dependencies(filepath):
-    """Extracts dependencies from package.json."""
-    dependencies = []
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            for dep_type in ['dependencies', 'devDependencies', 'peerDependencies', 'optionalDependencies', 'bundleDependencies']:
-                if dep_type in data and isinstance(data[dep_type], dict):
-                    for package, version in data[dep_type].items():
-                        dependencies.append(f"{package}@{version}")
-            
-            if "engines" in data and isinstance(data["engines"], dict):
-                for engine, version_spec in data["engines"].items():
-                    dependencies.append(f"engine:{engine}@{version_spec}")
-
-    except json.JSONDecodeError as e:
-        logging.error(f"Error parsing JSON file {filepath}: {e}")
-    except Exception as e:
-        logging.error(f"Error reading NPM file {filepath}: {e}")
-    return dependencies
+    """Extracts dependencies and engines from package.json."""
+    return _extract_formatted(filepath)
 
 def extract_python_requirements(filepath):
     """Extracts dependencies from requirements.txt."""
-    dependencies = []
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and not line.startswith('-'):
-                    match = re.match(r'([a-zA-Z0-9._-]+(?:==|>=|<=|>|<|~=|\!=)?(?:[a-zA-Z0-9._*-]+)?(?:\[.*?\])?).*', line)
-                    if match:
-                        dependencies.append(match.group(1))
-    except Exception as e:
-        logging.error(f"Error reading Python requirements file {filepath}: {e}")
-    return dependencies
+    return _extract_formatted(filepath)
 
 def extract_go_dependencies(filepath):
-    """Extracts dependencies from go.mod."""
-    dependencies = []
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-            module_match = re.search(r'^module\s+([^\s]+)', content, re.MULTILINE)
-            if module_match:
-                dependencies.append(f"go_module:{module_match.group(1)}")
-            
-            require_matches = re.findall(r'^\s*require\s+([^\s]+)\s+([^\s]+)(?:\s+//\s+indirect)?', content, re.MULTILINE)
-            for module, version in require_matches:
-                dependencies.append(f"{module}@{version}")
-            
-            go_version_match = re.search(r'^go\s+([\d\.]+)', content, re.MULTILINE)
-            if go_version_match:
-                dependencies.append(f"go_version:{go_version_match.group(1)}")
-
-    except Exception as e:
-        logging.error(f"Error reading Go module file {filepath}: {e}")
-    return dependencies
+    """Extracts the module, requirements and Go version from go.mod."""
+    return _extract_formatted(filepath)
 
 def extract_ruby_gems(filepath):
     """Extracts gems from Gemfile."""
-    dependencies = []
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-            gem_matches = re.findall(r"gem\s*['\"]([^'\"]+)['\"](?:,\s*['\"~>=<]*([^'\"]*)['\"])?", content)
-            for gem_name, gem_version in gem_matches:
-                if gem_version:
-                    dependencies.append(f"{gem_name}@{gem_version.strip()}")
-                else:
-                    dependencies.append(gem_name)
-    except Exception as e:
-        logging.error(f"Error reading Gemfile {filepath}: {e}")
-    return dependencies
+    return _extract_formatted(filepath)
 
 def extract_csproj_dependencies(filepath):
-    """Extracts PackageReference and ProjectReference from .csproj files."""
-    dependencies = []
-    try:
-        tree = ET.parse(filepath)
-        root = tree.getroot()
-        
-        for elem in root.iter():
-            if '}' in elem.tag:
-                elem.tag = elem.tag.split('}', 1)[1]
-        
-        package_refs = root.findall('.//PackageReference')
-        for pkg_ref in package_refs:
-            include = pkg_ref.get('Include')
-            version = pkg_ref.get('Version')
-            if include:
-                dependencies.append(f"NuGet_Package:{include}@{version}" if version else f"NuGet_Package:{include}")
-
-        project_refs = root.findall('.//ProjectReference')
-        for proj_ref in project_refs:
-            include = proj_ref.get('Include')
-            if include:
-                proj_name = os.path.splitext(os.path.basename(include))[0]
-                dependencies.append(f"Internal_Project:{proj_name}")
-
-        references = root.findall('.//Reference')
-        for ref in references:
-            include = ref.get('Include')
-            if include:
-                dependencies.append(f"Assembly_Reference:{include}")
-
-    except ET.ParseError as e:
-        logging.error(f"Error parsing XML file {filepath}: {e}")
-    except Exception as e:
-        logging.error(f"Error processing .csproj file {filepath}: {e}")
-    return dependencies
+    """Extracts PackageReference, ProjectReference and Reference from .csproj files."""
+    return _extract_formatted(filepath)
 
 # --- Main Scanner Function ---
 
@@ -599,126 +484,124 @@ def detect_custom_libraries(detected_libraries, custom_library_summaries):
     
     return detected_custom_libraries
 
+# Manifest file name or extension -> dependency extractor
+DEPENDENCY_EXTRACTORS = {
+    'pom.xml': extract_maven_dependencies,
+    'build.gradle': extract_gradle_dependencies,
+    'package.json': extract_npm_dependencies,
+    'requirements.txt': extract_python_requirements,
+    'go.mod': extract_go_dependencies,
+    'Gemfile': extract_ruby_gems,
+    '.csproj': extract_csproj_dependencies
+}
+
+def _path_parser(extract):
+    """Adapts an extractor reading its file to the analyzer's parser signature."""
+    return lambda path, read_text: extract(path)
+
+class CodebaseExtractor(FileExtractor):
+    """
+    Builds the scan_codebase views (structure, languages, build/config files and
+    their libraries) from the files of the shared repository walk, applying the
+    configured ignore rules on top of the scanner's.
+    """
+
+    name = "codebase"
+
+    def __init__(self, config):
+        self.language_map = config["LANGUAGE_MAP"]
+        self.build_config_files = config["BUILD_CONFIG_FILES"]
+        self.ignore_extensions = config["IGNORE_EXTENSIONS"]
+        self.ignore_dirs = config["IGNORE_DIRS"]
+
+        self.structure = StructureExtractor()
+        self.dependencies = DependencyExtractor({key: _path_parser(extract) for key, extract in DEPENDENCY_EXTRACTORS.items()})
+        self.build_and_config_analysis = []
+        self.all_detected_libraries = collections.defaultdict(int)
+        self.programming_languages_detected = collections.defaultdict(int)
+        self.key_config_files_found = collections.defaultdict(int)
+        self.build_files_found = collections.defaultdict(int)
+        self.directories = {()}
+        self.total_files = 0
+
+    def add(self, file_info, read_text):
+        directories = os.path.normpath(file_info["relative_path"]).split(os.sep)[:-1]
+        if any(d in self.ignore_dirs or d.startswith('.') for d in directories):
+            return
+
+        self.total_files += 1
+        for depth in range(1, len(directories) + 1):
+            self.directories.add(tuple(directories[:depth]))
+
+        filename = file_info["name"]
+        file_ext = file_info["extension"]
+        if file_ext in self.ignore_extensions or filename in self.ignore_extensions:
+            return
+
+        self.structure.add(file_info, read_text)
+
+        language = self.language_map.get(file_ext, self.language_map.get(filename, 'Unknown'))
+        if language != 'Unknown':
+            self.programming_languages_detected[language] += 1
+
+        file_type_key = filename if filename in self.build_config_files else file_ext
+        file_type = self.build_config_files.get(file_type_key)
+        if not file_type:
+            return
+
+        filepath = file_info["path"]
+        logging.info(f"Processing {file_type}: {filepath}")
+
+        if 'Build File' in file_type or 'Dependencies' in file_type or 'Gem File' in file_type or 'Project File' in file_type:
+            self.build_files_found[filename if filename != '.csproj' else f"*{file_ext}"] += 1
+        else:
+            self.key_config_files_found[filename if filename != '.csproj' else f"*{file_ext}"] += 1
+
+        libs = self.dependencies.add(file_info, read_text) or []
+        for lib in libs:
+            self.all_detected_libraries[lib] += 1
+
+        self.build_and_config_analysis.append({
+            "filepath": filepath,
+            "file_type": file_type,
+            "detected_libraries": sorted(list(set(libs)))
+        })
+
+    def result(self):
+        return {
+            "file_structure": self.structure.result(),
+            "build_and_config_analysis": self.build_and_config_analysis,
+            "all_detected_libraries": self.all_detected_libraries,
+            "programming_languages_detected": self.programming_languages_detected,
+            "key_config_files_found": self.key_config_files_found,
+            "build_files_found": self.build_files_found,
+            "total_files": self.total_files,
+            "total_directories": len(self.directories)
+        }
+
 def scan_codebase(root_folder, config):
     """
     Scans a codebase folder, extracts file structure (hierarchically with only filename),
     and identifies libraries from known build and configuration files.
+    Runs on the shared repository walk, so callers can add other extractors to the same pass.
     """
-    language_map = config["LANGUAGE_MAP"]
-    build_config_files = config["BUILD_CONFIG_FILES"]
-    ignore_extensions = config["IGNORE_EXTENSIONS"]
-    ignore_dirs = config["IGNORE_DIRS"]
     custom_library_summaries = config.get("CUSTOM_LIBRARY_SUMMARIES", {})
 
     if not os.path.isdir(root_folder):
         raise FileNotFoundError(f"The specified path '{root_folder}' is not a directory.")
 
-    hierarchical_file_structure = collections.OrderedDict()
-
-    build_and_config_analysis = []
-    all_detected_libraries = collections.defaultdict(int)
-    programming_languages_detected = collections.defaultdict(int)
-    key_config_files_found = collections.defaultdict(int)
-    build_files_found = collections.defaultdict(int)
-
-    total_files = 0
-    total_directories = 0
-
     logging.info(f"Starting scan of '{root_folder}'...")
 
-    def get_nested_dict(base_dict, path_components):
-        current = base_dict
-        for comp in path_components:
-            current = current.setdefault(comp, collections.OrderedDict())
-        return current
+    codebase = analyze_repository(root_folder, [CodebaseExtractor(config)], max_files=sys.maxsize)["codebase"]
 
-    for dirpath, dirnames, filenames in os.walk(root_folder):
-        dirnames[:] = [d for d in dirnames if d not in ignore_dirs and not d.startswith('.')]
-        
-        total_directories += 1
-
-        relative_path_components = os.path.relpath(dirpath, root_folder).split(os.sep)
-        
-        if relative_path_components == ['.']:
-            current_dir_node = hierarchical_file_structure
-        else:
-            current_dir_node = get_nested_dict(hierarchical_file_structure, relative_path_components)
-        
-        if '_files' not in current_dir_node:
-            current_dir_node['_files'] = []
-
-        for filename in filenames:
-            total_files += 1
-            filepath = os.path.join(dirpath, filename)
-            
-            file_ext = os.path.splitext(filename)[1].lower()
-            
-            if file_ext in ignore_extensions or filename in ignore_extensions:
-                continue
-
-            current_dir_node['_files'].append(filename)
-
-            language = language_map.get(file_ext, language_map.get(filename, 'Unknown'))
-            if language != 'Unknown':
-                programming_languages_detected[language] += 1
-
-            file_type_key = filename if filename in build_config_files else file_ext
-            file_type = build_config_files.get(file_type_key)
-            
-            if file_type:
-                logging.info(f"Processing {file_type}: {filepath}")
-                analysis_entry = {
-                    "filepath": filepath,
-                    "file_type": file_type,
-                    "detected_libraries": []
-                }
-                
-                if 'Build File' in file_type or 'Dependencies' in file_type or 'Gem File' in file_type or 'Project File' in file_type:
-                    build_files_found[filename if filename != '.csproj' else f"*{file_ext}"] += 1
-                else:
-                    key_config_files_found[filename if filename != '.csproj' else f"*{file_ext}"] += 1
-
-                if filename == 'pom.xml':
-                    libs = extract_maven_dependencies(filepath)
-                elif filename == 'build.gradle':
-                    libs = extract_gradle_dependencies(filepath)
-                elif filename == 'package.json':
-                    libs = extract_npm_dependencies(filepath)
-                elif filename == 'requirements.txt':
-                    libs = extract_python_requirements(filepath)
-                elif filename == 'go.mod':
-                    libs = extract_go_dependencies(filepath)
-                elif filename == 'Gemfile':
-                    libs = extract_ruby_gems(filepath)
-                elif file_ext == '.csproj':
-                    libs = extract_csproj_dependencies(filepath)
-                else:
-                    libs = []
-
-                analysis_entry["detected_libraries"] = sorted(list(set(libs)))
-                for lib in libs:
-                    all_detected_libraries[lib] += 1
-                
-                build_and_config_analysis.append(analysis_entry)
-
-        if '_files' in current_dir_node:
-            current_dir_node['_files'].sort()
-
-    def sort_dict_recursively(d):
-        new_d = collections.OrderedDict()
-        
-        if '_files' in d:
-            new_d['_files'] = sorted(d['_files'])
-        
-        sorted_keys = sorted([k for k in d.keys() if k != '_files'])
-        for k in sorted_keys:
-            if isinstance(d[k], dict):
-                new_d[k] = sort_dict_recursively(d[k])
-            else:
-                new_d[k] = d[k]
-        return new_d
-
-    hierarchical_file_structure = sort_dict_recursively(hierarchical_file_structure)
+    hierarchical_file_structure = codebase["file_structure"]
+    build_and_config_analysis = codebase["build_and_config_analysis"]
+    all_detected_libraries = codebase["all_detected_libraries"]
+    programming_languages_detected = codebase["programming_languages_detected"]
+    key_config_files_found = codebase["key_config_files_found"]
+    build_files_found = codebase["build_files_found"]
+    total_files = codebase["total_files"]
+    total_directories = codebase["total_directories"]
 
     programming_languages_detected_list = sorted(programming_languages_detected.items(), key=lambda item: item[1], reverse=True)
     all_detected_libraries_list = sorted([item for item, count in all_detected_libraries.items()], key=lambda x: x.lower())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Test script for batch scanning
+Verifies target resolution, per-stage concurrency limits, shared caches and the aggregate report
+"""
+
+import sys
+import csv
+import json
+import time
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent))
+
+from gates import nodes
+from gates.flow import create_validation_flow
+from gates.utils import batch_runner
+from gates.utils.batch_runner import StageLimiter, run_batch, resolve_batch_targets, read_repository_file
+from benchmarks.synthetic_repo import ensure_repository
+from benchmarks.benchmark_flow import StubLLMClient
+
+
+def test_resolve_targets():
+    """Targets are de-duplicated, keep their own branch and org repositories use their default branch"""
+    print("\n🔍 Testing batch target resolution...")
+    work_dir = tempfile.mkdtemp(prefix="batch_test_")
+    original_list = batch_runner.list_repositories
+    try:
+        repo_file = Path(work_dir) / "repos.txt"
+        repo_file.write_text("# compliance sweep\nhttps://github.com/acme/api develop\n\nhttps://github.com/acme/web\n")
+        file_targets = read_repository_file(str(repo_file))
+        assert file_targets == [
+            {"repository_url": "https://github.com/acme/api", "branch": "develop"},
+            {"repository_url": "https://github.com/acme/web", "branch": None}
+        ], f"Unexpected file targets: {file_targets}"
+
+        batch_runner.list_repositories = lambda org_url, token, include_forks=False, include_archived=False: [
+            {"repository_url": "https://github.com/acme/web.git", "branch": "main", "name": "acme/web"},
+            {"repository_url": "https://github.com/acme/legacy.git", "branch": "master", "name": "acme/legacy"}
+        ]
+        targets = resolve_batch_targets(file_targets, org_url="https://github.com/acme")
+        assert targets == [
+            {"repository_url": "https://github.com/acme/api", "branch": "develop"},
+            {"repository_url": "https://github.com/acme/web", "branch": "main"},
+            {"repository_url": "https://github.com/acme/legacy.git", "branch": "master"}
+        ], f"Unexpected targets: {targets}"
+        print(f"   ✅ {len(targets)} targets, duplicates removed, default branches kept")
+
+        targets = resolve_batch_targets(file_targets, org_url="https://github.com/acme", branch="release", limit=2)
+        assert [t["branch"] for t in targets] == ["develop", "release"], f"Unexpected branches: {targets}"
+        print("   ✅ Explicit branches win over the batch branch, limit applied")
+    finally:
+        batch_runner.list_repositories = original_list
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def test_stage_limiter():
+    """No more than the stage limit run at once and waits are recorded"""
+    print("\n🔍 Testing stage limiter...")
+    limiter = StageLimiter({"clone": 1, "scan": 2, "llm": 1})
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def work():
+        limiter.acquire("scan")
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        limiter.release("scan")
+
+    threads = [threading.Thread(target=work) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = limiter.get_stats()["scan"]
+    assert active["peak"] == 2, f"Expected 2 concurrent scans, saw {active['peak']}"
+    assert stats["peak"] == 2 and stats["acquired"] == 6 and stats["active"] == 0
+    assert stats["wait_seconds"] > 0, "Queued scans should record waiting time"
+    assert limiter.acquire("unknown") == 0.0, "Unknown stages are not limited"
+    print(f"   ✅ Peak {stats['peak']}/{stats['limit']} scans, {stats['wait_seconds']:.2f}s waited")
+
+
+def test_batch_run():
+    """A batch scans every repository once, shares caches and writes one aggregate report"""
+    print("\n🔍 Testing batch run...")
+    work_dir = tempfile.mkdtemp(prefix="batch_test_")
+    repositories = {
+        "https://github.com/acme/orders": ensure_repository(work_dir, "java-spring", 40, seed=1),
+        "https://github.com/acme/billing": ensure_repository(work_dir, "python", 40, seed=2),
+        "https://github.com/acme/portal": ensure_repository(work_dir, "ts-monorepo", 40, seed=3)
+    }
+    client_factory_calls = []
+    originals = (nodes.clone_repository, nodes.cleanup_repository, nodes.create_llm_client_from_env)
+
+    def local_clone(repo_url, branch="main", github_token=None, target_dir=None, checkout=True):
+        if repo_url not in repositories:
+            raise Exception(f"Repository not found: {repo_url}")
+        return repositories[repo_url]
+
+    def create_client():
+        client_factory_calls.append(1)
+        return StubLLMClient(latency=0.05)
+
+    nodes.clone_repository = local_clone
+    nodes.cleanup_repository = lambda path: None
+    nodes.create_llm_client_from_env = create_client
+    try:
+        targets = resolve_batch_targets(list(repositories) + ["https://github.com/acme/missing"])
+        output_dir = Path(work_dir) / "reports"
+        results = []
+        report = run_batch(
+            targets,
+            create_validation_flow,
+            request_options={"threshold": 10, "report_format": "json", "quiet": True},
+            output_dir=str(output_dir),
+            limits={"clone": 2, "scan": 1, "llm": 2},
+            directories={"logs": str(Path(work_dir) / "logs")},
+            on_result=lambda row, shared: results.append(row["repository_url"])
+        )
+
+        summary = report["summary"]
+        assert summary["repositories"] == 4 and summary["completed"] == 3 and summary["failed"] == 1, f"Unexpected summary: {summary}"
+        assert [row["repository_url"] for row in report["repositories"]] == [t["repository_url"] for t in targets], "Rows must keep target order"
+        assert sorted(results) == sorted(t["repository_url"] for t in targets), "on_result must be called once per repository"
+        failed = report["repositories"][-1]
+        assert failed["status"] == "failed" and "Repository not found" in failed["errors"][0], f"Unexpected failure row: {failed}"
+        for row in report["repositories"][:3]:
+            assert row["total_gates"] > 0 and Path(row["json_path"]).exists(), f"Missing results for {row['repository_url']}"
+            assert Path(row["json_path"]).parent == output_dir / f"batch_{report['batch_id']}"
+        print(f"   ✅ {summary['completed']} completed, {summary['failed']} failed, average {summary['average_score']}%")
+
+        assert len(client_factory_calls) == 1, f"LLM client created {len(client_factory_calls)} times"
+        assert report["caches"]["llm_client_reuses"] == 2
+        assert report["caches"]["pattern_screens_cached"] > 0, "Pattern screening results should be shared"
+        assert report["stages"]["scan"]["peak"] == 1, f"Scan stage exceeded its limit: {report['stages']['scan']}"
+        assert report["stages"]["clone"]["acquired"] == 4
+        assert report["pipeline"]["cpu"]["tasks"] > 0 and report["pipeline"]["network"]["tasks"] > 0, f"Unexpected pipeline stats: {report['pipeline']}"
+        assert report["gates"], "Per-gate aggregate missing"
+        print(f"   ✅ One LLM client for the batch, {report['caches']['pattern_screens_cached']} screened patterns shared, "
+              f"scan peak {report['stages']['scan']['peak']}")
+
+        saved = json.loads(Path(report["report_paths"]["json"]).read_text())
+        assert saved["summary"] == summary
+        with open(report["report_paths"]["csv"], newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 4 and rows[0]["repository_url"] == targets[0]["repository_url"]
+        print("   ✅ Aggregate JSON and CSV reports written")
+    finally:
+        nodes.clone_repository, nodes.cleanup_repository, nodes.create_llm_client_from_env = originals
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Testing Batch Scanning")
+    print("=" * 60)
+
+    try:
+        test_resolve_targets()
+        test_stage_limiter()
+        test_batch_run()
+
+        print("\n" + "=" * 60)
+        print("✅ All batch scanning tests passed!")
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test script for the validation flow benchmark harness
+Verifies deterministic synthetic repositories, per-node metrics and baseline regression detection
+"""
+
+import sys
+import copy
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent))
+
+from benchmarks.synthetic_repo import PROFILES, generate_repository, ensure_repository
+from benchmarks.benchmark_flow import run_flow_once, summarize_runs, compare_to_baseline, check_scaling
+
+
+EXPECTED_NODES = [
+    "FetchRepositoryNode", "ProcessCodebaseNode", "ExtractConfigNode", "GeneratePromptNode",
+    "CallLLMNode", "ValidateGatesNode", "GenerateReportNode", "CleanupNode"
+]
+
+
+def test_synthetic_repository_is_deterministic():
+    """Same profile, size and seed produce identical trees"""
+    print("\n🔍 Testing synthetic repository generation...")
+    work_dir = tempfile.mkdtemp(prefix="bench_test_")
+    try:
+        for profile in PROFILES:
+            first = Path(work_dir) / f"{profile}-a"
+            second = Path(work_dir) / f"{profile}-b"
+            generate_repository(str(first), profile, 60, seed=7)
+            generate_repository(str(second), profile, 60, seed=7)
+
+            first_files = sorted(p.relative_to(first) for p in first.rglob("*") if p.is_file())
+            second_files = sorted(p.relative_to(second) for p in second.rglob("*") if p.is_file())
+            assert first_files == second_files, f"{profile}: file lists differ"
+            assert len(first_files) >= 60, f"{profile}: expected at least 60 files, got {len(first_files)}"
+            for relative in first_files:
+                assert (first / relative).read_bytes() == (second / relative).read_bytes(), f"{profile}: {relative} differs"
+            print(f"   ✅ {profile}: {len(first_files)} files, deterministic")
+
+        # ensure_repository reuses an existing tree
+        path = ensure_repository(work_dir, "python", 40, seed=1)
+        marker = Path(path) / "marker.txt"
+        marker.write_text("kept")
+        assert ensure_repository(work_dir, "python", 40, seed=1) == path
+        assert marker.exists(), "ensure_repository regenerated an existing repository"
+        print("   ✅ Existing repositories are reused")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def test_flow_metrics():
+    """A run records wall, CPU and RSS for every node and produces a score"""
+    print("\n🔍 Testing per-node flow metrics...")
+    work_dir = tempfile.mkdtemp(prefix="bench_test_")
+    try:
+        repo_path = ensure_repository(work_dir, "java-spring", 80, seed=3)
+        runs = [run_flow_once(repo_path) for _ in range(2)]
+        summary = summarize_runs(runs)
+
+        assert list(summary["nodes"]) == EXPECTED_NODES, f"Unexpected nodes: {list(summary['nodes'])}"
+        for name, metrics in summary["nodes"].items():
+            assert metrics["wall_seconds"] >= 0 and metrics["cpu_seconds"] >= 0, f"{name}: negative timing"
+            assert "peak_rss_mb" in metrics
+        assert summary["files_scanned"] >= 80, f"Expected at least 80 files scanned, got {summary['files_scanned']}"
+        assert summary["overall_score"] > 0, "Stub LLM patterns should produce a non-zero score"
+        assert not summary["errors"], f"Flow reported errors: {summary['errors']}"
+        assert Path(repo_path).exists(), "Benchmark must not clean up the synthetic repository"
+        print(f"   ✅ {len(summary['nodes'])} nodes timed, score {summary['overall_score']:.1f}%, "
+              f"total {summary['total']['wall_seconds']:.2f}s")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def test_baseline_comparison():
+    """Slowdowns beyond tolerance are reported, small or noisy ones are not"""
+    print("\n🔍 Testing baseline comparison...")
+    node = {"wall_seconds": 1.0, "cpu_seconds": 1.0, "peak_rss_mb": 50.0}
+    fast = {"wall_seconds": 0.01, "cpu_seconds": 0.01, "peak_rss_mb": 50.0}
+    baseline = {"scenarios": [{
+        "scenario": "python-1000",
+        "nodes": {"ValidateGatesNode": dict(node), "CleanupNode": dict(fast)},
+        "total": dict(node)
+    }]}
+
+    unchanged = copy.deepcopy(baseline)
+    assert compare_to_baseline(unchanged, baseline, 0.25) == [], "Identical results must not regress"
+
+    slower = copy.deepcopy(baseline)
+    slower["scenarios"][0]["nodes"]["ValidateGatesNode"]["wall_seconds"] = 1.5
+    slower["scenarios"][0]["nodes"]["CleanupNode"]["wall_seconds"] = 0.03  # 3x, but below the noise floor
+    regressions = compare_to_baseline(slower, baseline, 0.25)
+    assert [r["node"] for r in regressions] == ["ValidateGatesNode"], f"Unexpected regressions: {regressions}"
+    assert regressions[0]["slowdown"] == 1.5
+
+    assert compare_to_baseline(slower, baseline, 0.6) == [], "50% slowdown is within a 60% tolerance"
+    print("   ✅ Regressions detected beyond tolerance, noise floor respected")
+
+
+def test_scaling_check():
+    """Nodes whose time per file grows with the repository are reported, linear ones are not"""
+    print("\n🔍 Testing scaling check...")
+
+    def scenario(size, validate_seconds, cleanup_seconds):
+        return {
+            "scenario": f"python-{size}", "profile": "python", "size": size, "files_scanned": size,
+            "nodes": {"ValidateGatesNode": {"wall_seconds": validate_seconds}, "CleanupNode": {"wall_seconds": cleanup_seconds}},
+            "total": {"wall_seconds": validate_seconds + cleanup_seconds}
+        }
+
+    linear = {"scenarios": [scenario(1000, 1.0, 0.001), scenario(4000, 4.2, 0.01)]}
+    assert check_scaling(linear, 2.0) == [], "Linear growth and noise-level nodes must pass"
+
+    quadratic = {"scenarios": [scenario(1000, 1.0, 0.001), scenario(4000, 16.0, 0.01)]}
+    superlinear = check_scaling(quadratic, 2.0)
+    assert [s["node"] for s in superlinear] == ["TOTAL", "ValidateGatesNode"], superlinear
+    assert superlinear[1]["ratio"] == 4.0 and superlinear[1]["sizes"] == [1000, 4000]
+    assert check_scaling({"scenarios": [scenario(1000, 1.0, 0.001)]}, 2.0) == [], "A single size has nothing to compare"
+    print(f"   ✅ {superlinear[1]['node']} flagged at {superlinear[1]['ratio']}x time per file")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Testing Benchmark Harness")
+    print("=" * 60)
+
+    try:
+        test_synthetic_repository_is_deterministic()
+        test_flow_metrics()
+        test_baseline_comparison()
+        test_scaling_check()
+
+        print("\n" + "=" * 60)
+        print("✅ All benchmark harness tests passed!")
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
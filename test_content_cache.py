@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Test script for the scan-scoped file content cache
+Verifies LRU eviction, byte budget, statistics and that gates share one disk read per file
+"""
+
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent))
+
+from gates.nodes import ValidateGatesNode
+from gates.utils.content_cache import FileContentCache, get_scan_content_cache
+
+
+def create_test_repository() -> str:
+    """Create a small repository with a few source files"""
+    test_dir = tempfile.mkdtemp(prefix="test_content_cache_")
+    src_dir = Path(test_dir) / "src"
+    src_dir.mkdir()
+
+    (src_dir / "App.java").write_text(
+        "import org.slf4j.Logger;\n"
+        "public class App {\n"
+        "    private static final Logger logger = LoggerFactory.getLogger(App.class);\n"
+        "    void run() { logger.info(\"started\"); }\n"
+        "}\n"
+    )
+    (src_dir / "service.py").write_text(
+        "import logging\n"
+        "logger = logging.getLogger(__name__)\n"
+        "logger.info('ready')\n"
+    )
+    return test_dir
+
+
+def create_test_metadata(test_dir: str) -> dict:
+    """Create scanner-like metadata for the test repository"""
+    file_list = []
+    for path in sorted(Path(test_dir).rglob("*.*")):
+        language = "Java" if path.suffix == ".java" else "Python"
+        file_list.append({
+            "relative_path": str(path.relative_to(test_dir)),
+            "language": language,
+            "type": "Source Code",
+            "size": path.stat().st_size,
+            "is_binary": False
+        })
+    return {
+        "total_files": len(file_list),
+        "file_list": file_list,
+        "language_stats": {
+            "Java": {"files": 1, "percentage": 50.0},
+            "Python": {"files": 1, "percentage": 50.0}
+        }
+    }
+
+
+def test_lru_eviction_and_budget():
+    """Test that the cache stays within its byte budget and evicts least recently used entries"""
+    print("💾 Testing LRU eviction and byte budget...")
+
+    test_dir = tempfile.mkdtemp(prefix="test_content_cache_lru_")
+    try:
+        for name in ["a.txt", "b.txt", "c.txt"]:
+            (Path(test_dir) / name).write_text("x" * 100)
+
+        cache = FileContentCache(test_dir, max_bytes=250)
+        cache.get_text("a.txt")
+        cache.get_text("b.txt")
+        cache.get_text("a.txt")  # a is now most recently used
+        cache.get_text("c.txt")  # evicts b
+
+        assert "a.txt" in cache
+        assert "b.txt" not in cache
+        assert "c.txt" in cache
+        assert cache.current_bytes <= 250
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 3
+        assert stats["evictions"] == 1
+        assert stats["bytes_read"] == 300
+        assert stats["bytes_served"] == 400
+        assert stats["hit_ratio"] == 0.25
+
+        print("   ✅ LRU eviction and byte budget test passed")
+    finally:
+        shutil.rmtree(test_dir)
+
+
+def test_snippet_generation():
+    """Test source snippet generation around a match line"""
+    print("📝 Testing snippet generation...")
+
+    test_dir = create_test_repository()
+    try:
+        cache = FileContentCache(test_dir)
+        snippet = cache.get_snippet("src/App.java", 4, context=1)
+        assert "logger.info" in snippet
+        assert "    3 |" in snippet and "    5 |" in snippet
+        assert cache.get_snippet("missing.java", 1) == ""
+
+        print("   ✅ Snippet generation test passed")
+    finally:
+        shutil.rmtree(test_dir)
+
+
+def test_gates_share_disk_reads():
+    """Test that repeated pattern matching is served from the cache"""
+    print("🔁 Testing shared cache across gates and pattern sources...")
+
+    test_dir = create_test_repository()
+    try:
+        metadata = create_test_metadata(test_dir)
+        shared = {"repository": {"local_path": test_dir}}
+        cache = get_scan_content_cache(shared)
+        assert get_scan_content_cache(shared) is cache
+
+        validator = ValidateGatesNode()
+        config = validator._get_pattern_matching_config({})
+        config["enable_detailed_logging"] = False
+        gate = {"name": "STRUCTURED_LOGS"}
+
+        first = validator._find_pattern_matches_with_config(
+            Path(test_dir), [r'logger\.info'], metadata, gate, config, "LLM", content_cache=cache
+        )
+        second = validator._find_pattern_matches_with_config(
+            Path(test_dir), [r'getLogger'], metadata, gate, config, "Static", content_cache=cache
+        )
+
+        assert len(first) == 2, f"Expected 2 matches, got {len(first)}"
+        assert len(second) == 2, f"Expected 2 matches, got {len(second)}"
+
+        stats = cache.get_stats()
+        assert stats["disk_reads"] == 2, f"Expected 2 disk reads, got {stats['disk_reads']}"
+        assert stats["hits"] == 2
+        assert stats["hit_ratio"] == 0.5
+
+        print(f"   ✅ {stats['disk_reads']} disk reads for {stats['hits'] + stats['misses']} lookups")
+    finally:
+        shutil.rmtree(test_dir)
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Testing Scan Content Cache")
+    print("=" * 60)
+
+    try:
+        test_lru_eviction_and_budget()
+        test_snippet_generation()
+        test_gates_share_disk_reads()
+
+        print("\n" + "=" * 60)
+        print("✅ All content cache tests passed!")
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Test script for streaming dependency extraction
+Verifies every manifest and lockfile format, that JSON is parsed incrementally across
+chunk boundaries, that parsed manifests are cached per content hash, that a large lockfile
+is parsed in bounded memory, and that config extraction only reads the head of each file
+"""
+
+import io
+import sys
+import json
+import time
+import shutil
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent))
+
+from gates.utils.dependency_extractor import (Dependency, DependencyCache, extract_dependencies,
+                                              extract_file_dependencies, iter_json_members, manifest_type)
+from gates.utils.content_cache import FileContentCache
+from gates.utils.file_scanner import scan_directory
+from gates.nodes import ExtractConfigNode
+
+POM = """<?xml version="1.0"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <parent><groupId>org.springframework.boot</groupId><artifactId>spring-boot-starter-parent</artifactId>
+    <version>3.2.0</version></parent>
+  <artifactId>app</artifactId>
+  <dependencyManagement><dependencies>
+    <dependency><groupId>io.micrometer</groupId><artifactId>micrometer-bom</artifactId><version>1.12.0</version></dependency>
+  </dependencies></dependencyManagement>
+  <dependencies>
+    <dependency><groupId>org.slf4j</groupId><artifactId>slf4j-api</artifactId><version>2.0.9</version></dependency>
+    <dependency><groupId>junit</groupId><artifactId>junit</artifactId><scope>test</scope></dependency>
+  </dependencies>
+</project>
+"""
+
+CSPROJ = """<Project Sdk="Microsoft.NET.Sdk">
+  <ItemGroup>
+    <PackageReference Include="Serilog" Version="3.1.1" />
+    <PackageReference Include="Polly"><Version>8.2.0</Version></PackageReference>
+    <ProjectReference Include="..\\Shared\\Shared.csproj" />
+    <Reference Include="System.Web" />
+  </ItemGroup>
+</Project>
+"""
+
+FORMATS = {
+    "pom.xml": (POM, [
+        Dependency("org.springframework.boot:spring-boot-starter-parent", "3.2.0", "maven", "parent"),
+        Dependency("io.micrometer:micrometer-bom", "1.12.0", "maven"),
+        Dependency("org.slf4j:slf4j-api", "2.0.9", "maven"),
+        Dependency("junit:junit", None, "maven")]),
+    "App.csproj": (CSPROJ, [
+        Dependency("Serilog", "3.1.1", "nuget"), Dependency("Polly", "8.2.0", "nuget"),
+        Dependency("Shared", None, "nuget", "project"), Dependency("System.Web", None, "nuget", "reference")]),
+    "build.gradle": ("plugins {\n    id 'org.springframework.boot' version '3.2.0'\n}\n"
+                     "dependencies {\n    implementation 'org.slf4j:slf4j-api:2.0.9'\n"
+                     "    testImplementation project(':common')\n}\n", [
+        Dependency("org.springframework.boot", "3.2.0", "gradle", "plugin"),
+        Dependency("org.slf4j:slf4j-api", "2.0.9", "maven"),
+        Dependency(":common", None, "gradle", "project")]),
+    "build.gradle.kts": ('dependencies {\n    implementation("io.ktor:ktor-server-core:2.3.6")\n}\n', [
+        Dependency("io.ktor:ktor-server-core", "2.3.6", "maven")]),
+    "package.json": (json.dumps({"dependencies": {"express": "^4.18.2"}, "devDependencies": {"jest": "29.7.0"},
+                                 "engines": {"node": ">=18"}}), [
+        Dependency("express", "^4.18.2", "npm"), Dependency("jest", "29.7.0", "npm", "dev"),
+        Dependency("node", ">=18", "npm", "engine")]),
+    "package-lock.json": (json.dumps({"lockfileVersion": 3, "packages": {
+        "": {"version": "1.0.0", "dependencies": {"express": "^4.18.2"}},
+        "node_modules/express": {"version": "4.18.2", "dependencies": {"accepts": "~1.3.8"}},
+        "node_modules/express/node_modules/@types/node": {"version": "20.10.0"}},
+        "dependencies": {"express": {"version": "4.18.2"}}}, indent=2), [
+        Dependency("express", "4.18.2", "npm", "locked"), Dependency("@types/node", "20.10.0", "npm", "locked")]),
+    "npm-shrinkwrap.json": (json.dumps({"lockfileVersion": 1, "dependencies": {
+        "debug": {"version": "2.6.9", "requires": {"ms": "2.0.0"}, "dependencies": {"ms": {"version": "2.0.0"}}}}}), [
+        Dependency("debug", "2.6.9", "npm", "locked"), Dependency("ms", "2.0.0", "npm", "locked")]),
+    "yarn.lock": ('# yarn lockfile v1\n\n"@babel/core@^7.0.0", "@babel/core@^7.1.0":\n  version "7.23.5"\n'
+                  '  dependencies:\n    debug "^4.1.0"\n\nlodash@npm:^4.17.21:\n  version: 4.17.21\n', [
+        Dependency("@babel/core", "7.23.5", "npm", "locked"), Dependency("lodash", "4.17.21", "npm", "locked")]),
+    "requirements.txt": ("-r base.txt\n# web\nrequests==2.31.0\nflask[async] >= 2.0 ; python_version > '3.8'\n"
+                         "git+https://github.com/org/lib.git\nuvicorn\n", [
+        Dependency("requests", "==2.31.0", "pypi"), Dependency("flask", ">=2.0", "pypi"), Dependency("uvicorn", None, "pypi")]),
+    "go.mod": ("module github.com/org/app\n\ngo 1.21\n\nrequire github.com/gin-gonic/gin v1.9.1\n"
+               "require (\n\tgo.uber.org/zap v1.26.0 // indirect\n)\n", [
+        Dependency("github.com/org/app", None, "go", "module"), Dependency("go", "1.21", "go", "toolchain"),
+        Dependency("github.com/gin-gonic/gin", "v1.9.1", "go"), Dependency("go.uber.org/zap", "v1.26.0", "go")]),
+    "Gemfile": ("source 'https://rubygems.org'\ngem 'rails', '~> 7.1'\ngem \"pg\"\n", [
+        Dependency("rails", "~> 7.1", "rubygems"), Dependency("pg", None, "rubygems")]),
+}
+
+
+class _TrickleStream(io.BytesIO):
+    """Returns a few bytes per read, so tokens and UTF-8 sequences straddle chunks"""
+
+    def read(self, size=-1):
+        return super().read(3)
+
+
+def test_formats():
+    """Every manifest and lockfile format yields its dependencies in file order"""
+    print("\n🔍 Testing manifest formats...")
+    cache = DependencyCache()
+    for filename, (content, expected) in FORMATS.items():
+        data = content.encode("utf-8")
+        dependencies = extract_dependencies(lambda: io.BytesIO(data), f"nested/{filename}", cache)
+        assert dependencies == expected, f"{filename}: {dependencies}"
+    assert manifest_type("src/Web.CSPROJ") == "nuget" and manifest_type("README.md") is None
+    assert extract_dependencies(lambda: io.BytesIO(b"x"), "README.md", cache) == []
+    print(f"   ✅ {len(FORMATS)} formats")
+
+
+def test_json_streaming():
+    """Incremental JSON members match json.loads across chunk boundaries; bad JSON keeps the prefix"""
+    print("\n🔍 Testing streaming JSON...")
+    document = {"name": "café \"x\"", "n": [1, -2.5e3, True, None], "empty": {}, "count": 12345,
+                "nested": {"a": {"b": "\u00e9"}, "c": 1.5}}
+    data = json.dumps(document, ensure_ascii=False).encode("utf-8")
+    members = list(iter_json_members(_TrickleStream(data), depth=2))
+    assert members == list(iter_json_members(io.BytesIO(data), depth=2))
+    assert members == [(("name",), "café \"x\""), (("n",), [1, -2500.0, True, None]), (("count",), 12345),
+                       (("nested", "a"), {"b": "\u00e9"}), (("nested", "c"), 1.5)], members
+    assert list(iter_json_members(io.BytesIO(data), depth=0)) == [((), document)]
+
+    broken = b'{"dependencies": {"a": "1.0.0", "b": '
+    cache = DependencyCache()
+    assert extract_dependencies(lambda: io.BytesIO(broken), "package.json", cache) == [Dependency("a", "1.0.0", "npm")]
+    print(f"   ✅ {len(members)} members, malformed input keeps the parsed prefix")
+
+
+def test_cache():
+    """Identical contents are parsed once whatever their path; edited contents are parsed again"""
+    print("\n🔍 Testing content-hash cache...")
+    cache = DependencyCache(max_entries=2)
+    opens = []
+
+    def opener(data):
+        def open_stream():
+            opens.append(1)
+            return io.BytesIO(data)
+        return open_stream
+
+    content = FORMATS["pom.xml"][0].encode("utf-8")
+    first = extract_dependencies(opener(content), "a/pom.xml", cache)
+    second = extract_dependencies(opener(content), "b/pom.xml", cache)
+    assert first == second and len(opens) == 2, "Each file is opened once, a cache hit only hashes it"
+    extract_dependencies(opener(content.replace(b"2.0.9", b"2.0.10")), "a/pom.xml", cache)
+    extract_dependencies(opener(b"requests==2.31.0\n"), "requirements.txt", cache)
+    stats = cache.get_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 3 and stats["entries"] == 2 and stats["evictions"] == 1, stats
+    print(f"   ✅ {stats['hits']} hit, {stats['misses']} misses, {stats['bytes_parsed']} bytes parsed")
+
+
+def test_large_lockfile():
+    """A multi-megabyte lockfile is parsed in a fraction of the memory json.load needs"""
+    print("\n🔍 Testing large lockfile...")
+    packages = {"": {"name": "app", "version": "1.0.0"}}
+    for i in range(12000):
+        packages[f"node_modules/package-{i}"] = {
+            "version": f"1.{i % 50}.{i % 7}",
+            "resolved": f"https://registry.npmjs.org/package-{i}/-/package-{i}-1.0.0.tgz",
+            "integrity": "sha512-" + "A" * 86 + "==",
+            "dependencies": {f"package-{(i + j) % 12000}": f"^1.{j}.0" for j in range(3)}
+        }
+    data = json.dumps({"name": "app", "lockfileVersion": 3, "packages": packages}, indent=2).encode("utf-8")
+    del packages
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    dependencies = extract_dependencies(lambda: io.BytesIO(data), "package-lock.json", DependencyCache())
+    streaming_seconds = time.perf_counter() - start
+    streaming_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.reset_peak()
+    json.loads(data)
+    loading_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    assert len(dependencies) == 12000 and dependencies[0] == Dependency("package-0", "1.0.0", "npm", "locked")
+    assert streaming_peak < loading_peak / 2, (streaming_peak, loading_peak)
+    print(f"   ✅ {len(data) / 1e6:.1f}MB lockfile in {streaming_seconds:.2f}s, peak {streaming_peak / 1e6:.1f}MB "
+          f"(json.load {loading_peak / 1e6:.1f}MB)")
+
+
+def test_extract_config():
+    """Config extraction reads file heads, parses nested manifests and lockfiles, and caches neither"""
+    print("\n🔍 Testing config extraction...")
+    # Keep "test" out of the path, it would classify every file as test code
+    work_dir = tempfile.mkdtemp(prefix="dependency_extractor_")
+    try:
+        repo = Path(work_dir) / "repo"
+        (repo / "service").mkdir(parents=True)
+        (repo / "service" / "pom.xml").write_text(POM)
+        (repo / "requirements.txt").write_text(FORMATS["requirements.txt"][0])
+        (repo / "package-lock.json").write_text(FORMATS["package-lock.json"][0])
+        (repo / "application.properties").write_text("# settings\n" + "server.port=8080\n" * 500)
+
+        shared = {"repository": {"local_path": str(repo), "metadata": scan_directory(str(repo))}}
+        shared["content_cache"] = content_cache = FileContentCache(str(repo))
+        node = ExtractConfigNode()
+        result = node.exec(node.prep(shared))
+        node.post(shared, {}, result)
+
+        assert {"org.slf4j:slf4j-api", "requests", "flask", "express", "@types/node"} <= set(result["dependencies"]), result["dependencies"]
+        properties = result["config_files"]["application.properties"]
+        assert len(properties["content"]) == 2000 and properties["size"] == (repo / "application.properties").stat().st_size
+        assert "service/pom.xml" in result["build_files"] and len(content_cache) == 0, "Heads are read without caching files"
+        assert shared["scan_stats"]["dependency_cache"]["misses"] >= 3
+
+        # A file whose text is cached is still hashed from its raw bytes
+        (repo / "requirements.txt").write_bytes(b"# caf\xe9\n" + FORMATS["requirements.txt"][0].encode("utf-8"))
+        cache = DependencyCache()
+        content_cache.get_text("requirements.txt")
+        from_cache = extract_dependencies(lambda: content_cache.open_binary("requirements.txt"), "requirements.txt", cache)
+        from_disk = extract_file_dependencies(str(repo / "requirements.txt"), cache)
+        assert from_cache == from_disk and cache.get_stats()["hits"] == 1, cache.get_stats()
+        print(f"   ✅ {len(result['dependencies'])} dependencies from {len(result['build_files'])} build files and a lockfile")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def test_prompt_dependencies():
+    """Declared dependencies come before lockfile entries, in a stable order"""
+    print("\n🔍 Testing prompt dependency order...")
+    work_dir = tempfile.mkdtemp(prefix="dependency_extractor_")
+    try:
+        repo = Path(work_dir) / "repo"
+        repo.mkdir()
+        declared = ["express", "winston", "prom-client"]
+        (repo / "package.json").write_text(json.dumps({"dependencies": {name: "^1.0.0" for name in declared}}))
+        packages = {"": {"dependencies": {name: "^1.0.0" for name in declared}}}
+        packages.update({f"node_modules/transitive-{i}": {"version": "1.0.0"} for i in range(400)})
+        packages.update({f"node_modules/{name}": {"version": "1.0.0"} for name in declared})
+        (repo / "package-lock.json").write_text(json.dumps({"lockfileVersion": 3, "packages": packages}))
+
+        orders = []
+        for _ in range(2):
+            shared = {"repository": {"local_path": str(repo), "metadata": scan_directory(str(repo))}}
+            shared["content_cache"] = FileContentCache(str(repo))
+            node = ExtractConfigNode()
+            orders.append(node.exec(node.prep(shared))["dependencies"])
+
+        dependencies = orders[0]
+        assert dependencies[:3] == declared, dependencies[:5]
+        assert len(dependencies) == 403 and orders[0] == orders[1], "Dependencies are unique and in a stable order"
+        print(f"   ✅ {len(declared)} declared dependencies ahead of {len(dependencies) - len(declared)} locked ones")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Testing Dependency Extraction")
+    print("=" * 60)
+
+    try:
+        test_formats()
+        test_json_streaming()
+        test_cache()
+        test_large_lockfile()
+        test_extract_config()
+        test_prompt_dependencies()
+
+        print("\n" + "=" * 60)
+        print("✅ All dependency extraction tests passed!")
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Test script for fast verdict early termination
+Verifies that gates stop scanning once their score or status is settled, that stopped gates
+keep the full scan's status (and score when saturated) and that reports label them
+"""
+
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent))
+
+from gates.nodes import ValidateGatesNode
+from gates.utils.early_termination import GateVerdictTracker
+from gates.utils.report_writer import read_json_report
+from benchmarks.synthetic_repo import ensure_repository
+from benchmarks.benchmark_flow import build_shared, stub_external_services
+from gates.flow import create_validation_flow
+
+
+def _tracker(validator, gate, metadata):
+    return GateVerdictTracker(
+        lambda *counts: validator._score_bounds(gate, metadata, *counts),
+        lambda score: validator._determine_status(score, gate)
+    )
+
+
+def _gate(name, percentage, priority, confidence="medium", relevant_files=100):
+    return {"name": name, "display_name": name, "priority": priority, "relevant_files": relevant_files,
+            "expected_coverage": {"percentage": percentage, "confidence": confidence}}
+
+
+def test_tracker_reasons():
+    """Trackers settle on saturated scores and certain verdicts, never before"""
+    print("\n🔍 Testing settle conditions...")
+    validator = ValidateGatesNode()
+    metadata = {"total_files": 100}
+
+    # 10 expected files, medium confidence: 8 files score 72 (PASS for high priority), the cap is 91
+    gate = _gate("STRUCTURED_LOGS", 10, "high")
+    tracker = _tracker(validator, gate, metadata)
+    tracker.start_pass("LLM", 100)
+    for i in range(100):
+        if tracker.settled(100 - i):
+            break
+        tracker.add_file(f"f{i}.java", [1])
+    assert i == 8 and tracker.reason == "verdict_settled" and tracker.bounds == (72.0, 91.0), (i, tracker.reason, tracker.bounds)
+    assert tracker.settled(0), "A settled tracker stays settled"
+
+    # One file with 12 leaked secrets: the score is 0 whatever else is found
+    secrets = _gate("AVOID_LOGGING_SECRETS", 0, "critical")
+    tracker = _tracker(validator, secrets, metadata)
+    tracker.start_pass("LLM", 100)
+    assert not tracker.settled(100)
+    tracker.add_file("Leak.java", list(range(1, 13)))
+    assert tracker.settled(99) and tracker.reason == "score_saturated" and tracker.bounds == (0.0, 0.0)
+
+    # Lines matched again by the static pass are counted once
+    tracker = _tracker(validator, secrets, metadata)
+    tracker.start_pass("LLM", 100)
+    tracker.add_file("Leak.java", [1, 2, 3])
+    tracker.start_pass("Static", 100)
+    tracker.add_file("Leak.java", [1, 2, 3])
+    assert len(tracker.matched_lines) == 3 and not tracker.settled(50)
+
+    # 60 expected critical files and no matches: FAIL is certain once too few files are left
+    gate = _gate("CORRELATION_ID", 60, "critical")
+    tracker = _tracker(validator, gate, metadata)
+    tracker.start_pass("LLM", 100)
+    assert not any(tracker.settled(100 - i) for i in range(100)), "The static pass may still match every file"
+    tracker.start_pass("Static", 100)
+    for i in range(100):
+        if tracker.settled(100 - i):
+            break
+    assert tracker.reason == "verdict_settled" and validator._determine_status(tracker.bounds[1], gate) == "FAIL"
+    assert tracker.bounds[1] < 70 <= validator._score_bounds(gate, metadata, 0, 0, 100 - i + 1, 100 - i + 1)[1]
+    print(f"   ✅ Verdict settled after 8 files, saturated on 12 secrets, FAIL certain with {100 - i} files left")
+
+
+def _scan(work_dir, repo_path, name, fast_verdict):
+    shared = build_shared(repo_path, tempfile.mkdtemp(dir=work_dir))
+    # CleanupNode removes temp_dir, keep the reports outside it
+    shared["request"]["output_dir"] = str(Path(work_dir) / f"reports-{name}")
+    shared["request"]["fast_verdict"] = fast_verdict
+    with stub_external_services(repo_path, llm_latency=0.0):
+        create_validation_flow().run(shared)
+    return shared
+
+
+def test_fast_verdict_scan():
+    """Fast verdict scans keep every gate's status, scan fewer files and label stopped gates"""
+    print("\n🔍 Testing fast verdict scan...")
+    # Keep "test" out of the path, it would classify every synthetic file as test code
+    work_dir = tempfile.mkdtemp(prefix="fast_verdict_")
+    try:
+        repo_path = ensure_repository(work_dir, "java-spring", 400, seed=71)
+        full = _scan(work_dir, repo_path, "full", False)
+        fast = _scan(work_dir, repo_path, "fast", True)
+
+        full_gates = {g["gate"]: g for g in full["validation"]["gate_results"]}
+        assert not any(g["early_terminated"] for g in full_gates.values() if "early_terminated" in g)
+        assert full["validation"]["early_terminated_gates"] == []
+        stopped = 0
+        for gate in fast["validation"]["gate_results"]:
+            reference = full_gates[gate["gate"]]
+            assert gate["status"] == reference["status"], f"{gate['gate']}: {gate['status']} != {reference['status']}"
+            termination = gate.get("early_termination")
+            if termination is None:
+                assert gate["score"] == reference["score"]
+                continue
+            stopped += 1
+            assert gate["early_terminated"] and not gate["partial"]
+            low, high = termination["score_bounds"]
+            assert low - 0.01 <= reference["score"] <= high + 0.01, f"{gate['gate']}: full score outside {low}-{high}"
+            if termination["reason"] == "score_saturated":
+                assert gate["score"] == reference["score"]
+            assert gate["timing"]["files_scanned"] <= reference["timing"]["files_scanned"]
+        assert stopped, "Synthetic repository should have gates settled before a full scan"
+        assert set(fast["validation"]["early_terminated_gates"]) == {g["gate"] for g in fast["validation"]["gate_results"] if g.get("early_termination")}
+
+        low, high = fast["validation"]["overall_score_bounds"]
+        assert low - 0.01 <= full["validation"]["overall_score"] <= high + 0.01
+        assert full["validation"]["overall_score_bounds"] == [full["validation"]["overall_score"]] * 2
+
+        report = read_json_report(fast["reports"]["json_path"])
+        assert report["early_terminated_gates"] == fast["validation"]["early_terminated_gates"]
+        assert all(g["early_termination"]["reason"] in ("score_saturated", "verdict_settled") for g in report["gates"] if g["early_terminated"])
+        html = Path(fast["reports"]["html_path"]).read_text(encoding="utf-8")
+        assert html.count("(early verdict)") == stopped
+        assert "(early verdict)" not in Path(full["reports"]["html_path"]).read_text(encoding="utf-8")
+
+        scanned = sum(g["timing"]["files_scanned"] for g in fast["validation"]["gate_results"])
+        reference_scanned = sum(g["timing"]["files_scanned"] for g in full["validation"]["gate_results"])
+        print(f"   ✅ {stopped} gates stopped early, same statuses, {scanned} vs {reference_scanned} gate-files scanned, "
+              f"overall {full['validation']['overall_score']:.1f}% within {low:.1f}-{high:.1f}%")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Testing Fast Verdict Early Termination")
+    print("=" * 60)
+
+    try:
+        test_tracker_reasons()
+        test_fast_verdict_scan()
+
+        print("\n" + "=" * 60)
+        print("✅ All early termination tests passed!")
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
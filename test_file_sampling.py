@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Test script for stratified file sampling
+Verifies that sample orders are proportional by stratum, that extrapolated totals and their
+confidence intervals hold up where truncating to the largest files is biased, and that
+sampled scans report estimates consistent with a full scan
+"""
+
+import sys
+import random
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent))
+
+from gates.utils.file_sampling import StratifiedFileSample, stratified_order
+from gates.utils.report_writer import read_json_report
+from benchmarks.synthetic_repo import ensure_repository
+from benchmarks.benchmark_flow import build_shared, stub_external_services
+from gates.flow import create_validation_flow
+
+
+def _monorepo(file_count, seed):
+    """Files of a monorepo where large (generated) files rarely match and services differ"""
+    rng = random.Random(seed)
+    files, matched = [], {}
+    for i in range(file_count):
+        service = i % 30
+        language = "TypeScript" if service % 3 == 0 else "Java"
+        size = rng.randint(200, 4000) if i % 10 else rng.randint(40000, 90000)
+        path = f"services/svc{service}/src/{'generated' if size > 20000 else 'main'}/File{i}.x"
+        files.append({"relative_path": path, "language": language, "size": size})
+        rate = 0.02 if size > 20000 else (0.15 if service < 15 else 0.6)
+        if rng.random() < rate:
+            matched[path] = rng.choice([1, 1, 2, 4])
+    return files, matched
+
+
+def test_stratified_order():
+    """Every prefix of the order takes files from each stratum in proportion"""
+    print("\n🔍 Testing stratified order...")
+    files, _ = _monorepo(6000, seed=1)
+    order = stratified_order(files, seed=3)
+    assert sorted(f["relative_path"] for _, f in order) == sorted(f["relative_path"] for f in files)
+    assert [f["relative_path"] for _, f in order] == [f["relative_path"] for _, f in stratified_order(files, seed=3)]
+
+    sizes = {}
+    for stratum, _ in order:
+        sizes[stratum] = sizes.get(stratum, 0) + 1
+    assert len(sizes) == 30, "Strata are the service directories (one language each)"
+    for n in (60, 250, 1000):
+        counts = {}
+        for stratum, _ in order[:n]:
+            counts[stratum] = counts.get(stratum, 0) + 1
+        for stratum, size in sizes.items():
+            assert abs(counts.get(stratum, 0) - n * size / len(files)) <= 1, f"{stratum} off proportion at n={n}"
+    print(f"   ✅ {len(sizes)} strata, prefixes proportional within one file")
+
+
+def test_estimates_and_intervals():
+    """Intervals cover the true totals at about the confidence level; top-N truncation is biased"""
+    print("\n🔍 Testing estimates and intervals...")
+    files, matched = _monorepo(20000, seed=2)
+    true_files = len(matched)
+    true_matches = sum(matched.values())
+    indicators = {path: 1 for path in matched}
+
+    covered_files = covered_matches = 0
+    errors = []
+    runs = 200
+    for seed in range(runs):
+        sample = StratifiedFileSample.from_files(files, seed=seed)
+        sample.add_scanned(len(sample.next_batch(500)))
+        estimate, low, high = sample.estimate_total(indicators, proportion=True)
+        covered_files += low <= true_files <= high
+        errors.append(abs(estimate - true_files))
+        _, low, high = sample.estimate_total(matched)
+        covered_matches += low <= true_matches <= high
+    assert covered_files >= 0.9 * runs and covered_matches >= 0.9 * runs, (covered_files, covered_matches)
+
+    # Truncating to the 500 largest files and scaling up is far off
+    largest = sorted(files, key=lambda f: f["size"], reverse=True)[:500]
+    truncated = sum(1 for f in largest if f["relative_path"] in matched) / 500 * len(files)
+    mean_error = sum(errors) / runs
+    assert mean_error * 5 < abs(truncated - true_files), (mean_error, truncated, true_files)
+
+    # A full sample is exact
+    sample = StratifiedFileSample.from_files(files[:300])
+    sample.add_scanned(len(sample.next_batch(1000)))
+    exact = sum(1 for f in files[:300] if f["relative_path"] in matched)
+    assert sample.estimate_total(indicators, proportion=True) == (exact, exact, exact)
+    print(f"   ✅ {covered_files}/{runs} file and {covered_matches}/{runs} match intervals cover the truth; "
+          f"mean error {mean_error:.0f} files vs {abs(truncated - true_files):.0f} for the largest files")
+
+
+def _scan(work_dir, repo_path, name, pattern_matching):
+    shared = build_shared(repo_path, tempfile.mkdtemp(dir=work_dir))
+    # CleanupNode removes temp_dir, keep the reports outside it
+    shared["request"]["output_dir"] = str(Path(work_dir) / f"reports-{name}")
+    shared["request"]["report_format"] = "json"
+    shared["request"]["pattern_matching"] = pattern_matching
+    with stub_external_services(repo_path, llm_latency=0.0):
+        create_validation_flow().run(shared)
+    return shared
+
+
+def test_sampled_scan():
+    """Sampled gates scan at most max_files and their intervals agree with a full scan"""
+    print("\n🔍 Testing sampled scan...")
+    # Keep "test" out of the path, it would classify every synthetic file as test code
+    work_dir = tempfile.mkdtemp(prefix="file_sampling_")
+    try:
+        repo_path = ensure_repository(work_dir, "java-spring", 1500, seed=81)
+        full = _scan(work_dir, repo_path, "full", {"max_files": 2000})
+        sampled = _scan(work_dir, repo_path, "sampled", {"max_files": 100, "file_selection": "sample"})
+        unsampled = _scan(work_dir, repo_path, "unsampled", {"max_files": 2000, "file_selection": "sample"})
+
+        full_gates = {g["gate"]: g for g in full["validation"]["gate_results"]}
+        covered = 0
+        for gate in sampled["validation"]["gate_results"]:
+            reference = full_gates[gate["gate"]]
+            sampling = gate["sampling"]
+            assert sampling["population"] == reference["relevant_files"] > 100
+            assert sampling["files_sampled"] <= 100 and gate["timing"]["files_scanned"] <= 100
+            low, high = sampling["files_with_matches_interval"]
+            covered += low <= reference["match_counts"]["files_with_matches"] <= high
+            score_low, score_high = sampling["score_interval"]
+            assert score_low <= gate["score"] <= score_high
+            if sampling["settled"]:
+                assert gate["status"] == reference["status"], gate["gate"]
+        gates = len(full_gates)
+        assert covered >= 0.8 * gates, f"Only {covered}/{gates} intervals contain the full scan's files with matches"
+        assert sampled["validation"]["sampled_gates"] == list(full_gates)
+
+        # Only the sampled files are read and indexed (one sample of source and one of test files), not the whole repository
+        full_index, sampled_index = full["scan_stats"]["trigram_index"], sampled["scan_stats"]["trigram_index"]
+        assert sampled_index["lazy"] and not full_index["lazy"]
+        assert sampled_index["files"] <= 2 * 100 < full_index["files"], (sampled_index, full_index)
+
+        report = read_json_report(sampled["reports"]["json_path"])
+        assert report["sampled_gates"] == list(full_gates)
+        assert all(g["sampling"]["files_sampled"] <= 100 for g in report["gates"])
+
+        # Gates within max_files scan every file, exactly as without sampling
+        assert unsampled["validation"]["sampled_gates"] == []
+        for gate in unsampled["validation"]["gate_results"]:
+            assert gate["score"] == full_gates[gate["gate"]]["score"] and "sampling" not in gate
+        settled = sum(g["sampling"]["settled"] for g in sampled["validation"]["gate_results"])
+        print(f"   ✅ {gates} gates sampled at 100 of up to {max(g['relevant_files'] for g in full_gates.values())} files, "
+              f"{covered}/{gates} intervals contain the full scan, {settled} statuses settled, "
+              f"{sampled_index['files']} of {full_index['files']} files indexed")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Testing File Sampling")
+    print("=" * 60)
+
+    try:
+        test_stratified_order()
+        test_estimates_and_intervals()
+        test_sampled_scan()
+
+        print("\n" + "=" * 60)
+        print("✅ All file sampling tests passed!")
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
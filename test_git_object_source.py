@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test script for checkout-free scanning from the git object database
+Verifies that the tree listing and blob reads match the working tree, that the scanner and
+the whole flow give the same results without one, and that a single cat-file process serves
+every read
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+from pathlib import Path
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent))
+
+from gates.utils.git_object_source import GitObjectSource, get_repository_source_mode
+from gates.utils.file_scanner import scan_directory
+from gates.utils.content_cache import FileContentCache
+from benchmarks.synthetic_repo import ensure_repository
+from benchmarks.benchmark_flow import build_shared, stub_external_services
+from gates.flow import create_validation_flow
+
+
+def _git(repo_path, *args):
+    subprocess.run(["git", "-C", str(repo_path), *args], check=True, capture_output=True)
+
+
+def _commit_all(repo_path):
+    _git(repo_path, "init", "-q")
+    _git(repo_path, "add", "-A")
+    _git(repo_path, "-c", "user.name=CodeGates", "-c", "user.email=codegates@example.com", "commit", "-q", "-m", "Initial commit")
+
+
+def test_listing_and_reads():
+    """Listing sizes and blob contents match the files; ignored paths, symlinks and submodules are skipped"""
+    print("\n🔍 Testing tree listing and blob reads...")
+    work_dir = tempfile.mkdtemp(prefix="git_objects_")
+    try:
+        repo = Path(work_dir) / "repo"
+        (repo / "src" / "main").mkdir(parents=True)
+        (repo / "node_modules" / "lib").mkdir(parents=True)
+        (repo / "src" / "main" / "App.java").write_text("class App {\n\n  void run() {}\n}\n")
+        (repo / "src" / "main" / "legacy.py").write_bytes(b"a = 1\r\nb = 2\rc = 3\n\n")
+        (repo / "src" / "main" / "logo.png").write_bytes(bytes(range(256)) * 4)
+        (repo / "node_modules" / "lib" / "index.js").write_text("module.exports = 1;\n")
+        (repo / "pom.xml").write_text("<project><artifactId>app</artifactId></project>\n")
+        os.symlink("pom.xml", repo / "pom-link.xml")
+        _commit_all(repo)
+
+        with GitObjectSource(str(repo)) as source:
+            listed = dict(source.list_files())
+            assert "pom-link.xml" not in listed, "Symlinks are not file contents"
+            for path, size in listed.items():
+                assert size == (repo / path).stat().st_size, path
+                assert source.read_bytes(path) == (repo / path).read_bytes(), path
+            assert source.exists("src\\main\\App.java") and not source.exists("missing.txt")
+            try:
+                source.read_bytes("missing.txt")
+                raise AssertionError("Missing files raise FileNotFoundError")
+            except FileNotFoundError:
+                pass
+            process = source._process
+            source.read_bytes("pom.xml")
+            assert source._process is process, "Every read goes through one cat-file process"
+            assert source.get_stats()["blob_reads"] == len(listed) + 1
+
+            # The scanner gives the same metadata from the objects as from the working tree
+            os.remove(repo / "pom-link.xml")
+            from_disk = scan_directory(str(repo))
+            shutil.rmtree(repo / "src")
+            from_objects = scan_directory(str(repo), source=source)
+            assert from_objects == from_disk and from_objects["total_files"] == 4
+            assert "node_modules/lib/index.js" not in [f["relative_path"] for f in from_objects["file_list"]]
+            assert [f["lines"] for f in from_objects["file_list"] if f["name"] == "legacy.py"] == [3]
+
+            # The content cache reads deleted working tree files from their blobs
+            cache = FileContentCache(str(repo), source=source)
+            assert cache.exists("src/main/App.java") and cache.file_size("src/main/App.java") == listed["src/main/App.java"]
+            assert cache.get_text("src/main/App.java").startswith("class App")
+        assert source._process is None, "Closing stops the cat-file process"
+        print(f"   ✅ {len(listed)} files listed with sizes, contents identical, one cat-file process")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _scan(work_dir, repo_path, name, repository_source):
+    shared = build_shared(repo_path, tempfile.mkdtemp(dir=work_dir))
+    # CleanupNode removes temp_dir, keep the reports outside it
+    shared["request"]["output_dir"] = str(Path(work_dir) / f"reports-{name}")
+    shared["request"]["report_format"] = "json"
+    shared["request"]["repository_source"] = repository_source
+    with stub_external_services(repo_path, llm_latency=0.0):
+        create_validation_flow().run(shared)
+    return shared
+
+
+def test_objects_scan():
+    """A scan of a bare clone gives the same results as a scan of the checkout"""
+    print("\n🔍 Testing object scan of a bare clone...")
+    # Keep "test" out of the path, it would classify every synthetic file as test code
+    work_dir = tempfile.mkdtemp(prefix="git_objects_")
+    previous_cache_dir = os.environ.get("CODEGATES_INDEX_CACHE_DIR")
+    os.environ["CODEGATES_INDEX_CACHE_DIR"] = str(Path(work_dir) / "index_cache")
+    try:
+        repo_path = ensure_repository(work_dir, "java-spring", 300, seed=91)
+        _commit_all(repo_path)
+        bare_path = str(Path(work_dir) / "bare.git")
+        subprocess.run(["git", "clone", "-q", "--bare", repo_path, bare_path], check=True, capture_output=True)
+        assert not any(p.suffix == ".java" for p in Path(bare_path).rglob("*")), "Bare clones have no working tree"
+
+        worktree = _scan(work_dir, repo_path, "worktree", "worktree")
+        objects = _scan(work_dir, bare_path, "objects", "objects")
+
+        assert objects["repository"]["metadata"]["total_files"] == worktree["repository"]["metadata"]["total_files"]
+        assert objects["repository"]["metadata"]["total_lines"] == worktree["repository"]["metadata"]["total_lines"]
+        assert objects["config"] == worktree["config"]
+        reference = {g["gate"]: g for g in worktree["validation"]["gate_results"]}
+        for gate in objects["validation"]["gate_results"]:
+            assert gate["score"] == reference[gate["gate"]]["score"], gate["gate"]
+            assert gate["match_counts"] == reference[gate["gate"]]["match_counts"], gate["gate"]
+        assert objects["validation"]["overall_score"] == worktree["validation"]["overall_score"]
+
+        stats = objects["scan_stats"]["repository_source"]
+        commit = subprocess.run(["git", "-C", repo_path, "rev-parse", "HEAD"], check=True, capture_output=True, text=True).stdout.strip()
+        assert stats["commit"] == commit and stats["blob_reads"] > 0
+        assert list(Path(os.environ["CODEGATES_INDEX_CACHE_DIR"]).glob(f"{commit}.*")), "Index persisted for the commit"
+        assert objects["repository"]["source"]._process is None
+
+        try:
+            get_repository_source_mode({"repository_source": "svn"})
+            raise AssertionError("Unknown sources are rejected")
+        except ValueError:
+            pass
+        print(f"   ✅ {len(reference)} gates identical, {stats['blob_reads']} blob reads "
+              f"({stats['bytes_read'] / 1024:.0f} KB) and no working tree")
+    finally:
+        if previous_cache_dir is None:
+            os.environ.pop("CODEGATES_INDEX_CACHE_DIR", None)
+        else:
+            os.environ["CODEGATES_INDEX_CACHE_DIR"] = previous_cache_dir
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Testing Git Object Source")
+    print("=" * 60)
+
+    try:
+        test_listing_and_reads()
+        test_objects_scan()
+
+        print("\n" + "=" * 60)
+        print("✅ All git object source tests passed!")
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test script for import-time budgets
+Verifies in fresh interpreters that the utilities package, the LLM client and short CLI
+commands load neither GitPython, requests, the provider SDKs nor the scan flow, and that
+each import stays within its time budget
+"""
+
+import sys
+import json
+import subprocess
+import importlib.util
+from pathlib import Path
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent))
+
+ROOT = Path(__file__).parent
+
+# Third-party modules only the code paths that use them may load
+HEAVY_MODULES = ["git", "requests", "urllib3", "openai", "anthropic", "google.generativeai", "ollama", "httpx"]
+
+# Milliseconds an import may take in a fresh interpreter (best of several runs)
+PACKAGE_BUDGET_MS = 50
+CLI_BUDGET_MS = 100
+FLOW_BUDGET_MS = 300
+
+
+def _fresh_import(statement, path=None, runs=3):
+    """Run an import statement in new interpreters; returns (best milliseconds, modules loaded)"""
+    script = (
+        "import sys, json, time\n"
+        f"sys.path.insert(0, {str(path or ROOT)!r})\n"
+        "before = set(sys.modules)\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "elapsed = (time.perf_counter() - start) * 1000\n"
+        "print(json.dumps({'ms': elapsed, 'modules': sorted(set(sys.modules) - before)}))\n"
+    )
+    best, modules = None, None
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", script], cwd=str(ROOT), check=True,
+                                capture_output=True, text=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        if best is None or result["ms"] < best:
+            best, modules = result["ms"], set(result["modules"])
+    return best, modules
+
+
+def _assert_not_loaded(modules, forbidden, what):
+    loaded = sorted(name for name in forbidden if name in modules)
+    assert not loaded, f"{what} loads {', '.join(loaded)}"
+
+
+def test_package_import():
+    """Importing the utilities package and light exports loads no heavy dependency"""
+    print("\n🔍 Testing utilities package import...")
+    ms, modules = _fresh_import("import gates.utils\nfrom gates.utils import HARD_GATES, ScanLogger")
+    _assert_not_loaded(modules, HEAVY_MODULES + ["gates.nodes", "gates.flow", "gates.utils.git_operations",
+                                                 "gates.utils.llm_client", "gates.utils.report_writer"], "gates.utils")
+    assert ms < PACKAGE_BUDGET_MS, f"gates.utils imports in {ms:.1f}ms (budget {PACKAGE_BUDGET_MS}ms)"
+    print(f"   ✅ {ms:.1f}ms, {len(modules)} modules")
+
+
+def test_exports_resolve():
+    """Every name in __all__ still resolves on first access"""
+    print("\n🔍 Testing lazy exports...")
+    import gates.utils
+    for name in gates.utils.__all__:
+        assert getattr(gates.utils, name) is not None, name
+    try:
+        gates.utils.no_such_utility
+        raise AssertionError("Unknown names raise AttributeError")
+    except AttributeError:
+        pass
+    print(f"   ✅ {len(gates.utils.__all__)} exports resolve")
+
+
+def test_provider_sdks_on_demand():
+    """The LLM client and git operations import their SDKs only when called"""
+    print("\n🔍 Testing on-demand SDK imports...")
+    ms, modules = _fresh_import("from gates.utils.llm_client import create_llm_client_from_env, LLMProvider\n"
+                                "from gates.utils.git_operations import clone_repository")
+    _assert_not_loaded(modules, HEAVY_MODULES, "llm_client and git_operations")
+    print(f"   ✅ {ms:.1f}ms without {', '.join(HEAVY_MODULES)}")
+
+
+def test_cli_and_flow_import():
+    """Short CLI commands skip the scan flow; the flow itself stays within budget"""
+    print("\n🔍 Testing CLI and flow imports...")
+    if importlib.util.find_spec("click") is None:
+        print("   ⚠️ click not installed, skipping the CLI import")
+    else:
+        ms, modules = _fresh_import("import cli", path=ROOT / "gates")
+        _assert_not_loaded(modules, HEAVY_MODULES + ["flow", "nodes", "utils.llm_client", "utils.git_operations",
+                                                     "utils.report_writer", "utils.batch_runner", "utils.profiler"], "cli")
+        assert ms < CLI_BUDGET_MS, f"cli imports in {ms:.1f}ms (budget {CLI_BUDGET_MS}ms)"
+        print(f"   ✅ cli: {ms:.1f}ms")
+
+    ms, modules = _fresh_import("import gates.flow")
+    _assert_not_loaded(modules, HEAVY_MODULES, "gates.flow")
+    assert ms < FLOW_BUDGET_MS, f"gates.flow imports in {ms:.1f}ms (budget {FLOW_BUDGET_MS}ms)"
+    print(f"   ✅ flow: {ms:.1f}ms")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Testing Import Time")
+    print("=" * 60)
+
+    try:
+        test_package_import()
+        test_exports_resolve()
+        test_provider_sdks_on_demand()
+        test_cli_and_flow_import()
+
+        print("\n" + "=" * 60)
+        print("✅ All import time tests passed!")
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test script for per-node instrumentation
+Verifies node timings, retries and counters in shared["metrics"], per-gate timings,
+the JSON report metrics section and the Prometheus text rendering
+"""
+
+import sys
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent))
+
+from gates.utils.instrumentation import InstrumentedNode, MetricsRegistry, NODE_COUNTERS
+from benchmarks.synthetic_repo import ensure_repository
+from benchmarks.benchmark_flow import build_shared, stub_external_services
+from gates.flow import create_validation_flow
+
+
+class FlakyNode(InstrumentedNode):
+    """Fails twice before succeeding"""
+
+    def exec(self, prep_res):
+        self.add_metric("files_touched", 2)
+        if self.cur_retry < 2:
+            raise RuntimeError("transient failure")
+        return "done"
+
+    def post(self, shared, prep_res, exec_res):
+        self.add_metric("matches_emitted", 5)
+        return "default"
+
+
+class BrokenNode(InstrumentedNode):
+    def exec(self, prep_res):
+        raise ValueError("always fails")
+
+
+def test_node_metrics():
+    """Phase timings, retries and counters are recorded per node"""
+    print("\n🔍 Testing node metrics...")
+    shared = {}
+    assert FlakyNode(max_retries=3)._run(shared) == "default"
+
+    node = shared["metrics"]["nodes"]["FlakyNode"]
+    for key in ["prep_seconds", "exec_seconds", "post_seconds", "total_seconds", "cpu_seconds"] + list(NODE_COUNTERS):
+        assert key in node, f"Missing {key} in node metrics"
+    assert node["status"] == "ok"
+    assert node["retries"] == 2, f"Expected 2 retries, got {node['retries']}"
+    assert node["files_touched"] == 6, f"Counters accumulate across attempts, got {node['files_touched']}"
+    assert node["matches_emitted"] == 5
+    print(f"   ✅ FlakyNode: {node['retries']} retries, {node['files_touched']} files touched")
+
+    try:
+        BrokenNode()._run(shared)
+        raise AssertionError("BrokenNode should raise")
+    except ValueError:
+        pass
+    assert shared["metrics"]["nodes"]["BrokenNode"]["status"] == "error", "Failed nodes are still recorded"
+    print("   ✅ Failed nodes recorded with status=error")
+
+
+def test_flow_metrics_and_report():
+    """The validation flow fills node and gate metrics and writes them to the JSON report"""
+    print("\n🔍 Testing flow metrics and JSON report...")
+    work_dir = tempfile.mkdtemp(prefix="instrumentation_test_")
+    try:
+        repo_path = ensure_repository(work_dir, "java-spring", 60, seed=5)
+        shared = build_shared(repo_path, tempfile.mkdtemp(dir=work_dir))
+        # CleanupNode removes temp_dir, keep the reports outside it
+        shared["request"]["output_dir"] = str(Path(work_dir) / "reports")
+        with stub_external_services(repo_path, llm_latency=0.0):
+            create_validation_flow().run(shared)
+
+        nodes = shared["metrics"]["nodes"]
+        assert len(nodes) == 8, f"Expected 8 instrumented nodes, got {list(nodes)}"
+        assert nodes["ProcessCodebaseNode"]["files_touched"] == shared["repository"]["metadata"]["total_files"]
+        assert nodes["ProcessCodebaseNode"]["bytes_read"] > 0
+        assert nodes["ValidateGatesNode"]["files_touched"] > 0, "Gate validation reads files through the content cache"
+        assert nodes["ValidateGatesNode"]["bytes_read"] > 0
+
+        gates = shared["metrics"]["gates"]
+        assert gates, "Per-gate timings missing"
+        total_matches = sum(g["matches"] for g in gates.values())
+        assert nodes["ValidateGatesNode"]["matches_emitted"] == total_matches
+        for gate_name, gate in gates.items():
+            assert gate["seconds"] >= gate["llm_seconds"] + gate["static_seconds"] - 1e-3, f"{gate_name}: inconsistent timing"
+        print(f"   ✅ {len(nodes)} nodes, {len(gates)} gates timed, {total_matches} matches emitted")
+
+        report = json.loads(Path(shared["reports"]["json_path"]).read_text())
+        assert "ValidateGatesNode" in report["metrics"]["nodes"], "JSON report is missing node metrics"
+        assert report["metrics"]["gates"].keys() == gates.keys()
+        assert report["scan_metadata"]["scan_duration"] > 0
+        print(f"   ✅ JSON report carries metrics (scan_duration {report['scan_metadata']['scan_duration']}s)")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def test_prometheus_rendering():
+    """Registry aggregates scans and renders valid exposition lines"""
+    print("\n🔍 Testing Prometheus rendering...")
+    registry = MetricsRegistry()
+    scan = {
+        "nodes": {"ValidateGatesNode": {"prep_seconds": 0.1, "exec_seconds": 2.0, "post_seconds": 0.1, "total_seconds": 2.2,
+                                        "cpu_seconds": 1.5, "retries": 0, "bytes_read": 1024, "files_touched": 10, "matches_emitted": 7}},
+        "gates": {'ODD"GATE': {"seconds": 1.0, "matches": 7}}
+    }
+    registry.observe_scan(scan, "completed")
+    registry.observe_scan(scan, "completed")
+    registry.observe_scan(None, "failed")
+    text = registry.render(active_scans=1)
+
+    expected = [
+        'codegates_scans_total{status="completed"} 2',
+        'codegates_scans_total{status="failed"} 1',
+        "codegates_active_scans 1",
+        'codegates_node_duration_seconds_sum{node="ValidateGatesNode",phase="exec"} 4.000000',
+        'codegates_node_duration_seconds_count{node="ValidateGatesNode",phase="exec"} 2',
+        'codegates_node_bytes_read_total{node="ValidateGatesNode"} 2048',
+        'codegates_node_matches_emitted_total{node="ValidateGatesNode"} 14',
+        'codegates_gate_duration_seconds_sum{gate="ODD\\"GATE"} 2.000000',
+    ]
+    for line in expected:
+        assert line in text.splitlines(), f"Missing line: {line}\n{text}"
+    for line in text.splitlines():
+        assert line.startswith("#") or len(line.rsplit(" ", 1)) == 2, f"Malformed line: {line}"
+    print(f"   ✅ {len(text.splitlines())} exposition lines rendered")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Testing Node Instrumentation")
+    print("=" * 60)
+
+    try:
+        test_node_metrics()
+        test_flow_metrics_and_report()
+        test_prometheus_rendering()
+
+        print("\n" + "=" * 60)
+        print("✅ All instrumentation tests passed!")
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
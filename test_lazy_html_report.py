@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test script for lazy HTML reports
+Verifies that lazy reports ship gate summaries without details, that the details sidecar
+holds every gate's panel content and that inline reports are unchanged
+"""
+
+import re
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent))
+
+from gates.nodes import GenerateReportNode
+from gates.utils.report_writer import read_html_details, HTML_DETAILS_PREFIX
+from benchmarks.synthetic_repo import ensure_repository
+from benchmarks.benchmark_flow import build_shared, stub_external_services
+from gates.flow import create_validation_flow
+
+
+def _scan(work_dir, repo_path, html_mode):
+    shared = build_shared(repo_path, tempfile.mkdtemp(dir=work_dir))
+    # CleanupNode removes temp_dir, keep the reports outside it
+    shared["request"]["output_dir"] = str(Path(work_dir) / f"reports-{html_mode}")
+    shared["request"]["report_format"] = "html"
+    shared["request"]["html_mode"] = html_mode
+    with stub_external_services(repo_path, llm_latency=0.0):
+        create_validation_flow().run(shared)
+    return shared
+
+
+def test_lazy_report():
+    """The lazy shell has every gate row but no details; the sidecar has the details"""
+    print("\n🔍 Testing lazy HTML report...")
+    work_dir = tempfile.mkdtemp(prefix="lazy_html_test_")
+    try:
+        repo_path = ensure_repository(work_dir, "java-spring", 80, seed=41)
+        inline = _scan(work_dir, repo_path, "inline")
+        lazy = _scan(work_dir, repo_path, "lazy")
+
+        assert inline["reports"]["html_details_path"] is None, "Inline reports have no sidecar"
+        details_path = Path(lazy["reports"]["html_details_path"])
+        assert details_path.parent == Path(lazy["reports"]["html_path"]).parent, "Sidecar must sit next to the HTML"
+
+        inline_html = Path(inline["reports"]["html_path"]).read_text(encoding="utf-8")
+        lazy_html = Path(lazy["reports"]["html_path"]).read_text(encoding="utf-8")
+        gate_results = lazy["validation"]["gate_results"]
+
+        rows = re.findall(r'class="gate-details" aria-hidden="true" data-gate="([A-Z_]+)"', lazy_html)
+        assert sorted(rows) == sorted(g["gate"] for g in gate_results), "Every gate needs a lazily filled details row"
+        assert lazy_html.count("Loading details...") == len(gate_results)
+        assert "Gate Information:</div>" not in lazy_html, "Lazy shell must not contain rendered details"
+        assert inline_html.count("Gate Information:</div>") == len(gate_results)
+        assert details_path.name in lazy_html, "Shell must reference its sidecar"
+        assert len(lazy_html) < len(inline_html), "Lazy shell should be smaller than the inline report"
+        for gate in gate_results:
+            assert f">{gate['display_name']}</strong>" in lazy_html, f"Summary row missing for {gate['gate']}"
+
+        assert details_path.read_text(encoding="utf-8").startswith(HTML_DETAILS_PREFIX)
+        details = read_html_details(str(details_path))
+        assert set(details) == {g["gate"] for g in gate_results}
+        node = GenerateReportNode()
+        for gate in gate_results:
+            data = details[gate["gate"]]
+            assert [list(m) for m in data["metrics"]] == [list(m) for m in node._gate_details_data(gate)["metrics"]]
+            assert data["matches_found"] == gate["matches_found"]
+            assert len(data["matches"]) == min(gate["matches_found"], node.lazy_details_matches)
+        print(f"   ✅ {len(gate_results)} gates: {len(lazy_html) / 1024:.1f}KB shell + "
+              f"{details_path.stat().st_size / 1024:.1f}KB details vs {len(inline_html) / 1024:.1f}KB inline")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def test_details_escaping():
+    """Sidecar content cannot close the script it is loaded as"""
+    print("\n🔍 Testing sidecar escaping...")
+    work_dir = tempfile.mkdtemp(prefix="lazy_html_test_")
+    try:
+        from gates.utils.report_writer import write_html_details
+        path = Path(work_dir) / "details.js"
+        details = {"GATE": {"evidence": [{"file": "a.html", "line": 1, "text": "</script><script>alert(1)</script>"}]}}
+        write_html_details(str(path), details)
+        assert "</script>" not in path.read_text(encoding="utf-8")
+        assert read_html_details(str(path)) == details
+        print("   ✅ Closing tags escaped and restored")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Testing Lazy HTML Reports")
+    print("=" * 60)
+
+    try:
+        test_lazy_report()
+        test_details_escaping()
+
+        print("\n" + "=" * 60)
+        print("✅ All lazy HTML report tests passed!")
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Test script for local filesystem scans
+Verifies that local directories are scanned in place without cloning or cleanup, that
+tracked-only and changed-file listings restrict the scan, and that no trigram index is
+persisted for local trees
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+from pathlib import Path
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent))
+
+from gates import nodes
+from gates.utils.local_source import LocalFileSource, resolve_local_target
+from gates.utils.file_scanner import scan_directory
+from benchmarks.synthetic_repo import ensure_repository
+from benchmarks.benchmark_flow import build_shared, stub_external_services
+from gates.flow import create_validation_flow
+
+
+def _commit_all(repo_path):
+    for args in (["init", "-q"], ["add", "-A"],
+                 ["-c", "user.name=CodeGates", "-c", "user.email=codegates@example.com", "commit", "-q", "-m", "Initial commit"]):
+        subprocess.run(["git", "-C", str(repo_path), *args], check=True, capture_output=True)
+
+
+def test_listing():
+    """Targets resolve to their work tree; tracked-only and changed-file listings restrict the files"""
+    print("\n🔍 Testing local listings...")
+    work_dir = tempfile.mkdtemp(prefix="local_source_")
+    try:
+        repo = Path(work_dir) / "repo"
+        (repo / "src").mkdir(parents=True)
+        (repo / "src" / "App.java").write_text("class App {}\n")
+        (repo / "src" / "Util.java").write_text("class Util {\n}\n")
+        (repo / "pom.xml").write_text("<project/>\n")
+        _commit_all(repo)
+        (repo / "generated").mkdir()
+        (repo / "generated" / "Stub.java").write_text("class Stub {}\n")
+        for ignored in ("node_modules/left-pad/index.js", "target/classes/App.class"):
+            (repo / ignored).parent.mkdir(parents=True)
+            (repo / ignored).write_text("ignored\n")
+
+        root = str(repo.resolve())
+        assert resolve_local_target(str(repo)) == (root, None)
+        assert resolve_local_target(str(repo / "src" / "App.java")) == (root, ["src/App.java"])
+        assert resolve_local_target(str(repo), ["src/App.java", str(repo / "pom.xml"), "src/App.java"]) == (root, ["src/App.java", "pom.xml"])
+        for path, changed in ((str(repo / "missing"), None), (str(repo), ["../outside.java"])):
+            try:
+                resolve_local_target(path, changed)
+                raise AssertionError(f"{path} {changed} should be rejected")
+            except ValueError:
+                pass
+
+        # All files: the same metadata as walking the directory
+        source = LocalFileSource(root)
+        assert scan_directory(root, source=source) == scan_directory(root)
+        assert "generated/Stub.java" in dict(source.list_files())
+        # Ignored directories are pruned from the walk, not listed and dropped later
+        assert not [path for path, _ in source.list_files() if path.startswith(("node_modules/", "target/"))]
+
+        tracked = dict(LocalFileSource(root, tracked_only=True).list_files())
+        assert sorted(tracked) == ["pom.xml", "src/App.java", "src/Util.java"], tracked
+
+        # Deleted changed files are skipped, the rest are readable
+        (repo / "src" / "Util.java").unlink()
+        changed = LocalFileSource(root, changed_files=["src/App.java", "src/Util.java"])
+        assert [path for path, _ in changed.list_files()] == ["src/App.java"]
+        assert changed.read_bytes("src/App.java") == b"class App {}\n"
+        assert not changed.exists("pom.xml") and changed.commit is None
+        print(f"   ✅ {len(source.list_files())} files, {len(tracked)} tracked, 1 of 2 changed files left")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _scan(work_dir, repo_path, name, **request):
+    shared = build_shared(repo_path, tempfile.mkdtemp(dir=work_dir))
+    # CleanupNode removes temp_dir, keep the reports outside it
+    shared["request"]["output_dir"] = str(Path(work_dir) / f"reports-{name}")
+    shared["request"]["report_format"] = "json"
+    shared["request"].update(request)
+    with stub_external_services(repo_path, llm_latency=0.0):
+        if request.get("repository_source") == "local":
+            # Local scans must neither clone nor delete the workspace
+            def fail(*args, **kwargs):
+                raise AssertionError("Local scans do not clone or clean up")
+            nodes.clone_repository = nodes.cleanup_repository = fail
+        create_validation_flow().run(shared)
+    return shared
+
+
+def test_local_scan():
+    """Local scans give the checkout's results in place and persist no index"""
+    print("\n🔍 Testing local scan...")
+    # Keep "test" out of the path, it would classify every synthetic file as test code
+    work_dir = tempfile.mkdtemp(prefix="local_source_")
+    index_dir = Path(work_dir) / "index_cache"
+    previous_cache_dir = os.environ.get("CODEGATES_INDEX_CACHE_DIR")
+    os.environ["CODEGATES_INDEX_CACHE_DIR"] = str(index_dir)
+    try:
+        repo_path = ensure_repository(work_dir, "java-spring", 200, seed=95)
+        _commit_all(repo_path)
+
+        local = _scan(work_dir, repo_path, "local", repository_url=repo_path, repository_source="local")
+        assert not local["errors"], local["errors"]
+        assert Path(repo_path).exists() and local["repository"]["local_path"] == str(Path(repo_path).resolve())
+        assert not index_dir.exists() or not any(index_dir.iterdir()), "Local trees persist no trigram index"
+
+        worktree = _scan(work_dir, repo_path, "worktree")
+        reference = {g["gate"]: g for g in worktree["validation"]["gate_results"]}
+        for gate in local["validation"]["gate_results"]:
+            assert gate["score"] == reference[gate["gate"]]["score"], gate["gate"]
+        assert local["repository"]["metadata"]["total_files"] == worktree["repository"]["metadata"]["total_files"]
+
+        java_file = next(f["relative_path"] for f in local["repository"]["metadata"]["file_list"] if f["language"] == "Java")
+        changed = _scan(work_dir, repo_path, "changed", repository_url=repo_path, repository_source="local",
+                        changed_files=[java_file, "pom.xml"])
+        assert [f["relative_path"] for f in changed["repository"]["metadata"]["file_list"]] == sorted([java_file, "pom.xml"])
+        assert list(changed["config"]["build_files"]) == ["pom.xml"]
+        assert changed["scan_stats"]["repository_source"]["changed_files"] == 2
+        print(f"   ✅ {len(reference)} gates match the checkout scan, no clone, cleanup or index; "
+              f"changed-file scan read {changed['repository']['metadata']['total_files']} files")
+    finally:
+        if previous_cache_dir is None:
+            os.environ.pop("CODEGATES_INDEX_CACHE_DIR", None)
+        else:
+            os.environ["CODEGATES_INDEX_CACHE_DIR"] = previous_cache_dir
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Testing Local Sources")
+    print("=" * 60)
+
+    try:
+        test_listing()
+        test_local_scan()
+
+        print("\n" + "=" * 60)
+        print("✅ All local source tests passed!")
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
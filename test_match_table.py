@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Test script for the columnar match table
+Verifies that deduplication and per-file / per-source counts agree with the match dict
+implementation (with and without NumPy), that report rows are unchanged and that a match
+takes a fraction of the memory of a match dict
+"""
+
+import sys
+import time
+import random
+import tracemalloc
+from pathlib import Path
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent))
+
+from gates.utils import match_table
+from gates.utils.match_table import MatchTable, as_match_table
+from gates.utils.report_writer import StringTables, encode_gate_matches
+
+
+def _synthetic_matches(count, source, seed):
+    rng = random.Random(seed)
+    patterns = [r"logger\.(info|debug)", r"assert", r"Exception", r"@Test"]
+    texts = ["logger.info", "assert", "Exception", "@Test"]
+    matches = []
+    for i in range(count):
+        kind = rng.randrange(len(patterns))
+        file_number = i * 2000 // count
+        matches.append({
+            "file": f"src/main/java/com/acme/module{file_number % 40}/Service{file_number}.java",
+            "pattern": patterns[kind],
+            "match": texts[kind] if rng.random() < 0.95 else f"logger.info(\"order {i}\")",
+            "line": rng.randint(1, 900),
+            "language": "Java",
+            "source": source
+        })
+    return matches
+
+
+def _legacy_deduplicate(matches):
+    seen = set()
+    unique_matches = []
+    for match in matches:
+        key = (match["file"], match["line"])
+        if key not in seen:
+            seen.add(key)
+            unique_matches.append(match)
+    return unique_matches
+
+
+def _expected_row(match):
+    return {**match, "match": match["match"][:match_table.MAX_MATCH_TEXT]}
+
+
+def _modes():
+    """Match table implementations available here: pure Python, plus NumPy when installed"""
+    return [False, True] if match_table.NUMPY_AVAILABLE else [False]
+
+
+def test_deduplicate_and_counts():
+    """Merged tables keep the first match per file and line, like the list implementation"""
+    print("\n🔍 Testing deduplication and counts...")
+    llm = _synthetic_matches(20000, "LLM", seed=1)
+    static = _synthetic_matches(30000, "Static", seed=2)
+    expected = [_expected_row(m) for m in _legacy_deduplicate(llm + static)]
+    numpy_available = match_table.NUMPY_AVAILABLE
+
+    try:
+        for use_numpy in _modes():
+            match_table.NUMPY_AVAILABLE = use_numpy
+            unique = MatchTable.merge_unique(MatchTable.from_matches(llm), MatchTable.from_matches(static))
+            assert len(unique) == len(expected)
+            assert list(unique) == expected, f"Deduplicated matches differ (numpy={use_numpy})"
+            assert unique.files_with_matches() == len({m["file"] for m in expected})
+
+            file_counts = {}
+            source_counts = {}
+            for m in expected:
+                file_counts[m["file"]] = file_counts.get(m["file"], 0) + 1
+                source_counts[m["source"]] = source_counts.get(m["source"], 0) + 1
+            assert unique.file_counts() == file_counts
+            assert unique.source_counts() == source_counts
+            assert MatchTable.merge_unique(MatchTable(), MatchTable()).files_with_matches() == 0
+            print(f"   ✅ numpy={use_numpy}: {len(unique)} unique of {len(llm) + len(static)} matches, {source_counts}")
+    finally:
+        match_table.NUMPY_AVAILABLE = numpy_available
+
+
+def test_list_compatibility():
+    """Indexing, slicing and conversion behave like the match list"""
+    print("\n🔍 Testing list compatibility...")
+    matches = _synthetic_matches(100, "Static", seed=3)
+    matches[5]["match"] = "x" * 500
+    table = as_match_table(matches)
+    assert as_match_table(table) is table
+    assert table[0] == _expected_row(matches[0]) and table[-1] == _expected_row(matches[-1])
+    assert table[:3] == [_expected_row(m) for m in matches[:3]]
+    assert table[5]["match"] == "x" * match_table.MAX_MATCH_TEXT, "Stored text is truncated like report text"
+    assert len(table.head(10)) == 10 and table.head(500) is table
+    assert not as_match_table(None) and not as_match_table([])
+    try:
+        table[100]
+        raise AssertionError("Index past the end must raise IndexError")
+    except IndexError:
+        pass
+    print("   ✅ Indexing, slicing, head and conversion")
+
+
+def test_report_rows():
+    """Report encoding of a table is identical to encoding the match dicts"""
+    print("\n🔍 Testing report rows...")
+    matches = _legacy_deduplicate(_synthetic_matches(5000, "LLM", seed=4) + _synthetic_matches(5000, "Static", seed=5))
+    table = MatchTable.merge_unique(as_match_table(matches))
+    for detail in ("file", "match"):
+        from_dicts, from_table = StringTables(), StringTables()
+        assert encode_gate_matches(matches, detail, from_dicts) == encode_gate_matches(table, detail, from_table)
+        assert from_dicts.tables == from_table.tables, f"{detail}: string tables differ"
+    print(f"   ✅ {len(matches)} matches encode identically at file and match detail")
+
+
+def test_memory_and_speed():
+    """A stored match takes a fraction of a match dict; counting files gets faster"""
+    print("\n🔍 Testing memory and speed...")
+    matches = _synthetic_matches(200000, "Static", seed=6)
+    rows = [(m["file"], m["line"], m["pattern"], m["match"], m["language"], m["source"]) for m in matches]
+
+    # Each match gets a fresh text string, as re.finditer produces
+    tracemalloc.start()
+    dicts = [{"file": f, "pattern": p, "match": (t + " ")[:-1], "line": line, "language": lang, "source": s} for f, line, p, t, lang, s in rows]
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del dicts
+
+    tracemalloc.start()
+    table = MatchTable()
+    for f, line, p, t, lang, s in rows:
+        table.append(f, line, p, (t + " ")[:-1], lang, s)
+    table_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    ratio = dict_bytes / table_bytes
+    assert ratio > 8, f"Match table uses {table_bytes} bytes vs {dict_bytes} for dicts ({ratio:.1f}x)"
+
+    start = time.perf_counter()
+    for _ in range(5):
+        legacy = len(set(m["file"] for m in matches))
+    legacy_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(5):
+        columnar = table.files_with_matches()
+    table_seconds = time.perf_counter() - start
+    assert legacy == columnar
+    assert table_seconds < legacy_seconds, f"Counting files took {table_seconds:.3f}s vs {legacy_seconds:.3f}s"
+    print(f"   ✅ {dict_bytes / len(rows):.0f} -> {table_bytes / len(rows):.0f} bytes per match ({ratio:.1f}x), "
+          f"files counted in {table_seconds * 200:.1f}ms vs {legacy_seconds * 200:.1f}ms")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Testing Match Table")
+    print("=" * 60)
+    print(f"   NumPy available: {match_table.NUMPY_AVAILABLE}")
+
+    try:
+        test_deduplicate_and_counts()
+        test_list_compatibility()
+        test_report_rows()
+        test_memory_and_speed()
+
+        print("\n" + "=" * 60)
+        print("✅ All match table tests passed!")
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
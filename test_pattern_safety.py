@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Test script for the regex safety guard
+Verifies ReDoS detection, safe rewrites, rejection, time budgets and report integration
+"""
+
+import re
+import sys
+import time
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent))
+
+from gates.nodes import ValidateGatesNode
+from gates.utils.pattern_safety import PatternSafetyGuard, analyze_pattern, rewrite_pattern
+
+
+def test_redos_detection():
+    """Test that backtracking-prone constructs are detected and normal patterns are not"""
+    print("🛡️ Testing ReDoS detection...")
+
+    unsafe_patterns = [r'(a+)+b', r'(\w*)*=', r'(a|ab)*c', r'(\d+\s?)+x', r'(\w+\w)+', r'(\w+.)+!', r'([^,]+;)+']
+    safe_patterns = [r'logger\.(info|debug|error)', r'@Slf4j', r'(GET|POST)+', r'\b\w*logger\w*\.info', r'(?>a+)+b']
+
+    for pattern in unsafe_patterns:
+        assert not analyze_pattern(pattern)["safe"], f"Expected unsafe: {pattern}"
+    for pattern in safe_patterns:
+        assert analyze_pattern(pattern)["safe"], f"Expected safe: {pattern}"
+
+    print("   ✅ ReDoS detection test passed")
+
+
+def test_separated_nested_quantifiers():
+    """Test that nested quantifiers delimited by a mandatory separator pass screening and still match"""
+    print("🧩 Testing separated nested quantifiers...")
+
+    samples = {
+        r'import\s+(\w+\.)+\w+': "import com.example.logging.Logger;",
+        r'@(\w+\.)*Test': "@org.junit.Test",
+        r'(\.\w+)*': ".info.debug",
+        r'(\w+\s*,\s*)*\w+': "logger, metrics ,tracer",
+        r'([^,]+,)+': "a,b,",
+    }
+    for pattern in samples:
+        analysis = analyze_pattern(pattern)
+        assert analysis["safe"], f"Expected safe: {pattern} ({analysis['issues']})"
+
+    guard = PatternSafetyGuard()
+    compiled = guard.screen(list(samples), re.IGNORECASE | re.MULTILINE, analyze=True)
+    assert [pattern for pattern, _ in compiled] == list(samples), guard.get_report()["rejected"]
+    assert not guard.get_report()["rewritten"]
+    for pattern, regex in compiled:
+        assert regex.search(samples[pattern]).group(), f"{pattern} no longer matches {samples[pattern]!r}"
+
+    print(f"   ✅ {len(compiled)} separated patterns kept")
+
+
+def test_rewrite_preserves_matches():
+    """Test that nested single-atom quantifiers are rewritten without changing matches"""
+    print("✏️ Testing safe rewrites...")
+
+    assert rewrite_pattern(r'(a+)+b') == r'(a)+b'
+    assert rewrite_pattern(r'(?:\w*)*=') == r'(?:\w)*='
+    assert rewrite_pattern(r'(ab+)+') == r'(ab+)+'  # Not a single atom, left alone
+
+    samples = ["aaab", "b", "aaaa", "xx aab yy", "key=value", "=", "abab"]
+    for original in [r'(a+)+b', r'(?:\w*)*=', r'([a-z]+)*\d']:
+        rewritten = rewrite_pattern(original)
+        assert analyze_pattern(rewritten)["safe"], f"Rewrite still unsafe: {rewritten}"
+        for sample in samples:
+            expected = [m.group() for m in re.finditer(original, sample)]
+            actual = [m.group() for m in re.finditer(rewritten, sample)]
+            assert expected == actual, f"{original} vs {rewritten} on {sample!r}"
+
+    print("   ✅ Rewrite test passed")
+
+
+def test_guard_screening_and_budget():
+    """Test rejection reporting and time budget enforcement"""
+    print("⏱️ Testing guard screening and time budget...")
+
+    guard = PatternSafetyGuard(time_budget=1.0, sample_files=2)
+    compiled = guard.screen([r'(a+)+b', r'(a|ab)*c', r'logger\.info', r'[unclosed'], re.IGNORECASE, analyze=True)
+    assert [pattern for pattern, _ in compiled] == [r'(a+)+b', r'logger\.info']
+
+    report = guard.get_report()
+    assert {item["pattern"] for item in report["rejected"]} == {r'(a|ab)*c', r'[unclosed'}
+    assert report["rewritten"][0]["rewritten"] == r'(a)+b'
+
+    # Static patterns skip analysis but are still compiled and budgeted
+    static_compiled = PatternSafetyGuard().screen([r'(a|ab)*c'], re.IGNORECASE, analyze=False)
+    assert len(static_compiled) == 1
+
+    # Projected cost over all eligible bytes exceeds the budget after the sample
+    assert guard.record("logger\\.info", 0.1, 1000, 1000000)
+    assert not guard.record("logger\\.info", 0.1, 1000, 1000000)
+    assert not guard.is_enabled("logger\\.info")
+    assert guard.get_report()["slow"][0]["projected_seconds"] > 1.0
+
+    # Cumulative time beyond the budget disables the pattern immediately
+    assert not guard.record("(a+)+b", 1.5, 1000, 1000)
+    assert len(guard.get_report()["slow"]) == 2
+
+    print("   ✅ Guard screening and budget test passed")
+
+
+def test_unsafe_pattern_does_not_stall_gate():
+    """Test that an unsafe LLM pattern is rejected while the remaining patterns still match"""
+    print("🚦 Testing gate matching with an unsafe LLM pattern...")
+
+    test_dir = tempfile.mkdtemp(prefix="test_pattern_safety_")
+    try:
+        (Path(test_dir) / "App.java").write_text(
+            "public class App {\n"
+            "    void run() { logger.info(\"" + "a" * 40 + "\"); }\n"
+            "}\n"
+        )
+        metadata = {
+            "total_files": 1,
+            "file_list": [{
+                "relative_path": "App.java",
+                "language": "Java",
+                "type": "Source Code",
+                "size": (Path(test_dir) / "App.java").stat().st_size,
+                "is_binary": False
+            }],
+            "language_stats": {"Java": {"files": 1}}
+        }
+
+        validator = ValidateGatesNode()
+        config = validator._get_pattern_matching_config({})
+        config["enable_detailed_logging"] = False
+        diagnostics = {}
+
+        start = time.time()
+        matches = validator._find_pattern_matches_with_config(
+            Path(test_dir), [r'(a|aa)*b', r'logger\.info'], metadata,
+            {"name": "STRUCTURED_LOGS"}, config, "LLM", diagnostics=diagnostics
+        )
+        elapsed = time.time() - start
+
+        assert elapsed < 5, f"Matching took {elapsed:.1f}s"
+        assert len(matches) == 1 and matches[0]["pattern"] == r'logger\.info'
+        assert diagnostics["pattern_safety"]["rejected"][0]["pattern"] == r'(a|aa)*b'
+
+        print(f"   ✅ Unsafe pattern rejected, gate matched in {elapsed:.2f}s")
+    finally:
+        shutil.rmtree(test_dir)
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Testing Regex Safety Guard")
+    print("=" * 60)
+
+    try:
+        test_redos_detection()
+        test_separated_nested_quantifiers()
+        test_rewrite_preserves_matches()
+        test_guard_screening_and_budget()
+        test_unsafe_pattern_does_not_stall_gate()
+
+        print("\n" + "=" * 60)
+        print("✅ All regex safety tests passed!")
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test script for scan profiling
+Verifies the pstats, summary and collapsed-stack outputs of a profiled scan,
+sampling-only mode and that unprofiled scans are left untouched
+"""
+
+import sys
+import time
+import pstats
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent))
+
+from gates.utils.profiler import StackSampler, profile_scan
+from benchmarks.synthetic_repo import ensure_repository
+from benchmarks.benchmark_flow import build_shared, stub_external_services
+from gates.flow import create_validation_flow
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(1000))
+
+
+def _preexisting_wait(stop):
+    stop.wait(5)
+
+
+def test_stack_sampler():
+    """Worker threads started after the sampler are sampled, pre-existing threads are not"""
+    print("\n🔍 Testing stack sampler...")
+    stop = threading.Event()
+    existing = threading.Thread(target=_preexisting_wait, args=(stop,), daemon=True)
+    existing.start()
+
+    sampler = StackSampler(interval=0.002)
+    sampler.start()
+    worker = threading.Thread(target=_busy, args=(0.2,))
+    worker.start()
+    worker.join()
+    sampler.stop()
+    stop.set()
+
+    assert sampler.samples > 0, "No samples taken"
+    assert any("_busy" in stack for stack in sampler.stacks), "Worker thread stacks missing"
+    assert existing.ident in sampler._excluded, "Pre-existing threads must be excluded"
+    assert not any("_preexisting_wait" in stack for stack in sampler.stacks), "Pre-existing threads must not be sampled"
+    print(f"   ✅ {sampler.samples} samples, {len(sampler.stacks)} distinct stacks")
+
+
+def _profiled_scan(work_dir, mode):
+    repo_path = ensure_repository(work_dir, "java-spring", 60, seed=11)
+    shared = build_shared(repo_path, tempfile.mkdtemp(dir=work_dir))
+    # CleanupNode removes temp_dir, keep the reports outside it
+    shared["request"]["output_dir"] = str(Path(work_dir) / f"reports-{mode}")
+    shared["request"]["profile"] = True
+    shared["request"]["profile_mode"] = mode
+    with stub_external_services(repo_path, llm_latency=0.0):
+        with profile_scan(shared):
+            create_validation_flow().run(shared)
+    return shared
+
+
+def test_cprofile_scan():
+    """cProfile mode writes a loadable pstats file, a summary and collapsed stacks"""
+    print("\n🔍 Testing cProfile scan profile...")
+    work_dir = tempfile.mkdtemp(prefix="profiler_test_")
+    try:
+        shared = _profiled_scan(work_dir, "cprofile")
+        paths = shared["reports"]["profile"]
+        assert set(paths) == {"pstats", "summary", "collapsed"}, f"Unexpected profile outputs: {paths}"
+        for path in paths.values():
+            assert Path(path).parent == Path(shared["request"]["output_dir"]), f"{path} not in the reports directory"
+
+        stats = pstats.Stats(paths["pstats"])
+        functions = {name for (_, _, name) in stats.stats}
+        assert "_run" in functions and "exec" in functions, "Flow nodes missing from pstats"
+
+        lines = Path(paths["collapsed"]).read_text().splitlines()
+        assert lines, "Collapsed stack file is empty"
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            assert stack and int(count) > 0, f"Malformed collapsed line: {line}"
+        assert "cumulative" in Path(paths["summary"]).read_text()
+        assert shared["profile"]["mode"] == "cprofile" and shared["profile"]["duration_seconds"] > 0
+        print(f"   ✅ {len(stats.stats)} profiled functions, {len(lines)} collapsed stacks")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def test_sampling_scan():
+    """Sampling mode only writes collapsed stacks"""
+    print("\n🔍 Testing sampling-only scan profile...")
+    work_dir = tempfile.mkdtemp(prefix="profiler_test_")
+    try:
+        shared = _profiled_scan(work_dir, "sampling")
+        paths = shared["reports"]["profile"]
+        assert list(paths) == ["collapsed"], f"Sampling mode should only write collapsed stacks, got {paths}"
+        assert Path(paths["collapsed"]).exists()
+        print(f"   ✅ {shared['profile']['samples']} samples written to {Path(paths['collapsed']).name}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def test_profiling_disabled():
+    """Without request["profile"] the context manager does nothing"""
+    print("\n🔍 Testing unprofiled scans...")
+    output_dir = tempfile.mkdtemp(prefix="profiler_test_")
+    try:
+        shared = {"request": {"output_dir": output_dir, "scan_id": "plain"}, "reports": {}}
+        with profile_scan(shared) as sampler:
+            assert sampler is None
+        assert "profile" not in shared["reports"] and "profile" not in shared
+        assert not list(Path(output_dir).iterdir()), "No files should be written"
+        print("   ✅ No profile outputs without the profile option")
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Testing Scan Profiling")
+    print("=" * 60)
+
+    try:
+        test_stack_sampler()
+        test_cprofile_scan()
+        test_sampling_scan()
+        test_profiling_disabled()
+
+        print("\n" + "=" * 60)
+        print("✅ All profiling tests passed!")
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test script for the per-scan file relevance index
+Verifies indexed file selection matches the unindexed ordering and is served from the index on repeat
+"""
+
+import sys
+from pathlib import Path
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent))
+
+from gates.nodes import ValidateGatesNode
+
+
+def create_test_metadata() -> dict:
+    """Create scanner-like metadata with mixed languages and file types"""
+    file_list = []
+    for i in range(20):
+        file_list.append({
+            "relative_path": f"src/main/java/Service{i}.java",
+            "language": "Java",
+            "type": "Source Code",
+            "size": 1000 + (i % 5) * 100,
+            "is_binary": False
+        })
+    for i in range(5):
+        file_list.append({
+            "relative_path": f"src/test/java/Service{i}Test.java",
+            "language": "Java",
+            "type": "Test Code",
+            "size": 500 + i,
+            "is_binary": False
+        })
+    for i in range(4):
+        file_list.append({
+            "relative_path": f"web/page{i}.html",
+            "language": "HTML",
+            "type": "Source Code",
+            "size": 300,
+            "is_binary": False
+        })
+    file_list.append({
+        "relative_path": "config/application.yaml",
+        "language": "YAML",
+        "type": "Source Code",
+        "size": 200,
+        "is_binary": False
+    })
+    file_list.append({
+        "relative_path": "assets/logo.png",
+        "language": "Unknown",
+        "type": "Source Code",
+        "size": 5000,
+        "is_binary": True
+    })
+    return {
+        "total_files": len(file_list),
+        "file_list": file_list,
+        "language_stats": {
+            "Java": {"files": 25},
+            "HTML": {"files": 4},
+            "YAML": {"files": 1}
+        }
+    }
+
+
+def test_indexed_selection_matches_unindexed():
+    """Test that the shared index returns the same files in the same order as a standalone call"""
+    print("🗂️ Testing indexed file selection...")
+
+    metadata = create_test_metadata()
+    validator = ValidateGatesNode()
+    config = validator._get_pattern_matching_config({})
+    index = validator._build_relevance_index(metadata)
+
+    for gate_name, file_type in [
+        ("STRUCTURED_LOGS", "Source Code"),
+        ("UI_ERRORS", "Source Code"),
+        ("AUTOMATED_TESTS", "Test Code"),
+        ("RETRY_LOGIC", "Source Code")
+    ]:
+        expected = validator._get_improved_relevant_files(metadata, file_type=file_type, gate_name=gate_name, config=config)
+        indexed = validator._get_improved_relevant_files(metadata, file_type=file_type, gate_name=gate_name, config=config, relevance_index=index)
+        assert [f["relative_path"] for f in indexed] == [f["relative_path"] for f in expected], f"Ordering differs for {gate_name}"
+        assert all(not f["is_binary"] and f["type"] == file_type for f in indexed)
+
+    # UI gates include HTML, logging gates do not
+    ui_files = validator._get_improved_relevant_files(metadata, file_type="Source Code", gate_name="UI_ERRORS", config=config, relevance_index=index)
+    log_files = validator._get_improved_relevant_files(metadata, file_type="Source Code", gate_name="STRUCTURED_LOGS", config=config, relevance_index=index)
+    assert any(f["language"] == "HTML" for f in ui_files)
+    assert not any(f["language"] == "HTML" for f in log_files)
+
+    print("   ✅ Indexed selection matches unindexed ordering")
+
+
+def test_gates_served_from_index():
+    """Test that gates sharing a language category reuse one subset"""
+    print("🔁 Testing index reuse across gates...")
+
+    metadata = create_test_metadata()
+    validator = ValidateGatesNode()
+    config = validator._get_pattern_matching_config({})
+    index = validator._build_relevance_index(metadata)
+
+    logging_gates = ["STRUCTURED_LOGS", "AVOID_LOGGING_SECRETS", "AUDIT_TRAIL", "LOG_API_CALLS", "LOG_APPLICATION_MESSAGES", "ERROR_LOGS"]
+    results = [
+        validator._get_improved_relevant_files(metadata, file_type="Source Code", gate_name=gate_name, config=config, relevance_index=index)
+        for gate_name in logging_gates
+    ]
+
+    assert all(result is results[0] for result in results)
+    stats = index.get_stats()
+    assert stats["subsets"] == 1, f"Expected 1 subset, got {stats['subsets']}"
+    assert stats["hits"] == len(logging_gates) - 1
+    assert stats["misses"] == 1
+
+    # Different thresholds must not reuse the cached subset
+    strict_config = dict(config, language_threshold_percent=90.0)
+    validator._get_improved_relevant_files(metadata, file_type="Source Code", gate_name="STRUCTURED_LOGS", config=strict_config, relevance_index=index)
+    assert index.get_stats()["subsets"] == 2
+
+    print(f"   ✅ {stats['hits']} of {stats['hits'] + stats['misses']} lookups served from index")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Testing File Relevance Index")
+    print("=" * 60)
+
+    try:
+        test_indexed_selection_matches_unindexed()
+        test_gates_served_from_index()
+
+        print("\n" + "=" * 60)
+        print("✅ All relevance index tests passed!")
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
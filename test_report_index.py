@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Test script for the report index
+Verifies filtered and paginated gate and match queries against a brute-force filter,
+field selection and that scans write the index next to their reports
+"""
+
+import sys
+import random
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent))
+
+from gates.utils.report_index import ReportIndex, write_report_index
+from benchmarks.synthetic_repo import ensure_repository
+from benchmarks.benchmark_flow import build_shared, stub_external_services
+from gates.flow import create_validation_flow
+
+
+LANGUAGES = {".java": "Java", ".py": "Python", ".ts": "TypeScript"}
+
+
+def _gate_results(seed=7):
+    rng = random.Random(seed)
+    gate_results = []
+    for g, status in enumerate(["PASS", "FAIL", "WARNING", "FAIL", "NOT_APPLICABLE", "PASS"]):
+        matches = []
+        for _ in range(0 if status == "NOT_APPLICABLE" else rng.randint(1, 400)):
+            extension = rng.choice(list(LANGUAGES))
+            matches.append({
+                "file": f"src/{rng.choice(['api', 'core', 'web'])}/module{rng.randint(0, 30)}{extension}",
+                "line": rng.randint(1, 500),
+                "pattern": f"pattern_{g}_{rng.randint(0, 5)}",
+                "match": f"log(\"event {rng.randint(0, 10000)}\")",
+                "language": LANGUAGES[extension],
+                "source": rng.choice(["LLM", "Static"])
+            })
+        gate_results.append({
+            "gate": f"GATE_{g}", "display_name": f"Gate {g}", "status": status, "score": float(g * 10),
+            "category": "logging" if g % 2 else "reliability", "priority": "high", "description": "",
+            "matches_found": len(matches), "matches": matches, "details": [], "recommendations": [f"Fix gate {g}"]
+        })
+    return gate_results
+
+
+def _expected(gate_results, **filters):
+    rows = []
+    for gate_result in gate_results:
+        if filters.get("gate") and gate_result["gate"] != filters["gate"]:
+            continue
+        if filters.get("status") and gate_result["status"] not in filters["status"].split(","):
+            continue
+        for match in gate_result["matches"]:
+            if filters.get("file") and not (match["file"] == filters["file"] or
+                                            (filters["file"].endswith("/") and match["file"].startswith(filters["file"]))):
+                continue
+            if filters.get("language") and match["language"] != filters["language"]:
+                continue
+            if filters.get("source") and match["source"].lower() != filters["source"].lower():
+                continue
+            rows.append({"gate": gate_result["gate"], **{k: match[k] for k in ["file", "line", "pattern", "language", "source", "match"]}})
+    return rows
+
+
+def test_gate_queries():
+    """Gates filter by status and category, paginate and select fields"""
+    print("\n🔍 Testing gate queries...")
+    work_dir = tempfile.mkdtemp(prefix="report_index_test_")
+    try:
+        gate_results = _gate_results()
+        index = ReportIndex.load(write_report_index(work_dir, "scan", gate_results, 41.5))
+
+        page = index.query_gates(status="FAIL,WARNING")
+        assert page["total"] == 3 and [g["gate"] for g in page["items"]] == ["GATE_1", "GATE_2", "GATE_3"]
+        page = index.query_gates(category="logging", offset=1, limit=1, fields="gate,score")
+        assert page["total"] == 3 and page["items"] == [{"gate": "GATE_3", "score": 30.0}], f"Unexpected page: {page}"
+        assert "matches" not in index.query_gates()["items"][0], "Gate summaries must not carry matches"
+        assert ReportIndex.load(str(Path(work_dir) / "codegates_report_scan.index.json")) is index, "Unchanged index should be cached"
+        print(f"   ✅ {len(gate_results)} gates queried by status, category and fields")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def test_match_queries():
+    """Every filter combination pages through exactly the brute-force result"""
+    print("\n🔍 Testing match queries...")
+    work_dir = tempfile.mkdtemp(prefix="report_index_test_")
+    try:
+        gate_results = _gate_results()
+        index = ReportIndex.load(write_report_index(work_dir, "scan", gate_results))
+        some_file = gate_results[1]["matches"][0]["file"]
+
+        cases = [
+            {}, {"gate": "GATE_2"}, {"status": "FAIL"}, {"file": some_file}, {"file": "src/api/"},
+            {"language": "Python"}, {"source": "llm", "status": "PASS"}, {"source": "static"}, {"source": "Static"},
+            {"file": "src/web/", "language": "Java"},
+            {"gate": "GATE_4"}, {"file": "missing.py"}
+        ]
+        for filters in cases:
+            expected = _expected(gate_results, **filters)
+            for offset, limit in [(0, 50), (37, 120), (len(expected) - 5, 50), (len(expected) + 10, 10)]:
+                page = index.query_matches(offset=max(offset, 0), limit=limit, **filters)
+                assert page["total"] == len(expected), f"{filters}: total {page['total']} != {len(expected)}"
+                assert page["items"] == expected[max(offset, 0):max(offset, 0) + limit], f"{filters} offset {offset}: wrong page"
+
+        page = index.query_matches(gate="GATE_1", limit=2, fields="file,line")
+        assert all(set(item) == {"file", "line"} for item in page["items"])
+        assert index.query_matches(limit=100000)["limit"] == 1000, "Page size must be capped"
+        print(f"   ✅ {len(cases)} filter combinations x 4 pages match the brute-force result")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def test_scan_writes_index():
+    """A scan writes the index and its match counts agree with the gate results"""
+    print("\n🔍 Testing scan report index...")
+    work_dir = tempfile.mkdtemp(prefix="report_index_test_")
+    try:
+        repo_path = ensure_repository(work_dir, "java-spring", 60, seed=31)
+        shared = build_shared(repo_path, tempfile.mkdtemp(dir=work_dir))
+        # CleanupNode removes temp_dir, keep the reports outside it
+        shared["request"]["output_dir"] = str(Path(work_dir) / "reports")
+        with stub_external_services(repo_path, llm_latency=0.0):
+            create_validation_flow().run(shared)
+
+        index_path = shared["reports"]["index_path"]
+        assert index_path and Path(index_path).parent == Path(shared["request"]["output_dir"])
+        index = ReportIndex.load(index_path)
+        gate_results = shared["validation"]["gate_results"]
+        assert index.query_gates(limit=1000)["total"] == len(gate_results)
+        total = index.query_matches()["total"]
+        assert total == sum(g["matches_found"] for g in gate_results), "Indexed matches must equal the gate match counts"
+        print(f"   ✅ {len(gate_results)} gates and {total} matches indexed")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Testing Report Index")
+    print("=" * 60)
+
+    try:
+        test_gate_queries()
+        test_match_queries()
+        test_scan_writes_index()
+
+        print("\n" + "=" * 60)
+        print("✅ All report index tests passed!")
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
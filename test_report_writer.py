@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Test script for the streamed JSON report writer
+Verifies that compact, pretty and NDJSON reports (gzipped or not) load back identically,
+that interned match rows expand to the original matches and that scans honour the report options
+"""
+
+import sys
+import json
+import time
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent))
+
+from gates.utils.report_writer import (
+    StringTables, encode_gate_matches, expand_gate_matches, write_json_report, read_json_report,
+    get_report_options, get_report_filename
+)
+from benchmarks.synthetic_repo import ensure_repository
+from benchmarks.benchmark_flow import build_shared, stub_external_services
+from gates.flow import create_validation_flow
+
+
+def _synthetic_matches(gate_index, count):
+    return [
+        {
+            "file": f"src/main/java/com/acme/service/module{i % 400}/Service{i % 40}.java",
+            "pattern": f"(?i)logger\\.(info|debug|warn)\\(.*gate{gate_index}",
+            "match": f"logger.info(\"processed order {i}\")",
+            "line": i % 900 + 1,
+            "language": "Java",
+            "source": "static" if i % 3 else "llm"
+        }
+        for i in range(count)
+    ]
+
+
+def test_formats_round_trip():
+    """Every format loads back to the same report and match rows expand to the original matches"""
+    print("\n🔍 Testing report formats...")
+    work_dir = tempfile.mkdtemp(prefix="report_writer_test_")
+    try:
+        header = {"report_metadata": {"scan_id": "test"}, "overall_score": 42.0, "report_detail": "match"}
+        matches = {gate: _synthetic_matches(gate, 20000) for gate in range(3)}
+
+        def gates(tables):
+            for gate, gate_matches in matches.items():
+                yield {"name": f"GATE_{gate}", "matches_found": len(gate_matches), **encode_gate_matches(gate_matches, "match", tables)}
+
+        loaded, sizes = {}, {}
+        for json_format in ("compact", "pretty", "ndjson"):
+            for compress in (False, True):
+                name = get_report_filename(f"{json_format}", {"json_format": json_format, "gzip": compress})
+                path = Path(work_dir) / name
+                tables = StringTables()
+                start = time.perf_counter()
+                written = write_json_report(str(path), header, gates(tables), tables=tables, json_format=json_format, compress=compress)
+                elapsed = time.perf_counter() - start
+                assert written["gates"] == 3 and written["bytes"] == path.stat().st_size
+                loaded[name] = read_json_report(str(path))
+                sizes[name] = written["bytes"]
+                print(f"   📄 {name}: {written['bytes'] / 1024:.0f}KB in {elapsed:.2f}s")
+
+        reference = loaded["codegates_report_compact.json"]
+        for name, report in loaded.items():
+            assert report == reference, f"{name} does not load back like the compact report"
+        assert reference["overall_score"] == 42.0 and len(reference["gates"]) == 3
+
+        for gate, gate_matches in matches.items():
+            expanded = expand_gate_matches(reference["gates"][gate], reference["string_tables"])
+            assert expanded == gate_matches, f"Gate {gate} matches do not round trip"
+
+        # The pre-streaming writer: full match dicts, indent=2
+        legacy_size = len(json.dumps({**header, "gates": [{"name": f"GATE_{g}", "matches": m} for g, m in matches.items()]}, indent=2).encode())
+        assert sizes["codegates_report_compact.json"] < legacy_size / 2, "Interned compact report should be under half the size of full match dicts"
+        assert sizes["codegates_report_compact.json"] < sizes["codegates_report_pretty.json"]
+        assert sizes["codegates_report_compact.json.gz"] < sizes["codegates_report_compact.json"] / 3
+        print(f"   ✅ All formats identical, compact {sizes['codegates_report_compact.json'] / 1024:.0f}KB vs {legacy_size / 1024:.0f}KB of match dicts")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def test_detail_levels():
+    """Per-file rows count matches per file; summary adds nothing; strings are interned once"""
+    print("\n🔍 Testing detail levels...")
+    tables = StringTables()
+    gate_matches = _synthetic_matches(0, 1000)
+
+    assert encode_gate_matches(gate_matches, "summary", tables) == {}
+    files = encode_gate_matches(gate_matches, "file", tables)["match_files"]
+    assert len(files) == 400 and sum(row[1] for row in files) == 1000
+    assert len(tables.tables["files"]) == 400 and tables.take_new() == {"files": tables.tables["files"]}
+    assert tables.take_new() == {}, "Already emitted entries must not be emitted again"
+
+    per_file = expand_gate_matches({"match_files": files}, tables.tables)
+    first = min(m["line"] for m in gate_matches if m["file"] == per_file[0]["file"])
+    assert per_file[0]["first_line"] == first
+    print(f"   ✅ {len(files)} file rows for {len(gate_matches)} matches")
+
+
+def test_scan_report_options():
+    """A scan writes the report in the requested format and detail"""
+    print("\n🔍 Testing scan report options...")
+    work_dir = tempfile.mkdtemp(prefix="report_writer_test_")
+    try:
+        repo_path = ensure_repository(work_dir, "java-spring", 60, seed=21)
+        runs = {}
+        for options in ({}, {"report_detail": "match", "report_json_format": "ndjson", "report_gzip": True}):
+            shared = build_shared(repo_path, tempfile.mkdtemp(dir=work_dir))
+            # CleanupNode removes temp_dir, keep the reports outside it
+            shared["request"]["output_dir"] = str(Path(work_dir) / f"reports-{len(runs)}")
+            shared["request"]["report_format"] = "json"
+            shared["request"].update(options)
+            with stub_external_services(repo_path, llm_latency=0.0):
+                create_validation_flow().run(shared)
+            runs[bool(options)] = (shared["reports"]["json_path"], read_json_report(shared["reports"]["json_path"]))
+
+        default_path, default_report = runs[False]
+        assert default_path.endswith(".json") and default_report["report_detail"] == "summary"
+        assert all("match_rows" not in gate for gate in default_report["gates"])
+
+        path, report = runs[True]
+        assert path.endswith(".ndjson.gz") and report["report_detail"] == "match"
+        assert report["match_columns"][0] == "file"
+        matched = [gate for gate in report["gates"] if gate["matches_found"]]
+        assert matched, "Synthetic repository should match some gates"
+        for gate in report["gates"]:
+            assert len(gate.get("match_rows", [])) == gate["matches_found"], f"{gate['name']}: match rows do not match the count"
+        assert report["overall_score"] == default_report["overall_score"]
+        print(f"   ✅ {sum(g['matches_found'] for g in matched)} matches over {len(matched)} gates in {Path(path).name}")
+
+        assert get_report_options({"report_detail": "everything"})["detail"] == "summary", "Unknown detail falls back to summary"
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Testing Report Writer")
+    print("=" * 60)
+
+    try:
+        test_formats_round_trip()
+        test_detail_levels()
+        test_scan_report_options()
+
+        print("\n" + "=" * 60)
+        print("✅ All report writer tests passed!")
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
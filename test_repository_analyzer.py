@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Test script for the repository analyzer
+Verifies that one walk builds the scanner metadata and every extractor view, that each
+file is read at most once whatever the number of extractors, and that the processor and
+meta summaries are built on the same walk without dropping files whose names contain an ignored one
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent))
+
+from gates.utils.file_scanner import scan_directory
+from gates.utils.local_source import LocalFileSource
+from gates.utils.repository_analyzer import (analyze_repository, StructureExtractor, LineTotalsExtractor,
+                                             DependencyExtractor)
+import meta
+import processor
+
+
+def _create_repository(work_dir):
+    repo = Path(work_dir) / "repo"
+    files = {
+        "pom.xml": "<project><dependencies><dependency><groupId>org.slf4j</groupId>"
+                   "<artifactId>slf4j-api</artifactId></dependency></dependencies></project>\n",
+        "package.json": json.dumps({"dependencies": {"express": "4.18.2"}}),
+        "requirements.txt": "requests==2.31.0\n# comment\nflask>=2.0\n",
+        "src/main/App.java": "class App {\n\n    void run() {}\n}\n",
+        "src/main/web/index.html": "<html></html>\n",
+        "src/test/AppTest.java": "class AppTest {\n}\n",
+        "node_modules/left-pad/index.js": "module.exports = 1;\n",
+        ".git/config": "[core]\n",
+    }
+    for relative_path, content in files.items():
+        (repo / relative_path).parent.mkdir(parents=True, exist_ok=True)
+        (repo / relative_path).write_text(content)
+    return str(repo)
+
+
+class _WalkCounter:
+    """Counts os.walk calls while active"""
+
+    def __enter__(self):
+        self.calls = 0
+        self._walk = os.walk
+
+        def walk(*args, **kwargs):
+            self.calls += 1
+            return self._walk(*args, **kwargs)
+
+        os.walk = walk
+        return self
+
+    def __exit__(self, *exc):
+        os.walk = self._walk
+
+
+def test_single_walk():
+    """All views come from one walk that reads each file once and matches scan_directory"""
+    print("\n🔍 Testing single walk...")
+    # Keep "test" out of the path, it would classify every file as test code
+    work_dir = tempfile.mkdtemp(prefix="repository_analyzer_")
+    try:
+        repo = _create_repository(work_dir)
+        parsers = {"requirements.txt": lambda path, read_text: [line.split("==")[0] for line in read_text().splitlines()
+                                                                if line and not line.startswith("#")]}
+        extractors = [StructureExtractor(), LineTotalsExtractor(), DependencyExtractor(parsers),
+                      meta.SummaryExtractor(), processor.CodebaseExtractor(processor.DEFAULT_CONFIG)]
+
+        with _WalkCounter() as walks:
+            analysis = analyze_repository(repo, extractors)
+        assert walks.calls == 1, f"{walks.calls} walks"
+        assert analysis["metadata"] == scan_directory(repo), "The metadata is the plain scan's"
+        assert set(analysis) == {"metadata", "structure", "line_totals", "dependencies", "summary", "codebase"}
+
+        source = LocalFileSource(repo)
+        analyze_repository(repo, [LineTotalsExtractor(), DependencyExtractor(parsers), meta.SummaryExtractor()],
+                           source=source)
+        assert source.file_reads == analysis["metadata"]["total_files"], "Each file is read once"
+
+        try:
+            analyze_repository(repo, [LineTotalsExtractor(), LineTotalsExtractor()])
+            raise AssertionError("Duplicate extractor names are rejected")
+        except ValueError:
+            pass
+        print(f"   ✅ {walks.calls} walk, {source.file_reads} reads for {len(extractors)} extractors")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def test_views():
+    """Structure, line totals and dependencies views"""
+    print("\n🔍 Testing built-in views...")
+    work_dir = tempfile.mkdtemp(prefix="repository_analyzer_")
+    try:
+        repo = _create_repository(work_dir)
+        analysis = analyze_repository(repo, [StructureExtractor(), LineTotalsExtractor(), DependencyExtractor(
+            {".xml": lambda path, read_text: ["xml"] if "<project>" in read_text() else []})])
+
+        structure = analysis["structure"]
+        assert list(structure) == ["_files", "src"] and structure["_files"] == ["package.json", "pom.xml", "requirements.txt"]
+        assert structure["src"]["main"]["_files"] == ["App.java"] and "node_modules" not in structure and ".git" not in structure
+
+        assert analysis["line_totals"] == {"source_files": 1, "source_lines": 3, "test_files": 1, "test_lines": 2}
+
+        dependencies = analysis["dependencies"]
+        assert [m["relative_path"] for m in dependencies["manifests"]] == ["pom.xml"], dependencies
+        assert dependencies["dependency_counts"] == {"xml": 1}
+        print(f"   ✅ {analysis['metadata']['total_files']} files, {analysis['line_totals']}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def test_summaries():
+    """The processor and meta summaries keep their shapes on the shared walk"""
+    print("\n🔍 Testing processor and meta summaries...")
+    work_dir = tempfile.mkdtemp(prefix="repository_analyzer_")
+    try:
+        repo = _create_repository(work_dir)
+
+        codebase = processor.scan_codebase(repo, processor.DEFAULT_CONFIG)
+        libraries = codebase["concise_prompt_data"]["all_detected_libraries"]
+        assert "org.slf4j:slf4j-api" in libraries and "express@4.18.2" in libraries and "requests==2.31.0" in libraries
+        assert codebase["codebase_summary"]["total_files"] == 6 and codebase["codebase_summary"]["total_directories"] == 5
+        assert codebase["file_structure"]["src"]["test"]["_files"] == ["AppTest.java"]
+        assert {entry["file_type"] for entry in codebase["build_and_config_analysis"]}
+
+        summary = meta.analyze_repository(repo)
+        assert summary["total_source_files"] == 1 and summary["total_test_lines"] == 2, summary
+        assert summary["libraries_detected"]["java"] == ["org.slf4j:slf4j-api"]
+        assert summary["libraries_detected"]["python"] == ["requests"]
+        assert summary["libraries_detected"]["nodejs"] == ["express"]
+        assert not any(".git" in path or "node_modules" in path for paths in summary["file_structure"].values() for path in paths)
+        print(f"   ✅ {len(libraries)} processor libraries, meta languages {summary['languages_detected']}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def test_ignore_rules():
+    """Ignored names match whole path components below the root, not substrings of the absolute path"""
+    print("\n🔍 Testing ignore rules...")
+    work_dir = tempfile.mkdtemp(prefix="repository_analyzer_")
+    try:
+        # A repository checked out under an output/ directory
+        repo = Path(work_dir) / "output" / "repo"
+        files = {
+            "src/Layout.java": "class Layout {\n}\n",
+            "src/checkout/Cart.java": "class Cart {\n}\n",
+            "catalog.py": "ITEMS = []\n",
+            "build.sh": "echo build\n",
+            ".gitignore": "target/\n",
+            "target/App.class": "",
+            "build/generated.java": "class Generated {}\n",
+            "app.log": "started\n",
+        }
+        for relative_path, content in files.items():
+            (repo / relative_path).parent.mkdir(parents=True, exist_ok=True)
+            (repo / relative_path).write_text(content)
+
+        expected = {"src/Layout.java", "src/checkout/Cart.java", "catalog.py", "build.sh", ".gitignore"}
+        metadata = scan_directory(str(repo))
+        assert {Path(f["relative_path"]).as_posix() for f in metadata["file_list"]} == expected, metadata["file_list"]
+
+        summary = meta.analyze_repository(str(repo))
+        assert summary["total_source_files"] == 3, summary
+        assert sorted(summary["file_structure"]["source"]) == ["catalog.py", "src/Layout.java", "src/checkout/Cart.java"]
+
+        codebase = processor.scan_codebase(str(repo), processor.DEFAULT_CONFIG)
+        assert codebase["codebase_summary"]["total_files"] == 5, codebase["codebase_summary"]
+        assert codebase["file_structure"]["src"]["checkout"]["_files"] == ["Cart.java"]
+        print(f"   ✅ {len(expected)} files kept under {repo.parent.name}/, build output and logs skipped")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Testing Repository Analyzer")
+    print("=" * 60)
+
+    try:
+        test_single_walk()
+        test_views()
+        test_summaries()
+        test_ignore_rules()
+
+        print("\n" + "=" * 60)
+        print("✅ All repository analyzer tests passed!")
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Test script for the scan daemon
+Verifies the JSON-RPC protocol and its errors, that scans stream progress and keep the LLM
+client and file contents warm between scans, that edited files are read again and that
+scans write nothing to the working directory
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent))
+
+from gates.utils.local_source import LocalFileCache
+from gates.utils.scan_daemon import ScanDaemon, serve_stdio, PARSE_ERROR, INVALID_REQUEST, METHOD_NOT_FOUND, INVALID_PARAMS
+from benchmarks.synthetic_repo import ensure_repository
+from benchmarks.benchmark_flow import stub_external_services
+from gates.flow import create_validation_flow
+
+
+def test_file_cache():
+    """Entries are served while size and mtime match, and evicted least recently used first"""
+    print("\n🔍 Testing warm file cache...")
+    cache = LocalFileCache(10)
+    cache.put("/a", 4, 1, b"aaaa")
+    cache.put("/b", 4, 1, b"bbbb")
+    assert cache.get("/a", 4, 1) == b"aaaa"
+    assert cache.get("/a", 4, 2) is None, "A changed mtime is a miss"
+    cache.put("/c", 4, 1, b"cccc")
+    assert cache.get("/b", 4, 1) is None and cache.get("/a", 4, 1) == b"aaaa", "The least recently used entry goes first"
+    cache.put("/big", 11, 1, b"x" * 11)
+    stats = cache.get_stats()
+    assert stats["entries"] == 2 and stats["current_bytes"] == 8 and stats["evictions"] == 1, stats
+    print(f"   ✅ {stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} eviction")
+
+
+def _rpc(daemon, *messages):
+    """Serve a sequence of requests, return the responses by id and the notifications"""
+    reader = io.StringIO("".join((m if isinstance(m, str) else json.dumps(m)) + "\n" for m in messages))
+    writer = io.StringIO()
+    daemon.serve(reader, writer)
+    responses, notifications = {}, []
+    for line in writer.getvalue().splitlines():
+        message = json.loads(line)
+        if "method" in message:
+            notifications.append(message)
+        else:
+            responses[message["id"]] = message
+    return responses, notifications
+
+
+def test_protocol():
+    """Malformed, unknown and invalid requests get JSON-RPC errors, notifications get no response"""
+    print("\n🔍 Testing protocol errors...")
+    daemon = ScanDaemon(create_validation_flow, file_cache_bytes=0)
+    writer = io.StringIO()
+    daemon.serve(io.StringIO("{not json\n[]\n"), writer)
+    codes = [json.loads(line)["error"]["code"] for line in writer.getvalue().splitlines()]
+    assert codes == [PARSE_ERROR, INVALID_REQUEST], codes
+
+    responses, _ = _rpc(daemon,
+                        {"jsonrpc": "2.0", "id": 1, "method": "initialize"},
+                        {"jsonrpc": "2.0", "id": 2, "method": "compile"},
+                        {"jsonrpc": "2.0", "id": 3, "method": "scan", "params": {}},
+                        {"jsonrpc": "2.0", "id": 4, "method": "scan", "params": {"path": "/nonexistent/workspace"}},
+                        {"jsonrpc": "2.0", "method": "stats"},
+                        {"jsonrpc": "2.0", "id": 5, "method": "shutdown"},
+                        {"jsonrpc": "2.0", "id": 6, "method": "stats"})
+    assert responses[1]["result"]["pid"] == os.getpid() and responses[1]["result"]["capabilities"]["static_patterns"] > 0
+    assert responses[2]["error"]["code"] == METHOD_NOT_FOUND
+    assert responses[3]["error"]["code"] == INVALID_PARAMS and responses[4]["error"]["code"] == INVALID_PARAMS
+    assert sorted(responses) == [1, 2, 3, 4, 5], "No response to notifications or after shutdown"
+    assert not daemon.running and daemon.scans == 0
+    print(f"   ✅ {len(responses)} responses, errors {PARSE_ERROR}, {INVALID_REQUEST}, {METHOD_NOT_FOUND}, {INVALID_PARAMS}")
+
+
+def test_warm_scans():
+    """Repeated scans reuse the LLM client and unchanged files, stream progress and see edits"""
+    print("\n🔍 Testing repeated scans...")
+    # Keep "test" out of the path, it would classify every synthetic file as test code
+    work_dir = tempfile.mkdtemp(prefix="scan_daemon_")
+    previous_cwd = os.getcwd()
+    try:
+        repo_path = ensure_repository(work_dir, "java-spring", 200, seed=97)
+        daemon = ScanDaemon(create_validation_flow, output_dir=str(Path(work_dir) / "reports"))
+        # Run from an empty directory, as an editor would from the user's workspace
+        cwd = Path(work_dir) / "cwd"
+        cwd.mkdir()
+        os.chdir(cwd)
+        scan = {"jsonrpc": "2.0", "method": "scan", "params": {"path": repo_path}}
+
+        with stub_external_services(repo_path, llm_latency=0.0):
+            start = time.perf_counter()
+            first, progress = _rpc(daemon, {**scan, "id": 1})
+            first_seconds = time.perf_counter() - start
+            cold_reads = daemon.file_cache.get_stats()["misses"]
+
+            start = time.perf_counter()
+            second, _ = _rpc(daemon, {**scan, "id": 2}, {"jsonrpc": "2.0", "id": 3, "method": "stats"})
+            second_seconds = time.perf_counter() - start
+
+            # An edited file is read again, the rest still comes from memory
+            java_file = next(Path(repo_path).rglob("*.java"))
+            java_file.write_text(java_file.read_text() + "\n// edited\n")
+            third, _ = _rpc(daemon, {**scan, "id": 4})
+        os.chdir(previous_cwd)
+
+        result = first[1]["result"]
+        assert result["status"] == "completed" and result["gate_scores"], first[1]
+        gate = result["gate_scores"][0]
+        assert {"gate", "expected", "found", "coverage", "score", "details", "recommendations", "issues"} <= set(gate)
+        assert result["languages"] and result["project_name"] == Path(repo_path).name
+
+        steps = [(n["params"]["node"], n["params"]["state"]) for n in progress if n["method"] == "progress"]
+        assert steps[0] == ("FetchRepositoryNode", "started") and steps[-1] == ("CleanupNode", "finished"), steps
+        assert [n["params"]["percentage"] for n in progress if n["method"] == "progress"][-1] == 100
+
+        assert [g["score"] for g in second[2]["result"]["gate_scores"]] == [g["score"] for g in result["gate_scores"]]
+        stats = second[3]["result"]
+        assert stats["scans"] == 2 and stats["batch_cache"]["llm_client_reuses"] == 1, stats
+        assert stats["file_cache"]["hits"] >= cold_reads > 0, stats["file_cache"]
+        assert Path(repo_path).exists(), "Local scans leave the workspace alone"
+
+        assert not list(cwd.iterdir()), f"Scans wrote to the working directory: {list(cwd.iterdir())}"
+        logs = [path.name for path in (Path(work_dir) / "reports" / "logs").iterdir()]
+        assert any(name.startswith("prompt_") for name in logs) and any(name.startswith("llm_response_") for name in logs), logs
+
+        after_edit = daemon.file_cache.get_stats()
+        assert third[4]["result"]["status"] == "completed"
+        assert after_edit["misses"] - stats["file_cache"]["misses"] == 1, "Only the edited file is read from disk"
+        print(f"   ✅ first scan {first_seconds:.2f}s, second {second_seconds:.2f}s with {stats['file_cache']['hits']} "
+              f"cached reads; {len(steps)} progress events; one re-read after an edit")
+    finally:
+        os.chdir(previous_cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def test_stdio():
+    """On stdio, stdout carries only protocol messages"""
+    print("\n🔍 Testing stdio transport...")
+    work_dir = tempfile.mkdtemp(prefix="scan_daemon_")
+    previous_stdin, previous_stdout = sys.stdin, sys.stdout
+    try:
+        repo_path = ensure_repository(work_dir, "java-spring", 50, seed=98)
+        daemon = ScanDaemon(create_validation_flow, request_options={"quiet": False},
+                            output_dir=str(Path(work_dir) / "reports"))
+        requests = [{"jsonrpc": "2.0", "id": 1, "method": "scan", "params": {"path": repo_path}},
+                    {"jsonrpc": "2.0", "id": 2, "method": "shutdown"}]
+        sys.stdin = io.StringIO("".join(json.dumps(r) + "\n" for r in requests))
+        sys.stdout = protocol = io.StringIO()
+        with stub_external_services(repo_path, llm_latency=0.0):
+            serve_stdio(daemon)
+        sys.stdin, sys.stdout = previous_stdin, previous_stdout
+
+        messages = [json.loads(line) for line in protocol.getvalue().splitlines()]
+        assert messages[-1] == {"jsonrpc": "2.0", "id": 2, "result": None}
+        assert next(m for m in messages if m.get("id") == 1)["result"]["status"] == "completed"
+        print(f"   ✅ {len(messages)} protocol lines on stdout, scan output on stderr")
+    finally:
+        sys.stdin, sys.stdout = previous_stdin, previous_stdout
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Testing Scan Daemon")
+    print("=" * 60)
+
+    try:
+        test_file_cache()
+        test_protocol()
+        test_warm_scans()
+        test_stdio()
+
+        print("\n" + "=" * 60)
+        print("✅ All scan daemon tests passed!")
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
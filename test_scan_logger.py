@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test script for the scan logger
+Verifies levels, rate limiting with per-node counters, quiet mode and JSON-lines output from the flow
+"""
+
+import io
+import sys
+import json
+import shutil
+import tempfile
+import contextlib
+from pathlib import Path
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent))
+
+from gates.utils.scan_logger import ScanLogger
+from benchmarks.synthetic_repo import ensure_repository
+from benchmarks.benchmark_flow import build_shared, stub_external_services
+from gates.flow import create_validation_flow
+
+
+def capture(func):
+    """Run func and return the lines it printed"""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        func()
+    return buffer.getvalue().splitlines()
+
+
+def test_levels_and_rate_limit():
+    """Per-item messages are printed up to the burst, counted always and summarized per node"""
+    print("\n🔍 Testing levels and rate limiting...")
+    logger = ScanLogger(level="info", log_format="text", quiet=False, burst=5, rate=0.0)
+
+    def run():
+        logger.start_node("ValidateGatesNode")
+        logger.debug("hidden debug line")
+        logger.info("visible info line")
+        for i in range(1000):
+            logger.item("warning", "file_too_large", f"skipping file {i}")
+        counters = logger.end_node("ValidateGatesNode")
+        run.counters = counters
+
+    lines = capture(run)
+    assert "hidden debug line" not in lines
+    assert "visible info line" in lines
+    item_lines = [line for line in lines if line.startswith("skipping file")]
+    assert len(item_lines) == 5, f"Expected 5 lines within the burst, got {len(item_lines)}"
+    assert any("995 more 'file_too_large' messages suppressed" in line for line in lines), lines
+    assert run.counters["events"]["file_too_large"] == 1000
+    assert run.counters["suppressed"]["file_too_large"] == 995
+    print(f"   ✅ 1000 per-file messages -> {len(lines)} lines, all 1000 counted")
+
+    # A new node run gets a fresh burst
+    lines = capture(lambda: (logger.start_node("ProcessCodebaseNode"), logger.item("warning", "file_too_large", "again"), logger.end_node("ProcessCodebaseNode")))
+    assert lines == ["again"], lines
+    print("   ✅ Rate limits reset per node")
+
+
+def test_quiet_mode():
+    """Quiet mode prints warnings and errors only and never per-item messages"""
+    print("\n🔍 Testing quiet mode...")
+    logger = ScanLogger(log_format="text", quiet=True)
+
+    def run():
+        logger.start_node("ValidateGatesNode")
+        logger.info("progress")
+        logger.warning("something odd")
+        logger.item("warning", "file_read_error", "per-file warning")
+        run.counters = logger.end_node("ValidateGatesNode")
+
+    lines = capture(run)
+    assert "progress" not in lines and "per-file warning" not in lines
+    assert "something odd" in lines
+    assert lines == ["something odd"], lines
+    assert run.counters["events"]["file_read_error"] == 1, "Quiet mode still counts events"
+    print(f"   ✅ Quiet mode printed {len(lines)} lines")
+
+
+def test_flow_json_lines():
+    """A flow run in JSON mode prints only JSON lines and records log counters per node"""
+    print("\n🔍 Testing JSON-lines output from the flow...")
+    work_dir = tempfile.mkdtemp(prefix="scan_logger_test_")
+    try:
+        repo_path = ensure_repository(work_dir, "python", 60, seed=9)
+        shared = build_shared(repo_path, tempfile.mkdtemp(dir=work_dir))
+        shared["request"]["log_format"] = "json"
+
+        def run():
+            with stub_external_services(repo_path, llm_latency=0.0):
+                create_validation_flow().run(shared)
+
+        lines = capture(run)
+        records = [json.loads(line) for line in lines]
+        assert records, "Flow produced no log records"
+        for record in records:
+            for key in ["ts", "level", "scan_id", "node", "event", "message"]:
+                assert key in record, f"Missing {key} in {record}"
+            assert record["scan_id"] == shared["request"]["scan_id"]
+        nodes = {record["node"] for record in records}
+        assert "ValidateGatesNode" in nodes and "ProcessCodebaseNode" in nodes, nodes
+
+        validate_metrics = shared["metrics"]["nodes"]["ValidateGatesNode"]
+        gates_validated = validate_metrics["log_events"].get("gate_validated", 0) + validate_metrics["log_events"].get("gate_not_applicable", 0)
+        assert gates_validated == len(shared["validation"]["gate_results"]), validate_metrics["log_events"]
+        print(f"   ✅ {len(records)} JSON records from {len(nodes)} nodes")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Testing Scan Logger")
+    print("=" * 60)
+
+    try:
+        test_levels_and_rate_limit()
+        test_quiet_mode()
+        test_flow_json_lines()
+
+        print("\n" + "=" * 60)
+        print("✅ All scan logger tests passed!")
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Test script for the pipelined stage scheduler
+Verifies that network and CPU stages of different scans overlap, stage limits and
+node order hold, failures are isolated (including in the finish callback) and
+admission is bounded
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent))
+
+from pocketflow import Flow
+from gates.utils.instrumentation import InstrumentedNode
+from gates.utils.batch_runner import StageLimiter
+from gates.utils.stage_scheduler import PipelineScheduler
+
+
+CPU_ACTIVE = {"now": 0, "peak": 0}
+CPU_LOCK = threading.Lock()
+
+
+class CloneNode(InstrumentedNode):
+    stage = "clone"
+
+    def exec(self, prep_res):
+        time.sleep(0.1)
+
+    def post(self, shared, prep_res, exec_res):
+        shared["steps"].append("clone")
+        return "default"
+
+
+class MatchNode(InstrumentedNode):
+    stage = "scan"
+
+    def exec(self, prep_res):
+        with CPU_LOCK:
+            CPU_ACTIVE["now"] += 1
+            CPU_ACTIVE["peak"] = max(CPU_ACTIVE["peak"], CPU_ACTIVE["now"])
+        end = time.perf_counter() + 0.03
+        while time.perf_counter() < end:
+            sum(range(500))
+        with CPU_LOCK:
+            CPU_ACTIVE["now"] -= 1
+
+    def post(self, shared, prep_res, exec_res):
+        if shared.get("fail"):
+            raise RuntimeError("broken repository")
+        shared["steps"].append("match")
+        return "default"
+
+
+class AskLLMNode(InstrumentedNode):
+    stage = "llm"
+
+    def exec(self, prep_res):
+        time.sleep(0.2)
+
+    def post(self, shared, prep_res, exec_res):
+        shared["steps"].append("llm")
+        return "default"
+
+
+class ReportNode(MatchNode):
+    def post(self, shared, prep_res, exec_res):
+        shared["steps"].append("report")
+        return "default"
+
+
+def create_flow():
+    clone, match, llm, report = CloneNode(), MatchNode(), AskLLMNode(), ReportNode()
+    clone >> match
+    match >> llm
+    llm >> report
+    return Flow(start=clone)
+
+
+def run_pipeline(count, max_in_flight=None, failing=(), failing_finish=()):
+    limiter = StageLimiter({"clone": 2, "scan": 1, "llm": 2})
+    scheduler = PipelineScheduler(network_workers=4, cpu_workers=1, max_in_flight=max_in_flight, limiter=limiter)
+    finished = {}
+
+    def start(index):
+        return create_flow(), {"steps": [], "fail": index in failing}
+
+    def finish(index, shared, error):
+        finished[index] = (shared, error)
+        if index in failing_finish:
+            raise RuntimeError("report upload failed")
+
+    start_time = time.perf_counter()
+    scheduler.run(range(count), start, finish)
+    return finished, time.perf_counter() - start_time, scheduler.get_stats(), limiter.get_stats()
+
+
+def test_pipeline_overlaps_stages():
+    """Scans overlap across pools while each scan keeps its node order"""
+    print("\n🔍 Testing pipelined execution...")
+    CPU_ACTIVE["peak"] = 0
+
+    serial_start = time.perf_counter()
+    create_flow().run({"steps": []})
+    serial = (time.perf_counter() - serial_start) * 6
+
+    finished, elapsed, stats, stages = run_pipeline(6)
+    assert len(finished) == 6
+    for index, (shared, error) in finished.items():
+        assert error is None, f"Scan {index} failed: {error}"
+        assert shared["steps"] == ["clone", "match", "llm", "report"], f"Scan {index} ran out of order: {shared['steps']}"
+        assert "queue_seconds" in shared["metrics"]["nodes"]["AskLLMNode"]
+
+    assert CPU_ACTIVE["peak"] == 1, f"CPU pool ran {CPU_ACTIVE['peak']} nodes at once"
+    assert stages["clone"]["peak"] <= 2 and stages["llm"]["peak"] <= 2, f"Stage limits exceeded: {stages}"
+    assert elapsed < serial * 0.6, f"Pipeline took {elapsed:.2f}s, serial {serial:.2f}s"
+    assert stats["network"]["tasks"] == 12 and stats["cpu"]["tasks"] == 12
+    print(f"   ✅ 6 scans in {elapsed:.2f}s vs {serial:.2f}s serial, "
+          f"cpu utilization {stats['cpu']['utilization']:.0%}, network {stats['network']['utilization']:.0%}")
+
+
+def test_failures_and_admission():
+    """A failing scan ends early without stopping the others; admission is bounded"""
+    print("\n🔍 Testing failure isolation and admission...")
+    finished, _, stats, _ = run_pipeline(4, max_in_flight=1, failing={1})
+
+    shared, error = finished[1]
+    assert isinstance(error, RuntimeError) and shared["steps"] == ["clone"], f"Unexpected failed scan: {shared['steps']}, {error}"
+    for index in (0, 2, 3):
+        assert finished[index][1] is None and finished[index][0]["steps"][-1] == "report"
+    assert stats["peak_in_flight"] == 1, f"Admission exceeded max_in_flight: {stats['peak_in_flight']}"
+    print("   ✅ Failure isolated, at most 1 scan in flight")
+
+
+def test_finish_errors():
+    """A raising finish callback neither kills its worker nor hangs the run"""
+    print("\n🔍 Testing finish callback failures...")
+    result = {}
+    # One CPU worker and one failing finish per pool: a dead worker would never finish the rest
+    runner = threading.Thread(target=lambda: result.update(
+        finished=run_pipeline(6, failing_finish={0, 1, 2, 3, 4})[0]), daemon=True)
+    runner.start()
+    runner.join(timeout=30)
+
+    assert not runner.is_alive(), "Scheduler hung after a finish callback raised"
+    finished = result["finished"]
+    assert sorted(finished) == list(range(6)), f"Not every scan finished: {sorted(finished)}"
+    assert all(error is None and shared["steps"][-1] == "report" for shared, error in finished.values())
+    print("   ✅ 6 scans finished with 5 failing finish callbacks")
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Testing Stage Scheduler")
+    print("=" * 60)
+
+    try:
+        test_pipeline_overlaps_stages()
+        test_failures_and_admission()
+        test_finish_errors()
+
+        print("\n" + "=" * 60)
+        print("✅ All stage scheduler tests passed!")
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for the static pattern registry
+Verifies that static pattern lookups are resolved and compiled once per process and that
+scans match static patterns without compiling them again
+"""
+
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent))
+
+from gates.utils.static_patterns import (
+    STATIC_PATTERN_LIBRARY, GATE_EXTRA_PATTERNS, STATIC_PATTERN_FLAGS, StaticPatternRegistry,
+    get_static_pattern_registry, get_static_patterns_for_gate, get_compiled_static_patterns
+)
+from gates.utils.pattern_safety import PatternSafetyGuard
+from benchmarks.synthetic_repo import ensure_repository
+from benchmarks.benchmark_flow import build_shared, stub_external_services
+from gates.flow import create_validation_flow
+
+
+def test_lookups():
+    """Lookups keep the library's patterns, deduplicated, and return the same compiled objects"""
+    print("\n🔍 Testing registry lookups...")
+    registry = get_static_pattern_registry()
+    assert get_static_pattern_registry() is registry, "Registry must be built once per process"
+
+    for gate_name, gate_patterns in STATIC_PATTERN_LIBRARY.items():
+        patterns = get_static_patterns_for_gate(gate_name, ["Java", "Spring Boot"])
+        assert len(patterns) == len(set(patterns)), f"{gate_name}: duplicate patterns"
+        expected = set(gate_patterns.get("java", [])) | set(GATE_EXTRA_PATTERNS.get(gate_name, []))
+        for category in ("standard_logging", "structured_logging", "framework_logging", "multi_language"):
+            expected |= set(gate_patterns.get(category, []))
+        assert set(patterns) == expected, f"{gate_name}: unexpected pattern set"
+
+        compiled = get_compiled_static_patterns(gate_name, ["Java", "Spring Boot"])
+        assert [pattern for pattern, _ in compiled] == patterns
+        assert all(c.flags & STATIC_PATTERN_FLAGS == STATIC_PATTERN_FLAGS for _, c in compiled)
+        again = get_compiled_static_patterns(gate_name, ["Java", "Spring Boot"])
+        assert all(a is b for (_, a), (_, b) in zip(compiled, again)), f"{gate_name}: patterns compiled twice"
+
+    assert get_static_patterns_for_gate("UNKNOWN_GATE", ["Java"]) == []
+    assert registry.resolve_technologies(["TypeScript", "React"]) == ("javascript", "typescript")
+    print(f"   ✅ {registry.get_stats()}")
+
+
+def test_invalid_patterns():
+    """Invalid library patterns are rejected once and never returned as compiled patterns"""
+    print("\n🔍 Testing invalid patterns...")
+    registry = StaticPatternRegistry({"GATE": {"java": [r"valid\(", r"broken(", r"valid\("]}})
+    assert registry.get_patterns("GATE", ["java"]) == (r"valid\(", r"broken(")
+    assert [pattern for pattern, _ in registry.get_compiled("GATE", ["java"])] == [r"valid\("]
+    assert set(registry.invalid) == {r"broken("}
+
+    guard = PatternSafetyGuard(screen_cache=registry.screen_cache)
+    screened = guard.screen(list(registry.get_patterns("GATE", ["java"])), STATIC_PATTERN_FLAGS, analyze=False)
+    assert [pattern for pattern, _ in screened] == [r"valid\("] and len(guard.rejected) == 1
+    print("   ✅ Invalid pattern rejected from the registry's screen cache")
+
+
+def test_scans_reuse_compiled_patterns():
+    """Scans screen static patterns from the registry instead of compiling them"""
+    print("\n🔍 Testing scans reuse compiled patterns...")
+    work_dir = tempfile.mkdtemp(prefix="static_registry_test_")
+    original_screen_one = PatternSafetyGuard._screen_one
+    screened = {"static": 0, "llm": 0}
+
+    def counting_screen_one(self, pattern, flags, analyze):
+        screened["llm" if analyze else "static"] += 1
+        return original_screen_one(self, pattern, flags, analyze)
+
+    try:
+        repo_path = ensure_repository(work_dir, "java-spring", 60, seed=51)
+        PatternSafetyGuard._screen_one = counting_screen_one
+        scores = []
+        for _ in range(2):
+            shared = build_shared(repo_path, tempfile.mkdtemp(dir=work_dir))
+            shared["request"]["output_dir"] = str(Path(work_dir) / f"reports-{len(scores)}")
+            with stub_external_services(repo_path, llm_latency=0.0):
+                create_validation_flow().run(shared)
+            scores.append(shared["validation"]["overall_score"])
+
+        assert screened["static"] == 0, f"{screened['static']} static patterns were compiled during scans"
+        assert screened["llm"] > 0, "LLM patterns are still screened per scan"
+        assert scores[0] == scores[1]
+        print(f"   ✅ 2 scans, 0 static compilations ({screened['llm']} LLM patterns screened)")
+    finally:
+        PatternSafetyGuard._screen_one = original_screen_one
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Testing Static Pattern Registry")
+    print("=" * 60)
+
+    try:
+        test_lookups()
+        test_invalid_patterns()
+        test_scans_reuse_compiled_patterns()
+
+        print("\n" + "=" * 60)
+        print("✅ All static pattern registry tests passed!")
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
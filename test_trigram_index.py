@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Test script for trigram pre-screening of pattern matches
+Verifies literal extraction, identical matches with and without the index, and per-commit persistence
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent))
+
+from gates.nodes import ValidateGatesNode
+from gates.utils.hard_gates import HARD_GATES
+from gates.utils.static_patterns import get_static_patterns_for_gate
+from gates.utils.content_cache import FileContentCache
+from gates.utils.trigram_index import TrigramIndex, extract_literal_query, get_scan_trigram_index, resolve_commit_sha
+
+
+JAVA_TEMPLATES = [
+    "import org.slf4j.Logger;\nimport org.slf4j.LoggerFactory;\n\npublic class Service{i} {{\n"
+    "    private static final Logger LOGGER = LoggerFactory.getLogger(Service{i}.class);\n"
+    "    public void run() {{ LOGGER.info(\"running {i}\"); }}\n}}\n",
+    "import io.github.resilience4j.circuitbreaker.annotation.CircuitBreaker;\n\npublic class Client{i} {{\n"
+    "    @CircuitBreaker(name = \"backend\", fallbackMethod = \"fallback\")\n"
+    "    @Retry(name = \"backend\")\n    public String call() {{ return restTemplate.getForObject(url, String.class); }}\n}}\n",
+    "public class Plain{i} {{\n    int add(int a, int b) {{ return a + b; }}\n}}\n",
+    "@RestController\npublic class Controller{i} {{\n    @GetMapping(\"/api\")\n"
+    "    public ResponseEntity<String> get() {{ return ResponseEntity.status(HttpStatus.NOT_FOUND).build(); }}\n}}\n"
+]
+
+PYTHON_TEMPLATES = [
+    "import logging\nimport structlog\nlogger = logging.getLogger(__name__)\n\ndef handler_{i}():\n"
+    "    logger.error('failed', exc_info=True)\n",
+    "import requests\n\ndef fetch_{i}(url):\n    return requests.get(url, timeout=5)\n",
+    "def compute_{i}(x):\n    return x * 2\n"
+]
+
+
+def create_test_repository(file_count: int = 40) -> tuple:
+    """Create a repository with a mix of Java and Python files"""
+    test_dir = tempfile.mkdtemp(prefix="test_trigram_index_")
+    file_list = []
+    for i in range(file_count):
+        if i % 2 == 0:
+            relative_path = f"src/main/java/File{i}.java"
+            content = JAVA_TEMPLATES[i % len(JAVA_TEMPLATES)].format(i=i)
+            language = "Java"
+        else:
+            relative_path = f"app/module_{i}.py"
+            content = PYTHON_TEMPLATES[i % len(PYTHON_TEMPLATES)].format(i=i)
+            language = "Python"
+        path = Path(test_dir) / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+        file_list.append({
+            "relative_path": relative_path,
+            "language": language,
+            "type": "Source Code",
+            "size": path.stat().st_size,
+            "is_binary": False
+        })
+    metadata = {
+        "total_files": file_count,
+        "file_list": file_list,
+        "language_stats": {"Java": {"files": file_count // 2}, "Python": {"files": file_count // 2}}
+    }
+    return test_dir, metadata
+
+
+def test_literal_extraction():
+    """Test required literal extraction from regex patterns"""
+    print("🔤 Testing literal extraction...")
+
+    assert extract_literal_query(r'LoggerFactory\.getLogger\(') == "LoggerFactory.getLogger("
+    assert extract_literal_query(r'@CircuitBreaker') == "@CircuitBreaker"
+    assert extract_literal_query(r'\blog\.(info|debug)\(') == ("and", ["log.", ("or", ["info", "debug"]), "("])
+    assert extract_literal_query(r'\w+') is None
+    assert extract_literal_query(r'(foo)?bar') == "bar"
+    assert extract_literal_query(r'(foo|\w+)bar') == "bar"
+    assert extract_literal_query(r'[unclosed') is None
+
+    print("   ✅ Literal extraction test passed")
+
+
+def test_prescreen_preserves_matches():
+    """Test that every static pattern finds exactly the same matches with pre-screening"""
+    print("🔎 Testing pre-screening preserves matches...")
+
+    test_dir, metadata = create_test_repository()
+    try:
+        validator = ValidateGatesNode()
+        config = validator._get_pattern_matching_config({})
+        config["enable_detailed_logging"] = False
+        cache = FileContentCache(test_dir)
+        shared = {"repository": {"local_path": test_dir}}
+        index = get_scan_trigram_index(shared, validator._get_indexable_files(metadata, config), cache)
+        assert len(index) == 40
+
+        total_matches = 0
+        for gate in HARD_GATES:
+            patterns = get_static_patterns_for_gate(gate["name"], ["java", "python"])
+            plain = validator._find_pattern_matches_with_config(
+                Path(test_dir), patterns, metadata, gate, config, "Static", content_cache=cache
+            )
+            screened = validator._find_pattern_matches_with_config(
+                Path(test_dir), patterns, metadata, gate, config, "Static", content_cache=cache, trigram_index=index
+            )
+            key = lambda m: (m["file"], m["line"], m["pattern"], m["match"])
+            assert sorted(map(key, plain)) == sorted(map(key, screened)), f"Matches differ for {gate['name']}"
+            total_matches += len(plain)
+
+        stats = index.get_stats()
+        assert total_matches > 0
+        assert stats["regex_runs_skipped"] > stats["pattern_file_pairs"] // 2, stats
+
+        print(f"   ✅ {total_matches} matches identical, {stats['skip_ratio'] * 100:.1f}% of regex runs skipped")
+    finally:
+        shutil.rmtree(test_dir)
+
+
+def test_incremental_postings():
+    """Test that candidate masks built from file id lists match every file and include files added later"""
+    print("🧮 Testing posting lists...")
+
+    index = TrigramIndex()
+    contents = [f"class Service{i} {{ Logger log = LoggerFactory.getLogger(); }}" if i % 3 == 0 else f"int value{i} = {i};"
+                for i in range(200)]
+    for i, content in enumerate(contents):
+        index.add_file(f"File{i}.java", content)
+
+    mask = index.candidates(r'LoggerFactory\.getLogger')
+    assert mask == sum(1 << i for i in range(200) if i % 3 == 0), "Candidates differ from the files containing the literal"
+    assert not any(index.may_match(mask, f"File{i}.java") for i in range(200) if i % 3)
+
+    # A file added after a query is a candidate of the next one
+    index.add_file("Late.java", "LoggerFactory.getLogger()")
+    assert index.may_match(index.candidates(r'LoggerFactory\.getLogger'), "Late.java")
+    assert index.get_stats()["files"] == 201
+
+    print(f"   ✅ {bin(mask).count('1')} candidates of {len(index)} files, late file included")
+
+
+def test_persistence_per_commit():
+    """Test that the index is persisted per commit and reused"""
+    print("💾 Testing per-commit persistence...")
+
+    test_dir, metadata = create_test_repository(file_count=6)
+    cache_dir = tempfile.mkdtemp(prefix="test_trigram_cache_")
+    try:
+        # Minimal git metadata: HEAD pointing at a branch ref
+        commit = "0123456789abcdef0123456789abcdef01234567"
+        git_dir = Path(test_dir) / ".git"
+        (git_dir / "refs" / "heads").mkdir(parents=True)
+        (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+        (git_dir / "refs" / "heads" / "main").write_text(commit + "\n")
+        assert resolve_commit_sha(test_dir) == commit
+
+        os.environ["CODEGATES_INDEX_CACHE_DIR"] = cache_dir
+        validator = ValidateGatesNode()
+        config = validator._get_pattern_matching_config({})
+        files = validator._get_indexable_files(metadata, config)
+
+        first = get_scan_trigram_index({"repository": {"local_path": test_dir}}, files, FileContentCache(test_dir))
+        assert not first.loaded_from_disk
+        assert list(Path(cache_dir).glob(f"{commit}*"))
+
+        second = get_scan_trigram_index({"repository": {"local_path": test_dir}}, files, FileContentCache(test_dir))
+        assert second.loaded_from_disk
+        assert second.commit == commit
+        assert first.candidates(r'LoggerFactory') == second.candidates(r'LoggerFactory')
+
+        # Corrupt cache files are ignored
+        assert TrigramIndex.load(Path(cache_dir) / "missing.json.gz") is None
+
+        print("   ✅ Per-commit persistence test passed")
+    finally:
+        os.environ.pop("CODEGATES_INDEX_CACHE_DIR", None)
+        shutil.rmtree(test_dir)
+        shutil.rmtree(cache_dir)
+
+
+def main():
+    """Run all tests"""
+    print("🧪 Testing Trigram Pre-screening")
+    print("=" * 60)
+
+    try:
+        test_literal_extraction()
+        test_prescreen_preserves_matches()
+        test_incremental_postings()
+        test_persistence_per_commit()
+
+        print("\n" + "=" * 60)
+        print("✅ All trigram index tests passed!")
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,8 @@ export class CodeGatesProvider {
     constructor(context: vscode.ExtensionContext, runner: CodeGatesRunner) {
         this.context = context;
         this.runner = runner;
+        // Stops the runner's daemon when the extension is deactivated
+        context.subscriptions.push(runner);
     }
 
     public async scanWorkspace(): Promise<ScanResult | null> {
@@ -13,7 +13,7 @@ import * as fs from 'fs';
 import * as path from 'path';
 import { ConfigurationManager } from '../utils/configurationManager';
 import { NotificationManager } from '../utils/notificationManager';
-import { ApiConfig, ScanOptions, ScanRequest, ScanResult, GateResult, ICodeGatesRunner } from '../types/api';
+import { ApiConfig, ScanOptions, ScanRequest, ScanResult, GateResult, ICodeGatesRunner, ReportQuery, ReportPage } from '../types/api';
 
 interface HttpResponse {
     statusCode: number;
@@ -313,6 +313,36 @@ export class ApiRunner implements ICodeGatesRunner {
         }
     }
     
+    /**
+     * Fetch one page of gate results (filtered by gate, status or category) instead of the full report
+     */
+    async getReportGates(scanId: string, query: ReportQuery = {}): Promise<ReportPage<any>> {
+        return this.queryReport(scanId, 'gates', query);
+    }
+
+    /**
+     * Fetch one page of matches (filtered by gate, status, file, language or source) instead of the full report
+     */
+    async getReportMatches(scanId: string, query: ReportQuery = {}): Promise<ReportPage<any>> {
+        return this.queryReport(scanId, 'matches', query);
+    }
+
+    private async queryReport(scanId: string, resource: string, query: ReportQuery): Promise<ReportPage<any>> {
+        const params = new URLSearchParams();
+        for (const [key, value] of Object.entries(query)) {
+            if (value !== undefined && value !== null) {
+                params.append(key, Array.isArray(value) ? value.join(',') : String(value));
+            }
+        }
+        const queryString = params.toString();
+        try {
+            const response = await this.makeHttpRequest('GET', `/scan/${scanId}/${resource}${queryString ? `?${queryString}` : ''}`);
+            return response.data;
+        } catch (error: any) {
+            throw new Error(`Failed to query report ${resource}: ${this.getErrorMessage(error)}`);
+        }
+    }
+    
     async updateReportComments(scanId: string, comments: Record<string, string>): Promise<void> {
         // Comments functionality is not implemented on the server yet
         // This method is kept for future implementation
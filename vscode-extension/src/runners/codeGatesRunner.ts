@@ -1,6 +1,8 @@
-import { exec, spawn } from 'child_process';
+import { exec, spawn, ChildProcess } from 'child_process';
 import * as path from 'path';
+import * as readline from 'readline';
 import * as fs from 'fs';
+import * as zlib from 'zlib';
 import { ConfigurationManager } from '../utils/configurationManager';
 import { NotificationManager } from '../utils/notificationManager';
 
@@ -35,11 +37,105 @@ export interface Issue {
     gate: string;
 }
 
+export interface ScanProgress {
+    scan_id: string;
+    node: string;
+    state: 'started' | 'finished';
+    step: string;
+    percentage: number | null;
+}
+
+interface PendingRequest {
+    resolve: (result: any) => void;
+    reject: (error: Error) => void;
+}
+
+/**
+ * Client for `codegates daemon`: one long-lived process answering JSON-RPC 2.0
+ * requests (one JSON message per line on stdin/stdout), so repeated scans reuse
+ * its warm LLM client, compiled patterns and file contents.
+ */
+class DaemonClient {
+    private process: ChildProcess;
+    private nextId = 1;
+    private pending = new Map<number, PendingRequest>();
+    private exited = false;
+
+    constructor(command: string, private onProgress?: (progress: ScanProgress) => void) {
+        // Scan logs go to stderr, stdout carries only protocol messages
+        this.process = spawn(command, { shell: true, stdio: ['pipe', 'pipe', 'pipe'] });
+        readline.createInterface({ input: this.process.stdout! }).on('line', line => this.handleLine(line));
+        this.process.stderr!.on('data', () => { /* Scan log output */ });
+        this.process.on('exit', () => this.fail(new Error('CodeGates daemon exited')));
+        this.process.on('error', error => this.fail(error));
+    }
+
+    get alive(): boolean {
+        return !this.exited;
+    }
+
+    request(method: string, params: any = {}): Promise<any> {
+        if (this.exited) {
+            return Promise.reject(new Error('CodeGates daemon is not running'));
+        }
+        const id = this.nextId++;
+        return new Promise((resolve, reject) => {
+            this.pending.set(id, { resolve, reject });
+            this.process.stdin!.write(JSON.stringify({ jsonrpc: '2.0', id, method, params }) + '\n');
+        });
+    }
+
+    dispose(): void {
+        if (!this.exited) {
+            this.request('shutdown').catch(() => undefined);
+            this.process.stdin!.end();
+        }
+    }
+
+    private handleLine(line: string): void {
+        let message: any;
+        try {
+            message = JSON.parse(line);
+        } catch {
+            return;
+        }
+        if (message.method === 'progress') {
+            this.onProgress?.(message.params);
+            return;
+        }
+        if (message.method === 'log') {
+            console.warn(`CodeGates ${message.params.level}:`, message.params.message);
+            return;
+        }
+        const request = this.pending.get(message.id);
+        if (!request) {
+            return;
+        }
+        this.pending.delete(message.id);
+        if (message.error) {
+            request.reject(new Error(message.error.message));
+        } else {
+            request.resolve(message.result);
+        }
+    }
+
+    private fail(error: Error): void {
+        this.exited = true;
+        for (const request of this.pending.values()) {
+            request.reject(error);
+        }
+        this.pending.clear();
+    }
+}
+
 export class CodeGatesRunner {
     private configManager: ConfigurationManager;
     private notificationManager: NotificationManager;
     private pythonPath: string;
     private codeGatesPath: string;
+    private daemon: DaemonClient | null = null;
+    private daemonUnavailable = false;
+    public onProgress?: (progress: ScanProgress) => void;
 
     constructor(configManager: ConfigurationManager, notificationManager: NotificationManager) {
         this.configManager = configManager;
@@ -72,6 +168,11 @@ export class CodeGatesRunner {
     }
 
     async scanWorkspace(workspacePath: string): Promise<ScanResult> {
+        const daemonResult = await this.scanWithDaemon(workspacePath);
+        if (daemonResult) {
+            return daemonResult;
+        }
+
         const args = this.buildScanArgs(workspacePath, false);
         
         try {
@@ -83,6 +184,11 @@ export class CodeGatesRunner {
     }
 
     async scanFile(filePath: string): Promise<ScanResult> {
+        const daemonResult = await this.scanWithDaemon(filePath);
+        if (daemonResult) {
+            return daemonResult;
+        }
+
         const args = this.buildScanArgs(filePath, true);
         
         try {
@@ -93,6 +199,50 @@ export class CodeGatesRunner {
         }
     }
 
+    /**
+     * Scan through the daemon, starting it on first use. Returns null when the
+     * daemon is disabled, cannot start or fails the scan, so the caller runs one
+     * process per scan.
+     */
+    private async scanWithDaemon(targetPath: string): Promise<ScanResult | null> {
+        if (this.daemonUnavailable || !this.configManager.get<boolean>('useDaemon', true)) {
+            return null;
+        }
+
+        if (!this.daemon || !this.daemon.alive) {
+            this.daemon = new DaemonClient(this.buildCommand(['daemon']), progress => this.onProgress?.(progress));
+            try {
+                await this.daemon.request('initialize');
+            } catch (error) {
+                console.warn('CodeGates daemon unavailable, running one process per scan:', error);
+                this.daemonUnavailable = true;
+                this.daemon = null;
+                return null;
+            }
+        }
+
+        try {
+            const result = await this.daemon.request('scan', {
+                path: targetPath,
+                threshold: this.configManager.get<number>('threshold', 70)
+            });
+            return this.transformResult(result);
+        } catch (error) {
+            console.warn('CodeGates daemon scan failed, running one process for this scan:', error);
+            // A daemon that exited is started again on the next scan
+            if (this.daemon && !this.daemon.alive) {
+                this.daemon.dispose();
+                this.daemon = null;
+            }
+            return null;
+        }
+    }
+
+    dispose(): void {
+        this.daemon?.dispose();
+        this.daemon = null;
+    }
+
     private buildScanArgs(targetPath: string, isFile: boolean): string[] {
         const args = ['scan', targetPath];
         
@@ -204,7 +354,7 @@ export class CodeGatesRunner {
         }
         
         const reportFiles = fs.readdirSync(reportsDir)
-            .filter(file => file.startsWith('codegates_report_') && file.endsWith('.json'))
+            .filter(file => file.startsWith('codegates_report_') && (file.endsWith('.json') || file.endsWith('.json.gz')))
             .sort()
             .reverse();
         
@@ -213,7 +363,10 @@ export class CodeGatesRunner {
         }
         
         const latestReport = path.join(reportsDir, reportFiles[0]);
-        const reportContent = fs.readFileSync(latestReport, 'utf-8');
+        // Reports written with CODEGATES_REPORT_GZIP=true are gzipped
+        const reportContent = latestReport.endsWith('.gz')
+            ? zlib.gunzipSync(fs.readFileSync(latestReport)).toString('utf-8')
+            : fs.readFileSync(latestReport, 'utf-8');
         const result = JSON.parse(reportContent);
         
         return this.transformResult(result);
@@ -39,6 +39,25 @@ export interface ScanResult {
     step_details?: string;
 }
 
+export interface ReportQuery {
+    gate?: string;
+    status?: string;
+    category?: string;
+    file?: string;
+    language?: string;
+    source?: string;
+    offset?: number;
+    limit?: number;
+    fields?: string[];
+}
+
+export interface ReportPage<T> {
+    total: number;
+    offset: number;
+    limit: number;
+    items: T[];
+}
+
 export interface ICodeGatesRunner {
     scanRepository(repoUrl: string, branch?: string, token?: string, options?: ScanOptions): Promise<ScanResult>;
     testConnection(): Promise<boolean>;